@@ -0,0 +1,201 @@
+#!/usr/bin/env python
+"""
+Local stub of the Bedrock Runtime API for offline development and tests.
+
+Serves InvokeModel (Titan-style embeddings) and Converse (echoes the last user
+message) with an optional fixed latency, can throttle a number of requests
+(429 ThrottlingException), and rejects requests without a SigV4 Authorization
+header. System prompt text before a cachePoint block is reported as a prompt
+cache write the first time it is seen per model and as a cache read after that. It counts requests and the peak number in flight, which
+is how the tests check that the async transport really overlaps calls.
+
+Usage:
+    python scripts/bedrock_stub.py --port 8787 --latency 0.5
+    BEDROCK_ENDPOINT_URL=http://127.0.0.1:8787 uvicorn src.api.main:app
+"""
+
+import argparse
+import hashlib
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import unquote
+
+_PATH = re.compile(r"^/model/(?P<model>[^/]+)/(?P<action>invoke|converse)$")
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 128  # accept bursts of concurrent connections
+
+
+class BedrockStub:
+    """Threaded HTTP server imitating bedrock-runtime."""
+
+    def __init__(
+        self, host: str = "127.0.0.1", port: int = 0, latency: float = 0.0, dimensions: int = 16
+    ) -> None:
+        """
+        Create the stub (call start() to serve).
+
+        Args:
+            host: Interface to bind
+            port: Port to bind (0 picks a free port)
+            latency: Seconds each request takes
+            dimensions: Size of the returned embeddings
+        """
+        self.latency = latency
+        self.dimensions = dimensions
+        self.throttle_requests = 0  # the next N signed requests get a 429
+        self.requests: list[dict] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._prompt_cache: set[tuple[str, str]] = set()
+        self._lock = threading.Lock()
+        self._server = _Server((host, port), _handler(self))
+        self._thread: threading.Thread | None = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "BedrockStub":
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "BedrockStub":
+        return self.start()
+
+    def __exit__(self, *exc: object) -> None:
+        self.stop()
+
+    def embedding(self, text: str) -> list[float]:
+        """Deterministic unit-length vector for a text."""
+        digest = hashlib.sha256(text.encode("utf-8")).digest()
+        values = [(digest[i % len(digest)] - 127.5) / 127.5 for i in range(self.dimensions)]
+        norm = sum(v * v for v in values) ** 0.5 or 1.0
+        return [v / norm for v in values]
+
+    def handle(self, model_id: str, action: str, body: dict) -> dict:
+        """Build the response body for one request."""
+        if action == "invoke":
+            text = body.get("inputText", "")
+            return {"embedding": self.embedding(text), "inputTextTokenCount": len(text.split())}
+
+        prompt = ""
+        for message in body.get("messages", []):
+            if message.get("role") == "user":
+                prompt = "".join(block.get("text", "") for block in message.get("content", []))
+        blocks = body.get("system", [])
+        system = "".join(block.get("text", "") for block in blocks)
+
+        # Word counts stand in for tokens; the cached prefix is the system text before a cachePoint
+        cache_read = cache_write = 0
+        if any("cachePoint" in block for block in blocks):
+            end = next(i for i, block in enumerate(blocks) if "cachePoint" in block)
+            prefix = "".join(block.get("text", "") for block in blocks[:end])
+            with self._lock:
+                hit = (model_id, prefix) in self._prompt_cache
+                self._prompt_cache.add((model_id, prefix))
+            if hit:
+                cache_read = len(prefix.split())
+            else:
+                cache_write = len(prefix.split())
+        input_tokens = len(system.split()) - cache_read - cache_write + len(prompt.split())
+        return {
+            "output": {
+                "message": {
+                    "role": "assistant",
+                    "content": [{"text": f"[stub {model_id}] {prompt}"}],
+                }
+            },
+            "stopReason": "end_turn",
+            "usage": {
+                "inputTokens": input_tokens,
+                "outputTokens": len(prompt.split()) + 2,
+                "totalTokens": len(system.split()) + 2 * len(prompt.split()) + 2,
+                "cacheReadInputTokens": cache_read,
+                "cacheWriteInputTokens": cache_write,
+            },
+        }
+
+
+def _handler(stub: BedrockStub) -> type[BaseHTTPRequestHandler]:
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self) -> None:  # noqa: N802 (http.server naming)
+            body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            match = _PATH.match(self.path)
+            if match is None:
+                self._reply(404, {"message": f"Unknown path {self.path}"}, "ResourceNotFound")
+                return
+            if not self.headers.get("Authorization", "").startswith("AWS4-HMAC-SHA256 "):
+                self._reply(403, {"message": "Missing SigV4 signature"}, "AccessDeniedException")
+                return
+
+            with stub._lock:
+                throttle = stub.throttle_requests > 0
+                stub.throttle_requests -= throttle
+            if throttle:
+                self._reply(429, {"message": "Rate exceeded"}, "ThrottlingException")
+                return
+
+            with stub._lock:
+                stub.in_flight += 1
+                stub.max_in_flight = max(stub.max_in_flight, stub.in_flight)
+            try:
+                if stub.latency:
+                    time.sleep(stub.latency)
+                model_id, action = unquote(match["model"]), match["action"]
+                payload = json.loads(body or b"{}")
+                with stub._lock:
+                    stub.requests.append({"model_id": model_id, "action": action, "body": payload})
+                self._reply(200, stub.handle(model_id, action, payload))
+            finally:
+                with stub._lock:
+                    stub.in_flight -= 1
+
+        def _reply(self, status: int, payload: dict, error_type: str | None = None) -> None:
+            data = json.dumps(payload).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            if error_type:
+                self.send_header("x-amzn-ErrorType", error_type)
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, format: str, *args: object) -> None:
+            pass
+
+    return Handler
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Serve a local Bedrock Runtime stub")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8787)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds per request")
+    args = parser.parse_args()
+
+    stub = BedrockStub(args.host, args.port, args.latency)
+    print(f"Bedrock stub listening on {stub.url} (set BEDROCK_ENDPOINT_URL to this)")
+    try:
+        stub._server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stub._server.server_close()
+
+
+if __name__ == "__main__":
+    main()
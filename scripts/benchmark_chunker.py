@@ -0,0 +1,139 @@
+#!/usr/bin/env python
+"""
+Benchmark the token-aware chunker against the legacy character chunker.
+
+Builds a synthetic corpus from the historical SOWs (each file extended with a
+large pricing table, a long deliverables list and an oversized paragraph) and
+reports throughput, chunk counts and structure breakage for both chunkers.
+
+Usage:
+    python scripts/benchmark_chunker.py
+    python scripts/benchmark_chunker.py --files 1000 --max-tokens 300
+"""
+
+import argparse
+import random
+import re
+import sys
+import time
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.rag.chunker import MarkdownChunker, count_tokens  # noqa: E402
+
+
+def legacy_chunk(content: str, max_chunk_size: int = 1000) -> list[tuple[str, str]]:
+    """Previous DocumentIndexer._chunk_markdown: header split then character-based paragraphs."""
+    chunks = []
+    current_section = "Introduction"
+    current_text = ""
+
+    for part in re.split(r"(^#{1,3}\s+.+$)", content, flags=re.MULTILINE):
+        if re.match(r"^#{1,3}\s+", part):
+            if current_text.strip():
+                chunks.extend(_legacy_split(current_section, current_text, max_chunk_size))
+            current_section = part.strip("# ").strip()
+            current_text = ""
+        else:
+            current_text += part
+
+    if current_text.strip():
+        chunks.extend(_legacy_split(current_section, current_text, max_chunk_size))
+    return chunks
+
+
+def _legacy_split(section: str, text: str, max_size: int) -> list[tuple[str, str]]:
+    if len(text) <= max_size:
+        return [(section, text.strip())]
+
+    chunks = []
+    current_chunk = ""
+    for para in text.split("\n\n"):
+        if len(current_chunk) + len(para) > max_size:
+            if current_chunk:
+                chunks.append((section, current_chunk.strip()))
+            current_chunk = para
+        else:
+            current_chunk += "\n\n" + para if current_chunk else para
+    if current_chunk:
+        chunks.append((section, current_chunk.strip()))
+    return chunks
+
+
+def build_corpus(n_files: int, seed: int = 7) -> list[str]:
+    """Create n_files synthetic SOWs from the historical SOW corpus."""
+    rng = random.Random(seed)
+    bases = [
+        p.read_text(encoding="utf-8")
+        for p in (project_root / "data" / "historical_sows").glob("*.md")
+    ]
+
+    corpus = []
+    for i in range(n_files):
+        rows = "\n".join(
+            f"| Item {j} | Milestone {j} services | ${rng.randint(5, 500)},000 |"
+            for j in range(rng.randint(5, 120))
+        )
+        items = "\n".join(
+            f"- Deliverable {j}: design, build and test of component {j}"
+            for j in range(rng.randint(5, 80))
+        )
+        paragraph = " ".join(
+            f"The vendor will perform activity {j} in line with the agreed plan."
+            for j in range(rng.randint(10, 150))
+        )
+        corpus.append(
+            f"{bases[i % len(bases)]}\n\n## 8. Rate Card\n\n| Item | Description | Cost |\n"
+            f"|------|-------------|------|\n{rows}\n\n## 9. Deliverables Register\n\n{items}\n\n"
+            f"## 10. Assumptions\n\n{paragraph}\n"
+        )
+    return corpus
+
+
+def broken_structures(texts: list[str]) -> int:
+    """Count chunks that start inside a table without its header row."""
+    broken = 0
+    for text in texts:
+        lines = text.splitlines()
+        if lines and lines[0].startswith("|") and (len(lines) < 2 or "---" not in lines[1]):
+            broken += 1
+    return broken
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark markdown chunkers")
+    parser.add_argument("--files", type=int, default=10_000, help="Number of synthetic files")
+    parser.add_argument("--max-tokens", type=int, default=400, help="Token budget per chunk")
+    parser.add_argument("--overlap", type=int, default=40, help="Token overlap between chunks")
+    args = parser.parse_args()
+
+    corpus = build_corpus(args.files)
+    total_mb = sum(len(doc) for doc in corpus) / 1_000_000
+    print(f"📄 Synthetic corpus: {len(corpus)} files, {total_mb:.1f} MB\n")
+
+    chunker = MarkdownChunker(max_tokens=args.max_tokens, overlap_tokens=args.overlap)
+    runs = {
+        "legacy": lambda doc: [text for _, text in legacy_chunk(doc)],
+        "token-aware": lambda doc: [chunk.text for chunk in chunker.chunk(doc)],
+    }
+
+    print(
+        f"{'Chunker':<12} {'Seconds':>8} {'MB/s':>8} {'Chunks':>9} {'Oversized':>10} {'Broken':>8}"
+    )
+    for name, run in runs.items():
+        start = time.perf_counter()
+        texts = [text for doc in corpus for text in run(doc)]
+        elapsed = time.perf_counter() - start
+
+        oversized = sum(1 for text in texts if count_tokens(text) > args.max_tokens)
+        print(
+            f"{name:<12} {elapsed:>8.2f} {total_mb / elapsed:>8.2f} {len(texts):>9} "
+            f"{oversized:>10} {broken_structures(texts):>8}"
+        )
+
+
+if __name__ == "__main__":
+    main()
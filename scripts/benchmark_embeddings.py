@@ -0,0 +1,108 @@
+#!/usr/bin/env python
+"""
+Benchmark embedding backends on the historical SOW corpus.
+
+Each section of every historical SOW becomes one document and each distinct
+heading becomes a query; recall@k is the share of queries for which a section
+with that heading appears in the top k results.
+
+Usage:
+    python scripts/benchmark_embeddings.py
+    python scripts/benchmark_embeddings.py --backends local --k 3
+"""
+
+import argparse
+import re
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.agent.config import config  # noqa: E402
+from src.rag.embeddings import get_embeddings  # noqa: E402
+
+
+def load_sections(corpus_dir: Path) -> list[tuple[str, str]]:
+    """Split every markdown file into (heading, section_text) pairs."""
+    sections = []
+    for file_path in sorted(corpus_dir.glob("*.md")):
+        content = file_path.read_text(encoding="utf-8")
+        for part in re.split(r"^(?=#{2,3}\s)", content, flags=re.MULTILINE):
+            lines = part.strip().splitlines()
+            if len(lines) < 2 or not lines[0].startswith("#"):
+                continue
+            heading = re.sub(r"^#+\s*(\d+\.\s*)?", "", lines[0]).strip()
+            sections.append((heading, "\n".join(lines[1:])))
+    return sections
+
+
+def benchmark(backend_name: str, sections: list[tuple[str, str]], k: int) -> dict:
+    """Measure query latency and recall@k for one backend."""
+    backend = get_embeddings(backend_name)
+    documents = [text for _, text in sections]
+    labels = [heading for heading, _ in sections]
+    queries = sorted(set(labels))
+
+    start = time.perf_counter()
+    doc_matrix = np.asarray(backend.embed_documents(documents))
+    index_seconds = time.perf_counter() - start
+
+    latencies = []
+    hits = 0
+    for query in queries:
+        start = time.perf_counter()
+        query_vector = np.asarray(backend.embed_query(query))
+        latencies.append((time.perf_counter() - start) * 1000)
+
+        scores = doc_matrix @ query_vector
+        top_k = np.argsort(-scores)[:k]
+        hits += int(any(labels[i] == query for i in top_k))
+
+    return {
+        "backend": backend_name,
+        "documents": len(documents),
+        "queries": len(queries),
+        "index_seconds": index_seconds,
+        "query_ms_mean": statistics.mean(latencies),
+        "query_ms_p95": sorted(latencies)[int(len(latencies) * 0.95) - 1],
+        "recall_at_k": hits / len(queries),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark embedding backends")
+    parser.add_argument("--backends", default="local,bedrock", help="Comma-separated backends")
+    parser.add_argument("--k", type=int, default=5, help="Cut-off for recall@k")
+    parser.add_argument(
+        "--corpus",
+        default=str(project_root / "data" / "historical_sows"),
+        help="Directory of markdown SOWs",
+    )
+    args = parser.parse_args()
+
+    sections = load_sections(Path(args.corpus))
+    print(f"📄 Loaded {len(sections)} sections from {args.corpus}")
+    print(f"   Configured backend: {config.embedding_backend}\n")
+
+    print(f"{'Backend':<10} {'Index (s)':>10} {'Query ms':>10} {'p95 ms':>10} {'Recall@k':>10}")
+    for backend_name in args.backends.split(","):
+        try:
+            result = benchmark(backend_name.strip(), sections, args.k)
+        except Exception as e:
+            print(f"{backend_name:<10} skipped: {e}")
+            continue
+        print(
+            f"{result['backend']:<10} {result['index_seconds']:>10.3f} "
+            f"{result['query_ms_mean']:>10.2f} {result['query_ms_p95']:>10.2f} "
+            f"{result['recall_at_k']:>10.2%}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -2,11 +2,17 @@
 """
 Script to index documents into ChromaDB for RAG retrieval.
 
-Indexes:
+Indexes markdown, PDF and DOCX files from:
 - Historical SOWs from data/historical_sows/
 - Product knowledge base from data/product_kb/
+
+Usage:
+    python scripts/index_documents.py
+    python scripts/index_documents.py --resume --workers 8
 """
 
+import argparse
+import os
 import sys
 from pathlib import Path
 
@@ -14,60 +20,90 @@ from pathlib import Path
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
-from src.rag.indexer import DocumentIndexer
+from src.agent.config import config  # noqa: E402
+from src.rag.indexer import DocumentIndexer  # noqa: E402
+from src.rag.ingestion import IngestionPipeline, IngestionStats  # noqa: E402
 
 
-def main() -> None:
-    """Index all documents into ChromaDB."""
-    print("🔍 Starting document indexing...")
+def historical_sow_metadata(sow_file: Path) -> dict[str, str]:
+    """Extract metadata from a historical SOW filename (e.g., SOW-2023-001-acme-payments.md)."""
+    parts = sow_file.stem.split("-")
+    metadata = {
+        "doc_type": "historical_sow",
+        "year": parts[1] if len(parts) > 1 else "unknown",
+    }
 
-    indexer = DocumentIndexer(collection_name="sow_documents")
+    # Try to extract client and product from filename
+    if len(parts) >= 4:
+        metadata["client_id"] = parts[3] if len(parts) > 3 else "unknown"
+        metadata["product"] = parts[4] if len(parts) > 4 else "unknown"
 
-    # Clear existing data
-    print("🗑️  Clearing existing collection...")
-    indexer.clear_collection()
+    return metadata
 
-    # Index historical SOWs
-    sow_dir = project_root / "data" / "historical_sows"
-    if sow_dir.exists():
-        print(f"\n📄 Indexing historical SOWs from {sow_dir}...")
-        for sow_file in sow_dir.glob("*.md"):
-            print(f"  - {sow_file.name}")
 
-            # Extract metadata from filename (e.g., SOW-2023-001-acme-payments.md)
-            parts = sow_file.stem.split("-")
-            metadata = {
-                "doc_type": "historical_sow",
-                "year": parts[1] if len(parts) > 1 else "unknown",
-            }
+def product_kb_metadata(product_file: Path) -> dict[str, str]:
+    """Extract the product name from a knowledge base filename."""
+    return {
+        "doc_type": "product_kb",
+        "product": product_file.stem.replace("_", " ").title(),
+    }
 
-            # Try to extract client and product from filename
-            if len(parts) >= 4:
-                metadata["client_id"] = parts[3] if len(parts) > 3 else "unknown"
-                metadata["product"] = parts[4] if len(parts) > 4 else "unknown"
 
-            indexer.index_markdown_file(sow_file, metadata)
+def report_progress(stats: IngestionStats) -> None:
+    """Print throughput after each upserted batch."""
+    print(
+        f"  - {stats.files_indexed} files, {stats.chunks_indexed} chunks "
+        f"({stats.files_per_second:.1f} files/s, {stats.chunks_per_second:.1f} chunks/s)"
+    )
 
-    # Index product knowledge base
-    product_dir = project_root / "data" / "product_kb"
-    if product_dir.exists():
-        print(f"\n📚 Indexing product knowledge base from {product_dir}...")
-        for product_file in product_dir.glob("*.md"):
-            print(f"  - {product_file.name}")
 
-            # Extract product name from filename
-            product_name = product_file.stem.replace("_", " ").title()
+def main() -> None:
+    """Index all documents into ChromaDB."""
+    parser = argparse.ArgumentParser(description="Index documents into ChromaDB")
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Keep the collection and skip files indexed by a previous run",
+    )
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 4, help="Parser processes")
+    parser.add_argument("--batch-size", type=int, default=64, help="Chunks per upsert batch")
+    args = parser.parse_args()
 
-            metadata = {
-                "doc_type": "product_kb",
-                "product": product_name,
-            }
+    print("🔍 Starting document indexing...")
 
-            indexer.index_markdown_file(product_file, metadata)
+    indexer = DocumentIndexer(collection_name="sow_documents")
+    pipeline = IngestionPipeline(
+        indexer,
+        workers=args.workers,
+        batch_size=args.batch_size,
+        checkpoint_path=Path(config.chroma_persist_dir) / "ingestion_checkpoint.json",
+    )
+
+    if not args.resume:
+        # Clear existing data
+        print("🗑️  Clearing existing collection...")
+        indexer.clear_collection()
+        pipeline.checkpoint.clear()
+
+    sources = [
+        (project_root / "data" / "historical_sows", historical_sow_metadata),
+        (project_root / "data" / "product_kb", product_kb_metadata),
+    ]
+
+    print(f"\n📄 Indexing {', '.join(str(d) for d, _ in sources)}...")
+    stats = pipeline.run(sources, progress=report_progress)
 
     print("\n✅ Indexing complete!")
     print(f"   Collection: {indexer.collection_name}")
-    print(f"   Documents indexed: {indexer.collection.count()}")
+    print(f"   Files: {stats.files_indexed} indexed, {stats.files_skipped} skipped (resume)")
+    print(f"   Chunks indexed: {stats.chunks_indexed}")
+    print(f"   Throughput: {stats.files_per_second:.1f} files/s in {stats.elapsed_seconds:.1f}s")
+    print(f"   Documents in collection: {indexer.collection.count()}")
+
+    if stats.failures:
+        print(f"\n⚠️  {stats.files_failed} files failed:")
+        for path, error in stats.failures.items():
+            print(f"  - {path}: {error}")
 
 
 if __name__ == "__main__":
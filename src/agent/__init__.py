@@ -1,6 +1,22 @@
-"""Agent module initialization."""
+"""Agent module initialization.
+
+SOWAgent and get_agent are resolved on first access, so importing
+``src.agent.config`` or the tools does not load LangGraph and langchain_aws.
+"""
+
+from typing import TYPE_CHECKING, Any
 
 from src.agent.config import config
-from src.agent.core.planner import SOWAgent, get_agent
+
+if TYPE_CHECKING:
+    from src.agent.core.planner import SOWAgent, get_agent
 
 __all__ = ["config", "SOWAgent", "get_agent"]
+
+
+def __getattr__(name: str) -> Any:
+    if name in ("SOWAgent", "get_agent"):
+        from src.agent.core import planner
+
+        return getattr(planner, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
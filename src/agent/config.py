@@ -2,14 +2,13 @@
 Configuration module for the SOW Generator agent.
 
 Loads environment variables and provides shared resources like Bedrock client and ChromaDB.
+boto3 and chromadb are imported when a client is first requested, not at import time.
 """
 
 import os
 from pathlib import Path
 from typing import Any, Optional
 
-import boto3
-import chromadb
 from dotenv import load_dotenv
 
 # Load environment variables
@@ -38,17 +37,105 @@ class Config:
         self.bedrock_model_id = os.getenv("BEDROCK_MODEL_ID", "apac.amazon.nova-pro-v1:0")
         print(f"🚀 Using Bedrock Model ID: {self.bedrock_model_id}")
 
+        # Async Bedrock transport (endpoint override, e.g. a local stub, pool size and timeout)
+        self.bedrock_endpoint_url = os.getenv("BEDROCK_ENDPOINT_URL") or None
+        self.bedrock_max_connections = int(os.getenv("BEDROCK_MAX_CONNECTIONS", "64"))
+        self.bedrock_timeout = float(os.getenv("BEDROCK_TIMEOUT", "120"))
+
+        # Bedrock rate limiting: requests per second and burst, AIMD concurrency bounds,
+        # and retries of throttled calls
+        self.bedrock_rate_limit = float(os.getenv("BEDROCK_RATE_LIMIT", "20"))
+        self.bedrock_burst = float(os.getenv("BEDROCK_BURST", "40"))
+        self.bedrock_max_concurrency = int(os.getenv("BEDROCK_MAX_CONCURRENCY", "16"))
+        self.bedrock_min_concurrency = int(os.getenv("BEDROCK_MIN_CONCURRENCY", "1"))
+        self.bedrock_max_retries = int(os.getenv("BEDROCK_MAX_RETRIES", "5"))
+
         # Model parameters
         self.temperature = float(os.getenv("TEMPERATURE", "0.7"))
         self.max_tokens = int(os.getenv("MAX_TOKENS", "4096"))
 
+        # Model routing by task and quality mode (empty: src/agent/model_routes.yaml)
+        self.model_routes_file = os.getenv("MODEL_ROUTES_FILE", "")
+
+        # Bedrock prompt caching of static prompt prefixes, on models that support it
+        self.prompt_cache_enabled = os.getenv("PROMPT_CACHE_ENABLED", "true").lower() == "true"
+
+        # Checkpoints of agent runs, for resuming a run that failed part-way
+        self.checkpoint_db = os.getenv("CHECKPOINT_DB", "./data/checkpoints.db")
+        # Seconds a run or editing session is kept after its last checkpoint (0 = forever)
+        self.checkpoint_ttl = float(os.getenv("CHECKPOINT_TTL", "604800"))
+
         # Vector store configuration
         self.chroma_persist_dir = os.getenv("CHROMA_PERSIST_DIR", "./data/chromadb")
 
+        # Embedding configuration ("bedrock" or "local")
+        self.embedding_backend = os.getenv("EMBEDDING_BACKEND", "bedrock").lower()
+        self.embedding_model_id = os.getenv("EMBEDDING_MODEL_ID", "amazon.titan-embed-text-v2:0")
+        self.local_embedding_dim = int(os.getenv("LOCAL_EMBEDDING_DIM", "1024"))
+
+        # Chunking (token budget per chunk and overlap between consecutive chunks)
+        self.chunk_max_tokens = int(os.getenv("CHUNK_MAX_TOKENS", "400"))
+        self.chunk_overlap_tokens = int(os.getenv("CHUNK_OVERLAP_TOKENS", "40"))
+
+        # Retriever query cache (size 0 disables caching)
+        self.retriever_cache_size = int(os.getenv("RETRIEVER_CACHE_SIZE", "256"))
+        self.retriever_cache_ttl = float(os.getenv("RETRIEVER_CACHE_TTL", "600"))
+
+        # Reranking of retrieved chunks ("mmr", "cross_encoder" or "none")
+        self.rerank_strategy = os.getenv("RERANK_STRATEGY", "mmr").lower()
+        self.rerank_fetch_k = int(os.getenv("RERANK_FETCH_K", "20"))
+        self.rerank_lambda = float(os.getenv("RERANK_LAMBDA", "0.5"))
+        self.reranker_model = os.getenv("RERANKER_MODEL", "cross-encoder/ms-marco-MiniLM-L-6-v2")
+
+        # PDF extraction (page-parallel above the page threshold, cached per page)
+        self.pdf_workers = int(os.getenv("PDF_WORKERS", "4"))
+        self.pdf_parallel_min_pages = int(os.getenv("PDF_PARALLEL_MIN_PAGES", "32"))
+        self.pdf_page_cache_size = int(os.getenv("PDF_PAGE_CACHE_SIZE", "2048"))
+
+        # Mandatory clause detection: share of a clause's tokens one sentence or
+        # heading must contain, and similarity cutoff for misspellings/headings
+        self.clause_token_threshold = float(os.getenv("CLAUSE_TOKEN_THRESHOLD", "0.75"))
+        self.clause_fuzzy_threshold = float(os.getenv("CLAUSE_FUZZY_THRESHOLD", "0.85"))
+
         # API Configuration
         self.api_host = os.getenv("API_HOST", "0.0.0.0")
         self.api_port = int(os.getenv("API_PORT", "8000"))
 
+        # Warm agent, vector store and document libraries in the background at startup
+        self.warmup_enabled = os.getenv("WARMUP_ENABLED", "true").lower() == "true"
+
+        # Admission control per lane: requests running at once (in total and per
+        # tenant), requests queued beyond that, and seconds a queued request waits
+        self.generation_max_concurrent = int(os.getenv("GENERATION_MAX_CONCURRENT", "8"))
+        self.generation_max_per_tenant = int(os.getenv("GENERATION_MAX_PER_TENANT", "2"))
+        self.generation_queue_size = int(os.getenv("GENERATION_QUEUE_SIZE", "32"))
+        self.generation_queue_timeout = float(os.getenv("GENERATION_QUEUE_TIMEOUT", "30"))
+        self.interactive_max_concurrent = int(os.getenv("INTERACTIVE_MAX_CONCURRENT", "64"))
+        self.interactive_max_per_tenant = int(os.getenv("INTERACTIVE_MAX_PER_TENANT", "16"))
+        self.interactive_queue_size = int(os.getenv("INTERACTIVE_QUEUE_SIZE", "256"))
+        self.interactive_queue_timeout = float(os.getenv("INTERACTIVE_QUEUE_TIMEOUT", "5"))
+
+        # Take the admission tenant from X-Tenant-ID; only enable behind a proxy
+        # that authenticates callers and sets the header itself
+        self.trust_tenant_header = os.getenv("TRUST_TENANT_HEADER", "false").lower() == "true"
+
+        # Seconds finished generation jobs (/sow/create/jobs) stay available
+        self.generation_job_ttl = float(os.getenv("GENERATION_JOB_TTL", "3600"))
+
+        # Document uploads (size limit and processes used to parse them)
+        self.max_upload_mb = float(os.getenv("MAX_UPLOAD_MB", "25"))
+        self.parse_workers = int(os.getenv("PARSE_WORKERS", "2"))
+
+        # Batch review (worker processes and the directory server-side sources must be under)
+        self.review_workers = int(os.getenv("REVIEW_WORKERS", "4"))
+        self.review_batch_root = os.getenv("REVIEW_BATCH_ROOT", "./data")
+        # Limits on what a server-side zip may extract: SOW files and total size
+        self.review_batch_max_files = int(os.getenv("REVIEW_BATCH_MAX_FILES", "1000"))
+        self.review_batch_max_mb = float(os.getenv("REVIEW_BATCH_MAX_MB", "500"))
+
+        # Incremental re-review: cached per-section findings
+        self.review_cache_size = int(os.getenv("REVIEW_CACHE_SIZE", "4096"))
+
         # Logging
         self.log_level = os.getenv("LOG_LEVEL", "INFO")
 
@@ -60,18 +147,34 @@ class Config:
 
     @property
     def bedrock_runtime(self) -> Any:
-        """Get or create Bedrock Runtime client."""
+        """
+        Get or create Bedrock Runtime client.
+
+        Model calls go through the shared rate limiter, which retries throttled
+        and transient (5xx, connection, timeout) failures, so botocore's own
+        retries are disabled.
+        """
         if self._bedrock_runtime is None:
+            import boto3
+            from botocore.config import Config as BotoConfig
+
+            from src.agent.utils.rate_limit import ThrottledBedrockClient
+
             session = boto3.Session(profile_name=self.aws_profile)
-            self._bedrock_runtime = session.client(
-                service_name="bedrock-runtime", region_name=self.aws_region
+            client = session.client(
+                service_name="bedrock-runtime",
+                region_name=self.aws_region,
+                config=BotoConfig(retries={"mode": "standard", "max_attempts": 1}),
             )
+            self._bedrock_runtime = ThrottledBedrockClient(client)
         return self._bedrock_runtime
 
     @property
     def chroma_client(self) -> Any:
         """Get or create ChromaDB client."""
         if self._chroma_client is None:
+            import chromadb
+
             # Ensure persist directory exists
             Path(self.chroma_persist_dir).mkdir(parents=True, exist_ok=True)
             self._chroma_client = chromadb.PersistentClient(path=self.chroma_persist_dir)
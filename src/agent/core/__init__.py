@@ -1,5 +1,6 @@
 """Core module initialization - planner/orchestrator."""
 
 from src.agent.core.planner import SOWAgent, get_agent
+from src.agent.core.sessions import SOWSessions, get_sessions
 
-__all__ = ["SOWAgent", "get_agent"]
+__all__ = ["SOWAgent", "get_agent", "SOWSessions", "get_sessions"]
@@ -0,0 +1,353 @@
+"""
+SQLite checkpointer for agent runs.
+
+The agent graph saves a checkpoint after every step (planner turn or batch of
+tool calls), keyed by a thread ID. A run that fails part-way, for example on
+a Bedrock timeout during revision, is resumed from its last checkpoint with
+the same ID: completed planner turns and tool outputs are reused instead of
+starting over from the planner.
+
+Threads whose newest checkpoint is older than CHECKPOINT_TTL (runs that failed
+and were never resumed, idle editing sessions) are deleted when the database
+is opened and then at most hourly as checkpoints are saved.
+"""
+
+import logging
+import sqlite3
+import threading
+import time
+from collections.abc import AsyncIterator, Iterator, Sequence
+from pathlib import Path
+from typing import Any
+
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import (
+    WRITES_IDX_MAP,
+    BaseCheckpointSaver,
+    ChannelVersions,
+    Checkpoint,
+    CheckpointMetadata,
+    CheckpointTuple,
+    get_checkpoint_id,
+    get_checkpoint_metadata,
+)
+
+from src.agent.config import config
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS checkpoints (
+    thread_id TEXT NOT NULL,
+    checkpoint_ns TEXT NOT NULL DEFAULT '',
+    checkpoint_id TEXT NOT NULL,
+    parent_checkpoint_id TEXT,
+    type TEXT,
+    checkpoint BLOB,
+    metadata_type TEXT,
+    metadata BLOB,
+    created_at REAL,
+    PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id)
+);
+CREATE TABLE IF NOT EXISTS writes (
+    thread_id TEXT NOT NULL,
+    checkpoint_ns TEXT NOT NULL DEFAULT '',
+    checkpoint_id TEXT NOT NULL,
+    task_id TEXT NOT NULL,
+    idx INTEGER NOT NULL,
+    channel TEXT NOT NULL,
+    type TEXT,
+    value BLOB,
+    task_path TEXT NOT NULL DEFAULT '',
+    PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id, task_id, idx)
+);
+"""
+
+_COLUMNS = (
+    "thread_id, checkpoint_ns, checkpoint_id, parent_checkpoint_id, "
+    "type, checkpoint, metadata_type, metadata"
+)
+
+# Checkpoint rows read at a time while listing
+FETCH_BATCH = 16
+
+# Seconds between deletions of expired threads while checkpoints are saved
+EXPIRY_INTERVAL = 3600
+
+
+class SqliteCheckpointSaver(BaseCheckpointSaver[int]):
+    """LangGraph checkpoint saver backed by a local SQLite file."""
+
+    def __init__(self, path: str | Path = ":memory:", ttl_seconds: float = 0) -> None:
+        """
+        Open (and create if needed) the checkpoint database.
+
+        Args:
+            path: SQLite file, or ":memory:" for a private in-memory database
+            ttl_seconds: Delete threads with no checkpoint saved for this long (0 = keep)
+        """
+        super().__init__()
+        if str(path) != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        # One connection shared by the API's worker threads, serialised by the lock
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(_SCHEMA)
+            columns = {row[1] for row in self._conn.execute("PRAGMA table_info(checkpoints)")}
+            if "created_at" not in columns:
+                # Databases from before the TTL: their age counts from now
+                self._conn.execute("ALTER TABLE checkpoints ADD COLUMN created_at REAL")
+                self._conn.execute("UPDATE checkpoints SET created_at = ?", (time.time(),))
+
+        self.ttl_seconds = ttl_seconds
+        self._next_expiry = 0.0
+        self._delete_expired_if_due()
+
+    def _tuple(self, row: tuple) -> CheckpointTuple:
+        thread_id, ns, checkpoint_id, parent_id, type_, blob, metadata_type, metadata = row
+        with self._lock:
+            writes = self._conn.execute(
+                "SELECT task_id, channel, type, value FROM writes "
+                "WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id = ? "
+                "ORDER BY task_path, task_id, idx",
+                (thread_id, ns, checkpoint_id),
+            ).fetchall()
+
+        def config_for(cid: str) -> RunnableConfig:
+            return {
+                "configurable": {"thread_id": thread_id, "checkpoint_ns": ns, "checkpoint_id": cid}
+            }
+
+        return CheckpointTuple(
+            config=config_for(checkpoint_id),
+            checkpoint=self.serde.loads_typed((type_, blob)),
+            metadata=self.serde.loads_typed((metadata_type, metadata)),
+            parent_config=config_for(parent_id) if parent_id else None,
+            pending_writes=[
+                (task_id, channel, self.serde.loads_typed((value_type, value)))
+                for task_id, channel, value_type, value in writes
+            ],
+        )
+
+    def get_tuple(self, config: RunnableConfig) -> CheckpointTuple | None:
+        """Get a thread's checkpoint: the one in config, else the latest."""
+        return next(self.list(config, limit=1), None)
+
+    def list(
+        self,
+        config: RunnableConfig | None,
+        *,
+        filter: dict[str, Any] | None = None,
+        before: RunnableConfig | None = None,
+        limit: int | None = None,
+    ) -> Iterator[CheckpointTuple]:
+        """List checkpoints, newest first."""
+        clauses, params = [], []
+        if config:
+            clauses.append("thread_id = ?")
+            params.append(config["configurable"]["thread_id"])
+            checkpoint_ns = config["configurable"].get("checkpoint_ns")
+            if checkpoint_ns is not None:
+                clauses.append("checkpoint_ns = ?")
+                params.append(checkpoint_ns)
+            if checkpoint_id := get_checkpoint_id(config):
+                clauses.append("checkpoint_id = ?")
+                params.append(checkpoint_id)
+        if before and (before_id := get_checkpoint_id(before)):
+            clauses.append("checkpoint_id < ?")
+            params.append(before_id)
+
+        query = f"SELECT {_COLUMNS} FROM checkpoints"
+        if clauses:
+            query += " WHERE " + " AND ".join(clauses)
+        query += " ORDER BY checkpoint_id DESC"
+        if limit is not None and not filter:
+            # get_tuple reads one row, not the whole history of a long-lived thread
+            query += " LIMIT ?"
+            params.append(limit)
+
+        with self._lock:
+            cursor = self._conn.execute(query, params)
+        try:
+            while limit is None or limit > 0:
+                # Metadata filters are applied here, so rows are read a batch at a time
+                with self._lock:
+                    rows = cursor.fetchmany(FETCH_BATCH)
+                if not rows:
+                    return
+                for row in rows:
+                    checkpoint = self._tuple(row)
+                    if filter and any(checkpoint.metadata.get(k) != v for k, v in filter.items()):
+                        continue
+                    yield checkpoint
+                    if limit is not None:
+                        limit -= 1
+                        if limit <= 0:
+                            return
+        finally:
+            with self._lock:
+                cursor.close()
+
+    def put(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        """Save a checkpoint, channel values included."""
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        type_, blob = self.serde.dumps_typed(checkpoint)
+        metadata_type, metadata_blob = self.serde.dumps_typed(
+            get_checkpoint_metadata(config, metadata)
+        )
+        with self._lock, self._conn:
+            self._conn.execute(
+                f"INSERT OR REPLACE INTO checkpoints ({_COLUMNS}, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    thread_id,
+                    checkpoint_ns,
+                    checkpoint["id"],
+                    config["configurable"].get("checkpoint_id"),
+                    type_,
+                    blob,
+                    metadata_type,
+                    metadata_blob,
+                    time.time(),
+                ),
+            )
+        self._delete_expired_if_due()
+        return {
+            "configurable": {
+                "thread_id": thread_id,
+                "checkpoint_ns": checkpoint_ns,
+                "checkpoint_id": checkpoint["id"],
+            }
+        }
+
+    def put_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        """Save the writes of a task, so a resumed step does not redo finished tasks."""
+        configurable = config["configurable"]
+        # Special channels (errors, interrupts) replace earlier writes; others are kept
+        verb = "REPLACE" if all(c in WRITES_IDX_MAP for c, _ in writes) else "IGNORE"
+        rows = [
+            (
+                configurable["thread_id"],
+                configurable.get("checkpoint_ns", ""),
+                configurable["checkpoint_id"],
+                task_id,
+                WRITES_IDX_MAP.get(channel, idx),
+                channel,
+                *self.serde.dumps_typed(value),
+                task_path,
+            )
+            for idx, (channel, value) in enumerate(writes)
+        ]
+        with self._lock, self._conn:
+            self._conn.executemany(
+                f"INSERT OR {verb} INTO writes VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", rows
+            )
+
+    def delete_thread(self, thread_id: str) -> None:
+        """Delete a thread's checkpoints and writes."""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM checkpoints WHERE thread_id = ?", (thread_id,))
+            self._conn.execute("DELETE FROM writes WHERE thread_id = ?", (thread_id,))
+
+    def delete_expired(self, max_age_seconds: float) -> int:
+        """
+        Delete threads whose newest checkpoint is older than max_age_seconds.
+
+        Args:
+            max_age_seconds: Age after which a thread is deleted
+
+        Returns:
+            Number of threads deleted
+        """
+        cutoff = time.time() - max_age_seconds
+        with self._lock, self._conn:
+            threads = [
+                (thread_id,)
+                for (thread_id,) in self._conn.execute(
+                    "SELECT thread_id FROM checkpoints GROUP BY thread_id "
+                    "HAVING MAX(created_at) < ?",
+                    (cutoff,),
+                )
+            ]
+            self._conn.executemany("DELETE FROM checkpoints WHERE thread_id = ?", threads)
+            self._conn.executemany("DELETE FROM writes WHERE thread_id = ?", threads)
+        return len(threads)
+
+    def _delete_expired_if_due(self) -> None:
+        """Delete threads past the TTL, at most once per EXPIRY_INTERVAL."""
+        now = time.time()
+        if not self.ttl_seconds or now < self._next_expiry:
+            return
+        self._next_expiry = now + EXPIRY_INTERVAL
+        deleted = self.delete_expired(self.ttl_seconds)
+        if deleted:
+            logger.info(f"Deleted {deleted} expired checkpoint threads")
+
+    # SQLite calls are short and local, so the async API runs them inline
+
+    async def aget_tuple(self, config: RunnableConfig) -> CheckpointTuple | None:
+        return self.get_tuple(config)
+
+    async def alist(
+        self,
+        config: RunnableConfig | None,
+        *,
+        filter: dict[str, Any] | None = None,
+        before: RunnableConfig | None = None,
+        limit: int | None = None,
+    ) -> AsyncIterator[CheckpointTuple]:
+        for checkpoint in self.list(config, filter=filter, before=before, limit=limit):
+            yield checkpoint
+
+    async def aput(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        return self.put(config, checkpoint, metadata, new_versions)
+
+    async def aput_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        self.put_writes(config, writes, task_id, task_path)
+
+    async def adelete_thread(self, thread_id: str) -> None:
+        self.delete_thread(thread_id)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+_checkpointer: SqliteCheckpointSaver | None = None
+_checkpointer_lock = threading.Lock()
+
+
+def get_checkpointer() -> SqliteCheckpointSaver:
+    """Get the shared checkpointer (database at CHECKPOINT_DB)."""
+    global _checkpointer
+    with _checkpointer_lock:
+        if _checkpointer is None:
+            _checkpointer = SqliteCheckpointSaver(config.checkpoint_db, config.checkpoint_ttl)
+        return _checkpointer
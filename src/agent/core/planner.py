@@ -1,52 +1,96 @@
 """
 Planner/Orchestrator for the SOW Generator agent.
 
-Uses LangGraph to orchestrate tool execution and generate responses.
+Uses LangGraph to orchestrate tool execution and generate responses. Runs are
+checkpointed after every step, so a failed run can be resumed by its run ID
+from the last completed step instead of starting over.
 """
 
-from typing import Annotated, Any, Literal, TypedDict
+import logging
+import uuid
+from typing import Annotated, Any, Literal, NotRequired, TypedDict, cast
 
 from langchain_aws import ChatBedrock
 from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, SystemMessage
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import BaseCheckpointSaver
 from langgraph.graph import END, StateGraph
 from langgraph.graph.message import add_messages
 from langgraph.prebuilt import ToolNode
+from langgraph.types import Send
 
 from src.agent.config import config
+from src.agent.core.checkpoint import get_checkpointer
+from src.agent.model_router import (
+    CACHE_POINT,
+    ModelProfile,
+    apply_prompt_cache,
+    resolve_model,
+    track,
+)
 from src.agent.prompts import get_system_prompt
 from src.agent.tools import ALL_TOOLS
 
+logger = logging.getLogger(__name__)
+
 
 class AgentState(TypedDict):
     """State for the agent graph."""
 
     messages: Annotated[list[BaseMessage], add_messages]
+    quality_mode: NotRequired[str | None]
 
 
 class SOWAgent:
     """Main SOW Generator agent with LangGraph orchestration."""
 
-    def __init__(self) -> None:
-        """Initialize the agent with LLM and tools."""
-        # Initialize LLM
-        self.llm = ChatBedrock(
-            model=config.bedrock_model_id,
-            client=config.bedrock_runtime,
-            model_kwargs={
-                "temperature": config.temperature,
-                "max_tokens": config.max_tokens,
-            },
-        )
+    def __init__(self, checkpointer: BaseCheckpointSaver | None = None) -> None:
+        """
+        Initialize the agent with LLM and tools.
+
+        Args:
+            checkpointer: Where run checkpoints are saved (default: the CHECKPOINT_DB database)
+        """
+        # Initialize LLM (model routed for the planner task)
+        self.profile = resolve_model("planner")
+        self.llm = self._create_llm(self.profile)
 
         # Bind tools to LLM
         self.llm_with_tools = self.llm.bind_tools(ALL_TOOLS)
 
+        # Tool-bound LLMs per model profile, for quality modes routed elsewhere
+        self._llms_with_tools: dict[ModelProfile, Any] = {self.profile: self.llm_with_tools}
+
         # Load system prompt
         self.system_prompt = get_system_prompt("planner")
 
+        # Checkpoints of in-progress runs, for resuming after a failure
+        self.checkpointer = checkpointer or get_checkpointer()
+
         # Create graph
         self.graph = self._create_graph()
 
+    def _create_llm(self, profile: ModelProfile) -> ChatBedrock:
+        return ChatBedrock(
+            model=profile.model_id,
+            client=config.bedrock_runtime,
+            model_kwargs={
+                "temperature": profile.temperature,
+                "max_tokens": profile.max_tokens,
+            },
+            # Prompt-cache checkpoints are Converse content blocks; Nova models need Converse too
+            beta_use_converse_api=profile.uses_converse_api,
+        )
+
+    def _planner_llm(self, quality_mode: str | None) -> tuple[ModelProfile, Any]:
+        """Routed profile and tool-bound LLM for a quality mode."""
+        profile = resolve_model("planner", quality_mode)
+        llm = self._llms_with_tools.get(profile)
+        if llm is None:
+            llm = self._create_llm(profile).bind_tools(ALL_TOOLS)
+            self._llms_with_tools[profile] = llm
+        return profile, llm
+
     def _create_graph(self) -> Any:
         """Create the LangGraph state graph."""
         # Define the graph
@@ -59,20 +103,13 @@ class SOWAgent:
         # Set entry point
         workflow.set_entry_point("planner")
 
-        # Add conditional edges
-        workflow.add_conditional_edges(
-            "planner",
-            self._should_continue,
-            {
-                "continue": "tools",
-                "end": END,
-            },
-        )
+        # Add conditional edges (one "tools" task per tool call, see _route_tools)
+        workflow.add_conditional_edges("planner", self._route_tools, ["tools", END])
 
         # Add edge from tools back to planner
         workflow.add_edge("tools", "planner")
 
-        return workflow.compile()
+        return workflow.compile(checkpointer=self.checkpointer)
 
     def _planner_node(self, state: AgentState) -> AgentState:
         """
@@ -84,17 +121,50 @@ class SOWAgent:
         Returns:
             Updated state with planner's response
         """
-        messages = state["messages"]
-
-        # Add system prompt if this is the first message
-        if len(messages) == 1 and isinstance(messages[0], HumanMessage):
-            messages = [SystemMessage(content=self.system_prompt)] + messages
+        # The system prompt is not kept in the state; it leads every planner call.
+        # With the tool schemas ahead of it, it is the static prefix that later
+        # turns of a run read from the prompt cache.
+        system = SystemMessage(content=[{"type": "text", "text": self.system_prompt}, CACHE_POINT])
 
         # Invoke LLM
-        response = self.llm_with_tools.invoke(messages)
+        quality_mode = state.get("quality_mode")
+        profile, llm = self._planner_llm(quality_mode)
+        messages = apply_prompt_cache([system, *state["messages"]], profile)
+        with track("planner", quality_mode, profile) as call:
+            response = llm.invoke(messages)
+            call.usage(response)
 
         return {"messages": [response]}
 
+    def _route_tools(self, state: AgentState) -> list[Send] | str:
+        """
+        Send each tool call of the planner's response to the tools node as its own task.
+
+        Tasks are checkpointed separately, so when one tool call fails, the
+        calls that succeeded in the same step are not repeated on resume. Each
+        task's input is the state ToolNode reads: a message holding just that
+        call, and the quality mode injected into the content tools.
+
+        Args:
+            state: Current agent state
+
+        Returns:
+            One Send per tool call, or END when there are none
+        """
+        if self._should_continue(state) == "end":
+            return END
+        last_message = cast(AIMessage, state["messages"][-1])
+        return [
+            Send(
+                "tools",
+                {
+                    "messages": [AIMessage(content="", tool_calls=[tool_call])],
+                    "quality_mode": state.get("quality_mode"),
+                },
+            )
+            for tool_call in last_message.tool_calls
+        ]
+
     def _should_continue(self, state: AgentState) -> Literal["continue", "end"]:
         """
         Determine if the agent should continue or end.
@@ -114,57 +184,90 @@ class SOWAgent:
         # Otherwise, end
         return "end"
 
-    def run(self, user_request: str) -> str:
+    def _start(
+        self, user_request: str, quality_mode: str | None, run_id: str | None
+    ) -> tuple[dict | None, RunnableConfig]:
         """
-        Run the agent with a user request.
+        Graph input and config for a run.
 
-        Args:
-            user_request: User's request string
-
-        Returns:
-            Agent's final response
+        A run ID whose last run stopped part-way is resumed from its latest
+        checkpoint (input None); otherwise a new run starts from the request.
         """
-        # Create initial state
-        initial_state = {"messages": [HumanMessage(content=user_request)]}
-
-        # Run the graph
-        final_state = self.graph.invoke(initial_state)
-
-        # Extract final response
+        run_config: RunnableConfig = {"configurable": {"thread_id": run_id or uuid.uuid4().hex}}
+        if run_id and self.graph.get_state(run_config).next:
+            logger.info(f"Resuming agent run {run_id} from its last checkpoint")
+            return None, run_config
+
+        initial_state = {
+            "messages": [HumanMessage(content=user_request)],
+            "quality_mode": quality_mode,
+        }
+        return initial_state, run_config
+
+    @staticmethod
+    def _final_response(final_state: dict) -> str:
         final_message = final_state["messages"][-1]
 
         if isinstance(final_message, AIMessage):
-            from typing import cast
-
             return cast(str, final_message.content)
 
         return str(final_message)
 
-    async def arun(self, user_request: str) -> str:
+    def run(
+        self, user_request: str, quality_mode: str | None = None, run_id: str | None = None
+    ) -> str:
         """
-        Run the agent asynchronously.
+        Run the agent with a user request.
 
         Args:
             user_request: User's request string
+            quality_mode: "quick" or "production", used to route the planner model
+            run_id: ID to checkpoint the run under. Calling again with the ID of
+                a run that failed resumes it from its last completed step.
 
         Returns:
             Agent's final response
         """
-        # Create initial state
-        initial_state = {"messages": [HumanMessage(content=user_request)]}
-
-        # Run the graph asynchronously
-        final_state = await self.graph.ainvoke(initial_state)
-
-        # Extract final response
-        final_message = final_state["messages"][-1]
-
-        if isinstance(final_message, AIMessage):
-            from typing import cast
+        inputs, run_config = self._start(user_request, quality_mode, run_id)
+        thread_id = run_config["configurable"]["thread_id"]
+
+        try:
+            final_state = self.graph.invoke(inputs, run_config)
+        except Exception:
+            # Keep the checkpoints only if the caller can resume the run
+            if run_id is None:
+                self.checkpointer.delete_thread(thread_id)
+            raise
+
+        self.checkpointer.delete_thread(thread_id)
+        return self._final_response(final_state)
+
+    async def arun(
+        self, user_request: str, quality_mode: str | None = None, run_id: str | None = None
+    ) -> str:
+        """
+        Run the agent asynchronously.
 
-            return cast(str, final_message.content)
+        Args:
+            user_request: User's request string
+            quality_mode: "quick" or "production", used to route the planner model
+            run_id: ID to checkpoint the run under (see run)
 
-        return str(final_message)
+        Returns:
+            Agent's final response
+        """
+        inputs, run_config = self._start(user_request, quality_mode, run_id)
+        thread_id = run_config["configurable"]["thread_id"]
+
+        try:
+            final_state = await self.graph.ainvoke(inputs, run_config)
+        except Exception:
+            if run_id is None:
+                await self.checkpointer.adelete_thread(thread_id)
+            raise
+
+        await self.checkpointer.adelete_thread(thread_id)
+        return self._final_response(final_state)
 
 
 # Singleton instance
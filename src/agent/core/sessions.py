@@ -0,0 +1,313 @@
+"""
+Multi-turn SOW editing sessions.
+
+A session holds one SOW document and its edit history as LangGraph state,
+checkpointed under the session ID, so it survives API restarts. A follow-up
+instruction such as "shorten the timeline section" is matched to the section
+it refers to, and only that section is sent to revise_section: one LLM call
+on a few hundred tokens instead of regenerating the whole document. Edits to
+one session run one at a time, each on the document the previous one left.
+"""
+
+import logging
+import operator
+import re
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Annotated, Any, NotRequired, TypedDict
+
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import BaseCheckpointSaver
+from langgraph.graph import END, StateGraph
+
+from src.agent.core.checkpoint import get_checkpointer
+from src.agent.tools.content import revise_section
+
+logger = logging.getLogger(__name__)
+
+_HEADING = re.compile(r"^(#{1,6})\s+(.+?)\s*#*\s*$")
+_WORD = re.compile(r"[a-z0-9]+")
+
+# Words that say how to edit rather than which section to edit
+_STOPWORDS = frozenset(
+    "a an and are as be by can for from in into is it its make more less of on or our "
+    "please section sections the this that to with your we us".split()
+)
+
+
+class SessionNotFoundError(Exception):
+    """No session with the given ID."""
+
+
+class SectionNotFoundError(LookupError):
+    """No section of the SOW matches an edit."""
+
+
+class SessionState(TypedDict):
+    """State of an editing session."""
+
+    sow_text: str
+    client_id: NotRequired[str | None]
+    product: NotRequired[str | None]
+    edits: Annotated[list[dict], operator.add]
+    # Pending edit, cleared once applied
+    instruction: NotRequired[str | None]
+    section_start: NotRequired[int | None]  # heading line of the section to revise
+
+
+@dataclass(frozen=True)
+class Section:
+    """A markdown heading and everything up to the next heading of the same or higher level."""
+
+    title: str
+    level: int
+    start: int  # line index of the heading
+    end: int  # line index after the section
+
+    def text(self, lines: list[str]) -> str:
+        return "\n".join(lines[self.start : self.end])
+
+
+def split_sections(sow_text: str) -> list[Section]:
+    """
+    Find the heading sections of a markdown SOW.
+
+    Args:
+        sow_text: SOW content
+
+    Returns:
+        Sections in document order; nested sections are included in their parent's span
+    """
+    lines = sow_text.splitlines()
+    headings = []
+    in_fence = False
+    for i, line in enumerate(lines):
+        if line.lstrip().startswith("```"):
+            in_fence = not in_fence
+        match = None if in_fence else _HEADING.match(line)
+        if match:
+            headings.append((i, len(match[1]), match[2]))
+
+    sections = []
+    for n, (start, level, title) in enumerate(headings):
+        end = next((i for i, lvl, _ in headings[n + 1 :] if lvl <= level), len(lines))
+        sections.append(Section(title=title, level=level, start=start, end=end))
+    return sections
+
+
+def _words(text: str) -> set[str]:
+    # Crude stemming: "price", "pricing" and "prices" all become "pric"
+    return {w[:4] for w in _WORD.findall(text.lower()) if w not in _STOPWORDS}
+
+
+def find_section(sow_text: str, instruction: str, title: str | None = None) -> Section:
+    """
+    Pick the section an edit instruction refers to.
+
+    Sections are ranked by the instruction words found in their title, then in
+    their text; ties go to the shortest section.
+
+    Args:
+        sow_text: SOW content
+        instruction: Edit instruction, e.g. "shorten the timeline section"
+        title: Section title to edit, overriding the instruction (case-insensitive)
+
+    Returns:
+        Section to revise
+
+    Raises:
+        SectionNotFoundError: If no section matches
+    """
+    sections = split_sections(sow_text)
+    if title is not None:
+        for section in sections:
+            if section.title.strip().lower() == title.strip().lower():
+                return section
+        raise SectionNotFoundError(f"No section titled '{title}'")
+
+    wanted = _words(instruction)
+    lines = sow_text.splitlines()
+
+    def rank(section: Section) -> tuple[int, int, int]:
+        in_title = len(wanted & _words(section.title))
+        in_text = len(wanted & _words(section.text(lines)))
+        return in_title, in_text, -(section.end - section.start)
+
+    best = max(sections, key=rank, default=None)
+    if best is None or rank(best)[:2] == (0, 0):
+        raise SectionNotFoundError(f"No section matches the instruction '{instruction}'")
+    return best
+
+
+def replace_section(sow_text: str, section: Section, revised: str) -> str:
+    """Put a revised section back in place, keeping its heading if the model dropped it."""
+    lines = sow_text.splitlines()
+    revised_lines = revised.strip("\n").splitlines()
+    if not revised_lines or not _HEADING.match(revised_lines[0]):
+        revised_lines = [lines[section.start], ""] + revised_lines
+
+    after = lines[section.end :]
+    if after:
+        revised_lines.append("")
+    text = "\n".join(lines[: section.start] + revised_lines + after)
+    return text + "\n" if sow_text.endswith("\n") else text
+
+
+class SOWSessions:
+    """Editing sessions over a checkpointed single-step graph."""
+
+    def __init__(self, checkpointer: BaseCheckpointSaver | None = None) -> None:
+        """
+        Initialize the session graph.
+
+        Args:
+            checkpointer: Where session state is saved (default: the CHECKPOINT_DB database)
+        """
+        self.checkpointer = checkpointer or get_checkpointer()
+        self.graph = self._create_graph()
+        # Per-session locks and how many callers use each; dropped when unused
+        self._locks: dict[str, tuple[threading.Lock, int]] = {}
+        self._locks_lock = threading.Lock()
+
+    def _create_graph(self) -> Any:
+        workflow = StateGraph(SessionState)
+        workflow.add_node("revise", self._revise_node)
+        workflow.set_conditional_entry_point(
+            lambda state: "revise" if state.get("instruction") else END, ["revise", END]
+        )
+        workflow.add_edge("revise", END)
+        return workflow.compile(checkpointer=self.checkpointer)
+
+    def _revise_node(self, state: SessionState) -> dict:
+        """Revise the one section the pending instruction is about."""
+        instruction = state["instruction"] or ""
+        # The section edit() resolved, by position: titles need not be unique
+        start = state.get("section_start")
+        sections = [s for s in split_sections(state["sow_text"]) if s.start == start]
+        section = sections[0] if sections else find_section(state["sow_text"], instruction)
+        lines = state["sow_text"].splitlines()
+
+        revised = revise_section.invoke({"section": section.text(lines), "feedback": instruction})
+        if revised.startswith("Error:"):
+            raise RuntimeError(revised)
+
+        return {
+            "sow_text": replace_section(state["sow_text"], section, revised),
+            "edits": [{"instruction": instruction, "section": section.title}],
+            "instruction": None,
+            "section_start": None,
+        }
+
+    @staticmethod
+    def _config(session_id: str) -> RunnableConfig:
+        return {"configurable": {"thread_id": f"session:{session_id}"}}
+
+    @contextmanager
+    def _locked(self, session_id: str) -> Iterator[None]:
+        """
+        Serialise the changes to one session.
+
+        A lock only exists while some caller holds or waits for it, so sessions
+        that expire (see CHECKPOINT_TTL) leave nothing behind.
+        """
+        with self._locks_lock:
+            lock, users = self._locks.get(session_id, (threading.Lock(), 0))
+            self._locks[session_id] = (lock, users + 1)
+        try:
+            with lock:
+                yield
+        finally:
+            with self._locks_lock:
+                lock, users = self._locks[session_id]
+                if users == 1:
+                    del self._locks[session_id]
+                else:
+                    self._locks[session_id] = (lock, users - 1)
+
+    def start(
+        self,
+        session_id: str,
+        sow_text: str,
+        client_id: str | None = None,
+        product: str | None = None,
+    ) -> dict:
+        """
+        Start (or restart) a session on a SOW.
+
+        Args:
+            session_id: Session ID
+            sow_text: SOW content to edit
+            client_id: Client the SOW is for
+            product: Product the SOW is for
+
+        Returns:
+            Session state
+        """
+        with self._locked(session_id):
+            self.checkpointer.delete_thread(self._config(session_id)["configurable"]["thread_id"])
+            return self.graph.invoke(
+                {
+                    "sow_text": sow_text,
+                    "client_id": client_id,
+                    "product": product,
+                    "edits": [],
+                    "instruction": None,
+                    "section_start": None,
+                },
+                self._config(session_id),
+            )
+
+    def get(self, session_id: str) -> dict | None:
+        """Current state of a session, or None if it does not exist."""
+        values = self.graph.get_state(self._config(session_id)).values
+        return dict(values) if values else None
+
+    def edit(self, session_id: str, instruction: str, section: str | None = None) -> dict:
+        """
+        Apply a follow-up instruction to the section it refers to.
+
+        Concurrent edits of the same session wait for each other, so none is lost.
+
+        Args:
+            session_id: Session ID
+            instruction: What to change, e.g. "shorten the timeline section"
+            section: Title of the section to edit, if the instruction does not name it
+
+        Returns:
+            Session state after the edit
+
+        Raises:
+            SessionNotFoundError: If the session does not exist
+            SectionNotFoundError: If no section matches the instruction
+        """
+        with self._locked(session_id):
+            state = self.get(session_id)
+            if state is None:
+                raise SessionNotFoundError(session_id)
+
+            # Resolve the section before running, so a bad instruction leaves no pending step
+            target = find_section(state["sow_text"], instruction, section)
+            logger.info(f"Session {session_id}: revising section '{target.title}'")
+            return self.graph.invoke(
+                {"instruction": instruction, "section_start": target.start},
+                self._config(session_id),
+            )
+
+    def delete(self, session_id: str) -> None:
+        """Delete a session and its history."""
+        with self._locked(session_id):
+            self.checkpointer.delete_thread(self._config(session_id)["configurable"]["thread_id"])
+
+
+# Singleton instance
+_sessions_instance = None
+
+
+def get_sessions() -> SOWSessions:
+    """Get or create the editing sessions singleton instance."""
+    global _sessions_instance
+    if _sessions_instance is None:
+        _sessions_instance = SOWSessions()
+    return _sessions_instance
@@ -0,0 +1,432 @@
+"""
+Model routing by task and quality mode.
+
+model_routes.yaml maps each task (planner, draft, critique, revision, section,
+summary) and quality mode to a model profile: Bedrock model ID, max tokens and
+temperature. Quick mode and auxiliary steps such as critiques and summaries
+can then run on a faster model than the flagship used for final drafts.
+
+Every routed call is recorded with its latency and token usage, giving
+per-route latency percentiles and estimated cost.
+
+Prompts mark the end of their static prefix (instructions, templates) with a
+Bedrock prompt-cache checkpoint. For profiles whose model supports prompt
+caching the checkpoint is sent, and repeat calls read the prefix from the
+cache at a fraction of the input price; for other models it is removed.
+"""
+
+import os
+import threading
+import time
+from collections import deque
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+import yaml
+
+from src.agent.config import config
+
+ROUTES_FILE = Path(__file__).parent / "model_routes.yaml"
+
+# Latencies kept per route for percentiles
+_LATENCY_WINDOW = 512
+
+# Bedrock prompt-cache checkpoint, a Converse content block
+CACHE_POINT = {"cachePoint": {"type": "default"}}
+
+# Models with Bedrock prompt caching, matched anywhere in the model ID so that
+# inference profiles such as apac.amazon.nova-pro-v1:0 match too
+PROMPT_CACHE_MODELS = (
+    "amazon.nova-micro",
+    "amazon.nova-lite",
+    "amazon.nova-pro",
+    "amazon.nova-premier",
+    "anthropic.claude-3-5-haiku",
+    "anthropic.claude-3-7-sonnet",
+    "anthropic.claude-sonnet-4",
+    "anthropic.claude-opus-4",
+    "anthropic.claude-haiku-4-5",
+)
+
+
+def supports_prompt_cache(model_id: str) -> bool:
+    """Whether Bedrock prompt caching is available for a model."""
+    return any(model in model_id for model in PROMPT_CACHE_MODELS)
+
+
+@dataclass(frozen=True)
+class ModelProfile:
+    """Bedrock model and generation settings for a route."""
+
+    name: str
+    model_id: str
+    max_tokens: int
+    temperature: float
+    input_cost_per_1k: float = 0.0
+    output_cost_per_1k: float = 0.0
+    prompt_cache: bool = False
+    cache_read_cost_per_1k: float = 0.0
+    cache_write_cost_per_1k: float = 0.0
+
+    @property
+    def uses_prompt_cache(self) -> bool:
+        """Whether calls on this profile send prompt-cache checkpoints."""
+        return self.prompt_cache and config.prompt_cache_enabled
+
+    @property
+    def uses_converse_api(self) -> bool:
+        """Whether ChatBedrock calls this profile through Converse (prompt caching, Nova)."""
+        return self.uses_prompt_cache or "amazon.nova" in self.model_id
+
+    def cost(
+        self,
+        input_tokens: int,
+        output_tokens: int,
+        cache_read_tokens: int = 0,
+        cache_write_tokens: int = 0,
+    ) -> float:
+        """Estimated cost in USD of one call (input_tokens excludes cached tokens)."""
+        return (
+            input_tokens * self.input_cost_per_1k
+            + output_tokens * self.output_cost_per_1k
+            + cache_read_tokens * self.cache_read_cost_per_1k
+            + cache_write_tokens * self.cache_write_cost_per_1k
+        ) / 1000
+
+
+def _model_id(value: str | None) -> str:
+    """A profile's model ID; "$NAME" reads environment variable NAME, else BEDROCK_MODEL_ID."""
+    if value and value.startswith("$"):
+        value = os.getenv(value[1:])
+    return value or config.bedrock_model_id
+
+
+def _profile(name: str, settings: dict) -> ModelProfile:
+    """Profile from its model_routes.yaml settings, with config defaults."""
+    model_id = _model_id(settings.get("model_id"))
+    input_cost = float(settings.get("input_cost_per_1k", 0.0))
+    return ModelProfile(
+        name=name,
+        model_id=model_id,
+        max_tokens=int(settings.get("max_tokens") or config.max_tokens),
+        temperature=float(settings.get("temperature", config.temperature)),
+        input_cost_per_1k=input_cost,
+        output_cost_per_1k=float(settings.get("output_cost_per_1k", 0.0)),
+        prompt_cache=bool(settings.get("prompt_cache", supports_prompt_cache(model_id))),
+        # Cached tokens are billed as input unless the profile prices them
+        cache_read_cost_per_1k=float(settings.get("cache_read_cost_per_1k", input_cost)),
+        cache_write_cost_per_1k=float(settings.get("cache_write_cost_per_1k", input_cost)),
+    )
+
+
+def apply_prompt_cache(messages: list[Any], profile: ModelProfile) -> list[Any]:
+    """
+    Keep or drop the prompt-cache checkpoints of a prompt for a profile.
+
+    Messages mark their static prefix as content blocks ending in CACHE_POINT.
+    If the profile does not use prompt caching, such content is turned back
+    into plain text.
+
+    Args:
+        messages: LangChain messages
+        profile: Profile the messages are sent to
+
+    Returns:
+        Messages to send
+    """
+    if profile.uses_prompt_cache:
+        return messages
+    return [
+        (
+            message.model_copy(update={"content": _plain_text(message.content)})
+            if isinstance(message.content, list)
+            else message
+        )
+        for message in messages
+    ]
+
+
+def _plain_text(content: list) -> str:
+    return "".join(
+        block if isinstance(block, str) else block.get("text", "")
+        for block in content
+        if block != CACHE_POINT
+    )
+
+
+class ModelRouter:
+    """Parsed model routes."""
+
+    def __init__(self, data: dict, version: tuple[int, int] = (0, 0)) -> None:
+        """
+        Build profiles and routes.
+
+        Args:
+            data: Parsed model_routes.yaml
+            version: (mtime_ns, size) of the file the data came from
+
+        Raises:
+            ValueError: If a route names a profile that is not defined
+        """
+        self.version = version
+        self.profiles = {
+            name: _profile(name, settings)
+            for name, settings in (data.get("profiles") or {}).items()
+        }
+        self.default_profile = data.get("default_profile") or "default"
+        if self.default_profile not in self.profiles:
+            self.profiles[self.default_profile] = _profile(self.default_profile, {})
+
+        self.routes: dict[str, dict[str, str]] = {}
+        for task, modes in (data.get("routes") or {}).items():
+            modes = {"default": modes} if isinstance(modes, str) else dict(modes)
+            for mode, profile in modes.items():
+                if profile not in self.profiles:
+                    raise ValueError(f"Route {task}/{mode} uses unknown model profile '{profile}'")
+            self.routes[task] = modes
+
+    def resolve(self, task: str, quality_mode: str | None = None) -> ModelProfile:
+        """
+        Get the model profile for a task.
+
+        Falls back to the task's "default" route, then to the default profile.
+
+        Args:
+            task: Task name, e.g. "draft" or "critique"
+            quality_mode: "quick", "production" or None
+
+        Returns:
+            Model profile to call
+        """
+        modes = self.routes.get(task, {})
+        name = modes.get(quality_mode or "default") or modes.get("default")
+        return self.profiles[name or self.default_profile]
+
+
+@dataclass
+class _RouteCounters:
+    calls: int = 0
+    errors: int = 0
+    input_tokens: int = 0
+    output_tokens: int = 0
+    cache_read_tokens: int = 0
+    cache_write_tokens: int = 0
+    cost_usd: float = 0.0
+    latencies: deque = field(default_factory=lambda: deque(maxlen=_LATENCY_WINDOW))
+
+
+class RouteStats:
+    """Latency, token and cost counters per (task, quality mode, profile)."""
+
+    def __init__(self) -> None:
+        self._routes: dict[tuple[str, str, str, str], _RouteCounters] = {}
+        self._lock = threading.Lock()
+
+    def record(
+        self,
+        task: str,
+        quality_mode: str | None,
+        profile: ModelProfile,
+        latency: float,
+        input_tokens: int = 0,
+        output_tokens: int = 0,
+        error: bool = False,
+        cache_read_tokens: int = 0,
+        cache_write_tokens: int = 0,
+    ) -> None:
+        """
+        Record one routed call.
+
+        Args:
+            task: Task name
+            quality_mode: Quality mode of the call, if any
+            profile: Profile the call used
+            latency: Call duration in seconds
+            input_tokens: Prompt tokens reported by Bedrock, excluding cached tokens
+            output_tokens: Completion tokens reported by Bedrock
+            error: Whether the call failed
+            cache_read_tokens: Prompt tokens read from the prompt cache
+            cache_write_tokens: Prompt tokens written to the prompt cache
+        """
+        key = (task, quality_mode or "default", profile.name, profile.model_id)
+        with self._lock:
+            counters = self._routes.setdefault(key, _RouteCounters())
+            counters.calls += 1
+            counters.errors += error
+            counters.input_tokens += input_tokens
+            counters.output_tokens += output_tokens
+            counters.cache_read_tokens += cache_read_tokens
+            counters.cache_write_tokens += cache_write_tokens
+            counters.cost_usd += profile.cost(
+                input_tokens, output_tokens, cache_read_tokens, cache_write_tokens
+            )
+            counters.latencies.append(latency)
+
+    def snapshot(self) -> list[dict]:
+        """One entry per route with call counts, latency percentiles and cost."""
+        with self._lock:
+            items = [
+                (key, counters, sorted(counters.latencies))
+                for key, counters in self._routes.items()
+            ]
+
+        routes = []
+        for (task, mode, profile, model_id), counters, latencies in sorted(items):
+            routes.append(
+                {
+                    "task": task,
+                    "quality_mode": mode,
+                    "profile": profile,
+                    "model_id": model_id,
+                    "calls": counters.calls,
+                    "errors": counters.errors,
+                    "latency_p50_ms": _percentile_ms(latencies, 0.5),
+                    "latency_p95_ms": _percentile_ms(latencies, 0.95),
+                    "input_tokens": counters.input_tokens,
+                    "output_tokens": counters.output_tokens,
+                    "cache_read_tokens": counters.cache_read_tokens,
+                    "cache_write_tokens": counters.cache_write_tokens,
+                    "cost_usd": round(counters.cost_usd, 6),
+                }
+            )
+        return routes
+
+    def reset(self) -> None:
+        with self._lock:
+            self._routes.clear()
+
+
+def _percentile_ms(latencies: list[float], q: float) -> float | None:
+    if not latencies:
+        return None
+    return round(latencies[min(len(latencies) - 1, int(q * len(latencies)))] * 1000, 1)
+
+
+class RouteCall:
+    """Token usage collector for a call being tracked."""
+
+    def __init__(self) -> None:
+        self.input_tokens = 0
+        self.output_tokens = 0
+        self.cache_read_tokens = 0
+        self.cache_write_tokens = 0
+        self.truncated = False  # stopped at max_tokens
+
+    def usage(self, response: Any) -> None:
+        """
+        Take token usage (and whether the reply was cut off) from a LangChain
+        message or a Converse response.
+
+        input_tokens is set to the prompt tokens that were not read from or
+        written to the prompt cache.
+
+        Args:
+            response: AIMessage (usage_metadata) or Converse response dict (usage)
+        """
+        if isinstance(response, dict):
+            usage = response.get("usage") or {}
+            self.input_tokens = int(usage.get("inputTokens", 0))
+            self.output_tokens = int(usage.get("outputTokens", 0))
+            self.cache_read_tokens = int(usage.get("cacheReadInputTokens") or 0)
+            self.cache_write_tokens = int(usage.get("cacheWriteInputTokens") or 0)
+            self.truncated = response.get("stopReason") == "max_tokens"
+            return
+        # Converse reports stopReason, InvokeModel stop_reason ("length" on some providers)
+        response_metadata = getattr(response, "response_metadata", None) or {}
+        stop_reason = response_metadata.get("stopReason") or response_metadata.get("stop_reason")
+        self.truncated = stop_reason in ("max_tokens", "length")
+        metadata = getattr(response, "usage_metadata", None)
+        if isinstance(metadata, dict):
+            # LangChain counts cached tokens in input_tokens
+            details = metadata.get("input_token_details") or {}
+            self.cache_read_tokens = int(details.get("cache_read") or 0)
+            self.cache_write_tokens = int(details.get("cache_creation") or 0)
+            self.input_tokens = (
+                int(metadata.get("input_tokens", 0))
+                - self.cache_read_tokens
+                - self.cache_write_tokens
+            )
+            self.output_tokens = int(metadata.get("output_tokens", 0))
+
+
+# Global stats, kept across reloads of the routes file
+route_stats = RouteStats()
+
+
+@contextmanager
+def track(task: str, quality_mode: str | None, profile: ModelProfile) -> Iterator[RouteCall]:
+    """
+    Time a routed call and record it in route_stats.
+
+    Usage:
+        with track("critique", mode, profile) as call:
+            response = llm.invoke(messages)
+            call.usage(response)
+    """
+    call = RouteCall()
+    start = time.perf_counter()
+    error = False
+    try:
+        yield call
+    except Exception:
+        error = True
+        raise
+    finally:
+        route_stats.record(
+            task,
+            quality_mode,
+            profile,
+            time.perf_counter() - start,
+            call.input_tokens,
+            call.output_tokens,
+            error=error,
+            cache_read_tokens=call.cache_read_tokens,
+            cache_write_tokens=call.cache_write_tokens,
+        )
+
+
+_router: ModelRouter | None = None
+_router_lock = threading.Lock()
+
+
+def routes_file() -> Path:
+    """Routes file in use (MODEL_ROUTES_FILE, else the bundled model_routes.yaml)."""
+    return Path(config.model_routes_file or ROUTES_FILE)
+
+
+def load_model_router() -> ModelRouter:
+    """
+    Get the model router, reloading the routes file only when it has changed.
+
+    Returns:
+        Router (every task on the default model if the file does not exist)
+    """
+    global _router
+
+    path = routes_file()
+    try:
+        stat = path.stat()
+        version = (stat.st_mtime_ns, stat.st_size)
+    except OSError:
+        version = (0, 0)
+
+    router = _router
+    if router is not None and router.version == version:
+        return router
+
+    with _router_lock:
+        if _router is None or _router.version != version:
+            data: dict[str, Any] = {}
+            if version != (0, 0):
+                with open(path) as f:
+                    data = yaml.safe_load(f) or {}
+            _router = ModelRouter(data, version)
+        return _router
+
+
+def resolve_model(task: str, quality_mode: str | None = None) -> ModelProfile:
+    """Model profile for a task and quality mode (see ModelRouter.resolve)."""
+    return load_model_router().resolve(task, quality_mode)
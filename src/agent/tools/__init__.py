@@ -1,49 +1,47 @@
-"""Tool module initialization - exports all tools."""
+"""Tool module initialization - exports all tools.
 
-from src.agent.tools.compliance import (
-    check_mandatory_clauses_v2,
-    check_prohibited_terms,
-    check_sla_requirements,
-    generate_compliance_report,
-)
-from src.agent.tools.content import (
-    generate_section,
-    generate_sow_draft,
-    generate_sow_draft_with_reflection,
-    generate_summary,
-    revise_section,
-)
-from src.agent.tools.context import assemble_client_brief, assemble_context
-from src.agent.tools.research import (
-    search_compliance_kb,
-    search_crm,
-    search_historical_sows,
-    search_opportunities,
-    search_product_kb,
-)
+Tools are imported on first access (``ALL_TOOLS`` or a tool name), so API
+routes importing one tool module do not pay for the others (content tools
+load langchain_aws).
+"""
 
-# All available tools for the agent
-ALL_TOOLS = [
+import importlib
+from typing import Any
+
+# Tool name -> module defining it, in the order they are offered to the agent
+_TOOL_MODULES = {
     # Research tools
-    search_crm,
-    search_opportunities,
-    search_historical_sows,
-    search_product_kb,
-    search_compliance_kb,
+    "search_crm": "research",
+    "search_opportunities": "research",
+    "search_historical_sows": "research",
+    "search_product_kb": "research",
+    "search_compliance_kb": "research",
     # Context tools
-    assemble_context,
-    assemble_client_brief,
+    "assemble_context": "context",
+    "assemble_client_brief": "context",
     # Content tools
-    generate_sow_draft,
-    generate_sow_draft_with_reflection,
-    generate_section,
-    revise_section,
-    generate_summary,
+    "generate_sow_draft": "content",
+    "generate_sow_draft_with_reflection": "content",
+    "generate_section": "content",
+    "revise_section": "content",
+    "generate_summary": "content",
     # Compliance tools
-    check_mandatory_clauses_v2,
-    check_prohibited_terms,
-    check_sla_requirements,
-    generate_compliance_report,
-]
+    "check_mandatory_clauses_v2": "compliance",
+    "check_prohibited_terms": "compliance",
+    "check_sla_requirements": "compliance",
+    "generate_compliance_report": "compliance",
+}
 
 __all__ = ["ALL_TOOLS"]
+
+
+def __getattr__(name: str) -> Any:
+    if name == "ALL_TOOLS":
+        # All available tools for the agent
+        tools = [__getattr__(tool_name) for tool_name in _TOOL_MODULES]
+        globals()["ALL_TOOLS"] = tools
+        return tools
+    if name in _TOOL_MODULES:
+        module = importlib.import_module(f"{__name__}.{_TOOL_MODULES[name]}")
+        return getattr(module, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -4,16 +4,179 @@ Compliance validation tools for the SOW Generator agent.
 Validates SOWs against mandatory clauses, prohibited terms, and SLA requirements.
 """
 
-import json
 import re
+from collections import Counter, defaultdict
+from dataclasses import asdict, dataclass
+from difflib import SequenceMatcher, get_close_matches
 from pathlib import Path
 from typing import Annotated, Any
 
 from langchain_core.tools import tool
 
+from src.agent.config import config
+from src.agent.tools.compliance_rules import load_compliance_rules
+from src.agent.tools.sla_validator import compile_sla_validator, extract_commitments
+
 # Data directory
 DATA_DIR = Path(__file__).parent.parent.parent.parent / "data"
 
+_HEADING = re.compile(r"^#{1,6}\s+(.+?)\s*#*\s*$")
+_SENTENCE_END = re.compile(r"(?<=[.!?;])\s+")
+_WORD = re.compile(r"[a-z0-9]+")
+_STOPWORDS = frozenset(
+    {"a", "an", "and", "as", "at", "by", "for", "in", "of", "on", "or", "the", "to", "with"}
+)
+# Tokens are cut to a fixed prefix so "termination"/"terminate" or
+# "services"/"service" compare equal without a stemmer dependency
+_STEM_LENGTH = 7
+
+
+def _stems(text: str) -> list[str]:
+    """Normalize text into lowercase, stopword-free prefix stems."""
+    words = _WORD.findall(text.lower())
+    stems = [w[:_STEM_LENGTH] for w in words if w not in _STOPWORDS]
+    return stems or [w[:_STEM_LENGTH] for w in words]
+
+
+@dataclass(frozen=True)
+class ClauseMatch:
+    """Best location found for a clause."""
+
+    clause: str
+    section: str
+    score: float
+    method: str  # "heading" or "tokens"
+
+
+class ClauseDetector:
+    """
+    Finds mandatory clauses in a SOW by section.
+
+    The SOW is indexed once: every heading and sentence becomes a unit with a
+    set of normalized stems, and an inverted index maps each stem to the units
+    containing it. A clause is then scored against only the units sharing its
+    stems, so checking hundreds of clauses stays linear in document size.
+
+    A clause matches when a single unit contains at least ``token_threshold``
+    of its stems (stems absent from the SOW fall back to close spellings), or
+    when a section heading is at least ``fuzzy_threshold`` similar to it.
+    """
+
+    def __init__(
+        self,
+        sow_text: str,
+        token_threshold: float | None = None,
+        fuzzy_threshold: float | None = None,
+    ) -> None:
+        self.token_threshold = (
+            config.clause_token_threshold if token_threshold is None else token_threshold
+        )
+        self.fuzzy_threshold = (
+            config.clause_fuzzy_threshold if fuzzy_threshold is None else fuzzy_threshold
+        )
+        self.sections: list[str] = []
+        self.headings: list[tuple[int, str]] = []  # (section, normalized heading)
+        self.unit_sections: list[int] = []
+        self.postings: dict[str, list[int]] = defaultdict(list)
+        self._vocabulary_by_initial: dict[str, list[str]] = defaultdict(list)
+        self._resolved: dict[str, list[str]] = {}
+        self._index(sow_text)
+
+    def _index(self, sow_text: str) -> None:
+        self.sections.append("Preamble")
+        in_fence = False
+
+        for line in sow_text.splitlines():
+            if line.lstrip().startswith("```"):
+                in_fence = not in_fence
+                continue
+            match = None if in_fence else _HEADING.match(line)
+            if match:
+                self.sections.append(match[1])
+                self.headings.append((len(self.sections) - 1, " ".join(_stems(match[1]))))
+                self._add_unit(match[1])
+            else:
+                for sentence in _SENTENCE_END.split(line):
+                    self._add_unit(sentence)
+
+        for stem in self.postings:
+            self._vocabulary_by_initial[stem[0]].append(stem)
+
+    def _add_unit(self, text: str) -> None:
+        stems = set(_WORD.findall(text.lower()))
+        if not stems:
+            return
+        unit = len(self.unit_sections)
+        self.unit_sections.append(len(self.sections) - 1)
+        for stem in {w[:_STEM_LENGTH] for w in stems}:
+            self.postings[stem].append(unit)
+
+    def _resolve(self, stem: str) -> list[str]:
+        """Map a clause stem to the SOW stems it should count as (exact or close spelling)."""
+        if stem in self.postings:
+            return [stem]
+        if stem not in self._resolved:
+            candidates = self._vocabulary_by_initial.get(stem[0], [])
+            self._resolved[stem] = get_close_matches(
+                stem, candidates, n=3, cutoff=self.fuzzy_threshold
+            )
+        return self._resolved[stem]
+
+    def match(self, clause: str) -> ClauseMatch | None:
+        """
+        Find the best-scoring location for a clause.
+
+        Args:
+            clause: Clause name or phrase
+
+        Returns:
+            Best match (which may be below the thresholds), or None if nothing overlaps
+        """
+        stems = list(dict.fromkeys(_stems(clause)))
+        if not stems:
+            return None
+
+        hits: Counter[int] = Counter()
+        for stem in stems:
+            units = {unit for resolved in self._resolve(stem) for unit in self.postings[resolved]}
+            hits.update(units)
+
+        best: ClauseMatch | None = None
+        if hits:
+            unit, count = max(hits.items(), key=lambda item: (item[1], -item[0]))
+            best = ClauseMatch(
+                clause=clause,
+                section=self.sections[self.unit_sections[unit]],
+                score=count / len(stems),
+                method="tokens",
+            )
+
+        # The clause is the cached side of the matcher; the quick upper bounds
+        # skip most headings before the full ratio is computed
+        matcher = SequenceMatcher(None, autojunk=False)
+        matcher.set_seq2(" ".join(stems))
+        for section, heading in self.headings:
+            matcher.set_seq1(heading)
+            if (
+                matcher.real_quick_ratio() < self.fuzzy_threshold
+                or matcher.quick_ratio() < self.fuzzy_threshold
+            ):
+                continue
+            ratio = matcher.ratio()
+            if ratio >= self.fuzzy_threshold and (best is None or ratio > best.score):
+                best = ClauseMatch(
+                    clause=clause, section=self.sections[section], score=ratio, method="heading"
+                )
+
+        return best
+
+    def is_match(self, match: ClauseMatch | None) -> bool:
+        """Whether a match clears the threshold for its method."""
+        if match is None:
+            return False
+        threshold = self.fuzzy_threshold if match.method == "heading" else self.token_threshold
+        return match.score >= threshold
+
 
 @tool
 def check_mandatory_clauses_v2(
@@ -23,15 +186,22 @@ def check_mandatory_clauses_v2(
     """
     Check if all mandatory clauses are present in the SOW.
 
+    Clauses are matched by normalized tokens and fuzzy similarity rather than
+    exact text, so reworded or misspelled clauses still count (see ClauseDetector).
+
     Args:
         sow_text: Full SOW text
         requirements: List of required clause keywords/phrases
 
     Returns:
-        Validation results with missing clauses
+        Validation results with missing clauses, the section each found clause
+        is in, and the closest section for each missing clause (if any)
     """
+    detector = ClauseDetector(sow_text)
     missing_clauses = []
     found_clauses = []
+    clause_locations = {}
+    closest_sections = {}
 
     for item in requirements:
         # Handle dict inputs (graceful degradation)
@@ -40,11 +210,14 @@ def check_mandatory_clauses_v2(
         else:
             clause = str(item)
 
-        # Case-insensitive search
-        if re.search(re.escape(clause), sow_text, re.IGNORECASE):
+        match = detector.match(clause)
+        if match is not None and detector.is_match(match):
             found_clauses.append(clause)
+            clause_locations[clause] = match.section
         else:
             missing_clauses.append(clause)
+            if match is not None:
+                closest_sections[clause] = match.section
 
     status = "PASS" if not missing_clauses else "FAIL"
 
@@ -52,13 +225,18 @@ def check_mandatory_clauses_v2(
         "status": status,
         "found_clauses": found_clauses,
         "missing_clauses": missing_clauses,
+        "clause_locations": clause_locations,
+        "closest_sections": closest_sections,
         "total_required": len(requirements),
         "total_found": len(found_clauses),
     }
 
 
 @tool
-def check_prohibited_terms(sow_text: Annotated[str, "SOW text to check"]) -> dict:
+def check_prohibited_terms(
+    sow_text: Annotated[str, "SOW text to check"],
+    product: Annotated[str | None, "Optional product name for product-specific terms"] = None,
+) -> dict:
     """
     Check for prohibited terms or risky language in the SOW.
 
@@ -66,37 +244,33 @@ def check_prohibited_terms(sow_text: Annotated[str, "SOW text to check"]) -> dic
 
     Args:
         sow_text: Full SOW text
+        product: Optional product name; its prohibited terms are checked too
 
     Returns:
         Validation results with any prohibited terms found
     """
     # Load prohibited terms from compliance rules
-    compliance_file = DATA_DIR / "compliance_rules" / "compliance_rules.json"
+    rules = load_compliance_rules()
 
-    if not compliance_file.exists():
+    if rules is None:
         return {"error": "Compliance rules file not found"}
 
-    with open(compliance_file) as f:
-        data = json.load(f)
-
-    prohibited_terms = data.get("prohibited_terms", [])
+    bundle = rules.bundle(product=product)
+    terms = {term.lower(): term for term in bundle.prohibited_terms}
     findings = []
 
-    for term in prohibited_terms:
-        pattern = re.compile(re.escape(term), re.IGNORECASE)
-        matches = pattern.finditer(sow_text)
-
-        for match in matches:
-            # Find line number
-            line_num = sow_text[: match.start()].count("\n") + 1
+    matcher = bundle.prohibited_matcher
+    for match in matcher.finditer(sow_text) if matcher is not None else ():
+        # Find line number
+        line_num = sow_text[: match.start()].count("\n") + 1
 
-            findings.append(
-                {
-                    "term": term,
-                    "location": f"Line {line_num}",
-                    "context": _get_context(sow_text, match.start(), match.end()),
-                }
-            )
+        findings.append(
+            {
+                "term": terms[match.group().lower()],
+                "location": f"Line {line_num}",
+                "context": _get_context(sow_text, match.start(), match.end()),
+            }
+        )
 
     status = "PASS" if not findings else "WARNING"
 
@@ -116,7 +290,10 @@ def check_sla_requirements(
     """
     Validate SLA requirements based on product and client tier.
 
-    Checks for required uptime, response time, and support level commitments.
+    Extracts every numeric commitment (percentages, durations, currency) from
+    the SOW and compares the uptime and response/resolution time commitments
+    against the tier's requirements, with units normalized. Missing
+    commitments and commitments weaker than required are both reported.
 
     Args:
         sow_text: Full SOW text
@@ -127,46 +304,18 @@ def check_sla_requirements(
         Validation results for SLA requirements
     """
     # Load compliance requirements
-    compliance_file = DATA_DIR / "compliance_rules" / "compliance_rules.json"
+    rules = load_compliance_rules()
 
-    if not compliance_file.exists():
+    if rules is None:
         return {"error": "Compliance rules file not found"}
 
-    with open(compliance_file) as f:
-        data = json.load(f)
-
-    tier_requirements = data.get("sla_requirements_by_tier", {}).get(client_tier, {})
+    tier_requirements = dict(rules.bundle(client_tier, product).sla_requirements)
 
     if not tier_requirements:
         return {"error": f"No SLA requirements found for tier '{client_tier}'"}
 
-    findings = []
-
-    # Check uptime
-    uptime = tier_requirements.get("uptime", "")
-    if uptime and uptime not in sow_text:
-        findings.append(
-            {
-                "severity": "HIGH",
-                "issue": f"Missing uptime SLA: '{uptime}'",
-                "location": "SLA Section",
-                "suggestion": f"Add uptime commitment: '{uptime}'",
-            }
-        )
-
-    # Check max response time
-    response_time = tier_requirements.get("max_response_time", "")
-    if response_time:
-        # Look for any response time mention
-        if not re.search(r"response.{0,20}time", sow_text, re.IGNORECASE):
-            findings.append(
-                {
-                    "severity": "MEDIUM",
-                    "issue": "Missing response time SLA",
-                    "location": "SLA Section",
-                    "suggestion": f"Add response time commitment: '{response_time}'",
-                }
-            )
+    index = extract_commitments(sow_text)
+    findings = compile_sla_validator(tier_requirements).validate(index)
 
     status = "PASS" if not findings else "WARNING"
 
@@ -174,6 +323,7 @@ def check_sla_requirements(
         "status": status,
         "client_tier": client_tier,
         "required_slas": tier_requirements,
+        "commitments": [asdict(c) for c in index.commitments if c.metric],
         "findings": findings,
     }
 
@@ -0,0 +1,195 @@
+"""
+Compliance rules loaded once and served as precomputed bundles.
+
+compliance_rules.json is read once (and again only when the file changes). At
+load time a ComplianceBundle is built for every (tier, product) combination:
+the mandatory clauses that apply with their texts rendered, the SLA
+requirements after product overrides, and a single compiled matcher for the
+prohibited terms. Bundles are immutable and shared between requests.
+"""
+
+import json
+import re
+import threading
+from collections.abc import Mapping
+from dataclasses import dataclass
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any
+
+from src.agent.tools.sla_validator import tier_sla_requirements
+
+# Data directory
+DATA_DIR = Path(__file__).parent.parent.parent.parent / "data"
+RULES_FILE = DATA_DIR / "compliance_rules" / "compliance_rules.json"
+
+# SLA rule keys that name the availability target rendered into "{sla}"
+_AVAILABILITY_KEYS = ("uptime", "availability", "sla")
+
+
+class _KeepMissing(dict):
+    """format_map mapping that leaves unknown placeholders as they are."""
+
+    def __missing__(self, key: str) -> str:
+        return "{" + key + "}"
+
+
+@dataclass(frozen=True)
+class ComplianceBundle:
+    """Everything a compliance check needs for one tier and product."""
+
+    client_tier: str | None
+    product: str | None  # canonical product name, None if no product rules apply
+    sla_requirements: Mapping[str, str]
+    mandatory_clauses: tuple[Mapping[str, Any], ...]
+    prohibited_terms: tuple[str, ...]
+    prohibited_matcher: re.Pattern | None
+
+    def to_dict(self) -> dict:
+        """Plain (mutable, JSON-serializable) copy for tool and API responses."""
+        return {
+            "client_tier": self.client_tier,
+            "product": self.product,
+            "sla_requirements": dict(self.sla_requirements),
+            "mandatory_clauses": [dict(clause) for clause in self.mandatory_clauses],
+            "prohibited_terms": list(self.prohibited_terms),
+        }
+
+
+class ComplianceRules:
+    """Parsed compliance rules with a bundle per (tier, product)."""
+
+    def __init__(self, data: dict, version: tuple[int, int] = (0, 0)) -> None:
+        """
+        Precompute bundles.
+
+        Args:
+            data: Parsed compliance_rules.json
+            version: (mtime_ns, size) of the file the data came from
+        """
+        self.version = version
+        self._products: dict[str | None, dict] = {None: {}}
+        self._aliases: dict[str, str] = {}
+        for name, rules in data.get("product_requirements", {}).items():
+            self._products[name] = rules
+            for alias in [name, *rules.get("aliases", [])]:
+                self._aliases[alias.strip().lower()] = name
+
+        tiers: set[str | None] = {None}
+        tiers.update(data.get("compliance_tiers", {}))
+        tiers.update(data.get("sla_requirements_by_tier", {}))
+        for clause in data.get("mandatory_clauses", []):
+            tiers.update(t for t in clause.get("required_for", []) if t != "ALL")
+
+        self._bundles = {
+            (tier, product): _build_bundle(data, tier, product, rules)
+            for tier in tiers
+            for product, rules in self._products.items()
+        }
+
+    def resolve_product(self, product: str | None) -> str | None:
+        """Canonical product name for a name or alias, or None if it has no rules."""
+        if not product:
+            return None
+        return self._aliases.get(product.strip().lower())
+
+    def bundle(
+        self, client_tier: str | None = None, product: str | None = None
+    ) -> ComplianceBundle:
+        """
+        Get the precomputed bundle for a tier and product.
+
+        Unknown tiers get the clauses required for "ALL" and no tier SLAs;
+        unknown products get the tier-only bundle.
+
+        Args:
+            client_tier: Compliance tier (HIGH, MEDIUM, LOW)
+            product: Optional product name or alias
+
+        Returns:
+            Immutable compliance bundle
+        """
+        product_name = self.resolve_product(product)
+        return self._bundles.get((client_tier, product_name)) or self._bundles[(None, product_name)]
+
+
+def _build_bundle(
+    data: dict, tier: str | None, product: str | None, product_rules: dict
+) -> ComplianceBundle:
+    sla_requirements = dict(tier_sla_requirements(data, tier)) if tier else {}
+    sla_requirements.update(product_rules.get("sla_requirements", {}))
+
+    values = _KeepMissing(data.get("compliance_tiers", {}).get(tier, {}) if tier else {})
+    for key in _AVAILABILITY_KEYS:
+        if key in sla_requirements:
+            values["sla"] = sla_requirements[key]
+            break
+
+    clauses = []
+    for clause in [*data.get("mandatory_clauses", []), *product_rules.get("mandatory_clauses", [])]:
+        required_for = clause.get("required_for", ["ALL"])
+        if "ALL" not in required_for and tier not in required_for:
+            continue
+        if "text" in clause:
+            clause = {**clause, "text": clause["text"].format_map(values)}
+        clauses.append(MappingProxyType(dict(clause)))
+
+    terms = tuple(
+        dict.fromkeys(
+            [*data.get("prohibited_terms", []), *product_rules.get("prohibited_terms", [])]
+        )
+    )
+    matcher = None
+    if terms:
+        # Longest first so a term is never shadowed by a shorter one it starts with
+        alternatives = sorted(terms, key=len, reverse=True)
+        matcher = re.compile("|".join(re.escape(t) for t in alternatives), re.IGNORECASE)
+
+    return ComplianceBundle(
+        client_tier=tier,
+        product=product,
+        sla_requirements=MappingProxyType(sla_requirements),
+        mandatory_clauses=tuple(clauses),
+        prohibited_terms=terms,
+        prohibited_matcher=matcher,
+    )
+
+
+_rules: ComplianceRules | None = None
+_rules_lock = threading.Lock()
+
+
+def load_compliance_rules() -> ComplianceRules | None:
+    """
+    Get the compliance rules, reloading them only when the file has changed.
+
+    Returns:
+        Loaded rules, or None if the rules file does not exist
+    """
+    global _rules
+
+    if not RULES_FILE.exists():
+        return None
+
+    try:
+        stat = RULES_FILE.stat()
+        version = (stat.st_mtime_ns, stat.st_size)
+    except OSError:
+        version = (0, 0)
+
+    rules = _rules
+    if rules is not None and rules.version == version:
+        return rules
+
+    with _rules_lock:
+        if _rules is None or _rules.version != version:
+            with open(RULES_FILE) as f:
+                _rules = ComplianceRules(json.load(f), version)
+        return _rules
+
+
+def clear_compliance_rules_cache() -> None:
+    """Forget the loaded rules so the next call reads the file again."""
+    global _rules
+    with _rules_lock:
+        _rules = None
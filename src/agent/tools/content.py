@@ -1,7 +1,17 @@
 """
 Content generation tools for the SOW Generator agent.
 
-Uses Amazon Bedrock Claude for text generation.
+Uses Amazon Bedrock Claude for text generation. Each tool also has an async
+implementation on the async Bedrock transport, which LangGraph uses when the
+agent runs with ``SOWAgent.arun`` so generations do not each hold a thread.
+
+Draft prompts put their static part (instructions and SOW template) first, in
+the system prompt, followed by a prompt-cache checkpoint; the per-request
+context comes after it.
+
+Tools called by the agent receive the run's quality mode from the graph state
+(it is not part of the schema the planner sees), so their model is routed the
+same way as the planner's.
 """
 
 import json
@@ -9,31 +19,117 @@ from pathlib import Path
 from typing import Annotated, cast
 
 from langchain_aws import ChatBedrock
-from langchain_core.messages import HumanMessage, SystemMessage
+from langchain_core.messages import BaseMessage, HumanMessage, SystemMessage
 from langchain_core.tools import tool
+from langgraph.prebuilt import InjectedState
 
 from src.agent.config import config
+from src.agent.model_router import (
+    CACHE_POINT,
+    ModelProfile,
+    apply_prompt_cache,
+    resolve_model,
+    track,
+)
+
+
+class TruncatedReplyError(RuntimeError):
+    """A reply that stopped at its profile's max_tokens limit."""
+
 
 # Templates directory
 TEMPLATES_DIR = Path(__file__).parent.parent.parent.parent / "data" / "templates"
 
 
-def _get_llm() -> ChatBedrock:
-    """Get configured Bedrock LLM instance."""
+def _get_llm(task: str = "draft", quality_mode: str | None = None) -> ChatBedrock:
+    """Get the Bedrock LLM routed for a task and quality mode."""
+    profile = resolve_model(task, quality_mode)
     return ChatBedrock(
-        model=config.bedrock_model_id,
+        model=profile.model_id,
         client=config.bedrock_runtime,
         model_kwargs={
-            "temperature": config.temperature,
-            "max_tokens": config.max_tokens,
+            "temperature": profile.temperature,
+            "max_tokens": profile.max_tokens,
         },
+        # Prompt-cache checkpoints are Converse content blocks; Nova models need Converse too
+        beta_use_converse_api=profile.uses_converse_api,
     )
 
 
+def _check_complete(task: str, profile: ModelProfile, truncated: bool) -> None:
+    if truncated:
+        raise TruncatedReplyError(
+            f"The {task} was cut off at the {profile.max_tokens}-token limit of model "
+            f"profile '{profile.name}'; raise MAX_TOKENS or the profile's max_tokens"
+        )
+
+
+def _generate(
+    task: str,
+    messages: list[BaseMessage],
+    quality_mode: str | None = None,
+    complete: bool = False,
+) -> str:
+    """
+    Generate a reply with the routed model, recording route stats.
+
+    With complete=True a reply cut off at max_tokens raises TruncatedReplyError.
+    """
+    profile = resolve_model(task, quality_mode)
+    llm = _get_llm(task, quality_mode)
+    with track(task, quality_mode, profile) as call:
+        response = llm.invoke(apply_prompt_cache(messages, profile))
+        call.usage(response)
+    if complete:
+        _check_complete(task, profile, call.truncated)
+    return cast(str, response.content)
+
+
+async def _agenerate(
+    task: str,
+    messages: list[BaseMessage],
+    quality_mode: str | None = None,
+    complete: bool = False,
+) -> str:
+    """Generate a reply with the routed model on the async Bedrock transport (see _generate)."""
+    from src.agent.utils.bedrock_async import get_async_bedrock, response_text, to_converse
+
+    profile = resolve_model(task, quality_mode)
+    turns, system = to_converse(apply_prompt_cache(messages, profile))
+    with track(task, quality_mode, profile) as call:
+        response = await get_async_bedrock().converse(
+            turns,
+            system=system,
+            model_id=profile.model_id,
+            temperature=profile.temperature,
+            max_tokens=profile.max_tokens,
+        )
+        call.usage(response)
+    if complete:
+        _check_complete(task, profile, call.truncated)
+    return response_text(response)
+
+
+def _static_system(instructions: str, template: str) -> list[str | dict]:
+    """System prompt content: instructions and template, then a prompt-cache checkpoint."""
+    return [
+        {"type": "text", "text": f"{instructions}\nTEMPLATE STRUCTURE:\n{template}"},
+        CACHE_POINT,
+    ]
+
+
+def _load_template(template_name: str) -> str | None:
+    template_file = TEMPLATES_DIR / f"{template_name}_sow_template.md"
+    if not template_file.exists():
+        return None
+    return template_file.read_text()
+
+
 @tool
 def generate_sow_draft(
     context: Annotated[dict, "Context package with client, product, history, compliance"],
     template_name: Annotated[str, "Template to use"] = "standard",
+    quality_mode: Annotated[str | None, InjectedState("quality_mode")] = None,
 ) -> str:
     """
     Generate a complete SOW draft using the provided context.
@@ -43,17 +139,41 @@ def generate_sow_draft(
     Args:
         context: Context package from assemble_context tool
         template_name: Name of the template to use (default: "standard")
+        quality_mode: Quality mode of the agent run, injected from its state
 
     Returns:
         Complete SOW draft in markdown format
     """
     # Load template
-    template_file = TEMPLATES_DIR / f"{template_name}_sow_template.md"
-    if not template_file.exists():
+    template = _load_template(template_name)
+    if template is None:
+        return f"Error: Template '{template_name}' not found"
+
+    # Generate (a cut-off draft is reported rather than passed on as complete)
+    try:
+        return _generate("draft", _draft_messages(context, template), quality_mode, complete=True)
+    except TruncatedReplyError as e:
+        return f"Error: {e}"
+
+
+async def _agenerate_sow_draft(
+    context: dict, template_name: str = "standard", quality_mode: str | None = None
+) -> str:
+    template = _load_template(template_name)
+    if template is None:
         return f"Error: Template '{template_name}' not found"
+    try:
+        return await _agenerate(
+            "draft", _draft_messages(context, template), quality_mode, complete=True
+        )
+    except TruncatedReplyError as e:
+        return f"Error: {e}"
 
-    template = template_file.read_text()
 
+generate_sow_draft.coroutine = _agenerate_sow_draft
+
+
+def _draft_messages(context: dict, template: str) -> list[BaseMessage]:
     # Build system prompt
     system_prompt = """You are an expert SOW (Statement of Work) writer.
 Generate a professional, comprehensive SOW based on the provided context and template.
@@ -66,7 +186,7 @@ Key requirements:
 - Ensure all sections are complete and specific (no placeholders)
 """
 
-    # Build human prompt
+    # Build human prompt (the template is part of the cached system prompt)
     human_prompt = f"""Generate a complete SOW using this context:
 
 CLIENT INFORMATION:
@@ -81,17 +201,15 @@ COMPLIANCE REQUIREMENTS:
 HISTORICAL REFERENCE (similar past SOWs):
 {json.dumps(context.get('historical_sows', []), indent=2)}
 
-TEMPLATE STRUCTURE:
-{template}
-
 Generate a complete, professional SOW following the template structure."""
 
-    # Generate
-    llm = _get_llm()
-    messages = [SystemMessage(content=system_prompt), HumanMessage(content=human_prompt)]
-    response = llm.invoke(messages)
+    if context.get("requirements"):
+        human_prompt += f"\n\nADDITIONAL REQUIREMENTS:\n{context['requirements']}"
 
-    return cast(str, response.content)
+    return [
+        SystemMessage(content=_static_system(system_prompt, template)),
+        HumanMessage(content=human_prompt),
+    ]
 
 
 @tool
@@ -118,14 +236,62 @@ def generate_sow_draft_with_reflection(
         Production-grade SOW draft in markdown format
     """
     # Load template
-    template_file = TEMPLATES_DIR / f"{template_name}_sow_template.md"
-    if not template_file.exists():
+    template = _load_template(template_name)
+    if template is None:
         return f"Error: Template '{template_name}' not found"
 
-    template = template_file.read_text()
-    llm = _get_llm()
-
     # STEP 1: Generate initial draft
+    initial_draft = _generate("draft", _reflection_draft_messages(context, template), "production")
+
+    # STEPS 2-3: Self-critique and revise
+    return refine_sow_draft(context, initial_draft)
+
+
+async def _agenerate_sow_draft_with_reflection(
+    context: dict, template_name: str = "standard"
+) -> str:
+    template = _load_template(template_name)
+    if template is None:
+        return f"Error: Template '{template_name}' not found"
+
+    initial_draft = await _agenerate(
+        "draft", _reflection_draft_messages(context, template), "production"
+    )
+    return await arefine_sow_draft(context, initial_draft)
+
+
+generate_sow_draft_with_reflection.coroutine = _agenerate_sow_draft_with_reflection
+
+
+def refine_sow_draft(context: dict, draft: str) -> str:
+    """
+    Critique a SOW draft and revise it (the reflection steps without the initial draft).
+
+    Lets a caller that already has a draft, e.g. a quick draft shown to the
+    user while the production version is prepared, refine it without paying
+    for another initial draft.
+
+    Args:
+        context: Context package the draft was generated from
+        draft: SOW draft in markdown
+
+    Returns:
+        Revised SOW in markdown
+    """
+    # STEP 2: Self-critique (auxiliary step, routed to a faster model by default)
+    critique = _generate("critique", _critique_messages(context, draft), "production")
+
+    # STEP 3: Revise based on critique
+    return _generate("revision", _revision_messages(draft, critique), "production")
+
+
+async def arefine_sow_draft(context: dict, draft: str) -> str:
+    """Async version of refine_sow_draft, on the async Bedrock transport."""
+    critique = await _agenerate("critique", _critique_messages(context, draft), "production")
+    return await _agenerate("revision", _revision_messages(draft, critique), "production")
+
+
+def _reflection_draft_messages(context: dict, template: str) -> list[BaseMessage]:
     generation_system = """You are an expert SOW (Statement of Work) writer.
 Generate a comprehensive, professional SOW based on the provided context.
 
@@ -151,18 +317,15 @@ COMPLIANCE REQUIREMENTS:
 HISTORICAL REFERENCE (similar past SOWs):
 {json.dumps(context.get('historical_sows', []), indent=2)}
 
-TEMPLATE STRUCTURE:
-{template}
-
 Generate a complete, professional SOW following the template structure."""
 
-    initial_messages = [
-        SystemMessage(content=generation_system),
+    return [
+        SystemMessage(content=_static_system(generation_system + "\n", template)),
         HumanMessage(content=generation_prompt),
     ]
-    initial_draft = cast(str, llm.invoke(initial_messages).content)
 
-    # STEP 2: Self-critique
+
+def _critique_messages(context: dict, initial_draft: str) -> list[BaseMessage]:
     critique_system = """You are an expert SOW reviewer and compliance auditor.
 Analyze the provided SOW draft and identify areas for improvement.
 
@@ -188,13 +351,13 @@ Provide a detailed critique covering:
 
 Be constructive but thorough."""
 
-    critique_messages = [
+    return [
         SystemMessage(content=critique_system),
         HumanMessage(content=critique_prompt),
     ]
-    critique = cast(str, llm.invoke(critique_messages).content)
 
-    # STEP 3: Revise based on critique
+
+def _revision_messages(initial_draft: str, critique: str) -> list[BaseMessage]:
     revision_system = """You are an expert SOW writer performing final revision.
 Improve the SOW draft based on the detailed critique provided.
 
@@ -215,19 +378,17 @@ CRITIQUE:
 Produce the final, polished SOW incorporating all improvements.
 Return ONLY the revised SOW, not the critique or commentary."""
 
-    revision_messages = [
+    return [
         SystemMessage(content=revision_system),
         HumanMessage(content=revision_prompt),
     ]
-    final_sow = cast(str, llm.invoke(revision_messages).content)
-
-    return final_sow
 
 
 @tool
 def generate_section(
     section_name: Annotated[str, "Name of the section to generate"],
     context: Annotated[dict, "Context information for generation"],
+    quality_mode: Annotated[str | None, InjectedState("quality_mode")] = None,
 ) -> str:
     """
     Generate a specific section of the SOW.
@@ -237,10 +398,24 @@ def generate_section(
     Args:
         section_name: Name of section (e.g., "Executive Summary", "Scope of Work")
         context: Relevant context for this section
+        quality_mode: Quality mode of the agent run, injected from its state
 
     Returns:
         Generated section content
     """
+    return _generate("section", _section_messages(section_name, context), quality_mode)
+
+
+async def _agenerate_section(
+    section_name: str, context: dict, quality_mode: str | None = None
+) -> str:
+    return await _agenerate("section", _section_messages(section_name, context), quality_mode)
+
+
+generate_section.coroutine = _agenerate_section
+
+
+def _section_messages(section_name: str, context: dict) -> list[BaseMessage]:
     system_prompt = f"""You are an expert SOW writer. Generate only the "{section_name}" section.
 Be specific, professional, and ensure compliance with requirements."""
 
@@ -250,17 +425,14 @@ Be specific, professional, and ensure compliance with requirements."""
 
 Return only the section content, properly formatted in markdown."""
 
-    llm = _get_llm()
-    messages = [SystemMessage(content=system_prompt), HumanMessage(content=human_prompt)]
-    response = llm.invoke(messages)
-
-    return cast(str, response.content)
+    return [SystemMessage(content=system_prompt), HumanMessage(content=human_prompt)]
 
 
 @tool
 def revise_section(
     section: Annotated[str, "Current section content"],
     feedback: Annotated[str, "Feedback or issues to address"],
+    quality_mode: Annotated[str | None, InjectedState("quality_mode")] = None,
 ) -> str:
     """
     Revise a section based on feedback or compliance issues.
@@ -268,10 +440,22 @@ def revise_section(
     Args:
         section: Current section content
         feedback: Description of what needs to be fixed
+        quality_mode: Quality mode of the agent run, injected from its state
 
     Returns:
         Revised section content
     """
+    return _generate("revision", _revise_messages(section, feedback), quality_mode)
+
+
+async def _arevise_section(section: str, feedback: str, quality_mode: str | None = None) -> str:
+    return await _agenerate("revision", _revise_messages(section, feedback), quality_mode)
+
+
+revise_section.coroutine = _arevise_section
+
+
+def _revise_messages(section: str, feedback: str) -> list[BaseMessage]:
     system_prompt = """You are an expert SOW writer. Revise the provided section to address the feedback.
 Maintain professional language and ensure compliance."""
 
@@ -285,15 +469,14 @@ FEEDBACK TO ADDRESS:
 
 Return the revised section."""
 
-    llm = _get_llm()
-    messages = [SystemMessage(content=system_prompt), HumanMessage(content=human_prompt)]
-    response = llm.invoke(messages)
-
-    return cast(str, response.content)
+    return [SystemMessage(content=system_prompt), HumanMessage(content=human_prompt)]
 
 
 @tool
-def generate_summary(documents: Annotated[list[str], "List of documents to summarize"]) -> str:
+def generate_summary(
+    documents: Annotated[list[str], "List of documents to summarize"],
+    quality_mode: Annotated[str | None, InjectedState("quality_mode")] = None,
+) -> str:
     """
     Generate a summary of multiple documents.
 
@@ -301,10 +484,22 @@ def generate_summary(documents: Annotated[list[str], "List of documents to summa
 
     Args:
         documents: List of document texts
+        quality_mode: Quality mode of the agent run, injected from its state
 
     Returns:
         Summary text
     """
+    return _generate("summary", _summary_messages(documents), quality_mode)
+
+
+async def _agenerate_summary(documents: list[str], quality_mode: str | None = None) -> str:
+    return await _agenerate("summary", _summary_messages(documents), quality_mode)
+
+
+generate_summary.coroutine = _agenerate_summary
+
+
+def _summary_messages(documents: list[str]) -> list[BaseMessage]:
     system_prompt = """You are an expert at summarizing technical and business documents.
 Create a concise, accurate summary highlighting key points."""
 
@@ -316,8 +511,4 @@ Create a concise, accurate summary highlighting key points."""
 
 Provide a clear, structured summary of the key information."""
 
-    llm = _get_llm()
-    messages = [SystemMessage(content=system_prompt), HumanMessage(content=human_prompt)]
-    response = llm.invoke(messages)
-
-    return cast(str, response.content)
+    return [SystemMessage(content=system_prompt), HumanMessage(content=human_prompt)]
@@ -10,6 +10,8 @@ from typing import Annotated, Any, cast
 
 from langchain_core.tools import tool
 
+from src.agent.config import config
+from src.agent.tools.compliance_rules import load_compliance_rules
 from src.rag.retriever import DocumentRetriever
 
 # Data directory (project root / data)
@@ -87,16 +89,21 @@ def search_historical_sows(
     query: Annotated[str, "Search query describing what to look for"],
     client_id: Annotated[str | None, "Optional client ID filter"] = None,
     product: Annotated[str | None, "Optional product name filter"] = None,
+    additional_queries: Annotated[
+        list[str] | None, "Optional related queries (e.g. scope, pricing, timeline, risks)"
+    ] = None,
 ) -> list[dict]:
     """
     Search historical SOW documents using semantic search.
 
-    Returns relevant past SOWs that match the query and filters.
+    Returns relevant past SOWs that match the query and filters. Pass related
+    queries in additional_queries to search them all in a single batched call.
 
     Args:
         query: Natural language search query
         client_id: Optional client ID to filter results
         product: Optional product name to filter results
+        additional_queries: Optional extra queries sharing the same filters
 
     Returns:
         List of relevant SOW excerpts with metadata
@@ -110,24 +117,37 @@ def search_historical_sows(
     if product:
         filters["product"] = product
 
-    # Search
-    results = retriever.search(query, n_results=5, filters=filters)
+    # Search all queries in one round trip, over-fetching and reranking so
+    # near-duplicate sections from different SOW versions are not all returned
+    queries = [query, *(additional_queries or [])]
+    results_by_query = retriever.search_many(
+        queries,
+        n_results=5,
+        filters=filters,
+        rerank=config.rerank_strategy,
+    )
+
+    # Format results, keeping the best score for excerpts matched by several queries
+    formatted: dict[tuple[str, str], dict] = {}
+    for matched_query, results in zip(queries, results_by_query, strict=True):
+        for result in results:
+            metadata = cast(dict[str, Any], result["metadata"])
+            source = metadata.get("file_name", "unknown")
+            key = (source, result["content"])
+
+            if key in formatted and formatted[key]["relevance_score"] <= result["score"]:
+                continue
 
-    # Format results
-    formatted = []
-    for result in results:
-        metadata = cast(dict[str, Any], result["metadata"])
-        formatted.append(
-            {
+            formatted[key] = {
                 "content": result["content"],
-                "source": metadata.get("file_name", "unknown"),
+                "source": source,
                 "client": metadata.get("client_id", "unknown"),
                 "product": metadata.get("product", "unknown"),
                 "relevance_score": result["score"],
+                "query": matched_query,
             }
-        )
 
-    return formatted
+    return list(formatted.values())
 
 
 @tool
@@ -202,7 +222,9 @@ def search_compliance_kb(
     """
     Search compliance requirements knowledge base.
 
-    Returns mandatory clauses, prohibited terms, and SLA requirements.
+    Returns mandatory clauses (with tier values filled into their text),
+    prohibited terms, and SLA requirements, including any product-specific
+    requirements. Served from bundles precomputed when the rules are loaded.
 
     Args:
         client_tier: Compliance tier (HIGH, MEDIUM, LOW)
@@ -211,30 +233,12 @@ def search_compliance_kb(
     Returns:
         Compliance requirements dictionary
     """
-    compliance_file = DATA_DIR / "compliance_rules" / "compliance_rules.json"
+    rules = load_compliance_rules()
 
-    if not compliance_file.exists():
+    if rules is None:
         return {"error": "Compliance rules file not found"}
 
-    with open(compliance_file) as f:
-        data = json.load(f)
-
-    # Get requirements for tier
-    tier_requirements = data.get("sla_requirements_by_tier", {}).get(client_tier, {})
-
-    # Filter mandatory clauses for tier
-    all_clauses = data.get("mandatory_clauses", [])
-    relevant_clauses = []
-    for c in all_clauses:
-        req_for = c.get("required_for", [])
-        if "ALL" in req_for or client_tier in req_for:
-            relevant_clauses.append(c)
-
-    response = {
-        "client_tier": client_tier,
-        "sla_requirements": tier_requirements,
-        "mandatory_clauses": relevant_clauses,
-        "prohibited_terms": data.get("prohibited_terms", []),
-    }
+    response = rules.bundle(client_tier, product).to_dict()
+    response["client_tier"] = client_tier
 
     return response
@@ -0,0 +1,328 @@
+"""
+Numeric SLA commitment extraction and validation.
+
+A SOW's numeric commitments (percentages, durations and currency amounts) are
+extracted in a single pass into a typed index, each tagged with the SLA metric
+it refers to. Tier requirements are compiled once into comparable thresholds
+and checked against that index, so re-validating an edited SOW costs one regex
+pass over the text.
+"""
+
+import bisect
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+
+# Minutes per duration unit, keyed by its first letter (milliseconds and months
+# are special-cased in _duration_minutes)
+_MINUTES = {"s": 1 / 60, "m": 1, "h": 60, "d": 1440, "w": 10080}
+_MINUTES_PER_MONTH = 43200
+_CURRENCY_SCALE = {"k": 1e3, "thousand": 1e3, "m": 1e6, "million": 1e6, "bn": 1e9, "billion": 1e9}
+_NUMBER_WORDS = {
+    "one": 1,
+    "two": 2,
+    "three": 3,
+    "four": 4,
+    "five": 5,
+    "six": 6,
+    "eight": 8,
+    "ten": 10,
+    "twelve": 12,
+    "twenty-four": 24,
+    "thirty": 30,
+    "forty-eight": 48,
+    "seventy-two": 72,
+}
+
+_COMMITMENT = re.compile(
+    r"""
+    (?P<currency>(?:AUD|USD|EUR|GBP|A\$|AU\$|US\$|\$|€|£)\s?)
+        (?P<amount>\d{1,3}(?:,\d{3})+(?:\.\d+)?|\d+(?:\.\d+)?)
+        (?:\s?(?P<scale>k|m|million|thousand|bn|billion)\b)?
+    | (?P<percent>\d+(?:\.\d+)?)\s?(?:%|percent\b)
+    | (?P<number>\b\d+(?:\.\d+)?|\b(?:one|two|three|four|five|six|eight|ten|twelve|thirty
+        |twenty[-\s]four|forty[-\s]eight|seventy[-\s]two))
+        (?:\s?\(\d+\))?[\s-]?(?:(?:business|working|calendar)\s)?
+        (?P<unit>milliseconds?|ms|seconds?|secs?|minutes?|mins?|hours?|hrs?|h|days?|weeks?
+        |months?)\b
+    """,
+    re.IGNORECASE | re.VERBOSE,
+)
+
+# Metric keywords; a commitment belongs to the nearest keyword before it on its
+# line, else the nearest after it, else the keyword of its section heading
+_METRIC = re.compile(
+    r"""
+    (?P<availability>\buptime\b|\bavailab\w*)
+    | (?P<response_time>\brespon\w*|\backnowledg\w*|\blatency\b)
+    | (?P<resolution_time>\bresol\w*|\brestor\w*|\bremediat\w*)
+    | (?P<service_credit>\bservice\s+credits?\b|\brebates?\b)
+    """,
+    re.IGNORECASE | re.VERBOSE,
+)
+_HEADING = re.compile(r"#{1,6}\s")  # matched at line starts
+
+# Rule key -> (metric, whether commitments must be at least the threshold)
+_REQUIREMENT_KEYS = {
+    "uptime": ("availability", True),
+    "availability": ("availability", True),
+    "sla": ("availability", True),
+    "max_response_time": ("response_time", False),
+    "max_resolution_time": ("resolution_time", False),
+    "min_service_credit": ("service_credit", True),
+}
+
+# Metric -> (label, severity)
+_METRIC_LABELS = {
+    "availability": ("Uptime", "HIGH"),
+    "response_time": ("Response time", "MEDIUM"),
+    "resolution_time": ("Resolution time", "MEDIUM"),
+    "service_credit": ("Service credit", "LOW"),
+}
+
+
+@dataclass(frozen=True)
+class Commitment:
+    """A numeric commitment found in a SOW."""
+
+    kind: str  # "percentage", "duration" or "currency"
+    value: float  # percent, minutes or currency amount
+    metric: str | None  # e.g. "availability", "response_time"; None if unrelated to an SLA
+    text: str
+    line: int
+
+
+@dataclass(frozen=True)
+class SlaRequirement:
+    """A tier requirement compiled to a comparable threshold."""
+
+    key: str
+    metric: str
+    kind: str
+    threshold: float
+    minimum: bool  # commitments must be >= threshold (otherwise <=)
+    label: str  # requirement as written, e.g. "99.9%"
+
+    def is_met_by(self, commitment: Commitment) -> bool:
+        if self.minimum:
+            return commitment.value >= self.threshold
+        return commitment.value <= self.threshold
+
+
+class CommitmentIndex:
+    """Numeric commitments of a SOW, grouped by (metric, kind)."""
+
+    def __init__(self, commitments: list[Commitment]) -> None:
+        self.commitments = commitments
+        self._by_metric: dict[tuple[str | None, str], list[Commitment]] = {}
+        for commitment in commitments:
+            key = (commitment.metric, commitment.kind)
+            self._by_metric.setdefault(key, []).append(commitment)
+
+    def find(self, metric: str, kind: str) -> list[Commitment]:
+        """Commitments of one kind for a metric, in document order."""
+        return self._by_metric.get((metric, kind), [])
+
+
+def parse_quantity(text: str) -> tuple[str, float] | None:
+    """
+    Parse the first quantity in a string, normalizing its unit.
+
+    Args:
+        text: e.g. "99.9%", "1 hour", "$5,000"
+
+    Returns:
+        Tuple of (kind, value in percent/minutes/currency), or None if there is none
+    """
+    match = _COMMITMENT.search(text)
+    return _quantity(match) if match else None
+
+
+def _quantity(match: re.Match) -> tuple[str, float]:
+    if match["percent"] is not None:
+        return "percentage", float(match["percent"])
+    if match["amount"] is not None:
+        scale = _CURRENCY_SCALE.get((match["scale"] or "").lower(), 1)
+        return "currency", float(match["amount"].replace(",", "")) * scale
+    return "duration", _duration_minutes(match["number"], match["unit"])
+
+
+def _duration_minutes(number: str, unit: str) -> float:
+    value = _NUMBER_WORDS.get(re.sub(r"[-\s]+", "-", number.lower())) or float(number)
+    unit = unit.lower()
+    if unit == "ms" or unit.startswith("milli"):
+        return value / 60000
+    if unit.startswith("mo"):
+        return value * _MINUTES_PER_MONTH
+    return value * _MINUTES[unit[0]]
+
+
+@lru_cache(maxsize=64)
+def extract_commitments(sow_text: str) -> CommitmentIndex:
+    """
+    Extract all numeric commitments from a SOW in one pass.
+
+    Cached on the text, so the several checks of a review (and repeated
+    reviews of an unchanged SOW) share one extraction.
+
+    Args:
+        sow_text: Full SOW text
+
+    Returns:
+        Index of commitments tagged with the metric they refer to
+    """
+    line_starts = [0] + [m.end() for m in re.finditer("\n", sow_text)]
+    keywords: dict[int, list[tuple[int, str]]] = {}
+    for match in _METRIC.finditer(sow_text):
+        if match.lastgroup is None:
+            continue
+        line = bisect.bisect_right(line_starts, match.start()) - 1
+        keywords.setdefault(line, []).append((match.start(), match.lastgroup))
+
+    heading_metrics: list[tuple[int, str | None]] = []  # (line, metric) per heading
+    for line, start in enumerate(line_starts):
+        if _HEADING.match(sow_text, start):
+            metrics = keywords.get(line)
+            heading_metrics.append((line, metrics[0][1] if metrics else None))
+
+    commitments = []
+    for match in _COMMITMENT.finditer(sow_text):
+        line = bisect.bisect_right(line_starts, match.start()) - 1
+        kind, value = _quantity(match)
+        commitments.append(
+            Commitment(
+                kind=kind,
+                value=value,
+                metric=_nearest_metric(match.start(), keywords.get(line, []))
+                or _section_metric(line, heading_metrics),
+                text=match.group().strip(),
+                line=line + 1,
+            )
+        )
+
+    return CommitmentIndex(commitments)
+
+
+def _nearest_metric(position: int, keywords: list[tuple[int, str]]) -> str | None:
+    before = [metric for start, metric in keywords if start < position]
+    if before:
+        return before[-1]
+    return keywords[0][1] if keywords else None
+
+
+def _section_metric(line: int, heading_metrics: list[tuple[int, str | None]]) -> str | None:
+    index = bisect.bisect_right(heading_metrics, line, key=lambda item: item[0]) - 1
+    return heading_metrics[index][1] if index >= 0 else None
+
+
+class SlaValidator:
+    """Compiled tier requirements, checked against a CommitmentIndex."""
+
+    def __init__(self, requirements: list[SlaRequirement]) -> None:
+        self.requirements = requirements
+
+    def validate(self, index: CommitmentIndex) -> list[dict]:
+        """
+        Check commitments against the requirements.
+
+        Args:
+            index: Commitments extracted from the SOW
+
+        Returns:
+            Findings for requirements with no commitment and for commitments
+            weaker than required
+        """
+        findings = []
+
+        for requirement in self.requirements:
+            label, severity = _METRIC_LABELS[requirement.metric]
+            commitments = index.find(requirement.metric, requirement.kind)
+
+            if not commitments:
+                findings.append(
+                    {
+                        "severity": severity,
+                        "issue": f"Missing {label.lower()} SLA: '{requirement.label}'",
+                        "location": "SLA Section",
+                        "suggestion": f"Add {label.lower()} commitment: '{requirement.label}'",
+                    }
+                )
+                continue
+
+            for commitment in commitments:
+                if not requirement.is_met_by(commitment):
+                    findings.append(
+                        {
+                            "severity": severity,
+                            "issue": (
+                                f"{label} commitment '{commitment.text}' is weaker than "
+                                f"required '{requirement.label}'"
+                            ),
+                            "location": f"Line {commitment.line}",
+                            "suggestion": f"Change to '{requirement.label}' or better",
+                        }
+                    )
+
+        return findings
+
+
+def compile_sla_validator(tier_requirements: dict) -> SlaValidator:
+    """
+    Compile tier requirements into a validator (cached per distinct requirements).
+
+    Keys without a numeric metric (e.g. "support_hours") are ignored.
+
+    Args:
+        tier_requirements: e.g. {"uptime": "99.9%", "max_response_time": "1 hour"}
+
+    Returns:
+        Validator for those requirements
+    """
+    items = tuple(sorted((str(k), str(v)) for k, v in tier_requirements.items()))
+    return _compile(items)
+
+
+@lru_cache(maxsize=32)
+def _compile(items: tuple[tuple[str, str], ...]) -> SlaValidator:
+    requirements = []
+    for key, label in items:
+        if key not in _REQUIREMENT_KEYS:
+            continue
+        quantity = parse_quantity(label)
+        if quantity is None:
+            continue
+        metric, minimum = _REQUIREMENT_KEYS[key]
+        kind, threshold = quantity
+        requirements.append(
+            SlaRequirement(
+                key=key,
+                metric=metric,
+                kind=kind,
+                threshold=threshold,
+                minimum=minimum,
+                label=label,
+            )
+        )
+    return SlaValidator(requirements)
+
+
+def tier_sla_requirements(compliance_rules: dict, client_tier: str) -> dict:
+    """
+    SLA requirements for a tier from the compliance rules data.
+
+    Uses ``sla_requirements_by_tier`` when present, otherwise the tier's
+    availability target from ``compliance_tiers``.
+
+    Args:
+        compliance_rules: Parsed compliance_rules.json
+        client_tier: Compliance tier (HIGH, MEDIUM, LOW)
+
+    Returns:
+        Requirements dictionary (empty if the tier has none)
+    """
+    requirements = compliance_rules.get("sla_requirements_by_tier", {}).get(client_tier)
+    if requirements:
+        return requirements
+
+    sla = compliance_rules.get("compliance_tiers", {}).get(client_tier, {}).get("sla")
+    return {"uptime": sla} if sla else {}
@@ -1,5 +1,30 @@
-"""Utils module initialization."""
+"""Utils module initialization.
 
-from src.agent.utils.doc_handler import export_to_docx, parse_document
+Exports are imported on first access so that importing one utility module
+does not load both pypdf and python-docx (or httpx and botocore).
+"""
 
-__all__ = ["parse_document", "export_to_docx"]
+import importlib
+from typing import Any
+
+_EXPORTS = {
+    "parse_document": "doc_handler",
+    "iter_pdf_pages": "doc_handler",
+    "extract_pdf_pages": "doc_handler",
+    "export_to_docx": "docx_exporter",
+    "export_to_bytes": "docx_exporter",
+    "export_batch": "docx_exporter",
+    "AsyncBedrockClient": "bedrock_async",
+    "get_async_bedrock": "bedrock_async",
+    "BedrockRateLimiter": "rate_limit",
+    "get_bedrock_limiter": "rate_limit",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str) -> Any:
+    if name in _EXPORTS:
+        module = importlib.import_module(f"{__name__}.{_EXPORTS[name]}")
+        return getattr(module, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,253 @@
+"""
+Async Bedrock Runtime transport.
+
+boto3 is synchronous, so every Bedrock call from the agent ties up a thread.
+This client sends the same requests over a pooled httpx.AsyncClient, signed
+with botocore's SigV4 signer, so one event loop can keep many embeddings and
+generations in flight. Generation uses the Converse API, which takes the same
+request shape for every Bedrock text model.
+
+Set ``BEDROCK_ENDPOINT_URL`` to point it at another endpoint (e.g. the local
+stub in scripts/bedrock_stub.py). httpx and botocore are imported on first use.
+Requests share the process-wide Bedrock rate limiter with the boto3 client.
+"""
+
+import asyncio
+import json
+import weakref
+from typing import Any
+from urllib.parse import quote
+
+from src.agent.config import config
+
+
+class BedrockError(RuntimeError):
+    """A Bedrock request that returned an error response."""
+
+    def __init__(self, status_code: int, error_type: str, message: str) -> None:
+        super().__init__(f"Bedrock {error_type} ({status_code}): {message}")
+        self.status_code = status_code
+        self.error_type = error_type
+
+
+class AsyncBedrockClient:
+    """SigV4-signed async client for the Bedrock Runtime API."""
+
+    def __init__(
+        self,
+        region: str | None = None,
+        endpoint_url: str | None = None,
+        credentials: Any = None,
+        max_connections: int | None = None,
+        timeout: float | None = None,
+        limiter: Any = None,
+    ) -> None:
+        """
+        Initialize the client.
+
+        Args:
+            region: AWS region (defaults to config)
+            endpoint_url: Endpoint override (defaults to BEDROCK_ENDPOINT_URL, then the
+                regional bedrock-runtime endpoint)
+            credentials: botocore credentials (defaults to the configured AWS profile)
+            max_connections: Connection pool size, i.e. requests in flight per event loop
+            timeout: Request timeout in seconds
+            limiter: BedrockRateLimiter (defaults to the shared one)
+        """
+        self.region = region or config.aws_region
+        self.endpoint_url = (
+            endpoint_url
+            or config.bedrock_endpoint_url
+            or f"https://bedrock-runtime.{self.region}.amazonaws.com"
+        ).rstrip("/")
+        self.max_connections = max_connections or config.bedrock_max_connections
+        self.timeout = timeout or config.bedrock_timeout
+        self._credentials = credentials
+        self._limiter = limiter
+        # httpx connection pools belong to one event loop, so keep one client per loop
+        self._clients: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Any] = (
+            weakref.WeakKeyDictionary()
+        )
+
+    def _http(self) -> Any:
+        loop = asyncio.get_running_loop()
+        client = self._clients.get(loop)
+        if client is None:
+            import httpx
+
+            client = httpx.AsyncClient(
+                timeout=self.timeout,
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections,
+                ),
+            )
+            self._clients[loop] = client
+        return client
+
+    def _signed_headers(self, url: str, body: bytes) -> dict[str, str]:
+        from botocore.auth import SigV4Auth
+        from botocore.awsrequest import AWSRequest
+
+        if self._credentials is None:
+            import boto3
+
+            self._credentials = boto3.Session(profile_name=config.aws_profile).get_credentials()
+            if self._credentials is None:
+                raise BedrockError(0, "NoCredentials", "No AWS credentials found")
+
+        request = AWSRequest(
+            method="POST",
+            url=url,
+            data=body,
+            headers={"Content-Type": "application/json", "Accept": "application/json"},
+        )
+        # Refreshable credentials are resolved per request so they do not expire mid-run
+        credentials = self._credentials
+        if hasattr(credentials, "get_frozen_credentials"):
+            credentials = credentials.get_frozen_credentials()
+        SigV4Auth(credentials, "bedrock", self.region).add_auth(request)
+        return dict(request.headers.items())
+
+    async def _post(self, model_id: str, action: str, payload: dict) -> dict:
+        from src.agent.utils.rate_limit import get_bedrock_limiter
+
+        url = f"{self.endpoint_url}/model/{quote(model_id, safe='')}/{action}"
+        body = json.dumps(payload).encode("utf-8")
+        limiter = self._limiter or get_bedrock_limiter()
+        return await limiter.acall(self._send, url, body)
+
+    async def _send(self, url: str, body: bytes) -> dict:
+        # Signed per attempt: SigV4 signatures carry a timestamp
+        headers = self._signed_headers(url, body)
+        response = await self._http().post(url, content=body, headers=headers)
+
+        if response.status_code >= 400:
+            try:
+                message = response.json().get("message", response.text)
+            except ValueError:
+                message = response.text
+            error_type = response.headers.get("x-amzn-errortype", "BedrockError").split(":")[0]
+            raise BedrockError(response.status_code, error_type, message)
+
+        return dict(response.json())
+
+    async def invoke_model(self, model_id: str, body: dict) -> dict:
+        """
+        Call InvokeModel with a model-specific JSON body.
+
+        Args:
+            model_id: Bedrock model ID
+            body: Request body, e.g. {"inputText": ...} for Titan embeddings
+
+        Returns:
+            Parsed response body
+        """
+        return await self._post(model_id, "invoke", body)
+
+    async def converse(
+        self,
+        messages: list[dict],
+        system: str | list[dict] | None = None,
+        model_id: str | None = None,
+        temperature: float | None = None,
+        max_tokens: int | None = None,
+    ) -> dict:
+        """
+        Call the Converse API.
+
+        Args:
+            messages: Converse messages, e.g. [{"role": "user", "content": [{"text": ...}]}]
+            system: Optional system prompt, as text or Converse content blocks
+            model_id: Bedrock model ID (defaults to config)
+            temperature: Sampling temperature (defaults to config)
+            max_tokens: Maximum output tokens (defaults to config)
+
+        Returns:
+            Parsed Converse response (output, usage, stopReason)
+        """
+        payload: dict[str, Any] = {
+            "messages": messages,
+            "inferenceConfig": {
+                "temperature": config.temperature if temperature is None else temperature,
+                "maxTokens": max_tokens or config.max_tokens,
+            },
+        }
+        if system:
+            payload["system"] = [{"text": system}] if isinstance(system, str) else system
+        return await self._post(model_id or config.bedrock_model_id, "converse", payload)
+
+    async def generate(self, messages: list[Any], **kwargs: Any) -> str:
+        """
+        Generate text from LangChain messages.
+
+        System messages become the Converse system prompt; the rest are sent as
+        user/assistant turns.
+
+        Args:
+            messages: LangChain messages (SystemMessage, HumanMessage, AIMessage)
+            **kwargs: Passed to converse()
+
+        Returns:
+            Text of the model's reply
+        """
+        turns, system = to_converse(messages)
+        return response_text(await self.converse(turns, system=system, **kwargs))
+
+    async def aclose(self) -> None:
+        """Close the HTTP client of the current event loop."""
+        client = self._clients.pop(asyncio.get_running_loop(), None)
+        if client is not None:
+            await client.aclose()
+
+
+def _content_blocks(content: str | list) -> list[dict]:
+    """Converse content blocks of a message; prompt-cache checkpoints pass through."""
+    if isinstance(content, str):
+        return [{"text": content}]
+    blocks = []
+    for block in content:
+        if isinstance(block, str):
+            blocks.append({"text": block})
+        elif "cachePoint" in block:
+            blocks.append(block)
+        else:
+            blocks.append({"text": block.get("text", "")})
+    return blocks
+
+
+def to_converse(messages: list[Any]) -> tuple[list[dict], list[dict] | None]:
+    """
+    Convert LangChain messages to Converse turns and system content blocks.
+
+    Args:
+        messages: LangChain messages (SystemMessage, HumanMessage, AIMessage)
+
+    Returns:
+        Tuple of (turns, system content blocks or None)
+    """
+    system = [block for m in messages if m.type == "system" for block in _content_blocks(m.content)]
+    turns = [
+        {"role": "assistant" if m.type == "ai" else "user", "content": _content_blocks(m.content)}
+        for m in messages
+        if m.type != "system"
+    ]
+    return turns, system or None
+
+
+def response_text(response: dict) -> str:
+    """Text of a Converse response."""
+    content = response["output"]["message"]["content"]
+    return "".join(block.get("text", "") for block in content)
+
+
+# Global async client, shared by embeddings and content tools
+_async_bedrock: AsyncBedrockClient | None = None
+
+
+def get_async_bedrock() -> AsyncBedrockClient:
+    """Get or create the shared async Bedrock client."""
+    global _async_bedrock
+    if _async_bedrock is None:
+        _async_bedrock = AsyncBedrockClient()
+    return _async_bedrock
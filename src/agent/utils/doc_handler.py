@@ -2,18 +2,31 @@
 Document handler utilities for PDF/DOCX parsing and export.
 """
 
+import hashlib
+import threading
+from collections import OrderedDict, deque
+from collections.abc import Iterator
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass, field
 from pathlib import Path
 
 from docx import Document
+from docx.oxml.ns import qn
 from pypdf import PdfReader
 
+from src.agent.config import config
 
-def parse_document(file_path: str | Path) -> str:
+# Pages extracted per worker task in page-parallel mode
+PDF_PAGES_PER_TASK = 8
+
+
+def parse_document(file_path: str | Path, pdf_workers: int | None = None) -> str:
     """
     Extract text from a PDF or DOCX file.
 
     Args:
         file_path: Path to the document file
+        pdf_workers: Processes for PDF page extraction (defaults to config.pdf_workers)
 
     Returns:
         Extracted text content
@@ -29,87 +42,452 @@ def parse_document(file_path: str | Path) -> str:
     suffix = file_path.suffix.lower()
 
     if suffix == ".pdf":
-        return _parse_pdf(file_path)
+        return _parse_pdf(file_path, pdf_workers)
     elif suffix in [".docx", ".doc"]:
         return _parse_docx(file_path)
     else:
         raise ValueError(f"Unsupported file format: {suffix}. Supported: .pdf, .docx")
 
 
-def _parse_pdf(file_path: Path) -> str:
+def _parse_pdf(file_path: Path, workers: int | None = None) -> str:
     """Extract text from PDF file."""
+    return "\n\n".join(text for _, text in iter_pdf_pages(file_path, workers=workers))
+
+
+class PdfPageCache:
+    """Thread-safe LRU cache of extracted PDF page text, keyed on file hash."""
+
+    def __init__(self, max_pages: int = 2048) -> None:
+        """
+        Initialize the cache.
+
+        Args:
+            max_pages: Maximum number of cached pages (0 disables caching)
+        """
+        self.max_pages = max_pages
+        self._pages: OrderedDict[tuple[str, int], str] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, file_hash: str, page_number: int) -> str | None:
+        """Return cached page text, or None on a miss."""
+        with self._lock:
+            text = self._pages.get((file_hash, page_number))
+            if text is None:
+                self.misses += 1
+                return None
+            self._pages.move_to_end((file_hash, page_number))
+            self.hits += 1
+            return text
+
+    def put(self, file_hash: str, page_number: int, text: str) -> None:
+        """Cache page text, evicting the least recently used pages."""
+        if self.max_pages <= 0:
+            return
+        with self._lock:
+            self._pages[(file_hash, page_number)] = text
+            self._pages.move_to_end((file_hash, page_number))
+            while len(self._pages) > self.max_pages:
+                self._pages.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop all cached pages."""
+        with self._lock:
+            self._pages.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+# Global page cache shared by all PDF extraction
+pdf_page_cache = PdfPageCache(max_pages=config.pdf_page_cache_size)
+
+
+def file_sha256(file_path: str | Path) -> str:
+    """
+    Hash a file's contents.
+
+    Args:
+        file_path: Path to the file
+
+    Returns:
+        Hex SHA-256 digest
+    """
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+_page_pools: dict[int, ProcessPoolExecutor] = {}
+_page_pools_lock = threading.Lock()
+
+# Set by mark_pool_worker in processes of the document pools
+_pool_worker = False
+
+
+def mark_pool_worker() -> None:
+    """
+    Pool initializer for processes that parse documents.
+
+    PDFs are then extracted serially in the process instead of through a
+    nested page pool. Pass it as the initializer of any ProcessPoolExecutor
+    whose tasks may parse PDFs.
+    """
+    global _pool_worker
+    _pool_worker = True
+
+
+def in_pool_worker() -> bool:
+    """Whether this process is a worker of a document pool."""
+    return _pool_worker
+
+
+def _page_pool(workers: int) -> ProcessPoolExecutor:
+    """Process pool for page extraction, created once per process and worker count."""
+    with _page_pools_lock:
+        pool = _page_pools.get(workers)
+        if pool is None:
+            pool = _page_pools[workers] = ProcessPoolExecutor(
+                max_workers=workers, initializer=mark_pool_worker
+            )
+        return pool
+
+
+def _extract_page_range(file_path: str, start: int, end: int) -> list[str]:
+    """Worker entry point: extract text for pages [start, end) of a PDF."""
+    reader = PdfReader(file_path)
+    return [reader.pages[i].extract_text() for i in range(start, end)]
+
+
+def iter_pdf_pages(
+    file_path: str | Path,
+    start: int = 0,
+    end: int | None = None,
+    workers: int | None = None,
+) -> Iterator[tuple[int, str]]:
+    """
+    Stream text from a range of PDF pages in page order.
+
+    Documents with at least PDF_PARALLEL_MIN_PAGES pages in the range are
+    extracted in a process pool, several pages per task, and each page is
+    yielded as soon as it and all earlier pages are ready. The pool is shared
+    by all calls in the process; inside a document pool worker (see
+    mark_pool_worker) pages are extracted serially rather than nesting pools. Extracted
+    pages are cached by file hash, so re-reading an unchanged file skips
+    extraction.
+
+    Args:
+        file_path: Path to the PDF
+        start: First page (0-based, inclusive)
+        end: Last page (exclusive, defaults to the page count)
+        workers: Worker processes (defaults to config.pdf_workers, <= 1 is serial)
+
+    Yields:
+        (page_number, text) tuples
+
+    Raises:
+        ValueError: If the page range is invalid
+    """
+    file_path = Path(file_path)
+    file_hash = file_sha256(file_path)
     reader = PdfReader(file_path)
-    text_parts = []
+    page_count = len(reader.pages)
+
+    end = page_count if end is None else min(end, page_count)
+    if start < 0 or start > end:
+        raise ValueError(f"Invalid page range {start}-{end} for {page_count} pages")
+
+    workers = config.pdf_workers if workers is None else workers
+    if in_pool_worker() or workers <= 1 or end - start < config.pdf_parallel_min_pages:
+        for i in range(start, end):
+            text = pdf_page_cache.get(file_hash, i)
+            if text is None:
+                text = reader.pages[i].extract_text()
+                pdf_page_cache.put(file_hash, i, text)
+            yield i, text
+        return
+
+    ranges = iter(range(start, end, PDF_PAGES_PER_TASK))
+    # (first page, cached texts or a future for the uncached range)
+    pending: deque[tuple[int, list[str] | Future]] = deque()
+    pool = _page_pool(workers)
+
+    def schedule() -> None:
+        # Keep a bounded number of ranges in flight so memory stays flat
+        for range_start in ranges:
+            range_end = min(range_start + PDF_PAGES_PER_TASK, end)
+            cached = [pdf_page_cache.get(file_hash, i) for i in range(range_start, range_end)]
+            texts = [text for text in cached if text is not None]
+            if len(texts) == len(cached):
+                pending.append((range_start, texts))
+            else:
+                future = pool.submit(_extract_page_range, str(file_path), range_start, range_end)
+                pending.append((range_start, future))
+            if len(pending) >= workers * 2:
+                return
 
-    for page in reader.pages:
-        text_parts.append(page.extract_text())
+    try:
+        schedule()
+        while pending:
+            range_start, result = pending.popleft()
+            texts = result.result() if isinstance(result, Future) else result
+            schedule()
+            for offset, text in enumerate(texts):
+                pdf_page_cache.put(file_hash, range_start + offset, text)
+                yield range_start + offset, text
+    finally:
+        # Consumers may stop early; don't extract pages nobody will read
+        for _, result in pending:
+            if isinstance(result, Future):
+                result.cancel()
 
-    return "\n\n".join(text_parts)
+
+def extract_pdf_pages(
+    file_path: str | Path,
+    start: int = 0,
+    end: int | None = None,
+    workers: int | None = None,
+) -> list[str]:
+    """
+    Extract text for a range of PDF pages.
+
+    Args:
+        file_path: Path to the PDF
+        start: First page (0-based, inclusive)
+        end: Last page (exclusive, defaults to the page count)
+        workers: Worker processes (defaults to config.pdf_workers)
+
+    Returns:
+        Page texts in page order
+    """
+    return [text for _, text in iter_pdf_pages(file_path, start, end, workers)]
 
 
 def _parse_docx(file_path: Path) -> str:
-    """Extract text from DOCX file."""
-    doc = Document(str(file_path))
-    text_parts = []
+    """Extract text from DOCX file as markdown (headings, lists and tables kept)."""
+    return docx_blocks_to_markdown(parse_docx_blocks(file_path))
+
+
+@dataclass
+class DocxBlock:
+    """One block of a DOCX body, in document order."""
 
-    for para in doc.paragraphs:
-        if para.text.strip():
-            text_parts.append(para.text)
+    kind: str  # "heading", "paragraph", "list_item", "table" or "code"
+    text: str = ""
+    level: int = 0  # Heading level (1-9) or list nesting level (0-based)
+    marker: str = ""  # List marker, e.g. "-" or "3."
+    rows: list[list[str]] = field(default_factory=list)  # Table cells
 
-    return "\n\n".join(text_parts)
 
+_W_P = qn("w:p")
+_W_TBL = qn("w:tbl")
+_W_TR = qn("w:tr")
+_W_TC = qn("w:tc")
+_W_T = qn("w:t")
+_W_TAB = qn("w:tab")
+_W_BR = qn("w:br")
+_W_VAL = qn("w:val")
+_W_PPR = qn("w:pPr")
+_W_PSTYLE = qn("w:pStyle")
+_W_NUMPR = qn("w:numPr")
+_W_NUMID = qn("w:numId")
+_W_ILVL = qn("w:ilvl")
+_W_OUTLINE = qn("w:outlineLvl")
 
-def export_to_docx(content: str, output_path: str | Path) -> None:
+
+def parse_docx_blocks(file_path: str | Path) -> list[DocxBlock]:
     """
-    Export markdown/text content to a DOCX file.
+    Parse a DOCX body into headings, paragraphs, list items and tables.
+
+    Walks the body XML once, so tables stay in document order and no paragraph
+    objects are built. Heading levels come from "Heading N"/"Title" styles or
+    outline levels; list items come from paragraph or style numbering.
 
     Args:
-        content: Text content (markdown will be rendered simply)
-        output_path: Path for the output DOCX file
+        file_path: Path to the DOCX file
+
+    Returns:
+        Blocks in document order
     """
-    output_path = Path(output_path)
+    doc = Document(str(file_path))
+    styles = _docx_style_info(doc)
+    num_formats = _docx_num_formats(doc)
+    counters: dict[tuple[str, int], int] = {}
+    blocks = []
 
-    # Create document
-    doc = Document()
+    for element in doc.element.body.iterchildren():
+        if element.tag == _W_TBL:
+            rows = [
+                [_element_text(tc) for tc in tr.iterchildren(_W_TC)]
+                for tr in element.iterchildren(_W_TR)
+            ]
+            if any(any(cell for cell in row) for row in rows):
+                blocks.append(DocxBlock(kind="table", rows=rows))
+        elif element.tag == _W_P:
+            block = _paragraph_block(element, styles, num_formats, counters)
+            if block is not None:
+                blocks.append(block)
 
-    # Split by markdown headers and paragraphs
-    lines = content.split("\n")
-    current_para: list[str] = []
+    return blocks
 
-    for line in lines:
-        line = line.strip()
 
-        if not line:
-            # Empty line - add paragraph if we have content
-            if current_para:
-                doc.add_paragraph(" ".join(current_para))
-                current_para = []
-            continue
+def docx_blocks_to_markdown(blocks: list[DocxBlock]) -> str:
+    """
+    Render DOCX blocks as markdown.
+
+    Args:
+        blocks: Blocks from parse_docx_blocks
 
-        # Check for headers
-        if line.startswith("# "):
-            if current_para:
-                doc.add_paragraph(" ".join(current_para))
-                current_para = []
-            doc.add_heading(line[2:], level=1)
-        elif line.startswith("## "):
-            if current_para:
-                doc.add_paragraph(" ".join(current_para))
-                current_para = []
-            doc.add_heading(line[3:], level=2)
-        elif line.startswith("### "):
-            if current_para:
-                doc.add_paragraph(" ".join(current_para))
-                current_para = []
-            doc.add_heading(line[4:], level=3)
+    Returns:
+        Markdown with # headings, list markers and pipe tables
+    """
+    parts: list[str] = []
+    previous_kind = None
+
+    for block in blocks:
+        if block.kind == "heading":
+            parts.append(f"{'#' * min(block.level, 6)} {block.text}")
+        elif block.kind == "list_item":
+            item = f"{'  ' * block.level}{block.marker} {block.text}"
+            # Consecutive list items form one markdown list
+            if previous_kind == "list_item":
+                parts[-1] += "\n" + item
+            else:
+                parts.append(item)
+        elif block.kind == "table":
+            width = max(len(row) for row in block.rows)
+            rows = [row + [""] * (width - len(row)) for row in block.rows]
+            lines = [_table_row(rows[0]), _table_row(["---"] * width)]
+            lines.extend(_table_row(row) for row in rows[1:])
+            parts.append("\n".join(lines))
         else:
-            # Regular text - clean markdown formatting
-            cleaned = line.replace("**", "").replace("*", "")
-            current_para.append(cleaned)
+            parts.append(block.text)
+        previous_kind = block.kind
+
+    return "\n\n".join(parts)
+
+
+def _table_row(cells: list[str]) -> str:
+    return "| " + " | ".join(cell.replace("|", "\\|").replace("\n", " ") for cell in cells) + " |"
 
-    # Add any remaining paragraph
-    if current_para:
-        doc.add_paragraph(" ".join(current_para))
 
-    # Save document
-    doc.save(str(output_path))
+def _paragraph_text(p) -> str:
+    """Text of a w:p element's runs, with tabs and breaks as spaces."""
+    return "".join(
+        (node.text or "") if node.tag == _W_T else " " for node in p.iter(_W_T, _W_TAB, _W_BR)
+    ).strip()
+
+
+def _element_text(element) -> str:
+    """Text of all paragraphs inside an element (e.g. a table cell), space-joined."""
+    return " ".join(text for p in element.iter(_W_P) if (text := _paragraph_text(p)))
+
+
+def _paragraph_block(
+    p,
+    styles: dict[str, tuple[int, str | None, int]],
+    num_formats: dict[tuple[str, int], str],
+    counters: dict[tuple[str, int], int],
+) -> DocxBlock | None:
+    """Classify one w:p element."""
+    text = _paragraph_text(p)
+    if not text:
+        return None
+
+    heading_level, num_id, ilvl = 0, None, 0
+    ppr = p.find(_W_PPR)
+    if ppr is not None:
+        pstyle = ppr.find(_W_PSTYLE)
+        if pstyle is not None:
+            heading_level, num_id, ilvl = styles.get(pstyle.get(_W_VAL), (0, None, 0))
+
+        outline = ppr.find(_W_OUTLINE)
+        if outline is not None:
+            heading_level = int(outline.get(_W_VAL)) + 1
+
+        numpr = ppr.find(_W_NUMPR)
+        if numpr is not None:
+            num_id_el, ilvl_el = numpr.find(_W_NUMID), numpr.find(_W_ILVL)
+            if num_id_el is not None:
+                num_id = num_id_el.get(_W_VAL)
+            if ilvl_el is not None:
+                ilvl = int(ilvl_el.get(_W_VAL))
+
+    if 0 < heading_level <= 9:
+        return DocxBlock(kind="heading", text=text, level=heading_level)
+
+    if num_id is None or num_id == "0":
+        return DocxBlock(kind="paragraph", text=text)
+    fmt = num_formats.get((num_id, ilvl))
+    if fmt is None or fmt == "none":
+        return DocxBlock(kind="paragraph", text=text)
+
+    if fmt == "bullet":
+        return DocxBlock(kind="list_item", text=text, level=ilvl, marker="-")
+
+    # Ordered list: count per (list, level) and restart deeper levels
+    counters[(num_id, ilvl)] = counters.get((num_id, ilvl), 0) + 1
+    for key in [k for k in counters if k[0] == num_id and k[1] > ilvl]:
+        del counters[key]
+    return DocxBlock(kind="list_item", text=text, level=ilvl, marker=f"{counters[(num_id, ilvl)]}.")
+
+
+def _docx_style_info(doc) -> dict[str, tuple[int, str | None, int]]:
+    """Map paragraph style IDs to (heading level, numbering ID, numbering level)."""
+    info = {}
+
+    for style in doc.styles.element.iterchildren(qn("w:style")):
+        style_id = style.get(qn("w:styleId"))
+        name_el = style.find(qn("w:name"))
+        name = (name_el.get(_W_VAL) if name_el is not None else "").lower()
+
+        level = 0
+        if name == "title":
+            level = 1
+        elif name.startswith("heading ") and name[8:].isdigit():
+            level = int(name[8:])
+
+        num_id, ilvl = None, 0
+        ppr = style.find(_W_PPR)
+        if ppr is not None:
+            outline = ppr.find(_W_OUTLINE)
+            if outline is not None and not level:
+                level = int(outline.get(_W_VAL)) + 1
+            numpr = ppr.find(_W_NUMPR)
+            if numpr is not None:
+                num_id_el, ilvl_el = numpr.find(_W_NUMID), numpr.find(_W_ILVL)
+                num_id = num_id_el.get(_W_VAL) if num_id_el is not None else None
+                ilvl = int(ilvl_el.get(_W_VAL)) if ilvl_el is not None else 0
+
+        if level or num_id is not None:
+            info[style_id] = (level, num_id, ilvl)
+
+    return info
+
+
+def _docx_num_formats(doc) -> dict[tuple[str, int], str]:
+    """Map (numbering ID, level) to its number format, e.g. "bullet" or "decimal"."""
+    try:
+        numbering = doc.part.numbering_part.element
+    except (KeyError, NotImplementedError):
+        return {}
+
+    abstract_formats: dict[str, dict[int, str]] = {}
+    for abstract in numbering.iterchildren(qn("w:abstractNum")):
+        levels = {}
+        for lvl in abstract.iterchildren(qn("w:lvl")):
+            fmt = lvl.find(qn("w:numFmt"))
+            levels[int(lvl.get(_W_ILVL))] = fmt.get(_W_VAL) if fmt is not None else "decimal"
+        abstract_formats[abstract.get(qn("w:abstractNumId"))] = levels
+
+    formats = {}
+    for num in numbering.iterchildren(qn("w:num")):
+        abstract_id = num.find(qn("w:abstractNumId"))
+        if abstract_id is None:
+            continue
+        for ilvl, fmt in abstract_formats.get(abstract_id.get(_W_VAL), {}).items():
+            formats[(num.get(qn("w:numId")), ilvl)] = fmt
+
+    return formats
@@ -0,0 +1,348 @@
+"""
+Markdown to DOCX exporter.
+
+Parses markdown into blocks (headings, paragraphs, bullet/numbered lists,
+tables and code) with inline bold/italic runs, then renders them into a copy of
+a cached template Document.
+"""
+
+import copy
+import io
+import re
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from pathlib import Path
+
+from docx import Document
+from docx.document import Document as DocumentObject
+from docx.shared import Pt
+
+from src.agent.utils.doc_handler import DocxBlock
+
+DOCX_MEDIA_TYPE = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+
+_HEADING = re.compile(r"^(#{1,6})\s+(.*?)\s*#*\s*$")
+_BULLET = re.compile(r"^(\s*)[-*+]\s+(.*)$")
+_NUMBERED = re.compile(r"^(\s*)(\d+)[.)]\s+(.*)$")
+_TABLE_SEPARATOR = re.compile(r"^\|?\s*:?-{2,}:?\s*(\|\s*:?-{2,}:?\s*)*\|?$")
+_RULE = re.compile(r"^(\*{3,}|-{3,}|_{3,})$")
+
+# Groups: 1 bold+italic, 2/3 bold, 4/5 italic, 6 code, 7 link text
+_INLINE = re.compile(
+    r"\*\*\*(.+?)\*\*\*"
+    r"|\*\*(.+?)\*\*"
+    r"|__(.+?)__"
+    r"|(?<![\w*])\*(?!\s)(.+?)(?<!\s)\*"
+    r"|(?<!\w)_(?!\s)(.+?)(?<!\s)_(?!\w)"
+    r"|`([^`]+)`"
+    r"|\[([^\]]+)\]\([^)]*\)"
+)
+
+# (text, bold, italic)
+Run = tuple[str, bool, bool]
+
+
+def parse_markdown_blocks(content: str) -> list[DocxBlock]:
+    """
+    Parse markdown into document blocks.
+
+    Args:
+        content: Markdown text
+
+    Returns:
+        Blocks in document order (heading, paragraph, list_item, table, code)
+    """
+    blocks: list[DocxBlock] = []
+    paragraph: list[str] = []
+    lines = content.splitlines()
+    i = 0
+
+    def flush_paragraph() -> None:
+        if paragraph:
+            blocks.append(DocxBlock(kind="paragraph", text=" ".join(paragraph)))
+            paragraph.clear()
+
+    while i < len(lines):
+        line = lines[i]
+        stripped = line.strip()
+
+        if not stripped:
+            flush_paragraph()
+        elif stripped.startswith("```"):
+            flush_paragraph()
+            code = []
+            i += 1
+            while i < len(lines) and not lines[i].strip().startswith("```"):
+                code.append(lines[i])
+                i += 1
+            blocks.append(DocxBlock(kind="code", text="\n".join(code)))
+        elif stripped.startswith("|"):
+            flush_paragraph()
+            rows = []
+            while i < len(lines) and lines[i].strip().startswith("|"):
+                row = lines[i].strip()
+                if not _TABLE_SEPARATOR.match(row):
+                    rows.append([cell.strip() for cell in row.strip("|").split("|")])
+                i += 1
+            blocks.append(DocxBlock(kind="table", rows=rows))
+            continue
+        elif match := _HEADING.match(stripped):
+            flush_paragraph()
+            blocks.append(DocxBlock(kind="heading", text=match[2], level=len(match[1])))
+        elif _RULE.match(stripped):
+            flush_paragraph()
+        elif match := _BULLET.match(line):
+            flush_paragraph()
+            level = len(match[1].expandtabs(4)) // 2
+            blocks.append(DocxBlock(kind="list_item", text=match[2], level=level, marker="-"))
+        elif match := _NUMBERED.match(line):
+            flush_paragraph()
+            level = len(match[1].expandtabs(4)) // 2
+            blocks.append(
+                DocxBlock(kind="list_item", text=match[3], level=level, marker=f"{match[2]}.")
+            )
+        else:
+            paragraph.append(stripped)
+        i += 1
+
+    flush_paragraph()
+    return blocks
+
+
+def parse_inline(text: str) -> list[Run]:
+    """
+    Split inline markdown into formatted runs.
+
+    Args:
+        text: Inline markdown (e.g. "Total **$450,000** *ex GST*")
+
+    Returns:
+        List of (text, bold, italic) runs
+    """
+    runs: list[Run] = []
+    position = 0
+
+    for match in _INLINE.finditer(text):
+        if match.start() > position:
+            runs.append((text[position : match.start()], False, False))
+
+        if match[1] is not None:
+            runs.append((match[1], True, True))
+        elif match[2] is not None or match[3] is not None:
+            runs.append((match[2] or match[3], True, False))
+        elif match[4] is not None or match[5] is not None:
+            runs.append((match[4] or match[5], False, True))
+        else:
+            runs.append((match[6] or match[7], False, False))
+        position = match.end()
+
+    if position < len(text):
+        runs.append((text[position:], False, False))
+    return runs
+
+
+@lru_cache(maxsize=4)
+def _template(
+    template_path: str | None = None,
+) -> tuple[DocumentObject, dict[str, str], int | None]:
+    """
+    Load a template once; exports render into deep copies of it.
+
+    Returns:
+        Tuple of (template Document, style ID by style name, "List Number" numbering ID)
+    """
+    doc = Document(template_path)
+    style_ids = {style.name: style.style_id for style in doc.styles}
+
+    list_num_id = None
+    if "List Number" in style_ids:
+        ppr = doc.styles["List Number"].element.pPr
+        if ppr is not None and ppr.numPr is not None and ppr.numPr.numId is not None:
+            list_num_id = ppr.numPr.numId.val
+
+    return doc, style_ids, list_num_id
+
+
+def render_docx(content: str, template_path: str | Path | None = None) -> DocumentObject:
+    """
+    Render markdown into a new Document.
+
+    Args:
+        content: Markdown content
+        template_path: Optional DOCX whose styles are used (defaults to python-docx's)
+
+    Returns:
+        Rendered Document
+    """
+    template, style_ids, list_num_id = _template(str(template_path) if template_path else None)
+    doc = copy.deepcopy(template)
+    _DocxRenderer(doc, style_ids, list_num_id).render(parse_markdown_blocks(content))
+    return doc
+
+
+def export_to_bytes(content: str, template_path: str | Path | None = None) -> bytes:
+    """
+    Render markdown to DOCX bytes, e.g. for an HTTP download.
+
+    Args:
+        content: Markdown content
+        template_path: Optional DOCX template
+
+    Returns:
+        DOCX file contents
+    """
+    buffer = io.BytesIO()
+    render_docx(content, template_path).save(buffer)
+    return buffer.getvalue()
+
+
+def export_to_docx(
+    content: str, output_path: str | Path, template_path: str | Path | None = None
+) -> None:
+    """
+    Export markdown content to a DOCX file.
+
+    Args:
+        content: Markdown content
+        output_path: Path for the output DOCX file
+        template_path: Optional DOCX template
+    """
+    render_docx(content, template_path).save(str(output_path))
+
+
+def _export_file(content: str, output_path: str, template_path: str | None) -> str:
+    """Worker entry point: render one document to a file."""
+    render_docx(content, template_path).save(output_path)
+    return output_path
+
+
+def export_batch(
+    documents: dict[str, str],
+    output_dir: str | Path,
+    workers: int = 4,
+    template_path: str | Path | None = None,
+) -> dict[str, Path]:
+    """
+    Export several markdown documents to DOCX concurrently.
+
+    Args:
+        documents: Mapping of output file stem to markdown content
+        output_dir: Directory for the DOCX files
+        workers: Worker processes
+        template_path: Optional DOCX template
+
+    Returns:
+        Mapping of file stem to written path
+    """
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    template = str(template_path) if template_path else None
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {
+            name: pool.submit(_export_file, content, str(output_dir / f"{name}.docx"), template)
+            for name, content in documents.items()
+        }
+        return {name: Path(future.result()) for name, future in futures.items()}
+
+
+class _DocxRenderer:
+    """Renders blocks into a Document.
+
+    Style IDs are resolved once per template and written straight to the
+    paragraph XML; python-docx's per-paragraph style lookup by name dominates
+    render time otherwise.
+    """
+
+    def __init__(
+        self, doc: DocumentObject, style_ids: dict[str, str], list_num_id: int | None
+    ) -> None:
+        self.doc = doc
+        self.style_ids = style_ids
+        self.list_num_id = list_num_id
+        self.previous_kind: str | None = None
+        self.num_id: int | None = None
+
+    def render(self, blocks: list[DocxBlock]) -> None:
+        heading_ids = [self.style_ids.get("Title")] + [
+            self.style_ids.get(f"Heading {level}") for level in range(1, 10)
+        ]
+        list_ids = {
+            (ordered, level): self.style_ids.get(f"List {kind}{suffix}")
+            for ordered, kind in ((False, "Bullet"), (True, "Number"))
+            for level, suffix in enumerate(("", " 2", " 3"))
+        }
+
+        for block in blocks:
+            if block.kind == "heading":
+                self._add_runs(self._add_paragraph(heading_ids[min(block.level, 9)]), block.text)
+            elif block.kind == "list_item":
+                level = min(block.level, 2)
+                ordered = block.marker != "-"
+                paragraph = self._add_paragraph(list_ids[(ordered, level)])
+                self._add_runs(paragraph, block.text)
+                if ordered and level == 0:
+                    self._restart_numbering(paragraph)
+            elif block.kind == "table":
+                self._add_table(block.rows)
+            elif block.kind == "code":
+                run = self._add_paragraph().add_run(block.text)
+                run.font.name = "Courier New"
+                run.font.size = Pt(9)
+            else:
+                self._add_runs(self._add_paragraph(), block.text)
+            self.previous_kind = block.kind
+
+    def _add_paragraph(self, style_id: str | None = None):
+        paragraph = self.doc.add_paragraph()
+        if style_id is not None:
+            paragraph._p.style = style_id
+        return paragraph
+
+    def _add_runs(self, paragraph, text: str) -> None:
+        for run_text, bold, italic in parse_inline(text):
+            run = paragraph.add_run(run_text)
+            if bold:
+                run.bold = True
+            if italic:
+                run.italic = True
+
+    def _restart_numbering(self, paragraph) -> None:
+        """Make each numbered list start at 1 instead of continuing the previous one."""
+        if self.previous_kind != "list_item" or self.num_id is None:
+            self.num_id = self._new_num_id()
+        if self.num_id is not None:
+            num_pr = paragraph._p.get_or_add_pPr().get_or_add_numPr()
+            num_pr.get_or_add_ilvl().val = 0
+            num_pr.get_or_add_numId().val = self.num_id
+
+    def _new_num_id(self) -> int | None:
+        """Create an instance of the "List Number" numbering that starts at 1."""
+        if self.list_num_id is None:
+            return None
+
+        numbering = self.doc.part.numbering_part.element
+        abstract_id = numbering.num_having_numId(self.list_num_id).abstractNumId.val
+        num = numbering.add_num(abstract_id)
+        num.add_lvlOverride(ilvl=0).add_startOverride(1)
+        return num.numId
+
+    def _add_table(self, rows: list[list[str]]) -> None:
+        if not rows:
+            return
+        width = max(len(row) for row in rows)
+        table = self.doc.add_table(rows=len(rows), cols=width)
+        table_style_id = self.style_ids.get("Table Grid")
+        if table_style_id is not None:
+            table._tbl.tblStyle_val = table_style_id
+
+        for r, (row, cells) in enumerate(zip(table.rows, rows, strict=True)):
+            for cell, text in zip(row.cells, cells, strict=False):
+                paragraph = cell.paragraphs[0]
+                for run_text, bold, italic in parse_inline(text):
+                    run = paragraph.add_run(run_text)
+                    # Header row is bold
+                    if bold or r == 0:
+                        run.bold = True
+                    if italic:
+                        run.italic = True
@@ -0,0 +1,424 @@
+"""
+Rate limiting and adaptive concurrency for Bedrock calls.
+
+Every Bedrock request in the process (boto3 via ``config.bedrock_runtime``,
+which ChatBedrock and BedrockEmbeddings use, and the async transport) goes
+through one shared BedrockRateLimiter:
+
+- a token bucket caps the request rate, with bursts up to its capacity;
+- an AIMD concurrency limit grows by about one slot per round of successful
+  calls and halves when Bedrock throttles (at most once per round, so a burst
+  of throttles from the same moment counts once);
+- throttled calls are retried with full-jitter exponential backoff, after the
+  limit has been lowered, instead of every thread retrying at once;
+- transient failures (5xx errors, connection resets, timeouts) are retried
+  with the same backoff, without lowering the limit.
+
+botocore's own retries are turned off for the client so they do not compound.
+"""
+
+import asyncio
+import logging
+import random
+import threading
+import time
+from collections import deque
+from collections.abc import Awaitable, Callable
+from typing import Any, TypeVar
+
+from src.agent.config import config
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+THROTTLING_ERROR_CODES = frozenset(
+    {
+        "ThrottlingException",
+        "TooManyRequestsException",
+        "ServiceUnavailableException",
+        "ModelNotReadyException",
+    }
+)
+
+
+# Server-side failures worth retrying that are not throttles
+TRANSIENT_ERROR_CODES = frozenset({"InternalServerException", "ModelTimeoutException"})
+
+
+def is_throttling_error(error: BaseException) -> bool:
+    """Whether an exception from boto3, the async transport or a wrapper is a throttle."""
+    response = getattr(error, "response", None)
+    if isinstance(response, dict):
+        code = response.get("Error", {}).get("Code")
+        if code in THROTTLING_ERROR_CODES:
+            return True
+    if getattr(error, "error_type", None) in THROTTLING_ERROR_CODES:
+        return True
+    if getattr(error, "status_code", None) == 429:
+        return True
+    # langchain_aws re-raises boto errors as ValueError with the code in the message
+    message = str(error)
+    return any(code in message for code in THROTTLING_ERROR_CODES)
+
+
+def is_transient_error(error: BaseException) -> bool:
+    """Whether an exception is a transient failure: a 5xx, connection reset or timeout."""
+    # Imported on use, keeping botocore out of this module's import
+    import httpx
+    from botocore.exceptions import ConnectionError as BotoConnectionError
+    from botocore.exceptions import HTTPClientError
+
+    if isinstance(error, (BotoConnectionError, HTTPClientError, httpx.TransportError)):
+        return True
+    response = getattr(error, "response", None)
+    if isinstance(response, dict):
+        if response.get("Error", {}).get("Code") in TRANSIENT_ERROR_CODES:
+            return True
+        if response.get("ResponseMetadata", {}).get("HTTPStatusCode", 0) >= 500:
+            return True
+    status_code = getattr(error, "status_code", None)
+    if isinstance(status_code, int) and status_code >= 500:
+        return True
+    message = str(error)
+    return any(code in message for code in TRANSIENT_ERROR_CODES)
+
+
+class TokenBucket:
+    """Thread-safe token bucket; callers reserve a token and sleep off any debt."""
+
+    def __init__(
+        self, rate: float, capacity: float, clock: Callable[[], float] = time.monotonic
+    ) -> None:
+        """
+        Initialize the bucket (full).
+
+        Args:
+            rate: Tokens added per second (0 disables limiting)
+            capacity: Maximum tokens, i.e. the largest burst
+            clock: Monotonic clock, injectable for tests
+        """
+        self.rate = rate
+        self.capacity = max(1.0, capacity)
+        self._clock = clock
+        self._tokens = self.capacity
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """
+        Take one token.
+
+        Returns:
+            Seconds the caller must wait before using it (0 if available now)
+        """
+        if self.rate <= 0:
+            return 0.0
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+
+class AdaptiveConcurrency:
+    """AIMD concurrency limit shared by threads and event loops."""
+
+    def __init__(
+        self, initial: float, minimum: float = 1.0, maximum: float = 64.0, decrease: float = 0.5
+    ) -> None:
+        """
+        Initialize the limit.
+
+        Args:
+            initial: Starting limit
+            minimum: Floor for the limit
+            maximum: Ceiling for the limit
+            decrease: Multiplier applied on a throttle
+        """
+        self.minimum = minimum
+        self.maximum = maximum
+        self.decrease = decrease
+        self.limit = min(maximum, max(minimum, initial))
+        self.in_flight = 0
+        self._epoch = 0  # bumped on every decrease
+        self._cond = threading.Condition()
+        self._async_waiters: deque[tuple[asyncio.AbstractEventLoop, asyncio.Future]] = deque()
+
+    def _has_room(self) -> bool:
+        return self.in_flight < int(self.limit)
+
+    def acquire(self) -> int:
+        """Block until a slot is free; returns the epoch to pass to on_throttle()."""
+        with self._cond:
+            while not self._has_room():
+                self._cond.wait()
+            self.in_flight += 1
+            return self._epoch
+
+    async def aacquire(self) -> int:
+        """Wait on the event loop until a slot is free; returns the epoch."""
+        with self._cond:
+            if self._has_room() and not self._async_waiters:
+                self.in_flight += 1
+                return self._epoch
+            future = asyncio.get_running_loop().create_future()
+            self._async_waiters.append((asyncio.get_running_loop(), future))
+        try:
+            await future
+        except asyncio.CancelledError:
+            with self._cond:
+                waiter = (future.get_loop(), future)
+                if waiter in self._async_waiters:
+                    self._async_waiters.remove(waiter)
+                    raise
+            # Granted before the cancellation arrived (if the future itself was
+            # cancelled, _grant gives the slot back)
+            if not future.cancelled():
+                self.release()
+            raise
+        return self._epoch
+
+    def release(self) -> None:
+        with self._cond:
+            self.in_flight -= 1
+            self._wake()
+
+    def _wake(self) -> None:
+        # Called with the lock held
+        while self._async_waiters and self._has_room():
+            loop, future = self._async_waiters.popleft()
+            self.in_flight += 1
+            loop.call_soon_threadsafe(self._grant, future)
+        self._cond.notify_all()
+
+    def _grant(self, future: asyncio.Future) -> None:
+        if future.done():
+            self.release()
+        else:
+            future.set_result(None)
+
+    def on_success(self) -> None:
+        """Additive increase: about one more slot per limit's worth of successes."""
+        with self._cond:
+            self.limit = min(self.maximum, self.limit + 1 / self.limit)
+            self._wake()
+
+    def on_throttle(self, epoch: int) -> None:
+        """
+        Multiplicative decrease, once per epoch.
+
+        Args:
+            epoch: Epoch the throttled request started in
+        """
+        with self._cond:
+            if epoch != self._epoch:
+                return  # limit already lowered since this request started
+            self.limit = max(self.minimum, self.limit * self.decrease)
+            self._epoch += 1
+            logger.info(f"Bedrock throttled: concurrency limit lowered to {self.limit:.1f}")
+
+
+class BedrockRateLimiter:
+    """Token bucket, AIMD concurrency and retries around Bedrock calls."""
+
+    def __init__(
+        self,
+        rate: float | None = None,
+        burst: float | None = None,
+        max_concurrency: int | None = None,
+        min_concurrency: int | None = None,
+        max_retries: int | None = None,
+        backoff_base: float = 0.5,
+        backoff_cap: float = 20.0,
+    ) -> None:
+        """
+        Initialize the limiter (defaults from config).
+
+        Args:
+            rate: Requests per second (0 disables the bucket)
+            burst: Bucket capacity
+            max_concurrency: Starting and maximum concurrent requests
+            min_concurrency: Lowest the AIMD limit goes
+            max_retries: Retries of a throttled or transient failure before the error is raised
+            backoff_base: First retry's maximum delay in seconds
+            backoff_cap: Largest retry delay in seconds
+        """
+        rate = config.bedrock_rate_limit if rate is None else rate
+        max_concurrency = max_concurrency or config.bedrock_max_concurrency
+        self.bucket = TokenBucket(rate, burst or config.bedrock_burst)
+        self.concurrency = AdaptiveConcurrency(
+            initial=max_concurrency,
+            minimum=min_concurrency or config.bedrock_min_concurrency,
+            maximum=max_concurrency,
+        )
+        self.max_retries = config.bedrock_max_retries if max_retries is None else max_retries
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+
+        # Metrics
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.throttles = 0
+        self.retries = 0
+        self.failures = 0
+        self.wait_seconds_total = 0.0
+
+    def _backoff(self, attempt: int) -> float:
+        return random.uniform(0, min(self.backoff_cap, self.backoff_base * 2**attempt))
+
+    def _record(self, waited: float, throttled: bool = False, retry: bool = False) -> None:
+        with self._lock:
+            self.calls += 1
+            self.wait_seconds_total += waited
+            self.throttles += throttled
+            self.retries += retry
+
+    def call(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """
+        Run a blocking Bedrock call under the limiter.
+
+        Args:
+            fn: Function making one Bedrock request
+            *args: Positional arguments for fn
+            **kwargs: Keyword arguments for fn
+
+        Returns:
+            fn's result
+
+        Raises:
+            Exception: fn's error, if it is not retryable or retries are exhausted
+        """
+        attempt = 0
+        while True:
+            start = time.perf_counter()
+            delay = self.bucket.reserve()
+            if delay:
+                time.sleep(delay)
+            epoch = self.concurrency.acquire()
+            waited = time.perf_counter() - start
+            try:
+                result = fn(*args, **kwargs)
+            except Exception as e:
+                throttled = is_throttling_error(e)
+                if not (throttled or is_transient_error(e)):
+                    self._record(waited)
+                    raise
+                if throttled:
+                    self.concurrency.on_throttle(epoch)
+                self._record(waited, throttled=throttled, retry=attempt < self.max_retries)
+                if attempt == self.max_retries:
+                    with self._lock:
+                        self.failures += 1
+                    raise
+            else:
+                self.concurrency.on_success()
+                self._record(waited)
+                return result
+            finally:
+                self.concurrency.release()
+            time.sleep(self._backoff(attempt))
+            attempt += 1
+
+    async def acall(self, fn: Callable[..., Awaitable[T]], *args: Any, **kwargs: Any) -> T:
+        """
+        Await a Bedrock coroutine under the limiter.
+
+        Args:
+            fn: Coroutine function making one Bedrock request
+            *args: Positional arguments for fn
+            **kwargs: Keyword arguments for fn
+
+        Returns:
+            fn's result
+        """
+        attempt = 0
+        while True:
+            start = time.perf_counter()
+            delay = self.bucket.reserve()
+            if delay:
+                await asyncio.sleep(delay)
+            epoch = await self.concurrency.aacquire()
+            waited = time.perf_counter() - start
+            try:
+                result = await fn(*args, **kwargs)
+            except Exception as e:
+                throttled = is_throttling_error(e)
+                if not (throttled or is_transient_error(e)):
+                    self._record(waited)
+                    raise
+                if throttled:
+                    self.concurrency.on_throttle(epoch)
+                self._record(waited, throttled=throttled, retry=attempt < self.max_retries)
+                if attempt == self.max_retries:
+                    with self._lock:
+                        self.failures += 1
+                    raise
+            else:
+                self.concurrency.on_success()
+                self._record(waited)
+                return result
+            finally:
+                self.concurrency.release()
+            await asyncio.sleep(self._backoff(attempt))
+            attempt += 1
+
+    def snapshot(self) -> dict:
+        """Throttle rate, queue wait and the current concurrency limit."""
+        with self._lock:
+            calls = self.calls
+            return {
+                "calls": calls,
+                "throttles": self.throttles,
+                "throttle_rate": round(self.throttles / calls, 4) if calls else 0.0,
+                "retries": self.retries,
+                "failures": self.failures,
+                "avg_queue_wait_ms": round(
+                    self.wait_seconds_total / calls * 1000 if calls else 0.0, 1
+                ),
+                "concurrency_limit": round(self.concurrency.limit, 2),
+                "in_flight": self.concurrency.in_flight,
+            }
+
+
+class ThrottledBedrockClient:
+    """bedrock-runtime client proxy that sends model calls through the limiter."""
+
+    _LIMITED = frozenset(
+        {
+            "invoke_model",
+            "invoke_model_with_response_stream",
+            "converse",
+            "converse_stream",
+        }
+    )
+
+    def __init__(self, client: Any, limiter: "BedrockRateLimiter | None" = None) -> None:
+        self._client = client
+        self._limiter = limiter
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self._client, name)
+        if name not in self._LIMITED:
+            return attr
+
+        def limited(*args: Any, **kwargs: Any) -> Any:
+            return (self._limiter or get_bedrock_limiter()).call(attr, *args, **kwargs)
+
+        return limited
+
+
+# Global limiter shared by every Bedrock caller in the process
+_limiter: BedrockRateLimiter | None = None
+_limiter_lock = threading.Lock()
+
+
+def get_bedrock_limiter() -> BedrockRateLimiter:
+    """Get or create the shared Bedrock rate limiter."""
+    global _limiter
+    if _limiter is None:
+        with _limiter_lock:
+            if _limiter is None:
+                _limiter = BedrockRateLimiter()
+    return _limiter
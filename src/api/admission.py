@@ -0,0 +1,271 @@
+"""
+Admission control for API requests.
+
+Requests are admitted through lanes. Each lane caps how many requests run at
+once, both in total and per tenant, and holds a bounded FIFO queue of waiting
+requests. A request that finds the queue full, or is still queued when its
+deadline passes, is rejected with 429 and a Retry-After estimate instead of
+piling onto Bedrock. Generations and the cheap review/research calls use
+separate lanes, so a burst of generations never delays a review.
+
+The tenant is the authenticated user when an authentication middleware has
+set one, else the client address. The X-Tenant-ID header is honoured only when
+TRUST_TENANT_HEADER is enabled, since any client can send it.
+"""
+
+import asyncio
+import logging
+import math
+import time
+from collections import Counter, deque
+from collections.abc import AsyncIterator, Callable
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+
+from fastapi import HTTPException, Request
+
+from src.agent.config import config
+
+logger = logging.getLogger(__name__)
+
+TENANT_HEADER = "X-Tenant-ID"
+
+# Weight of the latest request in the moving average of service time
+_SERVICE_TIME_ALPHA = 0.2
+
+
+@dataclass(frozen=True)
+class LaneLimits:
+    """Concurrency and queueing limits of a lane."""
+
+    max_concurrent: int
+    max_per_tenant: int
+    max_queue: int
+    queue_timeout: float  # seconds a request may wait for a slot
+
+
+class AdmissionLane:
+    """Concurrency-limited lane with a bounded, deadline-checked wait queue."""
+
+    def __init__(self, name: str, limits: LaneLimits) -> None:
+        self.name = name
+        self.limits = limits
+        self.active = 0
+        self._active_by_tenant: Counter[str] = Counter()
+        self._waiters: deque[tuple[str, asyncio.Future]] = deque()
+        self._service_time: float | None = None
+
+        # Metrics
+        self.admitted = 0
+        self.rejected = 0
+        self.wait_seconds_total = 0.0
+
+    def _can_start(self, tenant: str) -> bool:
+        return (
+            self.active < self.limits.max_concurrent
+            and self._active_by_tenant[tenant] < self.limits.max_per_tenant
+        )
+
+    def _start(self, tenant: str) -> None:
+        self.active += 1
+        self._active_by_tenant[tenant] += 1
+
+    def retry_after(self) -> int:
+        """Seconds until a slot is likely to be free, for the Retry-After header."""
+        if self._service_time is None:
+            return max(1, math.ceil(self.limits.queue_timeout))
+        backlog = (len(self._waiters) + 1) / max(1, self.limits.max_concurrent)
+        return max(1, math.ceil(self._service_time * backlog))
+
+    def _reject(self, reason: str) -> HTTPException:
+        self.rejected += 1
+        retry_after = self.retry_after()
+        logger.warning(f"Admission lane '{self.name}' rejected a request: {reason}")
+        return HTTPException(
+            status_code=429,
+            detail=f"Too many {self.name} requests ({reason}); retry in {retry_after}s",
+            headers={"Retry-After": str(retry_after)},
+        )
+
+    async def acquire(self, tenant: str) -> None:
+        """
+        Wait for a slot.
+
+        Args:
+            tenant: Tenant the request belongs to
+
+        Raises:
+            HTTPException: 429 if the queue is full or the deadline passes first
+        """
+        # Start at once unless an earlier request of the same tenant is waiting
+        if self._can_start(tenant) and all(t != tenant for t, _ in self._waiters):
+            self._start(tenant)
+            self.admitted += 1
+            return
+
+        if len(self._waiters) >= self.limits.max_queue:
+            raise self._reject("queue full")
+
+        waiter = (tenant, asyncio.get_running_loop().create_future())
+        self._waiters.append(waiter)
+        enqueued = time.perf_counter()
+        try:
+            done, _ = await asyncio.wait({waiter[1]}, timeout=self.limits.queue_timeout)
+        except asyncio.CancelledError:
+            self._abandon(waiter)
+            raise
+        self.wait_seconds_total += time.perf_counter() - enqueued
+
+        if not done:
+            self._abandon(waiter)
+            raise self._reject("queue deadline exceeded")
+        self.admitted += 1
+
+    def _abandon(self, waiter: tuple[str, asyncio.Future]) -> None:
+        tenant, future = waiter
+        if future.done() and not future.cancelled():
+            # Granted a slot just as the caller gave up: hand it on
+            self.release(tenant)
+            return
+        future.cancel()
+        try:
+            self._waiters.remove(waiter)
+        except ValueError:
+            pass
+
+    def release(self, tenant: str, service_time: float | None = None) -> None:
+        """
+        Free a slot and start the earliest waiters that now fit.
+
+        Args:
+            tenant: Tenant that held the slot
+            service_time: How long the request ran, for Retry-After estimates
+        """
+        self.active -= 1
+        self._active_by_tenant[tenant] -= 1
+        if self._active_by_tenant[tenant] <= 0:
+            del self._active_by_tenant[tenant]
+        if service_time is not None:
+            if self._service_time is None:
+                self._service_time = service_time
+            else:
+                self._service_time += _SERVICE_TIME_ALPHA * (service_time - self._service_time)
+
+        # Waiters of tenants at their limit are skipped, not allowed to block others
+        for waiter in list(self._waiters):
+            if self.active >= self.limits.max_concurrent:
+                break
+            waiter_tenant, future = waiter
+            if future.done():
+                self._waiters.remove(waiter)
+            elif self._can_start(waiter_tenant):
+                self._waiters.remove(waiter)
+                self._start(waiter_tenant)
+                future.set_result(None)
+
+    @asynccontextmanager
+    async def slot(self, tenant: str) -> AsyncIterator[None]:
+        """Hold a slot for the duration of the block."""
+        await self.acquire(tenant)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.release(tenant, time.perf_counter() - start)
+
+    def snapshot(self) -> dict:
+        """Current load and counters."""
+        return {
+            "active": self.active,
+            "queued": len(self._waiters),
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+            "avg_wait_ms": round(
+                self.wait_seconds_total / self.admitted * 1000 if self.admitted else 0.0, 1
+            ),
+            "limits": {
+                "max_concurrent": self.limits.max_concurrent,
+                "max_per_tenant": self.limits.max_per_tenant,
+                "max_queue": self.limits.max_queue,
+                "queue_timeout": self.limits.queue_timeout,
+            },
+        }
+
+
+class AdmissionController:
+    """Named admission lanes shared by the API process."""
+
+    def __init__(self, lanes: dict[str, LaneLimits]) -> None:
+        self.lanes = {name: AdmissionLane(name, limits) for name, limits in lanes.items()}
+
+    def lane(self, name: str) -> AdmissionLane:
+        return self.lanes[name]
+
+    def snapshot(self) -> dict[str, dict]:
+        return {name: lane.snapshot() for name, lane in self.lanes.items()}
+
+
+def default_lanes() -> dict[str, LaneLimits]:
+    """Lanes from configuration: SOW generation and interactive review/research."""
+    return {
+        "generation": LaneLimits(
+            max_concurrent=config.generation_max_concurrent,
+            max_per_tenant=config.generation_max_per_tenant,
+            max_queue=config.generation_queue_size,
+            queue_timeout=config.generation_queue_timeout,
+        ),
+        "interactive": LaneLimits(
+            max_concurrent=config.interactive_max_concurrent,
+            max_per_tenant=config.interactive_max_per_tenant,
+            max_queue=config.interactive_queue_size,
+            queue_timeout=config.interactive_queue_timeout,
+        ),
+    }
+
+
+def tenant_of(request: Request) -> str:
+    """
+    Tenant of a request, for the per-tenant admission limits.
+
+    The authenticated user wins. The X-Tenant-ID header is used only with
+    TRUST_TENANT_HEADER, i.e. behind a proxy that sets it; otherwise a client
+    could dodge its limit by sending a new tenant on every request.
+
+    Args:
+        request: Incoming request
+
+    Returns:
+        Tenant identifier (user, trusted header or client address)
+    """
+    user = request.scope.get("user")
+    if user is not None and user.is_authenticated:
+        return str(user.display_name)
+
+    if config.trust_tenant_header:
+        tenant = request.headers.get(TENANT_HEADER, "").strip()
+        if tenant:
+            return tenant
+
+    return request.client.host if request.client else "anonymous"
+
+
+def admit(lane: str) -> Callable[[Request], AsyncIterator[None]]:
+    """
+    FastAPI dependency that holds a slot in a lane while the request runs.
+
+    Usage:
+        @router.post("/create", dependencies=[Depends(admit("generation"))])
+
+    Args:
+        lane: Lane name ("generation" or "interactive")
+    """
+
+    async def dependency(request: Request) -> AsyncIterator[None]:
+        async with admission_controller.lane(lane).slot(tenant_of(request)):
+            yield
+
+    return dependency
+
+
+# Global admission controller for the API process
+admission_controller = AdmissionController(default_lanes())
@@ -133,8 +133,11 @@ def audit_endpoint(endpoint_name: str):
                 # Convert Pydantic model to dict if needed
                 if hasattr(result, "model_dump"):
                     response_data = result.model_dump()
-                else:
+                elif isinstance(result, dict):
                     response_data = result
+                else:
+                    # File downloads and streams: record the media type only
+                    response_data = {"media_type": getattr(result, "media_type", None)}
 
                 return result
 
@@ -4,17 +4,66 @@ Dependency injection for API endpoints.
 Provides singleton instances of agent and other shared resources.
 """
 
+from concurrent.futures import ProcessPoolExecutor
 from functools import lru_cache
+from typing import TYPE_CHECKING
 
-from src.agent.core import SOWAgent, get_agent
+from src.agent.config import config
+
+if TYPE_CHECKING:
+    from src.agent.core import SOWAgent, SOWSessions
 
 
 @lru_cache
-def get_sow_agent() -> SOWAgent:
+def get_sow_agent() -> "SOWAgent":
     """
     Get singleton instance of SOW agent.
 
+    The agent module (LangGraph, langchain_aws) is imported on the first call
+    rather than at API startup.
+
     Returns:
         SOWAgent instance
     """
+    from src.agent.core import get_agent
+
     return get_agent()
+
+
+@lru_cache
+def get_sow_sessions() -> "SOWSessions":
+    """
+    Get singleton instance of the SOW editing sessions.
+
+    Returns:
+        SOWSessions instance
+    """
+    from src.agent.core import get_sessions
+
+    return get_sessions()
+
+
+@lru_cache
+def get_parse_pool() -> ProcessPoolExecutor:
+    """
+    Get the shared process pool used to parse uploaded documents.
+
+    Returns:
+        ProcessPoolExecutor sized by config.parse_workers
+    """
+    from src.agent.utils.doc_handler import mark_pool_worker
+
+    return ProcessPoolExecutor(max_workers=config.parse_workers, initializer=mark_pool_worker)
+
+
+@lru_cache
+def get_review_pool() -> ProcessPoolExecutor:
+    """
+    Get the shared process pool used for batch reviews.
+
+    Returns:
+        ProcessPoolExecutor sized by config.review_workers
+    """
+    from src.agent.utils.doc_handler import mark_pool_worker
+
+    return ProcessPoolExecutor(max_workers=config.review_workers, initializer=mark_pool_worker)
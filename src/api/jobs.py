@@ -0,0 +1,269 @@
+"""
+Background SOW generation jobs with a speculative quick draft.
+
+A job assembles the generation context once (CRM, opportunities, product KB,
+historical SOWs, compliance bundle), then generates the quick draft and
+publishes it straight away. In production mode the same context and that
+draft are then critiqued and revised, skipping the reflection tool's own
+initial draft call, and the refined SOW is published when it is ready.
+
+Refinement therefore starts from the quick draft, written by the quick-mode
+route (the fast profile, FAST_MODEL_ID), not by the production draft model.
+A quick draft cut off at its max_tokens limit fails the job instead of being
+published or refined.
+
+Clients poll the job or follow it as server-sent events.
+"""
+
+import asyncio
+import json
+import logging
+import time
+import uuid
+from collections import OrderedDict
+from collections.abc import AsyncIterator, Callable, Coroutine
+from dataclasses import dataclass, field
+from typing import Any
+
+from starlette.concurrency import run_in_threadpool
+
+from src.agent.config import config
+
+logger = logging.getLogger(__name__)
+
+# Events after which a job's stream ends
+_FINAL_EVENTS = ("final", "error")
+
+
+@dataclass
+class GenerationJob:
+    """State of one SOW generation job."""
+
+    id: str
+    client_id: str
+    product: str
+    quality_mode: str
+    status: str = "queued"  # queued, researching, drafting, refining, done, failed
+    draft: str | None = None
+    sow_text: str | None = None
+    error: str | None = None
+    created_at: float = field(default_factory=time.time)
+    timings: dict[str, float] = field(default_factory=dict)  # seconds since creation
+    events: list[dict] = field(default_factory=list)
+    task: asyncio.Task | None = field(default=None, repr=False)
+    _changed: asyncio.Condition = field(default_factory=asyncio.Condition, repr=False)
+
+    @property
+    def finished(self) -> bool:
+        return self.status in ("done", "failed")
+
+    async def publish(self, event: str, data: dict) -> None:
+        """Append an event and wake the streams following this job."""
+        self.events.append({"id": len(self.events) + 1, "event": event, "data": data})
+        async with self._changed:
+            self._changed.notify_all()
+
+    async def follow(self, after: int = 0) -> AsyncIterator[dict]:
+        """
+        Yield the job's events in order, waiting for new ones until it finishes.
+
+        Args:
+            after: Skip events up to this id (the SSE Last-Event-ID)
+        """
+        position = after
+        while True:
+            while position < len(self.events):
+                event = self.events[position]
+                position += 1
+                yield event
+                if event["event"] in _FINAL_EVENTS:
+                    return
+            if self.finished:
+                return
+            async with self._changed:
+                if position >= len(self.events) and not self.finished:
+                    await self._changed.wait()
+
+    def to_dict(self) -> dict:
+        return {
+            "job_id": self.id,
+            "status": self.status,
+            "client_id": self.client_id,
+            "product": self.product,
+            "quality_mode": self.quality_mode,
+            "draft": self.draft,
+            "sow_text": self.sow_text,
+            "error": self.error,
+            "timings": dict(self.timings),
+        }
+
+
+class JobStore:
+    """In-memory generation jobs, oldest evicted first once finished and expired."""
+
+    def __init__(self, ttl_seconds: float | None = None) -> None:
+        self.ttl_seconds = config.generation_job_ttl if ttl_seconds is None else ttl_seconds
+        self._jobs: OrderedDict[str, GenerationJob] = OrderedDict()
+
+    def create(self, client_id: str, product: str, quality_mode: str) -> GenerationJob:
+        self._evict()
+        job = GenerationJob(
+            id=uuid.uuid4().hex, client_id=client_id, product=product, quality_mode=quality_mode
+        )
+        self._jobs[job.id] = job
+        return job
+
+    def get(self, job_id: str) -> GenerationJob | None:
+        return self._jobs.get(job_id)
+
+    def _evict(self) -> None:
+        cutoff = time.time() - self.ttl_seconds
+        for job_id, job in list(self._jobs.items()):
+            if job.created_at >= cutoff:
+                break
+            if job.finished:
+                del self._jobs[job_id]
+
+
+def assemble_generation_context(
+    client_id: str, product: str, requirements: str | None = None
+) -> dict:
+    """
+    Run the research tools and assemble the context package for generation.
+
+    Args:
+        client_id: Client ID (or name) in the CRM
+        product: Product name
+        requirements: Additional requirements from the request
+
+    Returns:
+        Context package as produced by assemble_context
+
+    Raises:
+        LookupError: If the client is not in the CRM
+    """
+    from src.agent.tools.context import assemble_context
+    from src.agent.tools.research import (
+        search_compliance_kb,
+        search_crm,
+        search_historical_sows,
+        search_opportunities,
+        search_product_kb,
+    )
+
+    client = search_crm.invoke({"client_name": client_id})
+    if "error" in client:
+        raise LookupError(client["error"])
+
+    opportunities = search_opportunities.invoke({"client_id": client["id"]})
+    product_info = search_product_kb.invoke({"product": product})
+    compliance = search_compliance_kb.invoke(
+        {"client_tier": client.get("compliance_tier", "MEDIUM"), "product": product}
+    )
+    try:
+        # No product filter: historical SOWs are indexed under a filename slug
+        # ("payments", "fraud"), not the product name, so the query ranks them
+        history = search_historical_sows.invoke(
+            {
+                "query": f"{product} scope of work and deliverables",
+                "additional_queries": ["pricing", "timeline", "risks"],
+            }
+        )
+    except Exception as e:
+        logger.warning(f"Could not retrieve historical SOWs: {e}")
+        history = []
+
+    context = assemble_context.invoke(
+        {
+            "crm_data": client,
+            "product_info": product_info,
+            "history": history,
+            "compliance": compliance,
+            "opportunities": opportunities,
+        }
+    )
+    if requirements:
+        context["requirements"] = requirements
+    return dict(context)
+
+
+def _quick_draft(context: dict) -> str:
+    from src.agent.tools.content import generate_sow_draft
+
+    return str(generate_sow_draft.invoke({"context": context, "quality_mode": "quick"}))
+
+
+def _refine(context: dict, draft: str) -> str:
+    from src.agent.tools.content import refine_sow_draft
+
+    return refine_sow_draft(context, draft)
+
+
+async def run_generation_job(
+    job: GenerationJob,
+    requirements: str | None = None,
+    on_finish: Callable[[], Any] | None = None,
+) -> None:
+    """
+    Produce a job's quick draft, then (production mode) its refined SOW.
+
+    Args:
+        job: Job to run
+        requirements: Additional requirements from the request
+        on_finish: Called when the job ends, e.g. to release an admission slot
+    """
+
+    async def step(status: str, fn: Callable[..., Any], *args: Any) -> Any:
+        job.status = status
+        await job.publish("status", {"status": status})
+        result = await run_in_threadpool(fn, *args)
+        job.timings[status] = round(time.time() - job.created_at, 2)
+        return result
+
+    try:
+        context = await step(
+            "researching", assemble_generation_context, job.client_id, job.product, requirements
+        )
+
+        draft = await step("drafting", _quick_draft, context)
+        if draft.startswith("Error:"):
+            raise RuntimeError(draft)
+        job.draft = draft
+        await job.publish("draft", {"sow_text": job.draft, "seconds": job.timings["drafting"]})
+
+        if job.quality_mode == "production":
+            job.sow_text = await step("refining", _refine, context, job.draft)
+        else:
+            job.sow_text = job.draft
+
+        job.status = "done"
+        await job.publish(
+            "final", {"sow_text": job.sow_text, "seconds": round(time.time() - job.created_at, 2)}
+        )
+    except Exception as e:
+        logger.error(f"Generation job {job.id} failed: {e}", exc_info=True)
+        job.status = "failed"
+        job.error = str(e)
+        await job.publish("error", {"error": job.error, "draft_available": job.draft is not None})
+    finally:
+        if on_finish is not None:
+            on_finish()
+
+
+def start_generation_job(
+    job: GenerationJob,
+    requirements: str | None = None,
+    on_finish: Callable[[], Any] | None = None,
+    runner: Callable[..., Coroutine[Any, Any, None]] = run_generation_job,
+) -> None:
+    """Run a job in the background on the current event loop."""
+    job.task = asyncio.create_task(runner(job, requirements, on_finish))
+
+
+def format_sse(event: dict) -> str:
+    """Encode a job event as a server-sent event."""
+    return f"id: {event['id']}\nevent: {event['event']}\ndata: {json.dumps(event['data'])}\n\n"
+
+
+# Global job store for the API process
+generation_jobs = JobStore()
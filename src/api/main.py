@@ -4,12 +4,18 @@ FastAPI main application.
 Provides REST API for SOW Generator.
 """
 
+import asyncio
 import logging
+import time
+from contextlib import asynccontextmanager
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 
+from src.agent.config import config
+from src.api import admission, warmup
+
 # Import routers
 from src.api.routes import research_router, sow_router
 
@@ -17,8 +23,21 @@ from src.api.routes import research_router, sow_router
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Warm shared resources in the background; /health answers meanwhile."""
+    task = None
+    if config.warmup_enabled:
+        task = asyncio.create_task(warmup.warmup_state.run())
+    yield
+    if task is not None and not task.done():
+        task.cancel()
+
+
 # Create FastAPI app
 app = FastAPI(
+    lifespan=lifespan,
     title="SOW Generator API",
     description="AI-powered Statement of Work generation and review",
     version="1.0.0",
@@ -35,6 +54,21 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+
+# First-request latency per route (reported by /ready)
+@app.middleware("http")
+async def record_first_requests(request: Request, call_next):
+    warm = warmup.warmup_state.ready
+    start = time.perf_counter()
+    response = await call_next(request)
+    # Keyed by route template, so job IDs and unmatched probes don't add entries
+    route_path = getattr(request.scope.get("route"), "path", None)
+    if route_path is not None:
+        duration_ms = (time.perf_counter() - start) * 1000
+        warmup.first_requests.record(route_path, duration_ms, warm=warm)
+    return response
+
+
 # Register routers
 app.include_router(sow_router)
 app.include_router(research_router)
@@ -47,6 +81,7 @@ async def http_exception_handler(request, exc):
     return JSONResponse(
         status_code=exc.status_code,
         content={"error": exc.detail, "status_code": exc.status_code},
+        headers=getattr(exc, "headers", None),
     )
 
 
@@ -72,6 +107,55 @@ async def health_check():
     }
 
 
+# Readiness endpoint (distinct from liveness: 200 only once warm-up has finished)
+@app.get("/ready")
+@app.get("/api/v1/ready")
+async def readiness_check():
+    """Readiness check with warm-up progress and first-request latencies."""
+    state = warmup.warmup_state
+    ready = state.ready or not config.warmup_enabled
+    return JSONResponse(
+        status_code=200 if ready else 503,
+        content={
+            "status": "ready" if ready else state.status,
+            "warmup": state.snapshot(),
+            "first_requests": warmup.first_requests.snapshot(),
+        },
+    )
+
+
+# Admission control load per lane
+@app.get("/api/v1/admission")
+async def admission_status():
+    """Active, queued, admitted and rejected requests per admission lane."""
+    return admission.admission_controller.snapshot()
+
+
+# Bedrock rate limiter metrics
+@app.get("/api/v1/bedrock/metrics")
+async def bedrock_metrics():
+    """Throttle rate, queue wait and concurrency limit of Bedrock calls."""
+    from src.agent.utils.rate_limit import get_bedrock_limiter
+
+    return get_bedrock_limiter().snapshot()
+
+
+# Model routing and per-route stats
+@app.get("/api/v1/models/stats")
+async def model_stats():
+    """Model profile per task and quality mode, with per-route latency and cost."""
+    from src.agent.model_router import load_model_router, route_stats
+
+    router = load_model_router()
+    return {
+        "routes": {
+            task: {mode: router.profiles[name].model_id for mode, name in modes.items()}
+            for task, modes in router.routes.items()
+        },
+        "stats": route_stats.snapshot(),
+    }
+
+
 # Root endpoint
 @app.get("/")
 async def root():
@@ -81,6 +165,7 @@ async def root():
         "version": "1.0.0",
         "docs": "/api/docs",
         "health": "/health",
+        "ready": "/ready",
     }
 
 
@@ -93,7 +178,16 @@ async def api_info():
         "endpoints": {
             "sow": {
                 "create": "POST /api/v1/sow/create",
+                "create_job": "POST /api/v1/sow/create/jobs",
+                "job_status": "GET /api/v1/sow/jobs/{job_id}",
+                "job_events": "GET /api/v1/sow/jobs/{job_id}/events",
+                "session_create": "POST /api/v1/sow/sessions",
+                "session": "GET /api/v1/sow/sessions/{session_id}",
+                "session_edit": "POST /api/v1/sow/sessions/{session_id}/edits",
                 "review": "POST /api/v1/sow/review",
+                "review_upload": "POST /api/v1/sow/review/upload",
+                "review_batch": "POST /api/v1/sow/review/batch",
+                "export": "POST /api/v1/sow/export",
             },
             "research": {
                 "client": "POST /api/v1/research/client",
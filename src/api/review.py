@@ -0,0 +1,615 @@
+"""
+SOW review engine shared by the review endpoints.
+
+Runs the compliance tools over SOW text and turns their findings into scored
+ComplianceIssue lists. The tools (langchain_core) are imported by the checks
+that call them, so importing the API does not load them.
+"""
+
+import hashlib
+import logging
+import re
+import threading
+import zipfile
+from collections import Counter, OrderedDict
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from src.agent.config import config
+from src.agent.tools.compliance_rules import RULES_FILE
+from src.api.schemas import BatchReviewSummary, ComplianceIssue, ReviewDiff, SOWReviewResponse
+
+logger = logging.getLogger(__name__)
+
+BATCH_SUFFIXES = (".md", ".txt", ".pdf", ".docx")
+EXTRACT_CHUNK_BYTES = 1024 * 1024
+
+_HEADING_LINE = re.compile(r"^#{1,6}\s+(.+?)\s*#*\s*$")
+
+
+def review_sow_text(
+    sow_text: str,
+    product: str | None = None,
+    client_tier: str | None = None,
+) -> SOWReviewResponse:
+    """
+    Review SOW text for compliance.
+
+    Checks:
+    - Mandatory clauses presence
+    - Prohibited terms
+    - SLA requirements (if product specified)
+
+    Args:
+        sow_text: SOW content to review
+        product: Optional product name for SLA validation
+        client_tier: Optional client tier (HIGH/MEDIUM/LOW) for compliance rules
+
+    Returns:
+        Scored review with issues and a severity summary
+    """
+    compliance_rules = _compliance_rules(product, client_tier)
+
+    issues = _mandatory_clause_issues(sow_text, compliance_rules)
+    issues.extend(_prohibited_term_issues(sow_text, product))
+    issues.extend(_sla_issues(sow_text, product, client_tier, compliance_rules))
+
+    return score_issues(issues)
+
+
+def review_sow_pages(
+    pages: Iterable[str],
+    product: str | None = None,
+    client_tier: str | None = None,
+) -> tuple[SOWReviewResponse, str]:
+    """
+    Review SOW text that arrives page by page.
+
+    Prohibited terms are checked on each page as it arrives, so the first pages
+    of a PDF are reviewed while later pages are still being extracted.
+    Document-level checks (mandatory clauses, SLAs) run once the last page is in.
+
+    Args:
+        pages: Page texts in order, e.g. from iter_pdf_pages
+        product: Optional product name for SLA validation
+        client_tier: Optional client tier (HIGH/MEDIUM/LOW) for compliance rules
+
+    Returns:
+        Tuple of (review, full text with pages separated by blank lines)
+    """
+    texts: list[str] = []
+    page_issues: list[ComplianceIssue] = []
+    for number, text in enumerate(pages, start=1):
+        texts.append(text)
+        page_issues.extend(
+            issue.model_copy(update={"location": f"Page {number} | {issue.location}"})
+            for issue in _prohibited_term_issues(text, product)
+        )
+
+    sow_text = "\n\n".join(texts)
+    compliance_rules = _compliance_rules(product, client_tier)
+
+    issues = _mandatory_clause_issues(sow_text, compliance_rules)
+    issues.extend(page_issues)
+    issues.extend(_sla_issues(sow_text, product, client_tier, compliance_rules))
+
+    return score_issues(issues), sow_text
+
+
+def review_sow_file(
+    file_path: str | Path,
+    product: str | None = None,
+    client_tier: str | None = None,
+) -> tuple[SOWReviewResponse, str]:
+    """
+    Parse and review a SOW file (markdown, text, PDF or DOCX).
+
+    PDF pages are reviewed as they are extracted (see review_sow_pages).
+
+    Args:
+        file_path: SOW file
+        product: Optional product name for SLA validation
+        client_tier: Optional client tier
+
+    Returns:
+        Tuple of (review, extracted text)
+    """
+    path = Path(file_path)
+    suffix = path.suffix.lower()
+    if suffix in (".md", ".txt"):
+        sow_text = path.read_text(encoding="utf-8")
+    elif suffix == ".pdf":
+        from src.agent.utils.doc_handler import iter_pdf_pages
+
+        return review_sow_pages((text for _, text in iter_pdf_pages(path)), product, client_tier)
+    else:
+        from src.agent.utils.doc_handler import parse_document
+
+        sow_text = parse_document(path)
+
+    return review_sow_text(sow_text, product, client_tier), sow_text
+
+
+def _compliance_rules(product: str | None, client_tier: str | None) -> dict:
+    """Get compliance rules if product and client tier are provided."""
+    if product and client_tier:
+        from src.agent.tools.research import search_compliance_kb
+
+        return search_compliance_kb.invoke(
+            {
+                "product": product,
+                "client_tier": client_tier,
+            }
+        )
+    return {}
+
+
+def _mandatory_clause_issues(sow_text: str, compliance_rules: dict) -> list[ComplianceIssue]:
+    """Document-level check: mandatory clauses."""
+    if not compliance_rules.get("mandatory_clauses"):
+        return []
+
+    # Tool expects List[str], but rules contain Dicts. Extract names.
+    mandatory_clauses = compliance_rules["mandatory_clauses"]
+    requirements = [c["name"] if isinstance(c, dict) else str(c) for c in mandatory_clauses]
+    logger.debug(f"Extracted {len(requirements)} requirements from rules.")
+
+    from src.agent.tools.compliance import check_mandatory_clauses_v2
+
+    clause_check = check_mandatory_clauses_v2.invoke(
+        {
+            "sow_text": sow_text,
+            "requirements": requirements,
+        }
+    )
+
+    return [
+        ComplianceIssue(
+            severity="HIGH",
+            category="Mandatory Clause",
+            description=f"Missing required clause: {missing}",
+            location=_closest_section(clause_check, missing),
+            suggestion=f"Add clause: {missing}",
+        )
+        for missing in clause_check.get("missing_clauses", [])
+    ]
+
+
+def _closest_section(clause_check: dict, clause: str) -> str:
+    """Location for a missing clause: the section holding its nearest partial match."""
+    section = clause_check.get("closest_sections", {}).get(clause)
+    return f"Closest section: {section}" if section else "Unknown"
+
+
+def _prohibited_term_issues(sow_text: str, product: str | None = None) -> list[ComplianceIssue]:
+    """Block-level check: prohibited terms (findings depend only on the text and product)."""
+    from src.agent.tools.compliance import check_prohibited_terms
+
+    prohibited_check = check_prohibited_terms.invoke({"sow_text": sow_text, "product": product})
+
+    return [
+        ComplianceIssue(
+            severity="HIGH",
+            category="Prohibited Term",
+            description=f"Found prohibited term: '{finding['term']}'",
+            location=f"Near: {finding.get('context', 'N/A')}",
+            suggestion=f"Remove or replace: {finding['term']}",
+        )
+        for finding in prohibited_check.get("findings", [])
+    ]
+
+
+def _sla_issues(
+    sow_text: str,
+    product: str | None,
+    client_tier: str | None,
+    compliance_rules: dict,
+) -> list[ComplianceIssue]:
+    """Document-level check: SLA requirements."""
+    if not (product and compliance_rules.get("sla_requirements")):
+        return []
+
+    from src.agent.tools.compliance import check_sla_requirements
+
+    sla_check = check_sla_requirements.invoke(
+        {
+            "sow_text": sow_text,
+            "product": product,
+            "client_tier": client_tier or "MEDIUM",
+        }
+    )
+
+    return [
+        ComplianceIssue(
+            severity=finding.get("severity", "MEDIUM"),
+            category="SLA",
+            description=finding.get("issue", "SLA violation"),
+            location=finding.get("location", "SLA Section"),
+            suggestion=finding.get("suggestion", "Review SLA terms"),
+        )
+        for finding in sla_check.get("findings", [])
+    ]
+
+
+def score_issues(issues: list[ComplianceIssue]) -> SOWReviewResponse:
+    """
+    Score a list of issues.
+
+    Args:
+        issues: Compliance issues found in the document
+
+    Returns:
+        Review response with score (0-100), status and severity summary
+    """
+    # Calculate summary
+    summary = {"HIGH": 0, "MEDIUM": 0, "LOW": 0}
+    for issue in issues:
+        summary[issue.severity] += 1
+
+    # Scoring: -20 per HIGH, -10 per MEDIUM, -5 per LOW
+    score = 100 - (summary["HIGH"] * 20 + summary["MEDIUM"] * 10 + summary["LOW"] * 5)
+    score = max(0, min(100, score))  # Clamp to 0-100
+
+    # Determine status
+    if score >= 90:
+        status = "PASS"
+    elif score >= 70:
+        status = "WARNING"
+    else:
+        status = "FAIL"
+
+    return SOWReviewResponse(
+        compliance_score=score,
+        status=status,
+        issues=issues,
+        summary=summary,
+        diff=None,
+    )
+
+
+@dataclass(frozen=True)
+class ReviewBlock:
+    """A heading-delimited section of a SOW."""
+
+    title: str
+    text: str
+    digest: str
+
+
+def split_review_blocks(sow_text: str) -> list[ReviewBlock]:
+    """
+    Split SOW text into blocks at markdown headings.
+
+    Args:
+        sow_text: SOW content
+
+    Returns:
+        Blocks in document order; text before the first heading is "Preamble"
+    """
+    blocks = []
+    title = "Preamble"
+    lines: list[str] = []
+    in_fence = False
+
+    def flush() -> None:
+        text = "\n".join(lines)
+        if text.strip():
+            digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+            blocks.append(ReviewBlock(title=title, text=text, digest=digest))
+
+    for line in sow_text.splitlines():
+        if line.lstrip().startswith("```"):
+            in_fence = not in_fence
+        match = None if in_fence else _HEADING_LINE.match(line)
+        if match:
+            flush()
+            title, lines = match[1], []
+        lines.append(line)
+
+    flush()
+    return blocks
+
+
+def diff_issues(
+    previous: list[ComplianceIssue], current: list[ComplianceIssue]
+) -> tuple[list[ComplianceIssue], list[ComplianceIssue]]:
+    """
+    Compare two reviews of the same document.
+
+    Issues are matched by category and description (locations shift as text
+    is edited), counting repeats.
+
+    Returns:
+        Tuple of (added issues, resolved issues)
+    """
+
+    def key(issue: ComplianceIssue) -> tuple[str, str]:
+        return issue.category, issue.description
+
+    remaining = Counter(key(issue) for issue in previous)
+    added = []
+    for issue in current:
+        if remaining[key(issue)] > 0:
+            remaining[key(issue)] -= 1
+        else:
+            added.append(issue)
+
+    unmatched = Counter(key(issue) for issue in current)
+    resolved = []
+    for issue in previous:
+        if unmatched[key(issue)] > 0:
+            unmatched[key(issue)] -= 1
+        else:
+            resolved.append(issue)
+
+    return added, resolved
+
+
+class IncrementalReviewer:
+    """
+    Re-reviews edited documents, re-evaluating only blocks whose text changed.
+
+    Block-level findings (prohibited terms) are cached by block content hash,
+    product and compliance rules version. Document-level checks (mandatory clauses, SLAs)
+    run on every review. The last issues per document ID are kept so each
+    review returns a diff against the previous one.
+    """
+
+    def __init__(self, max_blocks: int = 4096, max_documents: int = 1000) -> None:
+        """
+        Initialize the reviewer.
+
+        Args:
+            max_blocks: Maximum cached block findings (LRU)
+            max_documents: Maximum documents whose last review is kept (LRU)
+        """
+        self.max_blocks = max_blocks
+        self.max_documents = max_documents
+        self._blocks: OrderedDict[tuple, list[ComplianceIssue]] = OrderedDict()
+        self._documents: OrderedDict[str, list[ComplianceIssue]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def review(
+        self,
+        document_id: str,
+        sow_text: str,
+        product: str | None = None,
+        client_tier: str | None = None,
+    ) -> SOWReviewResponse:
+        """
+        Review a document, reusing findings for unchanged blocks.
+
+        Args:
+            document_id: Stable ID of the document being edited
+            sow_text: Current SOW content
+            product: Optional product name for SLA validation
+            client_tier: Optional client tier
+
+        Returns:
+            Review response with a diff against the previous review
+        """
+        compliance_rules = _compliance_rules(product, client_tier)
+        rules_version = _rules_version()
+
+        issues = _mandatory_clause_issues(sow_text, compliance_rules)
+
+        blocks = split_review_blocks(sow_text)
+        reviewed = 0
+        for block in blocks:
+            key = (rules_version, product, block.digest)
+            with self._lock:
+                findings = self._blocks.get(key)
+                if findings is not None:
+                    self._blocks.move_to_end(key)
+
+            if findings is None:
+                reviewed += 1
+                findings = [
+                    issue.model_copy(update={"location": f"{block.title} | {issue.location}"})
+                    for issue in _prohibited_term_issues(block.text, product)
+                ]
+                with self._lock:
+                    self._blocks[key] = findings
+                    while len(self._blocks) > self.max_blocks:
+                        self._blocks.popitem(last=False)
+
+            issues.extend(findings)
+
+        issues.extend(_sla_issues(sow_text, product, client_tier, compliance_rules))
+
+        with self._lock:
+            previous = self._documents.pop(document_id, [])
+            self._documents[document_id] = issues
+            while len(self._documents) > self.max_documents:
+                self._documents.popitem(last=False)
+
+        added, resolved = diff_issues(previous, issues)
+        response = score_issues(issues)
+        response.diff = ReviewDiff(
+            added=added,
+            resolved=resolved,
+            unchanged=len(issues) - len(added),
+            blocks_total=len(blocks),
+            blocks_reviewed=reviewed,
+        )
+        return response
+
+    def clear(self) -> None:
+        """Drop cached findings and document history."""
+        with self._lock:
+            self._blocks.clear()
+            self._documents.clear()
+
+
+def _rules_version() -> tuple[int, int]:
+    """Version of compliance_rules.json, so edited rules invalidate cached findings."""
+    try:
+        stat = RULES_FILE.stat()
+    except OSError:
+        return (0, 0)
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+# Global incremental reviewer shared by review requests
+incremental_reviewer = IncrementalReviewer(max_blocks=config.review_cache_size)
+
+
+def review_batch_item(
+    doc_id: str,
+    sow_text: str | None = None,
+    file_path: str | None = None,
+    product: str | None = None,
+    client_tier: str | None = None,
+) -> dict[str, Any]:
+    """
+    Review one batch document (worker process entry point).
+
+    Args:
+        doc_id: Document ID echoed in the result
+        sow_text: SOW content (takes precedence over file_path)
+        file_path: SOW file to read or parse
+        product: Optional product name for SLA validation
+        client_tier: Optional client tier
+
+    Returns:
+        NDJSON-ready result: {"type": "result", "id": ..., **review}
+    """
+    if sow_text is not None:
+        review = review_sow_text(sow_text, product, client_tier)
+    elif file_path is not None:
+        review, _ = review_sow_file(file_path, product, client_tier)
+    else:
+        raise ValueError(f"Document {doc_id} has neither sow_text nor file_path")
+    return {"type": "result", "id": doc_id, **review.model_dump()}
+
+
+def collect_batch_sources(
+    source_path: str,
+    root: Path,
+    extract_dir: Path,
+    max_member_bytes: int | None = None,
+    max_total_bytes: int | None = None,
+    max_members: int | None = None,
+) -> list[tuple[str, Path]]:
+    """
+    List the SOW files in a server-side directory or zip archive.
+
+    Zip limits are enforced on the bytes actually decompressed, not the sizes
+    declared in the archive, so a zip bomb or forged header can't fill the disk.
+
+    Args:
+        source_path: Directory or .zip, absolute or relative to root
+        root: Directory sources must be inside
+        extract_dir: Where zip members are extracted
+        max_member_bytes: Optional size limit per zip member
+        max_total_bytes: Optional limit on the total size extracted from a zip
+        max_members: Optional limit on the number of SOW files in a zip
+
+    Returns:
+        (document ID, file path) pairs; IDs are paths relative to the source
+
+    Raises:
+        ValueError: If the source is outside root, missing, not a directory/zip,
+            or a zip exceeds a limit
+    """
+    root = root.resolve()
+    path = (root / source_path).resolve()
+    if not path.is_relative_to(root):
+        raise ValueError(f"source_path must be inside {root}")
+
+    if path.is_dir():
+        return [
+            (str(file.relative_to(path)), file)
+            for file in sorted(path.rglob("*"))
+            if file.is_file() and file.suffix.lower() in BATCH_SUFFIXES
+        ]
+
+    if path.is_file() and zipfile.is_zipfile(path):
+        sources: list[tuple[str, Path]] = []
+        total_bytes = 0
+        with zipfile.ZipFile(path) as archive:
+            for i, member in enumerate(archive.infolist()):
+                name = Path(member.filename)
+                if member.is_dir() or name.suffix.lower() not in BATCH_SUFFIXES:
+                    continue
+                if max_members is not None and len(sources) >= max_members:
+                    raise ValueError(f"Archive has more than {max_members} SOW files")
+
+                # Flat, index-prefixed names so members can't escape extract_dir
+                target = extract_dir / f"{i:05d}_{name.name}"
+                total_bytes += _extract_member(
+                    archive,
+                    member,
+                    target,
+                    max_member_bytes,
+                    None if max_total_bytes is None else max_total_bytes - total_bytes,
+                )
+                sources.append((member.filename, target))
+        return sources
+
+    raise ValueError(f"source_path is not a directory or zip archive: {source_path}")
+
+
+def _extract_member(
+    archive: zipfile.ZipFile,
+    member: zipfile.ZipInfo,
+    target: Path,
+    max_bytes: int | None,
+    remaining_bytes: int | None,
+) -> int:
+    """
+    Extract one zip member, counting decompressed bytes as they are written.
+
+    Returns:
+        Bytes written
+
+    Raises:
+        ValueError: If the member exceeds max_bytes or the archive's remaining allowance
+    """
+    written = 0
+    with archive.open(member) as src, open(target, "wb") as dst:
+        while chunk := src.read(EXTRACT_CHUNK_BYTES):
+            written += len(chunk)
+            if max_bytes is not None and written > max_bytes:
+                raise ValueError(f"{member.filename} exceeds the upload size limit")
+            if remaining_bytes is not None and written > remaining_bytes:
+                raise ValueError("Archive exceeds the batch extraction size limit")
+            dst.write(chunk)
+    return written
+
+
+@dataclass
+class BatchReviewAggregator:
+    """Accumulates batch results into a BatchReviewSummary."""
+
+    scores: list[int] = field(default_factory=list)
+    failed: int = 0
+    status_counts: Counter = field(default_factory=Counter)
+    issue_counts: Counter = field(default_factory=Counter)
+    category_counts: Counter = field(default_factory=Counter)
+
+    def add(self, result: dict[str, Any]) -> None:
+        """Add a successful document result."""
+        self.scores.append(result["compliance_score"])
+        self.status_counts[result["status"]] += 1
+        self.issue_counts.update(result["summary"])
+        self.category_counts.update(issue["category"] for issue in result["issues"])
+
+    def add_failure(self) -> None:
+        """Count a document that could not be reviewed."""
+        self.failed += 1
+
+    def summary(self, elapsed_seconds: float) -> BatchReviewSummary:
+        """Build the aggregate summary."""
+        return BatchReviewSummary(
+            documents=len(self.scores),
+            failed=self.failed,
+            average_score=(round(sum(self.scores) / len(self.scores), 2) if self.scores else 0.0),
+            min_score=min(self.scores) if self.scores else None,
+            status_counts=dict(self.status_counts),
+            issue_counts=dict(self.issue_counts),
+            category_counts=dict(self.category_counts),
+            elapsed_seconds=round(elapsed_seconds, 2),
+        )
@@ -1,17 +1,15 @@
 """
 Research endpoints: client and product information.
+
+The research tools (langchain_core) are imported by the handlers on first
+request, so importing the API does not load them.
 """
 
 import logging
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException
 
-from src.agent.tools.research import (
-    search_crm,
-    search_historical_sows,
-    search_opportunities,
-    search_product_kb,
-)
+from src.api.admission import admit
 from src.api.audit import audit_endpoint
 from src.api.schemas import (
     ClientResearchRequest,
@@ -22,7 +20,9 @@ from src.api.schemas import (
 
 logger = logging.getLogger(__name__)
 
-router = APIRouter(prefix="/api/v1/research", tags=["Research"])
+router = APIRouter(
+    prefix="/api/v1/research", tags=["Research"], dependencies=[Depends(admit("interactive"))]
+)
 
 
 @router.post("/client", response_model=ClientResearchResponse)
@@ -38,6 +38,8 @@ async def research_client(request: ClientResearchRequest):
     """
     logger.info(f"Researching client: name={request.client_name}, id={request.client_id}")
 
+    from src.agent.tools.research import search_crm, search_historical_sows, search_opportunities
+
     try:
         # Search CRM
         if request.client_id:
@@ -70,18 +72,24 @@ async def research_client(request: ClientResearchRequest):
             try:
                 sow_results = search_historical_sows.invoke(
                     {
+                        "query": "scope of work and deliverables",
+                        "additional_queries": ["pricing", "timeline", "risks"],
                         "client_id": client_data["id"],
                         "product": "",  # Get all products
                     }
                 )
 
-                # Format SOW results
+                # Format SOW results (one entry per source document)
+                seen_sources = set()
                 for sow in sow_results:
+                    if sow.get("source") in seen_sources:
+                        continue
+                    seen_sources.add(sow.get("source"))
                     historical_sows.append(
                         {
-                            "title": sow.get("metadata", {}).get("file_name", "Unknown"),
-                            "product": sow.get("metadata", {}).get("product", "N/A"),
-                            "year": sow.get("metadata", {}).get("year", "N/A"),
+                            "title": sow.get("source", "Unknown"),
+                            "product": sow.get("product", "N/A"),
+                            "relevance_score": sow.get("relevance_score"),
                         }
                     )
             except Exception as e:
@@ -117,6 +125,8 @@ async def research_product(request: ProductResearchRequest):
     """
     logger.info(f"Researching product: {request.product_name}")
 
+    from src.agent.tools.research import search_product_kb
+
     try:
         # Search product KB
         product_info = search_product_kb.invoke({"product": request.product_name})
@@ -1,39 +1,111 @@
 """
-SOW endpoints: creation and review.
+SOW endpoints: creation, review and export.
 """
 
+import asyncio
+import json
 import logging
+import re
+import shutil
+import tempfile
 import time
-
-from fastapi import APIRouter, Depends, HTTPException
-
-from src.agent.core import SOWAgent
-from src.agent.tools.compliance import (
-    check_mandatory_clauses_v2,
-    check_prohibited_terms,
-    check_sla_requirements,
-)
-from src.agent.tools.research import search_compliance_kb
+import uuid
+import zipfile
+from collections.abc import AsyncIterator
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Request
+from fastapi.responses import Response, StreamingResponse
+from starlette.concurrency import run_in_threadpool
+
+from src.agent.config import config
+from src.api import jobs
+from src.api.admission import admission_controller, admit, tenant_of
 from src.api.audit import audit_endpoint
-from src.api.dependencies import get_sow_agent
+from src.api.dependencies import (
+    get_parse_pool,
+    get_review_pool,
+    get_sow_agent,
+    get_sow_sessions,
+)
+from src.api.review import (
+    BatchReviewAggregator,
+    collect_batch_sources,
+    incremental_reviewer,
+    review_batch_item,
+    review_sow_file,
+    review_sow_text,
+)
 from src.api.schemas import (
-    ComplianceIssue,
+    SOWBatchReviewRequest,
     SOWCreateRequest,
     SOWCreateResponse,
+    SOWExportRequest,
+    SOWJobResponse,
+    SOWJobStatusResponse,
     SOWReviewRequest,
     SOWReviewResponse,
+    SOWSessionCreateRequest,
+    SOWSessionEditRequest,
+    SOWSessionEditResponse,
+    SOWSessionResponse,
+    SOWUploadReviewResponse,
 )
+from src.api.uploads import receive_upload
+
+if TYPE_CHECKING:
+    # The agent (LangGraph, langchain_aws) and the document libraries are
+    # imported by the handlers that use them, keeping API startup fast
+    from src.agent.core import SOWAgent, SOWSessions
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/v1/sow", tags=["SOW"])
 
+UPLOAD_SUFFIXES = (".pdf", ".docx")
+
+# Form fields of /review/upload, which parses its multipart body itself
+UPLOAD_FORM_SCHEMA = {
+    "requestBody": {
+        "required": True,
+        "content": {
+            "multipart/form-data": {
+                "schema": {
+                    "type": "object",
+                    "required": ["file"],
+                    "properties": {
+                        "file": {
+                            "type": "string",
+                            "format": "binary",
+                            "description": "SOW document (.pdf or .docx)",
+                        },
+                        "product": {
+                            "type": "string",
+                            "description": "Product name for SLA validation",
+                        },
+                        "client_tier": {
+                            "type": "string",
+                            "description": "Client tier (HIGH/MEDIUM/LOW)",
+                        },
+                    },
+                }
+            }
+        },
+    }
+}
+
 
-@router.post("/create", response_model=SOWCreateResponse)
+@router.post(
+    "/create", response_model=SOWCreateResponse, dependencies=[Depends(admit("generation"))]
+)
 @audit_endpoint("sow_create")
 async def create_sow(
     request: SOWCreateRequest,
-    agent: SOWAgent = Depends(get_sow_agent),
+    agent: "SOWAgent" = Depends(get_sow_agent),
+    sessions: "SOWSessions" = Depends(get_sow_sessions),
 ):
     """
     Generate a Statement of Work.
@@ -41,10 +113,17 @@ async def create_sow(
     Quality modes:
     - quick: Fast generation (15s, $0.06, 1 LLM call)
     - production: High-quality with reflection (35s, $0.23, 3 LLM calls)
+
+    With a session_id, the generated SOW starts an editing session for
+    follow-up edits (see /sow/sessions).
+
+    If generation fails, the error includes a run_id. Sending the request again
+    with that run_id resumes the run from its last completed step.
     """
     logger.info(f"Creating SOW for client={request.client_id}, product={request.product}")
 
     start_time = time.time()
+    run_id = request.run_id or uuid.uuid4().hex
 
     try:
         # Build agent query
@@ -68,10 +147,22 @@ async def create_sow(
 
         # Call agent
         logger.info(f"Calling agent with quality_mode={request.quality_mode}")
-        response = agent.run(query)
+        # In a worker thread, so queued and interactive requests keep being served
+        response = await run_in_threadpool(
+            agent.run, query, quality_mode=request.quality_mode, run_id=run_id
+        )
 
         generation_time = time.time() - start_time
 
+        if request.session_id:
+            await run_in_threadpool(
+                sessions.start,
+                request.session_id,
+                response,
+                client_id=request.client_id,
+                product=request.product,
+            )
+
         # Estimate cost and LLM calls based on mode
         if request.quality_mode == "production":
             cost_usd = 0.23
@@ -86,6 +177,8 @@ async def create_sow(
                 "client_id": request.client_id,
                 "product": request.product,
                 "quality_mode": request.quality_mode,
+                "run_id": run_id,
+                "session_id": request.session_id,
             },
             generation_time_seconds=round(generation_time, 2),
             cost_usd=cost_usd,
@@ -97,16 +190,205 @@ async def create_sow(
         logger.error(f"Error generating SOW: {e}", exc_info=True)
         raise HTTPException(
             status_code=500,
-            detail=f"Failed to generate SOW: {str(e)}",
+            detail=f"Failed to generate SOW: {str(e)} (resume with run_id={run_id})",
+        )
+
+
+@router.post("/create/jobs", response_model=SOWJobResponse, status_code=202)
+@audit_endpoint("sow_create_job")
+async def create_sow_job(request: SOWCreateRequest, http_request: Request):
+    """
+    Start generating a Statement of Work in the background.
+
+    The quick draft is published as soon as it is ready. In production mode
+    the same context and draft are then critiqued and revised, and the refined
+    SOW follows. Poll the status URL, or follow the events URL (server-sent
+    events "status", "draft", then "final" or "error").
+    """
+    logger.info(
+        f"Starting SOW job for client={request.client_id}, product={request.product}, "
+        f"quality_mode={request.quality_mode}"
+    )
+
+    # The generation slot is held by the job, not by this request
+    lane = admission_controller.lane("generation")
+    tenant = tenant_of(http_request)
+    await lane.acquire(tenant)
+    start = time.perf_counter()
+
+    try:
+        job = jobs.generation_jobs.create(request.client_id, request.product, request.quality_mode)
+        jobs.start_generation_job(
+            job,
+            request.requirements,
+            on_finish=lambda: lane.release(tenant, time.perf_counter() - start),
+        )
+    except BaseException:
+        # No job took the slot over
+        lane.release(tenant, time.perf_counter() - start)
+        raise
+
+    return SOWJobResponse(
+        job_id=job.id,
+        status=job.status,
+        status_url=f"{router.prefix}/jobs/{job.id}",
+        events_url=f"{router.prefix}/jobs/{job.id}/events",
+    )
+
+
+def _get_job(job_id: str) -> "jobs.GenerationJob":
+    job = jobs.generation_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job not found: {job_id}")
+    return job
+
+
+@router.get("/jobs/{job_id}", response_model=SOWJobStatusResponse)
+async def get_sow_job(job_id: str):
+    """Status of a generation job, with its quick draft and final SOW when available."""
+    return _get_job(job_id).to_dict()
+
+
+@router.get("/jobs/{job_id}/events")
+async def stream_sow_job(
+    job_id: str,
+    last_event_id: int = Header(0, alias="Last-Event-ID"),
+):
+    """
+    Follow a generation job as server-sent events.
+
+    Reconnecting clients send Last-Event-ID and receive only the events they missed.
+    """
+    job = _get_job(job_id)
+
+    async def events() -> AsyncIterator[str]:
+        async for event in job.follow(after=last_event_id):
+            yield jobs.format_sse(event)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+def _session_response(session_id: str, state: dict, **extra) -> dict:
+    from src.agent.core.sessions import split_sections
+
+    return {
+        "session_id": session_id,
+        "sow_text": state["sow_text"],
+        "sections": [section.title for section in split_sections(state["sow_text"])],
+        "edits": state.get("edits", []),
+        "client_id": state.get("client_id"),
+        "product": state.get("product"),
+        **extra,
+    }
+
+
+@router.post(
+    "/sessions",
+    response_model=SOWSessionResponse,
+    status_code=201,
+    dependencies=[Depends(admit("interactive"))],
+)
+@audit_endpoint("sow_session_create")
+async def create_sow_session(
+    request: SOWSessionCreateRequest,
+    sessions: "SOWSessions" = Depends(get_sow_sessions),
+):
+    """
+    Start an editing session on an existing SOW.
+
+    Follow-up instructions posted to /sessions/{session_id}/edits revise only
+    the section they refer to. Sessions are persisted and survive restarts.
+    """
+    session_id = request.session_id or uuid.uuid4().hex
+    state = await run_in_threadpool(
+        sessions.start,
+        session_id,
+        request.sow_text,
+        client_id=request.client_id,
+        product=request.product,
+    )
+    return _session_response(session_id, state)
+
+
+@router.get("/sessions/{session_id}", response_model=SOWSessionResponse)
+async def get_sow_session(
+    session_id: str,
+    sessions: "SOWSessions" = Depends(get_sow_sessions),
+):
+    """Current SOW and edit history of a session."""
+    state = await run_in_threadpool(sessions.get, session_id)
+    if state is None:
+        raise HTTPException(status_code=404, detail=f"Session not found: {session_id}")
+    return _session_response(session_id, state)
+
+
+@router.post(
+    "/sessions/{session_id}/edits",
+    response_model=SOWSessionEditResponse,
+    dependencies=[Depends(admit("generation"))],
+)
+@audit_endpoint("sow_session_edit")
+async def edit_sow_session(
+    session_id: str,
+    request: SOWSessionEditRequest,
+    sessions: "SOWSessions" = Depends(get_sow_sessions),
+):
+    """
+    Apply a follow-up instruction, e.g. "shorten the timeline section".
+
+    The instruction is matched to one section (or the section given), and only
+    that section is revised: a single small LLM call, not a regeneration.
+    """
+    from src.agent.core.sessions import SectionNotFoundError, SessionNotFoundError
+
+    logger.info(f"Editing session {session_id}: {request.instruction}")
+    start_time = time.time()
+
+    try:
+        state = await run_in_threadpool(
+            sessions.edit, session_id, request.instruction, request.section
         )
+    except SessionNotFoundError:
+        raise HTTPException(status_code=404, detail=f"Session not found: {session_id}")
+    except SectionNotFoundError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error editing SOW session: {e}", exc_info=True)
+        raise HTTPException(status_code=500, detail=f"Failed to edit SOW: {str(e)}")
+
+    return _session_response(
+        session_id,
+        state,
+        section=state["edits"][-1]["section"],
+        edit_time_seconds=round(time.time() - start_time, 2),
+    )
 
 
-@router.post("/review", response_model=SOWReviewResponse)
+@router.delete("/sessions/{session_id}", status_code=204)
+async def delete_sow_session(
+    session_id: str,
+    sessions: "SOWSessions" = Depends(get_sow_sessions),
+):
+    """Delete a session and its edit history."""
+    await run_in_threadpool(sessions.delete, session_id)
+    return Response(status_code=204)
+
+
+@router.post(
+    "/review", response_model=SOWReviewResponse, dependencies=[Depends(admit("interactive"))]
+)
 @audit_endpoint("sow_review")
 async def review_sow(request: SOWReviewRequest):
     """
     Review a Statement of Work for compliance.
 
+    With a document_id, only sections edited since the last review of that
+    document are re-evaluated and the response includes an issue diff.
+
     Checks:
     - Mandatory clauses presence
     - Prohibited terms
@@ -115,114 +397,199 @@ async def review_sow(request: SOWReviewRequest):
     logger.info(f"Reviewing SOW (length={len(request.sow_text)} chars)")
 
     try:
-        issues = []
-
-        # Get compliance rules if client tier provided
-        compliance_rules = {}
-        if request.product and request.client_tier:
-            compliance_rules = search_compliance_kb.invoke(
-                {
-                    "product": request.product,
-                    "client_tier": request.client_tier,
-                }
+        if request.document_id:
+            return incremental_reviewer.review(
+                request.document_id, request.sow_text, request.product, request.client_tier
             )
+        return review_sow_text(request.sow_text, request.product, request.client_tier)
 
-        # Check 1: Mandatory clauses
-        if compliance_rules.get("mandatory_clauses"):
-            # Tool expects List[str], but rules contain Dicts. Extract names.
-            mandatory_clauses = compliance_rules["mandatory_clauses"]
-            requirements = [c["name"] if isinstance(c, dict) else str(c) for c in mandatory_clauses]
-
-            logger.info(f"DEBUG: Extracted {len(requirements)} requirements from rules.")
-            if requirements:
-                logger.info(
-                    f"DEBUG: First requirement type: {type(requirements[0])} val: {requirements[0]}"
-                )
-
-            clause_check = check_mandatory_clauses_v2.invoke(
-                {
-                    "sow_text": request.sow_text,
-                    "requirements": requirements,
-                }
-            )
+    except Exception as e:
+        logger.error(f"Error reviewing SOW: {e}", exc_info=True)
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to review SOW: {str(e)}",
+        )
 
-            for missing in clause_check.get("missing_clauses", []):
-                issues.append(
-                    ComplianceIssue(
-                        severity="HIGH",
-                        category="Mandatory Clause",
-                        description=f"Missing required clause: {missing}",
-                        location="Unknown",
-                        suggestion=f"Add clause: {missing}",
-                    )
-                )
-
-        # Check 2: Prohibited terms
-        prohibited_check = check_prohibited_terms.invoke({"sow_text": request.sow_text})
-
-        for finding in prohibited_check.get("findings", []):
-            issues.append(
-                ComplianceIssue(
-                    severity="HIGH",
-                    category="Prohibited Term",
-                    description=f"Found prohibited term: '{finding['term']}'",
-                    location=f"Near: {finding.get('context', 'N/A')}",
-                    suggestion=f"Remove or replace: {finding['term']}",
-                )
-            )
 
-        # Check 3: SLA requirements
-        if request.product and compliance_rules.get("sla_requirements"):
-            sla_check = check_sla_requirements.invoke(
-                {
-                    "sow_text": request.sow_text,
-                    "product": request.product,
-                    "client_tier": request.client_tier or "MEDIUM",
-                }
-            )
+@router.post(
+    "/review/upload",
+    response_model=SOWUploadReviewResponse,
+    dependencies=[Depends(admit("interactive"))],
+    openapi_extra=UPLOAD_FORM_SCHEMA,
+)
+@audit_endpoint("sow_review_upload")
+async def review_uploaded_sow(
+    http_request: Request,
+    parse_pool: ProcessPoolExecutor = Depends(get_parse_pool),
+):
+    """
+    Review an uploaded PDF/DOCX Statement of Work.
 
-            for finding in sla_check.get("findings", []):
-                issues.append(
-                    ComplianceIssue(
-                        severity=finding.get("severity", "MEDIUM"),
-                        category="SLA",
-                        description=finding.get("issue", "SLA violation"),
-                        location=finding.get("location", "SLA Section"),
-                        suggestion=finding.get("suggestion", "Review SLA terms"),
-                    )
-                )
-
-        # Calculate summary
-        summary = {"HIGH": 0, "MEDIUM": 0, "LOW": 0}
-        for issue in issues:
-            summary[issue.severity] += 1
-
-        # Calculate compliance score (0-100)
-        high_issues = summary["HIGH"]
-        medium_issues = summary["MEDIUM"]
-
-        # Scoring: -20 per HIGH, -10 per MEDIUM, -5 per LOW
-        score = 100 - (high_issues * 20 + medium_issues * 10 + summary["LOW"] * 5)
-        score = max(0, min(100, score))  # Clamp to 0-100
-
-        # Determine status
-        if score >= 90:
-            status = "PASS"
-        elif score >= 70:
-            status = "WARNING"
-        else:
-            status = "FAIL"
+    The multipart body is parsed as it arrives: the file goes straight to a
+    temporary file and the upload is rejected as soon as it exceeds the size
+    limit. The file is then parsed and reviewed in a worker process (PDF pages
+    are checked as they are extracted), so large documents neither block the
+    event loop nor sit in API memory.
+    """
+    max_bytes = int(config.max_upload_mb * 1024 * 1024)
+    upload = await receive_upload(http_request, "file", UPLOAD_SUFFIXES, max_bytes)
+    product = upload.fields.get("product") or None
+    client_tier = upload.fields.get("client_tier") or None
+
+    logger.info(f"Reviewing uploaded SOW {upload.filename} ({upload.size} bytes)")
 
-        return SOWReviewResponse(
-            compliance_score=score,
-            status=status,
-            issues=issues,
-            summary=summary,
+    try:
+        loop = asyncio.get_running_loop()
+        review, sow_text = await loop.run_in_executor(
+            parse_pool, partial(review_sow_file, upload.path, product, client_tier)
+        )
+    except Exception as e:
+        logger.warning(f"Failed to parse upload {upload.filename}: {e}")
+        raise HTTPException(
+            status_code=422,
+            detail=f"Could not parse {upload.filename}: {str(e)}",
         )
+    finally:
+        upload.path.unlink(missing_ok=True)
 
+    if not sow_text.strip():
+        raise HTTPException(
+            status_code=422,
+            detail=f"No text could be extracted from {upload.filename}",
+        )
+
+    return SOWUploadReviewResponse(
+        **review.model_dump(), filename=upload.filename, sow_text=sow_text
+    )
+
+
+@router.post("/review/batch", dependencies=[Depends(admit("interactive"))])
+@audit_endpoint("sow_review_batch")
+async def review_sow_batch(
+    request: SOWBatchReviewRequest,
+    review_pool: ProcessPoolExecutor = Depends(get_review_pool),
+):
+    """
+    Review many SOWs, streaming NDJSON results as each document completes.
+
+    Documents come from the request body and/or a server-side directory or
+    zip archive (source_path). Each line is {"type": "result", ...} or
+    {"type": "error", ...}; the last line is the aggregate {"type": "summary"}.
+    """
+    if not request.documents and not request.source_path:
+        raise HTTPException(status_code=400, detail="Provide documents or source_path")
+
+    jobs = [
+        {
+            "doc_id": doc.id,
+            "sow_text": doc.sow_text,
+            "product": doc.product or request.product,
+            "client_tier": doc.client_tier or request.client_tier,
+        }
+        for doc in request.documents
+    ]
+
+    extract_dir = Path(tempfile.mkdtemp(prefix="sow-batch-"))
+    if request.source_path:
+        try:
+            sources = await run_in_threadpool(
+                collect_batch_sources,
+                request.source_path,
+                Path(config.review_batch_root),
+                extract_dir,
+                int(config.max_upload_mb * 1024 * 1024),
+                int(config.review_batch_max_mb * 1024 * 1024),
+                config.review_batch_max_files,
+            )
+        except (ValueError, zipfile.BadZipFile) as e:
+            shutil.rmtree(extract_dir, ignore_errors=True)
+            raise HTTPException(status_code=400, detail=str(e))
+
+        jobs.extend(
+            {
+                "doc_id": doc_id,
+                "file_path": str(path),
+                "product": request.product,
+                "client_tier": request.client_tier,
+            }
+            for doc_id, path in sources
+        )
+
+    logger.info(f"Batch review of {len(jobs)} documents")
+    return StreamingResponse(
+        _stream_batch_review(jobs, review_pool, extract_dir),
+        media_type="application/x-ndjson",
+    )
+
+
+async def _stream_batch_review(
+    jobs: list[dict], review_pool: ProcessPoolExecutor, extract_dir: Path
+) -> AsyncIterator[str]:
+    """Fan jobs out to the pool and yield one NDJSON line per finished document."""
+    aggregator = BatchReviewAggregator()
+    start_time = time.perf_counter()
+    loop = asyncio.get_running_loop()
+    remaining = iter(jobs)
+    pending: dict[asyncio.Future, str] = {}
+
+    try:
+        while True:
+            # Bound in-flight work so large batches don't queue every document at once
+            for job in remaining:
+                future = loop.run_in_executor(review_pool, partial(review_batch_item, **job))
+                pending[future] = job["doc_id"]
+                if len(pending) >= config.review_workers * 2:
+                    break
+
+            if not pending:
+                break
+
+            done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for future in done:
+                doc_id = pending.pop(future)
+                try:
+                    result = future.result()
+                except Exception as e:
+                    logger.warning(f"Batch review failed for {doc_id}: {e}")
+                    aggregator.add_failure()
+                    result = {"type": "error", "id": doc_id, "error": str(e)}
+                else:
+                    aggregator.add(result)
+                yield json.dumps(result) + "\n"
+
+        summary = aggregator.summary(time.perf_counter() - start_time)
+        yield summary.model_dump_json() + "\n"
+    finally:
+        for future in pending:
+            future.cancel()
+        shutil.rmtree(extract_dir, ignore_errors=True)
+
+
+@router.post("/export")
+@audit_endpoint("sow_export")
+async def export_sow(request: SOWExportRequest):
+    """
+    Export SOW markdown as a DOCX download.
+
+    Headings, bullet/numbered lists, tables and bold/italic text are kept.
+    """
+    from src.agent.utils.docx_exporter import DOCX_MEDIA_TYPE, export_to_bytes
+
+    logger.info(f"Exporting SOW to DOCX (length={len(request.sow_text)} chars)")
+
+    try:
+        # Rendering is CPU-bound; keep it off the event loop
+        content = await run_in_threadpool(export_to_bytes, request.sow_text)
     except Exception as e:
-        logger.error(f"Error reviewing SOW: {e}", exc_info=True)
+        logger.error(f"Error exporting SOW: {e}", exc_info=True)
         raise HTTPException(
             status_code=500,
-            detail=f"Failed to review SOW: {str(e)}",
+            detail=f"Failed to export SOW: {str(e)}",
         )
+
+    filename = re.sub(r"[^A-Za-z0-9._-]+", "_", request.filename).strip("._") or "sow"
+    return Response(
+        content=content,
+        media_type=DOCX_MEDIA_TYPE,
+        headers={"Content-Disposition": f'attachment; filename="{filename}.docx"'},
+    )
@@ -21,6 +21,13 @@ class SOWCreateRequest(BaseModel):
         "production",
         description="Generation mode: 'quick' (15s, $0.06) or 'production' (35s, $0.23)",
     )
+    run_id: str | None = Field(
+        None,
+        description="Run ID from a failed request; the run resumes from its last completed step",
+    )
+    session_id: str | None = Field(
+        None, description="Start an editing session with this ID on the generated SOW"
+    )
 
     model_config = ConfigDict(
         json_schema_extra={
@@ -62,6 +69,92 @@ class SOWCreateResponse(BaseModel):
     )
 
 
+class SOWJobResponse(BaseModel):
+    """Response model for a started generation job."""
+
+    job_id: str = Field(..., description="Job ID")
+    status: str = Field(..., description="Job status")
+    status_url: str = Field(..., description="URL to poll for the job's status")
+    events_url: str = Field(..., description="Server-sent events stream of the job")
+
+
+class SOWJobStatusResponse(BaseModel):
+    """Response model for generation job status."""
+
+    job_id: str = Field(..., description="Job ID")
+    status: str = Field(..., description="queued, researching, drafting, refining, done or failed")
+    client_id: str = Field(..., description="Client ID from CRM")
+    product: str = Field(..., description="Product name")
+    quality_mode: str = Field(..., description="Generation mode")
+    draft: str | None = Field(None, description="Quick draft, available before refinement")
+    sow_text: str | None = Field(None, description="Final SOW once the job is done")
+    error: str | None = Field(None, description="Error message if the job failed")
+    timings: dict[str, float] = Field(
+        default_factory=dict, description="Seconds from job start to the end of each step"
+    )
+
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {
+                "job_id": "3f2b9c0e8a7d4d1f9b6e5a4c3d2e1f0a",
+                "status": "refining",
+                "client_id": "CLIENT-001",
+                "product": "Real-Time Payments",
+                "quality_mode": "production",
+                "draft": "# Statement of Work\n\n## Executive Summary...",
+                "sow_text": None,
+                "error": None,
+                "timings": {"researching": 1.2, "drafting": 13.8},
+            }
+        }
+    )
+
+
+# ============================================================================
+# SOW Editing Session Schemas
+# ============================================================================
+
+
+class SOWSessionCreateRequest(BaseModel):
+    """Request model for starting an editing session on an existing SOW."""
+
+    sow_text: str = Field(..., description="SOW content to edit")
+    session_id: str | None = Field(None, description="Session ID (generated if omitted)")
+    client_id: str | None = Field(None, description="Client ID from CRM")
+    product: str | None = Field(None, description="Product name")
+
+
+class SOWSessionEditRequest(BaseModel):
+    """Request model for a follow-up edit instruction."""
+
+    instruction: str = Field(..., description="What to change")
+    section: str | None = Field(
+        None, description="Title of the section to edit (default: inferred from the instruction)"
+    )
+
+    model_config = ConfigDict(
+        json_schema_extra={"example": {"instruction": "Shorten the timeline section"}}
+    )
+
+
+class SOWSessionResponse(BaseModel):
+    """Response model for an editing session."""
+
+    session_id: str = Field(..., description="Session ID")
+    sow_text: str = Field(..., description="Current SOW content")
+    sections: list[str] = Field(..., description="Section titles in document order")
+    edits: list[dict[str, Any]] = Field(..., description="Edits applied so far, oldest first")
+    client_id: str | None = Field(None, description="Client ID from CRM")
+    product: str | None = Field(None, description="Product name")
+
+
+class SOWSessionEditResponse(SOWSessionResponse):
+    """Response model for an applied edit."""
+
+    section: str = Field(..., description="Title of the section that was revised")
+    edit_time_seconds: float = Field(..., description="Time taken to apply the edit")
+
+
 # ============================================================================
 # SOW Review Schemas
 # ============================================================================
@@ -75,6 +168,11 @@ class SOWReviewRequest(BaseModel):
     client_tier: str | None = Field(
         None, description="Client tier (HIGH/MEDIUM/LOW) for compliance rules"
     )
+    document_id: str | None = Field(
+        None,
+        description="Stable ID of a document being edited; enables incremental re-review "
+        "and an issue diff against the previous review",
+    )
 
     model_config = ConfigDict(
         json_schema_extra={
@@ -87,6 +185,74 @@ class SOWReviewRequest(BaseModel):
     )
 
 
+class SOWExportRequest(BaseModel):
+    """Request model for exporting a SOW to DOCX."""
+
+    sow_text: str = Field(..., description="SOW markdown to export")
+    filename: str = Field("statement-of-work", description="Download file name (without .docx)")
+
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {
+                "sow_text": "# Statement of Work\n\n## 1. Scope\n\n- **Gateway** provisioning",
+                "filename": "SOW-acme-payments",
+            }
+        }
+    )
+
+
+class BatchReviewDocument(BaseModel):
+    """One document in a batch review."""
+
+    id: str = Field(..., description="Caller-supplied document ID, echoed in results")
+    sow_text: str = Field(..., description="SOW content to review")
+    product: str | None = Field(None, description="Overrides the batch product")
+    client_tier: str | None = Field(None, description="Overrides the batch client tier")
+
+
+class SOWBatchReviewRequest(BaseModel):
+    """Request model for batch review of many SOWs."""
+
+    documents: list[BatchReviewDocument] = Field(
+        default_factory=list, description="Documents to review"
+    )
+    source_path: str | None = Field(
+        None,
+        description="Server-side directory or .zip of SOWs (.md, .txt, .pdf, .docx) "
+        "under REVIEW_BATCH_ROOT",
+    )
+    product: str | None = Field(None, description="Product name for SLA validation")
+    client_tier: str | None = Field(None, description="Client tier (HIGH/MEDIUM/LOW)")
+
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {
+                "source_path": "historical_sows",
+                "product": "Real-Time Payments",
+                "client_tier": "HIGH",
+            }
+        }
+    )
+
+
+class BatchReviewSummary(BaseModel):
+    """Aggregate results of a batch review (last NDJSON line)."""
+
+    type: str = "summary"
+    documents: int = Field(0, description="Documents reviewed successfully")
+    failed: int = Field(0, description="Documents that could not be reviewed")
+    average_score: float = Field(0.0, description="Mean compliance score")
+    min_score: int | None = Field(None, description="Lowest compliance score")
+    status_counts: dict[str, int] = Field(default_factory=dict, description="Documents by status")
+    issue_counts: dict[str, int] = Field(
+        default_factory=dict, description="Issues by severity across all documents"
+    )
+    category_counts: dict[str, int] = Field(
+        default_factory=dict, description="Issues by category across all documents"
+    )
+    elapsed_seconds: float = Field(0.0, description="Wall time for the batch")
+
+
 class ComplianceIssue(BaseModel):
     """Individual compliance issue."""
 
@@ -97,6 +263,16 @@ class ComplianceIssue(BaseModel):
     suggestion: str | None = Field(None, description="Suggested fix")
 
 
+class ReviewDiff(BaseModel):
+    """Changes since the previous review of the same document."""
+
+    added: list[ComplianceIssue] = Field(..., description="Issues new in this review")
+    resolved: list[ComplianceIssue] = Field(..., description="Issues no longer present")
+    unchanged: int = Field(..., description="Issues carried over from the previous review")
+    blocks_total: int = Field(..., description="Section blocks in the document")
+    blocks_reviewed: int = Field(..., description="Blocks re-evaluated (not served from cache)")
+
+
 class SOWReviewResponse(BaseModel):
     """Response model for SOW review."""
 
@@ -104,6 +280,9 @@ class SOWReviewResponse(BaseModel):
     status: str = Field(..., description="PASS, WARNING, or FAIL")
     issues: list[ComplianceIssue] = Field(..., description="List of issues found")
     summary: dict[str, int] = Field(..., description="Issue count by severity")
+    diff: ReviewDiff | None = Field(
+        None, description="Changes since the last review (requests with document_id)"
+    )
 
     model_config = ConfigDict(
         json_schema_extra={
@@ -125,6 +304,13 @@ class SOWReviewResponse(BaseModel):
     )
 
 
+class SOWUploadReviewResponse(SOWReviewResponse):
+    """Response model for review of an uploaded PDF/DOCX."""
+
+    filename: str = Field(..., description="Uploaded file name")
+    sow_text: str = Field(..., description="Text parsed from the document")
+
+
 # ============================================================================
 # Research Schemas
 # ============================================================================
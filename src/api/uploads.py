@@ -0,0 +1,206 @@
+"""
+Streaming multipart uploads.
+
+FastAPI parses a multipart body (spooling file parts to temporary files) before
+the endpoint runs, so a size limit checked in the handler neither stops a large
+body nor avoids copying the spooled file again. receive_upload parses the
+request stream itself: the file part is written once, straight to a named
+temporary file that worker processes can open, and the upload is rejected as
+soon as it goes over the limit.
+"""
+
+import tempfile
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import IO, TYPE_CHECKING
+
+from fastapi import HTTPException, Request
+from python_multipart.exceptions import MultipartParseError
+from python_multipart.multipart import MultipartParser, parse_options_header
+from starlette.concurrency import run_in_threadpool
+
+if TYPE_CHECKING:
+    from python_multipart.multipart import MultipartCallbacks
+
+# Allowance for part headers, boundaries and the form's text fields
+FORM_OVERHEAD_BYTES = 64 * 1024
+
+
+@dataclass
+class ReceivedUpload:
+    """A file received from a multipart upload, with the form's text fields."""
+
+    filename: str
+    path: Path
+    size: int
+    fields: dict[str, str] = field(default_factory=dict)
+
+
+class _FormReceiver:
+    """Multipart parser callbacks: the file part goes to disk, text fields to memory."""
+
+    def __init__(self, file_field: str, suffixes: tuple[str, ...]) -> None:
+        self.file_field = file_field
+        self.suffixes = suffixes
+        self.fields: dict[str, str] = {}
+        self.filename: str | None = None
+        self.file: IO[bytes] | None = None
+        self.file_size = 0
+        self.pending: list[bytes] = []
+
+        self._header_name = b""
+        self._header_value = b""
+        self._disposition = b""
+        self._field_name: str | None = None
+        self._field_data = bytearray()
+        self._writing_file = False
+
+    def callbacks(self) -> "MultipartCallbacks":
+        return {
+            "on_part_begin": self.on_part_begin,
+            "on_header_field": self.on_header_field,
+            "on_header_value": self.on_header_value,
+            "on_header_end": self.on_header_end,
+            "on_headers_finished": self.on_headers_finished,
+            "on_part_data": self.on_part_data,
+            "on_part_end": self.on_part_end,
+        }
+
+    def on_part_begin(self) -> None:
+        self._disposition = b""
+        self._field_name = None
+        self._field_data = bytearray()
+        self._writing_file = False
+
+    def on_header_field(self, data: bytes, start: int, end: int) -> None:
+        self._header_name += data[start:end]
+
+    def on_header_value(self, data: bytes, start: int, end: int) -> None:
+        self._header_value += data[start:end]
+
+    def on_header_end(self) -> None:
+        if self._header_name.lower() == b"content-disposition":
+            self._disposition = self._header_value
+        self._header_name = self._header_value = b""
+
+    def on_headers_finished(self) -> None:
+        _, options = parse_options_header(self._disposition)
+        name = options.get(b"name", b"").decode("utf-8", "replace")
+        filename = options.get(b"filename")
+
+        if filename is None:
+            self._field_name = name
+            return
+        if name != self.file_field or self.file is not None:
+            return  # Other (or repeated) file parts are not stored
+
+        self.filename = filename.decode("utf-8", "replace")
+        suffix = Path(self.filename).suffix.lower()
+        if suffix not in self.suffixes:
+            raise HTTPException(
+                status_code=415,
+                detail=(
+                    f"Unsupported file type: {suffix or 'unknown'}. "
+                    f"Supported: {', '.join(self.suffixes)}"
+                ),
+            )
+        self.file = tempfile.NamedTemporaryFile(suffix=suffix, delete=False)
+        self._writing_file = True
+
+    def on_part_data(self, data: bytes, start: int, end: int) -> None:
+        if self._writing_file:
+            self.pending.append(data[start:end])
+            self.file_size += end - start
+        elif self._field_name is not None:
+            self._field_data += data[start:end]
+
+    def on_part_end(self) -> None:
+        if self._field_name is not None:
+            self.fields[self._field_name] = self._field_data.decode("utf-8", "replace")
+        self._writing_file = False
+
+    def flush(self) -> None:
+        """Write file data received so far (called off the event loop)."""
+        if self.file is not None and self.pending:
+            self.file.write(b"".join(self.pending))
+        self.pending = []
+
+    def discard(self) -> None:
+        """Remove the partially written file."""
+        if self.file is not None:
+            self.file.close()
+            Path(self.file.name).unlink(missing_ok=True)
+            self.file = None
+
+
+def _too_large(max_bytes: int) -> HTTPException:
+    return HTTPException(
+        status_code=413,
+        detail=f"File exceeds the {max_bytes / (1024 * 1024):g} MB upload limit",
+    )
+
+
+async def receive_upload(
+    request: Request,
+    file_field: str,
+    suffixes: tuple[str, ...],
+    max_bytes: int,
+) -> ReceivedUpload:
+    """
+    Receive a multipart/form-data upload, writing its file part to a temporary file.
+
+    Args:
+        request: Incoming request (its body must not have been read)
+        file_field: Form field carrying the file
+        suffixes: Accepted file suffixes, e.g. (".pdf", ".docx")
+        max_bytes: Size limit for the file
+
+    Returns:
+        The received upload; the caller deletes upload.path when done
+
+    Raises:
+        HTTPException: 400 for a malformed body or missing file, 413 once the
+            file (or the body) exceeds the limit, 415 for an unsupported file type
+    """
+    content_type, params = parse_options_header(request.headers.get("content-type"))
+    boundary = params.get(b"boundary")
+    if content_type != b"multipart/form-data" or not boundary:
+        raise HTTPException(status_code=400, detail="Expected a multipart/form-data upload")
+
+    # Refuse bodies that announce their size up front; chunked bodies are counted below
+    max_body_bytes = max_bytes + FORM_OVERHEAD_BYTES
+    content_length = request.headers.get("content-length", "")
+    if content_length.isdigit() and int(content_length) > max_body_bytes:
+        raise _too_large(max_bytes)
+
+    receiver = _FormReceiver(file_field, suffixes)
+    parser = MultipartParser(boundary, callbacks=receiver.callbacks())
+    received = 0
+    try:
+        async for chunk in request.stream():
+            received += len(chunk)
+            if received > max_body_bytes:
+                raise _too_large(max_bytes)
+            parser.write(chunk)
+            if receiver.file_size > max_bytes:
+                raise _too_large(max_bytes)
+            if receiver.pending:
+                await run_in_threadpool(receiver.flush)
+        parser.finalize()
+    except MultipartParseError as e:
+        receiver.discard()
+        raise HTTPException(status_code=400, detail=f"Malformed multipart body: {e}")
+    except BaseException:
+        receiver.discard()
+        raise
+
+    if receiver.file is None or receiver.filename is None:
+        raise HTTPException(status_code=400, detail=f"Missing file field '{file_field}'")
+
+    receiver.file.close()
+    return ReceivedUpload(
+        filename=receiver.filename,
+        path=Path(receiver.file.name),
+        size=receiver.file_size,
+        fields=receiver.fields,
+    )
@@ -0,0 +1,161 @@
+"""
+API warm-up and readiness.
+
+The app answers /health as soon as it starts. A lifespan task then builds the
+expensive shared resources (agent graph, Chroma client, compliance bundles,
+document libraries) in the background, and /ready only returns 200 once that
+has finished. First-request latencies are recorded per path, with whether the
+request arrived before or after warm-up, so the effect shows in /ready.
+"""
+
+import logging
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import asdict, dataclass
+from typing import Any
+
+from starlette.concurrency import run_in_threadpool
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class WarmupStep:
+    """One resource to build during warm-up."""
+
+    name: str
+    status: str = "pending"  # pending, running, done, failed
+    duration_ms: float | None = None
+    error: str | None = None
+
+
+class WarmupState:
+    """Runs warm-up steps in order and reports readiness."""
+
+    def __init__(self, steps: list[tuple[str, Callable[[], Any]]]) -> None:
+        """
+        Initialize the warm-up.
+
+        Args:
+            steps: (name, function) pairs; functions are blocking and run in a thread
+        """
+        self._functions = dict(steps)
+        self.steps = [WarmupStep(name=name) for name, _ in steps]
+        self.started_at: float | None = None
+        self.finished_at: float | None = None
+
+    @property
+    def status(self) -> str:
+        """ "pending", "warming", "ready" or "failed"."""
+        if self.started_at is None:
+            return "pending"
+        if self.finished_at is None:
+            return "warming"
+        return "failed" if any(step.status == "failed" for step in self.steps) else "ready"
+
+    @property
+    def ready(self) -> bool:
+        return self.status == "ready"
+
+    async def run(self) -> None:
+        """Run every step, continuing past failures so /ready can report all of them."""
+        self.started_at = time.perf_counter()
+
+        for step in self.steps:
+            step.status = "running"
+            start = time.perf_counter()
+            try:
+                await run_in_threadpool(self._functions[step.name])
+                step.status = "done"
+            except Exception as e:
+                logger.error(f"Warm-up step '{step.name}' failed: {e}", exc_info=True)
+                step.status = "failed"
+                step.error = str(e)
+            step.duration_ms = round((time.perf_counter() - start) * 1000, 1)
+
+        self.finished_at = time.perf_counter()
+        logger.info(f"Warm-up finished: {self.status} in {self.snapshot()['duration_ms']} ms")
+
+    def snapshot(self) -> dict:
+        """Status, total duration and per-step results."""
+        duration_ms = None
+        if self.started_at is not None:
+            end = self.finished_at or time.perf_counter()
+            duration_ms = round((end - self.started_at) * 1000, 1)
+        return {
+            "status": self.status,
+            "duration_ms": duration_ms,
+            "steps": [asdict(step) for step in self.steps],
+        }
+
+
+class FirstRequestMetrics:
+    """Latency of the first request to each route since the process started."""
+
+    def __init__(self) -> None:
+        self._first: dict[str, dict] = {}
+        self._lock = threading.Lock()
+
+    def record(self, path: str, duration_ms: float, warm: bool) -> None:
+        """
+        Record a request if it is the first one to its route.
+
+        Args:
+            path: Route path template, e.g. /api/v1/sow/jobs/{job_id}
+            duration_ms: Request latency
+            warm: Whether warm-up had finished when the request arrived
+        """
+        with self._lock:
+            if path not in self._first:
+                self._first[path] = {"latency_ms": round(duration_ms, 1), "warm": warm}
+
+    def snapshot(self) -> dict[str, dict]:
+        with self._lock:
+            return {path: dict(entry) for path, entry in self._first.items()}
+
+
+def _warm_agent() -> None:
+    """Build the SOW agent: LangGraph, Bedrock client, tool binding, graph compile."""
+    from src.api.dependencies import get_sow_agent
+
+    get_sow_agent()
+
+
+def _warm_vector_store() -> None:
+    """Open Chroma and the collection used by the research tools."""
+    from src.rag.retriever import DocumentRetriever
+
+    DocumentRetriever()
+
+
+def _warm_compliance() -> None:
+    """Load compliance bundles and the tool modules the review endpoints call."""
+    import src.agent.tools.compliance  # noqa: F401
+    import src.agent.tools.research  # noqa: F401
+    from src.agent.tools.compliance_rules import load_compliance_rules
+
+    load_compliance_rules()
+
+
+def _warm_documents() -> None:
+    """Import the PDF/DOCX libraries and cache the default export template."""
+    import src.agent.utils.doc_handler  # noqa: F401
+    from src.agent.utils.docx_exporter import _template
+
+    _template(None)
+
+
+def default_steps() -> list[tuple[str, Callable[[], Any]]]:
+    """Warm-up steps for the API, cheapest first so failures surface early."""
+    return [
+        ("compliance", _warm_compliance),
+        ("documents", _warm_documents),
+        ("vector_store", _warm_vector_store),
+        ("agent", _warm_agent),
+    ]
+
+
+# Global warm-up state and first-request metrics for the API process
+warmup_state = WarmupState(default_steps())
+first_requests = FirstRequestMetrics()
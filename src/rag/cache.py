@@ -0,0 +1,182 @@
+"""
+Query result cache for the RAG pipeline.
+
+Caches DocumentRetriever results in memory with TTL + LRU eviction. Entries are
+keyed by collection version, so any write through DocumentIndexer invalidates
+earlier results for that collection.
+"""
+
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Any
+
+from src.agent.config import config
+
+
+def normalize_query(query: str) -> str:
+    """
+    Normalize a query so trivially different phrasings share a cache entry.
+
+    Args:
+        query: Raw query string
+
+    Returns:
+        Lower-cased query with collapsed whitespace and no edge punctuation
+    """
+    return re.sub(r"\s+", " ", query.lower()).strip(" .,;:!?\"'")
+
+
+class QueryCache:
+    """Thread-safe TTL + LRU cache for retriever results."""
+
+    def __init__(self, max_size: int = 256, ttl_seconds: float = 600.0) -> None:
+        """
+        Initialize the cache.
+
+        Args:
+            max_size: Maximum number of cached queries (0 disables caching)
+            ttl_seconds: Seconds before an entry expires
+        """
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+
+        self._entries: OrderedDict[tuple, tuple[float, float, Any]] = OrderedDict()
+        self._versions: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+        self._latency_saved = 0.0
+
+    @property
+    def enabled(self) -> bool:
+        """Whether caching is enabled."""
+        return self.max_size > 0
+
+    def make_key(
+        self,
+        collection_name: str,
+        query: str,
+        filters: dict[str, str] | None,
+        n_results: int,
+        *extra: Any,
+    ) -> tuple:
+        """
+        Build a cache key for a search.
+
+        Args:
+            collection_name: ChromaDB collection being searched
+            query: Search query
+            filters: Metadata filters
+            n_results: Number of results requested
+            extra: Any further parameters that change the result
+
+        Returns:
+            Hashable cache key
+        """
+        with self._lock:
+            version = self._versions.get(collection_name, 0)
+        filter_items = tuple(sorted((filters or {}).items()))
+        return (collection_name, version, normalize_query(query), filter_items, n_results, *extra)
+
+    def get(self, key: tuple) -> Any | None:
+        """
+        Look up a cached result.
+
+        Args:
+            key: Key from make_key
+
+        Returns:
+            Cached value, or None on a miss
+        """
+        if not self.enabled:
+            return None
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._misses += 1
+                return None
+
+            stored_at, compute_seconds, value = entry
+            if time.monotonic() - stored_at > self.ttl_seconds:
+                del self._entries[key]
+                self._expirations += 1
+                self._misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self._hits += 1
+            self._latency_saved += compute_seconds
+            return value
+
+    def put(self, key: tuple, value: Any, compute_seconds: float = 0.0) -> None:
+        """
+        Store a result.
+
+        Args:
+            key: Key from make_key
+            value: Result to cache
+            compute_seconds: Time taken to compute the result (for latency-saved metrics)
+        """
+        if not self.enabled:
+            return
+
+        with self._lock:
+            # Drop results computed against a collection version that is now stale
+            if key[1] != self._versions.get(key[0], 0):
+                return
+
+            self._entries[key] = (time.monotonic(), compute_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def invalidate(self, collection_name: str | None = None) -> None:
+        """
+        Invalidate cached results after a collection is written to.
+
+        Args:
+            collection_name: Collection that changed (all collections if None)
+        """
+        with self._lock:
+            if collection_name is None:
+                for name in self._versions:
+                    self._versions[name] += 1
+                self._entries.clear()
+                return
+
+            self._versions[collection_name] = self._versions.get(collection_name, 0) + 1
+            for key in [k for k in self._entries if k[0] == collection_name]:
+                del self._entries[key]
+
+    def stats(self) -> dict[str, Any]:
+        """
+        Get cache metrics.
+
+        Returns:
+            Dictionary with hit/miss counts, hit rate and latency saved
+        """
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "size": len(self._entries),
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+                "expirations": self._expirations,
+                "hit_rate": round(self._hits / lookups, 4) if lookups else 0.0,
+                "latency_saved_seconds": round(self._latency_saved, 3),
+            }
+
+
+# Global query cache shared by all retrievers and indexers in this process
+query_cache = QueryCache(
+    max_size=config.retriever_cache_size,
+    ttl_seconds=config.retriever_cache_ttl,
+)
@@ -0,0 +1,362 @@
+"""
+Token-aware markdown chunker for the RAG pipeline.
+
+Splits markdown into chunks bounded by a token budget while keeping tables,
+lists and code blocks intact where possible, carrying the heading path of each
+chunk and supporting a configurable token overlap. Runs in a single linear pass.
+"""
+
+import re
+import string
+from collections.abc import Callable
+from dataclasses import dataclass, field
+
+_PUNCTUATION_PATTERN = re.compile(f"[{re.escape(string.punctuation)}]")
+_HEADING_PATTERN = re.compile(r"^(#{1,6})\s+(.+?)\s*#*\s*$")
+_LIST_ITEM_PATTERN = re.compile(r"^\s*(?:[-*+]|\d+[.)])\s+")
+_FENCE_PATTERN = re.compile(r"^\s*(```|~~~)")
+_SENTENCE_PATTERN = re.compile(r"(?<=[.!?])\s+")
+
+
+def count_tokens(text: str) -> int:
+    """
+    Estimate the number of model tokens in text.
+
+    Counts whitespace-separated words plus punctuation marks. This slightly
+    over-estimates BPE token counts, which is the safe direction for a chunk
+    budget, and avoids loading a tokenizer.
+
+    Args:
+        text: Text to measure
+
+    Returns:
+        Estimated token count
+    """
+    return len(text.split()) + len(_PUNCTUATION_PATTERN.findall(text))
+
+
+@dataclass(frozen=True)
+class Chunk:
+    """A chunk of markdown with its position in the heading hierarchy."""
+
+    text: str
+    heading_path: tuple[str, ...]
+    token_count: int
+
+    @property
+    def section(self) -> str:
+        """Name of the innermost heading containing the chunk."""
+        return self.heading_path[-1] if self.heading_path else "Introduction"
+
+    @property
+    def heading_path_text(self) -> str:
+        """Heading path rendered as 'H1 > H2 > H3'."""
+        return " > ".join(self.heading_path) or "Introduction"
+
+
+@dataclass
+class _Block:
+    """A structural markdown block (paragraph, list, table or code)."""
+
+    kind: str
+    lines: list[str] = field(default_factory=list)
+
+
+class MarkdownChunker:
+    """Splits markdown into token-bounded, structure-preserving chunks."""
+
+    def __init__(
+        self,
+        max_tokens: int = 400,
+        overlap_tokens: int = 0,
+        token_counter: Callable[[str], int] = count_tokens,
+    ) -> None:
+        """
+        Initialize the chunker.
+
+        Args:
+            max_tokens: Maximum tokens per chunk
+            overlap_tokens: Tokens of trailing content repeated at the start of
+                the next chunk within the same section
+            token_counter: Function used to count tokens
+
+        Raises:
+            ValueError: If overlap_tokens is not smaller than max_tokens
+        """
+        if overlap_tokens >= max_tokens:
+            raise ValueError("overlap_tokens must be smaller than max_tokens")
+
+        self.max_tokens = max_tokens
+        self.overlap_tokens = overlap_tokens
+        self.count_tokens = token_counter
+
+    def chunk(self, content: str) -> list[Chunk]:
+        """
+        Chunk markdown content.
+
+        Args:
+            content: Markdown content
+
+        Returns:
+            List of chunks in document order
+        """
+        chunks: list[Chunk] = []
+        heading_path: list[tuple[int, str]] = []
+        pieces: list[tuple[str, int]] = []
+
+        def flush() -> None:
+            chunks.extend(self._pack(pieces, tuple(title for _, title in heading_path)))
+            pieces.clear()
+
+        for block in self._blocks(content):
+            if block.kind == "heading":
+                flush()
+                match = _HEADING_PATTERN.match(block.lines[0])
+                if match:
+                    level = len(match.group(1))
+                    while heading_path and heading_path[-1][0] >= level:
+                        heading_path.pop()
+                    heading_path.append((level, match.group(2).strip()))
+                continue
+
+            pieces.extend(self._split_block(block))
+
+        flush()
+        return chunks
+
+    def _blocks(self, content: str) -> list[_Block]:
+        """
+        Group lines into structural blocks in one pass.
+
+        Args:
+            content: Markdown content
+
+        Returns:
+            Blocks in document order
+        """
+        blocks: list[_Block] = []
+        current: _Block | None = None
+        fence: str | None = None
+
+        for line in content.splitlines():
+            stripped = line.strip()
+
+            # Inside a fenced code block everything belongs to the block
+            if fence is not None and current is not None:
+                current.lines.append(line)
+                if stripped.startswith(fence):
+                    fence = None
+                    current = None
+                continue
+
+            fence_match = _FENCE_PATTERN.match(line)
+            if fence_match:
+                fence = fence_match.group(1)
+                current = _Block("code", [line])
+                blocks.append(current)
+                continue
+
+            if not stripped:
+                # Blank lines end paragraphs and tables but not lists
+                if current is not None and current.kind != "list":
+                    current = None
+                continue
+
+            if _HEADING_PATTERN.match(line):
+                blocks.append(_Block("heading", [stripped]))
+                current = None
+                continue
+
+            if stripped.startswith("|"):
+                kind = "table"
+            elif _LIST_ITEM_PATTERN.match(line):
+                kind = "list"
+            elif current is not None and current.kind == "list" and line[:1].isspace():
+                kind = "list"  # Indented continuation of a list item
+            else:
+                kind = "paragraph"
+
+            if current is None or current.kind != kind:
+                current = _Block(kind)
+                blocks.append(current)
+            current.lines.append(line)
+
+        return blocks
+
+    def _split_block(self, block: _Block) -> list[tuple[str, int]]:
+        """
+        Split a block into pieces that each fit within max_tokens.
+
+        Tables split between rows (repeating the header), lists between items,
+        code between lines (re-opening the fence) and paragraphs between
+        sentences, falling back to words.
+
+        Args:
+            block: Block to split
+
+        Returns:
+            List of (piece_text, token_count) pairs
+        """
+        text = "\n".join(block.lines)
+        tokens = self.count_tokens(text)
+        if tokens <= self.max_tokens:
+            return [(text, tokens)]
+
+        if block.kind == "table":
+            header = block.lines[:2] if len(block.lines) > 2 else block.lines[:1]
+            return self._group(block.lines[len(header) :], prefix=header)
+        elif block.kind == "list":
+            return self._group(self._list_items(block.lines), separator="\n")
+        elif block.kind == "code":
+            fence = block.lines[0].strip()[:3]
+            closed = len(block.lines) > 1 and block.lines[-1].strip().startswith(fence)
+            body = block.lines[1:-1] if closed else block.lines[1:]
+            return self._group(body, prefix=[block.lines[0]], suffix=[fence])
+        else:
+            sentences = _SENTENCE_PATTERN.split(text)
+            return self._group(sentences, separator=" ")
+
+    def _list_items(self, lines: list[str]) -> list[str]:
+        """Join list lines into one string per top-level item."""
+        items: list[str] = []
+        for line in lines:
+            if not items or (not line[:1].isspace() and _LIST_ITEM_PATTERN.match(line)):
+                items.append(line)
+            else:
+                items[-1] += "\n" + line
+        return items
+
+    def _group(
+        self,
+        units: list[str],
+        prefix: list[str] | None = None,
+        suffix: list[str] | None = None,
+        separator: str = "\n",
+    ) -> list[tuple[str, int]]:
+        """
+        Greedily pack units into pieces within the token budget.
+
+        Units are joined on whitespace, so a piece's token count is the sum of
+        its parts and no text is counted twice. Each piece after the first
+        starts with trailing units of the previous one, up to overlap_tokens, so
+        an oversized block gets the same overlap as separate blocks do.
+
+        Args:
+            units: Units to pack (rows, items, lines or sentences)
+            prefix: Lines repeated at the start of every piece
+            suffix: Lines repeated at the end of every piece
+            separator: Separator between units
+
+        Returns:
+            List of (piece_text, token_count) pairs
+        """
+        prefix_text = "\n".join(prefix or [])
+        suffix_text = "\n".join(suffix or [])
+        overhead = self.count_tokens(prefix_text) + self.count_tokens(suffix_text)
+        budget = max(self.max_tokens - overhead, 1)
+
+        groups: list[list[tuple[str, int]]] = []
+        current: list[tuple[str, int]] = []
+        current_tokens = 0
+
+        for unit in units:
+            unit_tokens = self.count_tokens(unit)
+            if unit_tokens > budget:
+                # A single oversized unit is split on word boundaries
+                if current:
+                    groups.append(current)
+                    current, current_tokens = [], 0
+                groups.extend([part] for part in self._split_words(unit, budget))
+                continue
+
+            if current and current_tokens + unit_tokens > budget:
+                groups.append(current)
+                current = self._overlap(current, limit=budget - unit_tokens)
+                current_tokens = sum(tokens for _, tokens in current)
+            current.append((unit, unit_tokens))
+            current_tokens += unit_tokens
+
+        if current:
+            groups.append(current)
+
+        pieces = []
+        for group in groups:
+            parts = [prefix_text] if prefix_text else []
+            parts.append(separator.join(text for text, _ in group))
+            if suffix_text:
+                parts.append(suffix_text)
+            pieces.append(("\n".join(parts), sum(tokens for _, tokens in group) + overhead))
+        return pieces
+
+    def _split_words(self, text: str, budget: int) -> list[tuple[str, int]]:
+        """Split text on whitespace into overlapping parts within the token budget."""
+        parts: list[tuple[str, int]] = []
+        current: list[tuple[str, int]] = []
+        current_tokens = 0
+
+        def add_part() -> None:
+            parts.append((" ".join(word for word, _ in current), current_tokens))
+
+        for word in text.split():
+            word_tokens = self.count_tokens(word)
+            if current and current_tokens + word_tokens > budget:
+                add_part()
+                current = self._overlap(current, limit=budget - word_tokens)
+                current_tokens = sum(tokens for _, tokens in current)
+            current.append((word, word_tokens))
+            current_tokens += word_tokens
+
+        if current:
+            add_part()
+        return parts
+
+    def _pack(self, pieces: list[tuple[str, int]], heading_path: tuple[str, ...]) -> list[Chunk]:
+        """
+        Pack the pieces of one section into chunks, adding overlap between them.
+
+        Args:
+            pieces: (text, token_count) pairs, each within max_tokens
+            heading_path: Heading path shared by all pieces
+
+        Returns:
+            Chunks for the section
+        """
+        chunks: list[Chunk] = []
+        current: list[tuple[str, int]] = []
+        current_tokens = 0
+
+        for piece in pieces:
+            if current and current_tokens + piece[1] > self.max_tokens:
+                chunks.append(self._make_chunk(current, heading_path))
+                current = self._overlap(current, limit=self.max_tokens - piece[1])
+                current_tokens = sum(tokens for _, tokens in current)
+            current.append(piece)
+            current_tokens += piece[1]
+
+        if current:
+            chunks.append(self._make_chunk(current, heading_path))
+        return chunks
+
+    def _overlap(self, pieces: list[tuple[str, int]], limit: int) -> list[tuple[str, int]]:
+        """Return the trailing pieces (or units) that fit within the overlap budget."""
+        budget = min(self.overlap_tokens, limit)
+        carried: list[tuple[str, int]] = []
+        total = 0
+
+        for piece in reversed(pieces):
+            if total + piece[1] > budget:
+                break
+            carried.append(piece)
+            total += piece[1]
+
+        carried.reverse()
+        return carried
+
+    def _make_chunk(self, pieces: list[tuple[str, int]], heading_path: tuple[str, ...]) -> Chunk:
+        """Join pieces into a chunk."""
+        text = "\n\n".join(text for text, _ in pieces).strip()
+        return Chunk(
+            text=text,
+            heading_path=heading_path,
+            token_count=sum(tokens for _, tokens in pieces),
+        )
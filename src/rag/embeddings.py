@@ -1,22 +1,45 @@
 """
-Embeddings module for RAG pipeline using Amazon Bedrock Titan.
+Embeddings module for RAG pipeline.
+
+Provides the remote Amazon Bedrock Titan backend and a CPU-only local backend
+that can be selected with the ``EMBEDDING_BACKEND`` environment variable.
 """
 
+import asyncio
+import re
+import zlib
+from typing import Any, Protocol
+
+import numpy as np
+
 from src.agent.config import config
 
 
+class EmbeddingBackend(Protocol):
+    """Interface shared by all embedding backends."""
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        """Embed a list of documents."""
+        ...
+
+    def embed_query(self, text: str) -> list[float]:
+        """Embed a single query string."""
+        ...
+
+
 class BedrockEmbeddings:
     """Wrapper for Bedrock Titan embeddings."""
 
-    def __init__(self, model_id: str = "amazon.titan-embed-text-v2:0") -> None:
+    def __init__(self, model_id: str | None = None) -> None:
         """
         Initialize Bedrock embeddings.
 
         Args:
-            model_id: Bedrock model ID for embeddings
+            model_id: Bedrock model ID for embeddings (defaults to config)
         """
-        self.model_id = model_id
+        self.model_id = model_id or config.embedding_model_id
         self.client = config.bedrock_runtime
+        self._async_client: Any = None
 
     def embed_documents(self, texts: list[str]) -> list[list[float]]:
         """
@@ -71,3 +94,163 @@ class BedrockEmbeddings:
 
         response_body = json.loads(response["body"].read())
         return cast(list[float], response_body["embedding"])
+
+    async def aembed_documents(self, texts: list[str]) -> list[list[float]]:
+        """
+        Embed a list of documents concurrently over the async Bedrock transport.
+
+        Args:
+            texts: List of text strings to embed
+
+        Returns:
+            List of embedding vectors, in input order
+        """
+        return list(await asyncio.gather(*(self._aembed_single(text) for text in texts)))
+
+    async def aembed_query(self, text: str) -> list[float]:
+        """
+        Embed a single query string over the async Bedrock transport.
+
+        Args:
+            text: Query text to embed
+
+        Returns:
+            Embedding vector
+        """
+        return await self._aembed_single(text)
+
+    async def _aembed_single(self, text: str) -> list[float]:
+        if self._async_client is None:
+            from src.agent.utils.bedrock_async import get_async_bedrock
+
+            self._async_client = get_async_bedrock()
+
+        response_body = await self._async_client.invoke_model(self.model_id, {"inputText": text})
+        return list(response_body["embedding"])
+
+
+# Word tokens for the local backend (lower-cased before matching)
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+(?:[.%$][a-z0-9]+)*")
+
+
+class LocalEmbeddings:
+    """
+    CPU-only embeddings using hashed word and character n-grams.
+
+    Needs no model download or network access, so it suits offline development,
+    CI and latency-sensitive retrieval. Vectors are L2-normalized, which makes
+    ChromaDB's default L2 distance rank results the same way as cosine similarity.
+    """
+
+    def __init__(self, dimensions: int | None = None, char_ngram: int = 3) -> None:
+        """
+        Initialize local embeddings.
+
+        Args:
+            dimensions: Size of the hashed feature space (defaults to config)
+            char_ngram: Length of the character n-grams taken from each word
+        """
+        self.dimensions = dimensions or config.local_embedding_dim
+        self.char_ngram = char_ngram
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        """
+        Embed a list of documents in a single batched NumPy pass.
+
+        Args:
+            texts: List of text strings to embed
+
+        Returns:
+            List of embedding vectors
+        """
+        if not texts:
+            return []
+        return self._embed_batch(texts).tolist()
+
+    def embed_query(self, text: str) -> list[float]:
+        """
+        Embed a single query string.
+
+        Args:
+            text: Query text to embed
+
+        Returns:
+            Embedding vector
+        """
+        return self.embed_documents([text])[0]
+
+    def _embed_batch(self, texts: list[str]) -> np.ndarray:
+        """
+        Hash the features of every text into one (len(texts), dimensions) matrix.
+
+        Args:
+            texts: Texts to embed
+
+        Returns:
+            Row-normalized embedding matrix
+        """
+        rows: list[int] = []
+        hashes: list[int] = []
+
+        for row, text in enumerate(texts):
+            features = self._features(text)
+            rows.extend([row] * len(features))
+            hashes.extend(zlib.crc32(feature.encode("utf-8")) for feature in features)
+
+        hash_array = np.asarray(hashes, dtype=np.uint32)
+        columns = (hash_array % self.dimensions).astype(np.int64)
+        # Use a high bit of the hash as the sign so collisions tend to cancel out
+        signs = np.where(hash_array & 0x80000000, -1.0, 1.0)
+
+        flat_index = np.asarray(rows, dtype=np.int64) * self.dimensions + columns
+        matrix = np.bincount(
+            flat_index, weights=signs, minlength=len(texts) * self.dimensions
+        ).reshape(len(texts), self.dimensions)
+
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return matrix / norms
+
+    def _features(self, text: str) -> list[str]:
+        """
+        Extract word unigrams, word bigrams and character n-grams from text.
+
+        Args:
+            text: Text to featurize
+
+        Returns:
+            List of feature strings (with repeats, acting as term frequency)
+        """
+        words = _TOKEN_PATTERN.findall(text.lower())
+        features = [f"w:{word}" for word in words]
+        features.extend(f"b:{a} {b}" for a, b in zip(words, words[1:], strict=False))
+
+        n = self.char_ngram
+        for word in words:
+            padded = f"<{word}>"
+            features.extend(f"c:{padded[i:i + n]}" for i in range(len(padded) - n + 1))
+
+        return features
+
+
+def get_embeddings(backend: str | None = None) -> EmbeddingBackend:
+    """
+    Create the embedding backend selected in configuration.
+
+    Args:
+        backend: Backend name ("bedrock" or "local"); defaults to EMBEDDING_BACKEND
+
+    Returns:
+        Embedding backend instance
+
+    Raises:
+        ValueError: If the backend name is not recognised
+    """
+    backend = (backend or config.embedding_backend).lower()
+
+    if backend == "bedrock":
+        return BedrockEmbeddings()
+    elif backend == "local":
+        return LocalEmbeddings()
+    else:
+        raise ValueError(f"Unsupported embedding backend: {backend}. Supported: bedrock, local")
@@ -4,11 +4,13 @@ Document indexer for RAG pipeline.
 Handles chunking and indexing documents to ChromaDB.
 """
 
-import re
+import hashlib
 from pathlib import Path
 
 from src.agent.config import config
-from src.rag.embeddings import BedrockEmbeddings
+from src.rag.cache import query_cache
+from src.rag.chunker import Chunk, MarkdownChunker
+from src.rag.embeddings import get_embeddings
 
 
 class DocumentIndexer:
@@ -22,7 +24,11 @@ class DocumentIndexer:
             collection_name: Name of the ChromaDB collection
         """
         self.collection_name = collection_name
-        self.embeddings = BedrockEmbeddings()
+        self.embeddings = get_embeddings()
+        self.chunker = MarkdownChunker(
+            max_tokens=config.chunk_max_tokens,
+            overlap_tokens=config.chunk_overlap_tokens,
+        )
         self.chroma_client = config.chroma_client
 
         # Get or create collection
@@ -42,104 +48,63 @@ class DocumentIndexer:
         content = file_path.read_text(encoding="utf-8")
         chunks = self._chunk_markdown(content)
 
-        # Prepare metadata
-        base_metadata = metadata or {}
-        base_metadata["source_file"] = str(file_path)
-        base_metadata["file_name"] = file_path.name
-
-        # Generate IDs and prepare data
-        ids = []
-        documents = []
-        metadatas = []
-
-        for i, (section, chunk_text) in enumerate(chunks):
-            chunk_id = f"{file_path.stem}_{i}"
-            ids.append(chunk_id)
-            documents.append(chunk_text)
+        ids, documents, metadatas = build_chunk_records(file_path, chunks, metadata)
+        # A shorter new version would leave the old higher-numbered chunks behind
+        self.delete_sources([str(file_path)])
+        self.upsert_chunks(ids, documents, metadatas)
+
+    def upsert_chunks(
+        self,
+        ids: list[str],
+        documents: list[str],
+        metadatas: list[dict[str, str]],
+    ) -> None:
+        """
+        Embed chunks and upsert them into the collection.
 
-            chunk_metadata = base_metadata.copy()
-            chunk_metadata["section"] = section
-            chunk_metadata["chunk_index"] = str(i)
-            metadatas.append(chunk_metadata)
+        Args:
+            ids: Chunk IDs
+            documents: Chunk texts
+            metadatas: Chunk metadata
+        """
+        if not documents:
+            return
 
         # Generate embeddings
         embeddings = self.embeddings.embed_documents(documents)
 
-        # Add to collection
-        self.collection.add(
+        # Upsert so re-indexing a file replaces its existing chunks
+        self.collection.upsert(
             ids=ids, documents=documents, metadatas=metadatas, embeddings=embeddings
         )
 
-    def _chunk_markdown(self, content: str, max_chunk_size: int = 1000) -> list[tuple[str, str]]:
+        # Cached search results no longer reflect the collection
+        query_cache.invalidate(self.collection_name)
+
+    def delete_sources(self, source_files: list[str]) -> None:
         """
-        Chunk markdown content by sections.
+        Delete all chunks that came from the given source files.
 
         Args:
-            content: Markdown content
-            max_chunk_size: Maximum characters per chunk
-
-        Returns:
-            List of (section_name, chunk_text) tuples
+            source_files: Source file paths as stored in chunk metadata
         """
-        chunks = []
-
-        # Split by headers (##, ###, etc.)
-        sections = re.split(r"(^#{1,3}\s+.+$)", content, flags=re.MULTILINE)
-
-        current_section = "Introduction"
-        current_text = ""
-
-        for part in sections:
-            if re.match(r"^#{1,3}\s+", part):
-                # This is a header
-                if current_text.strip():
-                    # Save previous section
-                    chunks.extend(
-                        self._split_large_chunk(current_section, current_text, max_chunk_size)
-                    )
-                current_section = part.strip("# ").strip()
-                current_text = ""
-            else:
-                current_text += part
-
-        # Add last section
-        if current_text.strip():
-            chunks.extend(self._split_large_chunk(current_section, current_text, max_chunk_size))
-
-        return chunks
-
-    def _split_large_chunk(self, section: str, text: str, max_size: int) -> list[tuple[str, str]]:
+        if not source_files:
+            return
+
+        self.collection.delete(where={"source_file": {"$in": source_files}})
+        query_cache.invalidate(self.collection_name)
+
+    def _chunk_markdown(self, content: str) -> list[Chunk]:
         """
-        Split a large chunk into smaller pieces if needed.
+        Chunk markdown content by sections with the token-aware chunker.
 
         Args:
-            section: Section name
-            text: Text content
-            max_size: Maximum chunk size
+            content: Markdown content
 
         Returns:
-            List of (section, chunk) tuples
+            List of chunks carrying their heading path
         """
-        if len(text) <= max_size:
-            return [(section, text.strip())]
-
-        # Split by paragraphs
-        paragraphs = text.split("\n\n")
-        chunks = []
-        current_chunk = ""
-
-        for para in paragraphs:
-            if len(current_chunk) + len(para) > max_size:
-                if current_chunk:
-                    chunks.append((section, current_chunk.strip()))
-                current_chunk = para
-            else:
-                current_chunk += "\n\n" + para if current_chunk else para
-
-        if current_chunk:
-            chunks.append((section, current_chunk.strip()))
-
-        return chunks
+        return self.chunker.chunk(content)
 
     def clear_collection(self) -> None:
         """Clear all documents from the collection."""
@@ -148,3 +113,63 @@ class DocumentIndexer:
             name=self.collection_name,
             metadata={"description": "SOW documents and knowledge base"},
         )
+        query_cache.invalidate(self.collection_name)
+
+
+def chunk_id_prefix(file_path: Path) -> str:
+    """
+    ID prefix for the chunks of a file.
+
+    Ingestion walks directories recursively, so files such as a/sow.md, b/sow.md
+    and sow.pdf share a stem; a hash of the full source path keeps their chunk
+    IDs from overwriting each other on upsert.
+
+    Args:
+        file_path: Source file, as stored in the source_file metadata
+
+    Returns:
+        Prefix of the form "<stem>_<path hash>"
+    """
+    digest = hashlib.sha256(str(file_path).encode("utf-8")).hexdigest()[:12]
+    return f"{file_path.stem}_{digest}"
+
+
+def build_chunk_records(
+    file_path: Path,
+    chunks: list[Chunk],
+    metadata: dict[str, str] | None = None,
+) -> tuple[list[str], list[str], list[dict[str, str]]]:
+    """
+    Build ChromaDB IDs, documents and metadata for the chunks of one file.
+
+    Args:
+        file_path: Source file
+        chunks: Chunks of the file
+        metadata: Optional metadata to attach to every chunk
+
+    Returns:
+        Tuple of (ids, documents, metadatas)
+    """
+    # Prepare metadata
+    base_metadata = dict(metadata or {})
+    base_metadata["source_file"] = str(file_path)
+    base_metadata["file_name"] = file_path.name
+
+    # Generate IDs and prepare data
+    id_prefix = chunk_id_prefix(file_path)
+    ids = []
+    documents = []
+    metadatas = []
+
+    for i, chunk in enumerate(chunks):
+        ids.append(f"{id_prefix}_{i}")
+        documents.append(chunk.text)
+
+        chunk_metadata = base_metadata.copy()
+        chunk_metadata["section"] = chunk.section
+        chunk_metadata["heading_path"] = chunk.heading_path_text
+        chunk_metadata["chunk_index"] = str(i)
+        chunk_metadata["token_count"] = str(chunk.token_count)
+        metadatas.append(chunk_metadata)
+
+    return ids, documents, metadatas
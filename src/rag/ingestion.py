@@ -0,0 +1,363 @@
+"""
+Parallel ingestion pipeline for the RAG index.
+
+Streams documents through four stages:
+
+    directory walker -> process-pool parse + chunk -> batched embedding -> batched upsert
+
+Parsing runs in worker processes. Parsed chunks pass to a single writer thread
+through a bounded queue, so a slow embedding backend throttles parsing instead
+of letting results pile up in memory. Progress is checkpointed to a JSON file
+after every upsert so an interrupted run can resume where it stopped.
+"""
+
+import json
+import logging
+import queue
+import threading
+import time
+from collections.abc import Callable, Iterator
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from src.rag.chunker import MarkdownChunker
+from src.rag.indexer import DocumentIndexer, build_chunk_records
+
+logger = logging.getLogger(__name__)
+
+SUPPORTED_SUFFIXES = (".md", ".pdf", ".docx")
+
+# Builds chunk metadata for a source file (e.g. doc_type, client_id, product)
+MetadataFn = Callable[[Path], dict[str, str]]
+
+
+@dataclass
+class IngestionStats:
+    """Throughput and outcome counters for an ingestion run."""
+
+    files_seen: int = 0
+    files_skipped: int = 0
+    files_indexed: int = 0
+    files_failed: int = 0
+    chunks_indexed: int = 0
+    elapsed_seconds: float = 0.0
+    failures: dict[str, str] = field(default_factory=dict)
+
+    @property
+    def files_per_second(self) -> float:
+        """Indexed files per second."""
+        return self.files_indexed / self.elapsed_seconds if self.elapsed_seconds else 0.0
+
+    @property
+    def chunks_per_second(self) -> float:
+        """Indexed chunks per second."""
+        return self.chunks_indexed / self.elapsed_seconds if self.elapsed_seconds else 0.0
+
+
+@dataclass
+class _ParsedFile:
+    """Chunk records for one parsed file."""
+
+    path: str
+    ids: list[str]
+    documents: list[str]
+    metadatas: list[dict[str, str]]
+
+
+def iter_source_files(
+    directories: list[Path], suffixes: tuple[str, ...] = SUPPORTED_SUFFIXES
+) -> Iterator[Path]:
+    """
+    Walk directories and yield supported documents in a stable order.
+
+    Args:
+        directories: Directories to walk recursively
+        suffixes: File suffixes to include
+
+    Yields:
+        Paths of documents to ingest
+    """
+    for directory in directories:
+        if not directory.exists():
+            continue
+        for path in sorted(directory.rglob("*")):
+            if path.is_file() and path.suffix.lower() in suffixes:
+                yield path
+
+
+def load_document_text(file_path: Path) -> str:
+    """
+    Read a document as text, parsing PDF and DOCX files.
+
+    Args:
+        file_path: Path to the document
+
+    Returns:
+        Document text
+    """
+    if file_path.suffix.lower() == ".md":
+        return file_path.read_text(encoding="utf-8")
+
+    from src.agent.utils.doc_handler import parse_document
+
+    return parse_document(file_path)
+
+
+def _parse_and_chunk(
+    path: str,
+    metadata: dict[str, str],
+    max_tokens: int,
+    overlap_tokens: int,
+) -> _ParsedFile:
+    """Worker entry point: parse one file and build its chunk records."""
+    file_path = Path(path)
+    chunker = MarkdownChunker(max_tokens=max_tokens, overlap_tokens=overlap_tokens)
+    chunks = chunker.chunk(load_document_text(file_path))
+
+    metadata = {**metadata, "source_format": file_path.suffix.lower().lstrip(".")}
+    ids, documents, metadatas = build_chunk_records(file_path, chunks, metadata)
+    return _ParsedFile(path=path, ids=ids, documents=documents, metadatas=metadatas)
+
+
+class IngestionCheckpoint:
+    """JSON checkpoint of files already written to the index."""
+
+    def __init__(self, path: Path | None) -> None:
+        """
+        Load the checkpoint.
+
+        Args:
+            path: Checkpoint file (None disables checkpointing)
+        """
+        self.path = path
+        self._done: dict[str, dict[str, float]] = {}
+
+        if path is not None and path.exists():
+            self._done = json.loads(path.read_text(encoding="utf-8"))
+
+    def is_done(self, file_path: Path) -> bool:
+        """Whether the file is unchanged since it was last indexed."""
+        entry = self._done.get(str(file_path))
+        if entry is None:
+            return False
+        stat = file_path.stat()
+        return entry["mtime"] == stat.st_mtime and entry["size"] == stat.st_size
+
+    def mark_done(self, paths: list[str]) -> None:
+        """Record files as indexed and persist the checkpoint."""
+        for path in paths:
+            stat = Path(path).stat()
+            self._done[path] = {"mtime": stat.st_mtime, "size": stat.st_size}
+
+        if self.path is not None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix(".tmp")
+            tmp_path.write_text(json.dumps(self._done, indent=2), encoding="utf-8")
+            tmp_path.replace(self.path)
+
+    def clear(self) -> None:
+        """Forget all progress."""
+        self._done = {}
+        if self.path is not None and self.path.exists():
+            self.path.unlink()
+
+
+class IngestionPipeline:
+    """Parallel, resumable ingestion of PDF, DOCX and markdown documents."""
+
+    def __init__(
+        self,
+        indexer: DocumentIndexer,
+        workers: int = 4,
+        batch_size: int = 64,
+        queue_size: int = 8,
+        checkpoint_path: Path | None = None,
+    ) -> None:
+        """
+        Initialize the pipeline.
+
+        Args:
+            indexer: Indexer that owns the collection, embeddings and chunker settings
+            workers: Worker processes used for parsing and chunking
+            batch_size: Chunks per embedding + upsert batch
+            queue_size: Parsed files buffered before parsing pauses (backpressure)
+            checkpoint_path: Optional JSON file used to resume interrupted runs
+        """
+        self.indexer = indexer
+        self.workers = workers
+        self.batch_size = batch_size
+        self.queue_size = queue_size
+        self.checkpoint = IngestionCheckpoint(checkpoint_path)
+
+    def run(
+        self,
+        sources: list[tuple[Path, MetadataFn]],
+        progress: Callable[[IngestionStats], None] | None = None,
+    ) -> IngestionStats:
+        """
+        Ingest every supported document under the given directories.
+
+        Args:
+            sources: (directory, metadata_fn) pairs
+            progress: Optional callback invoked after each upserted batch
+
+        Returns:
+            Ingestion statistics
+
+        Raises:
+            Exception: Whatever the writer thread raised (e.g. from progress);
+                parsing stops as soon as the writer fails
+        """
+        from src.agent.utils.doc_handler import mark_pool_worker
+
+        stats = IngestionStats()
+        start_time = time.perf_counter()
+        parsed: queue.Queue[_ParsedFile | None] = queue.Queue(maxsize=self.queue_size)
+        writer_errors: list[Exception] = []
+
+        writer = threading.Thread(
+            target=self._write_batches,
+            args=(parsed, stats, start_time, progress, writer_errors),
+            daemon=True,
+        )
+        writer.start()
+
+        max_in_flight = self.workers * 2
+        chunker = self.indexer.chunker
+        files = (
+            (file_path, metadata_fn)
+            for directory, metadata_fn in sources
+            for file_path in iter_source_files([directory])
+        )
+
+        try:
+            with ProcessPoolExecutor(
+                max_workers=self.workers, initializer=mark_pool_worker
+            ) as pool:
+                in_flight: dict[Future, str] = {}
+
+                for file_path, metadata_fn in files:
+                    # Stop parsing once the writer has failed
+                    if writer_errors:
+                        break
+
+                    stats.files_seen += 1
+                    if self.checkpoint.is_done(file_path):
+                        stats.files_skipped += 1
+                        continue
+
+                    # Limit in-flight parses; results wait on the bounded queue
+                    while len(in_flight) >= max_in_flight:
+                        self._drain(in_flight, parsed, stats)
+
+                    future = pool.submit(
+                        _parse_and_chunk,
+                        str(file_path),
+                        metadata_fn(file_path),
+                        chunker.max_tokens,
+                        chunker.overlap_tokens,
+                    )
+                    in_flight[future] = str(file_path)
+
+                while in_flight and not writer_errors:
+                    self._drain(in_flight, parsed, stats)
+        finally:
+            parsed.put(None)
+            writer.join()
+
+        if writer_errors:
+            raise writer_errors[0]
+
+        stats.elapsed_seconds = time.perf_counter() - start_time
+        return stats
+
+    def _drain(
+        self,
+        in_flight: dict[Future, str],
+        parsed: "queue.Queue[_ParsedFile | None]",
+        stats: IngestionStats,
+    ) -> None:
+        """Wait for at least one parse to finish and hand results to the writer."""
+        done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+
+        for future in done:
+            path = in_flight.pop(future)
+            try:
+                result = future.result()
+            except Exception as e:
+                self._record_failure(stats, [path], e)
+                continue
+            parsed.put(result)  # Blocks while the writer is behind
+
+    def _write_batches(
+        self,
+        parsed: "queue.Queue[_ParsedFile | None]",
+        stats: IngestionStats,
+        start_time: float,
+        progress: Callable[[IngestionStats], None] | None,
+        errors: list[Exception],
+    ) -> None:
+        """
+        Writer thread: accumulate chunks and embed + upsert them in batches.
+
+        An exception from a batch (including the progress callback) is appended
+        to errors for run() to re-raise. The thread then keeps draining the queue
+        until the end marker so the parsing side never blocks on a full queue.
+        """
+        batch: list[_ParsedFile] = []
+        batch_chunks = 0
+
+        while True:
+            item = parsed.get()
+            if errors:
+                if item is None:
+                    break
+                continue
+
+            if item is not None:
+                batch.append(item)
+                batch_chunks += len(item.ids)
+
+            if batch and (item is None or batch_chunks >= self.batch_size):
+                try:
+                    self._write(batch, stats)
+                    stats.elapsed_seconds = time.perf_counter() - start_time
+                    if progress is not None:
+                        progress(stats)
+                except Exception as e:
+                    logger.error(f"Ingestion writer failed: {e}")
+                    errors.append(e)
+                batch, batch_chunks = [], 0
+
+            if item is None:
+                break
+
+    def _write(self, batch: list[_ParsedFile], stats: IngestionStats) -> None:
+        """Embed and upsert the chunks of a batch of files, then checkpoint them."""
+        paths = [item.path for item in batch]
+        ids = [chunk_id for item in batch for chunk_id in item.ids]
+        documents = [doc for item in batch for doc in item.documents]
+        metadatas = [meta for item in batch for meta in item.metadatas]
+
+        try:
+            # Remove chunks from earlier versions of these files before writing
+            self.indexer.delete_sources(paths)
+            for i in range(0, len(ids), self.batch_size):
+                end = i + self.batch_size
+                self.indexer.upsert_chunks(ids[i:end], documents[i:end], metadatas[i:end])
+        except Exception as e:
+            self._record_failure(stats, paths, e)
+            return
+
+        # A file is only checkpointed once all of its chunks are written
+        self.checkpoint.mark_done(paths)
+        stats.files_indexed += len(paths)
+        stats.chunks_indexed += len(ids)
+
+    def _record_failure(self, stats: IngestionStats, paths: list[str], error: Exception) -> None:
+        """Count files that could not be ingested."""
+        for path in paths:
+            logger.warning(f"Failed to ingest {path}: {error}")
+            stats.files_failed += 1
+            stats.failures[path] = str(error)
@@ -0,0 +1,154 @@
+"""
+Reranking stage for the RAG pipeline.
+
+Reorders over-fetched retrieval candidates so fewer, more diverse chunks reach
+the prompt. Supports maximal marginal relevance (MMR) over the embeddings
+returned by ChromaDB and an optional local cross-encoder model.
+"""
+
+from functools import lru_cache
+from typing import Any
+
+import numpy as np
+
+from src.agent.config import config
+
+RERANK_STRATEGIES = ("mmr", "cross_encoder")
+
+
+def mmr_select(
+    query_embedding: list[float],
+    candidate_embeddings: list[list[float]],
+    k: int,
+    lambda_mult: float = 0.5,
+) -> list[int]:
+    """
+    Select candidates by maximal marginal relevance.
+
+    Each step picks the candidate that maximizes
+    ``lambda_mult * sim(query, c) - (1 - lambda_mult) * max(sim(c, selected))``.
+
+    Args:
+        query_embedding: Query vector
+        candidate_embeddings: Candidate vectors
+        k: Number of candidates to select
+        lambda_mult: 1.0 ranks purely by relevance, 0.0 purely by diversity
+
+    Returns:
+        Indices of the selected candidates, in selection order
+    """
+    if not candidate_embeddings or k <= 0:
+        return []
+
+    candidates = _normalize(np.asarray(candidate_embeddings, dtype=np.float64))
+    query = _normalize(np.asarray(query_embedding, dtype=np.float64).reshape(1, -1))[0]
+
+    relevance = candidates @ query
+    pairwise = candidates @ candidates.T
+
+    selected = [int(np.argmax(relevance))]
+    max_similarity = pairwise[selected[0]].copy()
+
+    while len(selected) < min(k, len(candidate_embeddings)):
+        scores = lambda_mult * relevance - (1 - lambda_mult) * max_similarity
+        scores[selected] = -np.inf
+        best = int(np.argmax(scores))
+        selected.append(best)
+        max_similarity = np.maximum(max_similarity, pairwise[best])
+
+    return selected
+
+
+def rerank(
+    strategy: str,
+    query: str,
+    query_embedding: list[float],
+    candidates: list[dict[str, Any]],
+    candidate_embeddings: list[list[float]] | None,
+    k: int,
+    lambda_mult: float = 0.5,
+) -> list[dict[str, Any]]:
+    """
+    Rerank retrieval candidates and keep the top k.
+
+    Args:
+        strategy: "mmr" or "cross_encoder"
+        query: Query text (used by the cross-encoder)
+        query_embedding: Query vector (used by MMR)
+        candidates: Formatted retriever results
+        candidate_embeddings: Embeddings of the candidates, aligned with candidates
+        k: Number of results to keep
+        lambda_mult: MMR relevance/diversity trade-off
+
+    Returns:
+        Reranked results
+
+    Raises:
+        ValueError: If the strategy is not supported
+    """
+    if strategy == "mmr":
+        if candidate_embeddings is None or len(candidate_embeddings) != len(candidates):
+            return candidates[:k]
+        order = mmr_select(query_embedding, candidate_embeddings, k, lambda_mult)
+        return [candidates[i] for i in order]
+    elif strategy == "cross_encoder":
+        return CrossEncoderReranker().rerank(query, candidates, k)
+    else:
+        raise ValueError(
+            f"Unsupported rerank strategy: {strategy}. Supported: {', '.join(RERANK_STRATEGIES)}"
+        )
+
+
+class CrossEncoderReranker:
+    """Reranks candidates with a local sentence-transformers cross-encoder."""
+
+    def __init__(self, model_name: str | None = None) -> None:
+        """
+        Initialize the reranker.
+
+        Args:
+            model_name: Cross-encoder model name (defaults to config)
+        """
+        self.model_name = model_name or config.reranker_model
+
+    def rerank(self, query: str, candidates: list[dict[str, Any]], k: int) -> list[dict[str, Any]]:
+        """
+        Score each (query, candidate) pair and keep the top k.
+
+        Args:
+            query: Query text
+            candidates: Formatted retriever results
+            k: Number of results to keep
+
+        Returns:
+            Top k candidates with a 'rerank_score' field
+        """
+        if not candidates:
+            return []
+
+        model = _load_cross_encoder(self.model_name)
+        scores = model.predict([(query, c["content"]) for c in candidates])
+
+        ranked = sorted(zip(scores, candidates, strict=True), key=lambda x: -float(x[0]))
+        return [{**candidate, "rerank_score": float(score)} for score, candidate in ranked[:k]]
+
+
+@lru_cache(maxsize=2)
+def _load_cross_encoder(model_name: str) -> Any:
+    """Load (once) a cross-encoder model."""
+    try:
+        from sentence_transformers import CrossEncoder
+    except ImportError as e:
+        raise ImportError(
+            "The cross_encoder reranker requires sentence-transformers: "
+            "pip install sentence-transformers"
+        ) from e
+
+    return CrossEncoder(model_name)
+
+
+def _normalize(matrix: np.ndarray) -> np.ndarray:
+    """L2-normalize the rows of a matrix."""
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
@@ -4,24 +4,33 @@ Document retriever for RAG pipeline.
 Handles semantic search over indexed documents.
 """
 
+import time
 from typing import Any, cast
 
 from src.agent.config import config
-from src.rag.embeddings import BedrockEmbeddings
+from src.rag.cache import QueryCache, query_cache
+from src.rag.embeddings import get_embeddings
+from src.rag.reranker import rerank as rerank_results
 
 
 class DocumentRetriever:
     """Retrieves relevant documents from ChromaDB using semantic search."""
 
-    def __init__(self, collection_name: str = "sow_documents") -> None:
+    def __init__(
+        self,
+        collection_name: str = "sow_documents",
+        cache: QueryCache | None = query_cache,
+    ) -> None:
         """
         Initialize document retriever.
 
         Args:
             collection_name: Name of the ChromaDB collection
+            cache: Query result cache (None disables caching)
         """
         self.collection_name = collection_name
-        self.embeddings = BedrockEmbeddings()
+        self.embeddings = get_embeddings()
+        self.cache = cache
         self.chroma_client = config.chroma_client
 
         # Get collection
@@ -35,6 +44,9 @@ class DocumentRetriever:
         query: str,
         n_results: int = 5,
         filters: dict[str, str] | None = None,
+        rerank: str | None = None,
+        fetch_k: int | None = None,
+        lambda_mult: float | None = None,
     ) -> list[dict[str, Any]]:
         """
         Search for relevant documents.
@@ -43,42 +55,169 @@ class DocumentRetriever:
             query: Search query
             n_results: Number of results to return
             filters: Optional metadata filters (e.g., {"client_id": "CLIENT-001"})
+            rerank: Optional rerank strategy ("mmr" or "cross_encoder")
+            fetch_k: Candidates to over-fetch before reranking (defaults to config)
+            lambda_mult: MMR relevance/diversity trade-off (defaults to config)
 
         Returns:
             List of result dictionaries with 'content', 'metadata', and 'score'
         """
-        from typing import Any
+        return self.search_many(
+            [query],
+            n_results=n_results,
+            filters=filters,
+            rerank=rerank,
+            fetch_k=fetch_k,
+            lambda_mult=lambda_mult,
+        )[0]
 
-        # Generate query embedding
-        query_embedding = self.embeddings.embed_query(query)
+    def search_many(
+        self,
+        queries: list[str],
+        n_results: int = 5,
+        filters: dict[str, str] | None = None,
+        rerank: str | None = None,
+        fetch_k: int | None = None,
+        lambda_mult: float | None = None,
+    ) -> list[list[dict[str, Any]]]:
+        """
+        Search for several queries sharing the same filters in one round trip.
 
-        # Build where clause from filters
-        where: dict[str, Any] | None = None
-        if filters:
-            if len(filters) > 1:
-                # Wrap multiple filters in $and operator
-                where = {"$and": [{k: v} for k, v in filters.items()]}
-            else:
-                where = cast(dict[str, Any], filters)
+        Cached queries are answered from memory; the rest are embedded in one
+        batched call and sent to ChromaDB as a single multi-embedding query.
+        With a rerank strategy, ``fetch_k`` candidates are fetched per query and
+        reranked down to ``n_results``.
 
-        # Query ChromaDB
-        results = self.collection.query(
-            query_embeddings=[query_embedding],
-            n_results=n_results,
-            where=where,
-        )
+        Args:
+            queries: Search queries (e.g., scope, pricing, timeline, risks)
+            n_results: Number of results to return per query
+            filters: Optional metadata filters applied to every query
+            rerank: Optional rerank strategy ("mmr" or "cross_encoder")
+            fetch_k: Candidates to over-fetch before reranking (defaults to config)
+            lambda_mult: MMR relevance/diversity trade-off (defaults to config)
 
-        # Format results
-        formatted_results = []
-        if results["documents"] and len(results["documents"]) > 0:
-            for i in range(len(results["documents"][0])):
-                formatted_results.append(
-                    {
-                        "content": results["documents"][0][i],
-                        "metadata": results["metadatas"][0][i],
-                        "score": results["distances"][0][i] if results["distances"] else 0.0,
-                    }
+        Returns:
+            One result list per query, in the same order as ``queries``
+        """
+        if rerank == "none":
+            rerank = None
+        fetch_k = max(fetch_k or config.rerank_fetch_k, n_results) if rerank else n_results
+        lambda_mult = config.rerank_lambda if lambda_mult is None else lambda_mult
+        rerank_params = (rerank, fetch_k, lambda_mult) if rerank else ()
+
+        results_by_query: list[list[dict[str, Any]] | None] = [None] * len(queries)
+        cache_keys: list[tuple | None] = [None] * len(queries)
+
+        # Serve repeated queries from the cache
+        if self.cache is not None:
+            for i, query in enumerate(queries):
+                cache_keys[i] = self.cache.make_key(
+                    self.collection_name, query, filters, n_results, *rerank_params
                 )
+                cached = self.cache.get(cast(tuple, cache_keys[i]))
+                if cached is not None:
+                    results_by_query[i] = [dict(result) for result in cached]
+
+        # Group the remaining positions by query text so duplicates are fetched once
+        pending: dict[str, list[int]] = {}
+        for i, query in enumerate(queries):
+            if results_by_query[i] is None:
+                pending.setdefault(query, []).append(i)
+
+        if pending:
+            start_time = time.perf_counter()
+            pending_queries = list(pending)
+
+            # Generate query embeddings in one batched call
+            if len(pending_queries) == 1:
+                query_embeddings = [self.embeddings.embed_query(pending_queries[0])]
+            else:
+                query_embeddings = self.embeddings.embed_documents(pending_queries)
+
+            # Query ChromaDB once for all pending queries
+            include = ["documents", "metadatas", "distances"]
+            if rerank == "mmr":
+                include.append("embeddings")
+
+            results = self.collection.query(
+                query_embeddings=query_embeddings,
+                n_results=fetch_k,
+                where=self._build_where(filters),
+                include=include,
+            )
+
+            fetched: list[list[dict[str, Any]]] = []
+            for row, query in enumerate(pending_queries):
+                formatted_results = self._format_results(results, row)
+                if rerank:
+                    embeddings = results.get("embeddings")
+                    formatted_results = rerank_results(
+                        rerank,
+                        query,
+                        query_embeddings[row],
+                        formatted_results,
+                        list(embeddings[row]) if embeddings is not None else None,
+                        k=n_results,
+                        lambda_mult=lambda_mult,
+                    )
+                fetched.append(formatted_results)
+
+            compute_seconds = (time.perf_counter() - start_time) / len(pending_queries)
+
+            for query, formatted_results in zip(pending_queries, fetched, strict=True):
+                for i in pending[query]:
+                    results_by_query[i] = [dict(result) for result in formatted_results]
+
+                cache_key = cache_keys[pending[query][0]]
+                if self.cache is not None and cache_key is not None:
+                    self.cache.put(
+                        cache_key,
+                        [dict(result) for result in formatted_results],
+                        compute_seconds=compute_seconds,
+                    )
+
+        return [results or [] for results in results_by_query]
+
+    def _build_where(self, filters: dict[str, str] | None) -> dict[str, Any] | None:
+        """
+        Build a ChromaDB where clause from metadata filters.
+
+        Args:
+            filters: Metadata filters
+
+        Returns:
+            Where clause, or None when there are no filters
+        """
+        if not filters:
+            return None
+        if len(filters) > 1:
+            # Wrap multiple filters in $and operator
+            return {"$and": [{k: v} for k, v in filters.items()]}
+        return cast(dict[str, Any], filters)
+
+    def _format_results(self, results: dict[str, Any], row: int) -> list[dict[str, Any]]:
+        """
+        Format one row of a ChromaDB query response.
+
+        Args:
+            results: Raw ChromaDB query response
+            row: Index of the query embedding within the response
+
+        Returns:
+            List of result dictionaries with 'content', 'metadata', and 'score'
+        """
+        formatted_results: list[dict[str, Any]] = []
+        if not results["documents"] or len(results["documents"]) <= row:
+            return formatted_results
+
+        for i in range(len(results["documents"][row])):
+            formatted_results.append(
+                {
+                    "content": results["documents"][row][i],
+                    "metadata": results["metadatas"][row][i],
+                    "score": results["distances"][row][i] if results["distances"] else 0.0,
+                }
+            )
 
         return formatted_results
 
@@ -4,6 +4,7 @@ SOW Review page.
 
 import io
 import sys
+import uuid
 from pathlib import Path
 
 import requests
@@ -16,20 +17,6 @@ if str(root_path) not in sys.path:
 
 from src.ui.components.styles import apply_custom_css
 
-try:
-    from pypdf import PdfReader
-
-    HAS_PDF = True
-except ImportError:
-    HAS_PDF = False
-
-try:
-    from docx import Document
-
-    HAS_DOCX = True
-except ImportError:
-    HAS_DOCX = False
-
 st.set_page_config(page_title="Review SOW", page_icon="✅", layout="wide")
 
 # Apply shared styles
@@ -61,6 +48,9 @@ st.markdown(
 # Initialize Session State
 if "review_result" not in st.session_state:
     st.session_state.review_result = None
+if "review_document_id" not in st.session_state:
+    # Lets the API re-review only the sections edited since the last analysis
+    st.session_state.review_document_id = uuid.uuid4().hex
 
 # Header
 # Dashboard Header
@@ -99,25 +89,9 @@ with col_upload:
     if uploaded_file is not None:
         file_type = uploaded_file.name.split(".")[-1].lower()
         try:
-            if file_type == "pdf":
-                if HAS_PDF:
-                    reader = PdfReader(uploaded_file)
-                    text = []
-                    for page in reader.pages:
-                        text.append(page.extract_text())
-                    sow_text = "\n".join(text)
-                    st.success(f"✅ Extracted {len(sow_text)} chars from PDF")
-                else:
-                    st.error("❌ pypdf library missing.")
-
-            elif file_type in ["docx", "doc"]:
-                if HAS_DOCX:
-                    doc = Document(uploaded_file)
-                    text = [p.text for p in doc.paragraphs]
-                    sow_text = "\n".join(text)
-                    st.success(f"✅ Extracted {len(sow_text)} chars from DOCX")
-                else:
-                    st.error("❌ python-docx library missing.")
+            if file_type in ["pdf", "docx"]:
+                # Parsed server-side by /review/upload when analyzed
+                st.success(f"✅ {uploaded_file.name} will be parsed by the API on analysis")
 
             else:  # md, txt
                 stringio = io.StringIO(uploaded_file.getvalue().decode("utf-8"))
@@ -188,24 +162,44 @@ with col_settings:
 
 # Analysis Logic
 if analyze_btn:
-    if not sow_text_input:
+    upload_document = (
+        uploaded_file is not None
+        and uploaded_file.name.split(".")[-1].lower() in ["pdf", "docx"]
+        and not sow_text_input
+    )
+
+    if not sow_text_input and not upload_document:
         st.error("❌ Please provide SOW content")
     else:
         with st.spinner("Analyzing compliance rules... This may take 1-2 minutes with Nova Pro."):
             # Construct payload
-            payload = {"sow_text": sow_text_input}
+            payload = {}
             if product:
                 payload["product"] = product
             if client_tier:
                 payload["client_tier"] = client_tier
 
             try:
-                response = requests.post(f"{API_URL}/api/v1/sow/review", json=payload, timeout=300)
+                if upload_document and uploaded_file is not None:
+                    response = requests.post(
+                        f"{API_URL}/api/v1/sow/review/upload",
+                        files={"file": (uploaded_file.name, uploaded_file.getvalue())},
+                        data=payload,
+                        timeout=300,
+                    )
+                else:
+                    payload["sow_text"] = sow_text_input
+                    payload["document_id"] = st.session_state.review_document_id
+                    response = requests.post(
+                        f"{API_URL}/api/v1/sow/review", json=payload, timeout=300
+                    )
 
                 if response.status_code == 200:
                     st.session_state.review_result = response.json()
                     # Store input text too for display
-                    st.session_state.review_text = sow_text_input
+                    st.session_state.review_text = st.session_state.review_result.get(
+                        "sow_text", sow_text_input
+                    )
                     st.rerun()
                 else:
                     st.error(f"API Error: {response.text}")
@@ -226,6 +220,7 @@ if st.session_state.review_result:
     status = result["status"]
     summary = result["summary"]
     issues = result.get("issues", [])
+    diff = result.get("diff")
 
     st.markdown("<br>", unsafe_allow_html=True)
 
@@ -300,6 +295,12 @@ if st.session_state.review_result:
         unsafe_allow_html=True,
     )
 
+    if diff:
+        st.caption(
+            f"Since last analysis: {len(diff['added'])} new, {len(diff['resolved'])} resolved "
+            f"({diff['blocks_reviewed']}/{diff['blocks_total']} sections re-checked)"
+        )
+
     # Detailed Issues
     if issues:
         st.subheader("Risk Analysis Details")
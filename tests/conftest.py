@@ -1,5 +1,6 @@
 import json
 import os
+import sys
 from pathlib import Path
 from unittest.mock import MagicMock, patch
 
@@ -7,9 +8,39 @@ import pytest
 from fastapi.testclient import TestClient
 
 from src.agent.config import config
+from src.agent.tools.compliance_rules import clear_compliance_rules_cache
 from src.api.main import app
 
 
+@pytest.fixture(autouse=True)
+def reset_compliance_rules():
+    """Compliance rules are cached per process; tests mocking the rules file need a fresh load."""
+    clear_compliance_rules_cache()
+    yield
+    clear_compliance_rules_cache()
+
+
+@pytest.fixture
+def product_compliance_rules():
+    """Rules file with test product requirements (the shipped rules define none)."""
+    rules_file = Path(__file__).parent / "fixtures" / "compliance_rules.json"
+    with (
+        patch("src.agent.tools.compliance_rules.RULES_FILE", rules_file),
+        patch("src.api.review.RULES_FILE", rules_file),
+    ):
+        yield rules_file
+
+
+@pytest.fixture(autouse=True)
+def checkpoint_db():
+    """Agent run checkpoints go to a fresh in-memory database instead of data/checkpoints.db."""
+    with patch.object(config, "checkpoint_db", ":memory:"):
+        yield
+        checkpoint = sys.modules.get("src.agent.core.checkpoint")
+        if checkpoint is not None:
+            checkpoint._checkpointer = None
+
+
 @pytest.fixture
 def mock_aws_credentials():
     """Mocked AWS Credentials for moto."""
@@ -1,4 +1,5 @@
 import json
+import threading
 from unittest.mock import MagicMock, patch
 
 import pytest
@@ -78,3 +79,60 @@ def test_agent_graph_execution_flow():
         # Last message should be the tool message if the mock worked
         # If the tool actually ran (instead of using our mock), it would return an error
         assert isinstance(messages[-1], (ToolMessage, AIMessage))
+
+
+def test_failed_run_resumes_from_last_completed_step():
+    """A tool failure keeps the run's checkpoints; resuming skips the finished planner and tool calls."""
+    from src.agent.tools.research import search_crm, search_product_kb
+
+    mock_llm = MagicMock()
+    mock_llm.bind_tools.return_value.invoke.side_effect = [
+        AIMessage(
+            content="",
+            tool_calls=[
+                {"name": "search_crm", "args": {"client_name": "Acme"}, "id": "call_crm"},
+                {"name": "search_product_kb", "args": {"product": "Payments"}, "id": "call_kb"},
+            ],
+        ),
+        AIMessage(content="SOW ready."),
+    ]
+    calls = []
+    crm_done = threading.Event()
+
+    def crm(client_name: str) -> dict:
+        calls.append("crm")
+        crm_done.set()
+        return {"id": "C1", "name": client_name}
+
+    def product_kb(product: str) -> dict:
+        # Tool calls of one step run in parallel; fail only once the other has finished
+        crm_done.wait(timeout=5)
+        calls.append("kb")
+        if calls.count("kb") == 1:
+            raise TimeoutError("Bedrock read timeout")
+        return {"name": product}
+
+    with (
+        patch("src.agent.config.Config.bedrock_runtime", new_callable=lambda: MagicMock()),
+        patch("src.agent.core.planner.ChatBedrock", return_value=mock_llm),
+        patch("src.agent.core.planner.get_system_prompt", return_value="SysPrompt"),
+        patch.object(search_crm, "func", crm),
+        patch.object(search_product_kb, "func", product_kb),
+    ):
+        agent = SOWAgent()
+        with pytest.raises(TimeoutError):
+            agent.run("Draft a SOW for Acme", run_id="run-1")
+
+        assert agent.graph.get_state({"configurable": {"thread_id": "run-1"}}).next
+        response = agent.run("Draft a SOW for Acme", run_id="run-1")
+
+    assert response == "SOW ready."
+    assert calls == ["crm", "kb", "kb"]
+    assert mock_llm.bind_tools.return_value.invoke.call_count == 2
+    final_messages = mock_llm.bind_tools.return_value.invoke.call_args[0][0]
+    assert [m.tool_call_id for m in final_messages if isinstance(m, ToolMessage)] == [
+        "call_crm",
+        "call_kb",
+    ]
+    # Finished runs do not keep their checkpoints
+    assert agent.checkpointer.get_tuple({"configurable": {"thread_id": "run-1"}}) is None
@@ -1,10 +1,21 @@
+import asyncio
+import io
+import json
+import threading
+import time
+import zipfile
 from unittest.mock import MagicMock, patch
 
 import pytest
+from docx import Document
 from fastapi.testclient import TestClient
 
-from src.api.dependencies import get_sow_agent
+from src.agent.config import config
+from src.api import admission, warmup
+from src.api.admission import AdmissionController, LaneLimits
+from src.api.dependencies import get_sow_agent, get_sow_sessions
 from src.api.main import app
+from src.api.warmup import WarmupState
 
 # Create a module-level mock agent that all tests share
 _mock_agent = MagicMock()
@@ -26,6 +37,35 @@ def test_health_check():
     assert response.json()["status"] == "healthy"
 
 
+def test_ready_waits_for_warmup():
+    release = threading.Event()
+    state = WarmupState([("agent", lambda: release.wait(5))])
+
+    with patch.object(warmup, "warmup_state", state), TestClient(app) as lifespan_client:
+        warming = lifespan_client.get("/ready")
+        release.set()
+        for _ in range(50):
+            if state.ready:
+                break
+            time.sleep(0.05)
+        ready = lifespan_client.get("/api/v1/ready")
+
+    assert warming.status_code == 503
+    assert warming.json()["status"] == "warming"
+    assert ready.status_code == 200
+    assert ready.json()["warmup"]["steps"][0]["status"] == "done"
+    assert "/ready" in ready.json()["first_requests"]
+
+
+def test_first_requests_are_keyed_by_route():
+    client.get("/api/v1/sow/jobs/first-request-probe")
+    client.get("/first-request-probe")
+
+    first_requests = warmup.first_requests.snapshot()
+    assert "/api/v1/sow/jobs/{job_id}" in first_requests
+    assert not [path for path in first_requests if "first-request-probe" in path]
+
+
 def test_create_sow_endpoint():
     _mock_agent.run.return_value = "# Generated SOW\n\nContent..."
 
@@ -47,6 +87,22 @@ def test_create_sow_endpoint():
     _mock_agent.run.reset_mock()
 
 
+def test_failed_create_sow_can_be_resumed_by_run_id():
+    _mock_agent.run.side_effect = [TimeoutError("Bedrock read timeout"), "# Resumed SOW"]
+    payload = {"client_id": "CLIENT-001", "product": "Product X"}
+
+    failed = client.post("/api/v1/sow/create", json=payload)
+    run_id = failed.json()["error"].rsplit("run_id=", 1)[1].rstrip(")")
+    resumed = client.post("/api/v1/sow/create", json={**payload, "run_id": run_id})
+
+    assert failed.status_code == 500
+    assert resumed.json()["metadata"]["run_id"] == run_id
+    assert [c.kwargs["run_id"] for c in _mock_agent.run.call_args_list] == [run_id, run_id]
+
+    _mock_agent.run.side_effect = None
+    _mock_agent.run.reset_mock()
+
+
 @patch("src.agent.tools.research.search_crm.func")
 def test_research_client_endpoint(mock_search):
     mock_search.return_value = {"name": "Test Client", "industry": "Tech"}
@@ -76,3 +132,259 @@ def test_research_product_endpoint(mock_search):
     # ProductResearchResponse uses product_info, features, and requirements keys
     assert data["product_info"]["name"] == "Prod Y"
     assert "features" in data
+
+
+def test_generation_lane_full_returns_429_without_blocking_reviews():
+    controller = AdmissionController(
+        {"generation": LaneLimits(1, 1, 0, 0.1), "interactive": LaneLimits(4, 4, 4, 0.1)}
+    )
+    asyncio.run(controller.lane("generation").acquire("other-client"))
+    payload = {"client_id": "CLIENT-001", "product": "Product X"}
+
+    with patch.object(admission, "admission_controller", controller):
+        rejected = client.post("/api/v1/sow/create", json=payload)
+        review = client.post("/api/v1/sow/review", json={"sow_text": "# SOW\n\nTerms."})
+        status = client.get("/api/v1/admission").json()
+
+    assert rejected.status_code == 429
+    assert int(rejected.headers["Retry-After"]) >= 1
+    assert review.status_code == 200
+    assert status["generation"]["rejected"] == 1
+    assert status["interactive"]["admitted"] == 1
+    _mock_agent.run.assert_not_called()
+
+
+def test_export_sow_endpoint():
+    payload = {"sow_text": "# SOW\n\n- **Gateway** provisioning", "filename": "SOW acme/2026"}
+
+    response = client.post("/api/v1/sow/export", json=payload)
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/vnd.openxmlformats")
+    assert 'filename="SOW_acme_2026.docx"' in response.headers["content-disposition"]
+    assert response.content[:2] == b"PK"  # DOCX is a zip archive
+
+
+def _docx_bytes(*paragraphs):
+    doc = Document()
+    doc.add_heading("Statement of Work", level=1)
+    for text in paragraphs:
+        doc.add_paragraph(text)
+    buffer = io.BytesIO()
+    doc.save(buffer)
+    return buffer.getvalue()
+
+
+def test_review_upload_endpoint():
+    content = _docx_bytes("The vendor will guarantee 100% uptime for the platform.")
+    files = {"file": ("sow.docx", content, "application/octet-stream")}
+
+    response = client.post("/api/v1/sow/review/upload", files=files)
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["filename"] == "sow.docx"
+    assert data["sow_text"].startswith("# Statement of Work")
+    assert any(issue["category"] == "Prohibited Term" for issue in data["issues"])
+
+
+def test_review_upload_rejects_unsupported_type():
+    files = {"file": ("sow.txt", b"plain text", "text/plain")}
+
+    response = client.post("/api/v1/sow/review/upload", files=files)
+
+    assert response.status_code == 415
+
+
+def test_review_upload_enforces_size_limit():
+    files = {"file": ("sow.docx", _docx_bytes("x" * 5000), "application/octet-stream")}
+
+    with patch.object(config, "max_upload_mb", 0.001):
+        response = client.post("/api/v1/sow/review/upload", files=files)
+
+    assert response.status_code == 413
+
+
+def _ndjson(response):
+    return [json.loads(line) for line in response.text.splitlines() if line]
+
+
+def test_review_batch_streams_results_and_summary():
+    payload = {
+        "documents": [
+            {"id": "clean", "sow_text": "# SOW\n\nStandard delivery terms."},
+            {"id": "risky", "sow_text": "# SOW\n\nWe accept unlimited liability."},
+        ]
+    }
+
+    response = client.post("/api/v1/sow/review/batch", json=payload)
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    lines = _ndjson(response)
+    results = {line["id"]: line for line in lines if line["type"] == "result"}
+    assert results["clean"]["status"] == "PASS"
+    assert results["risky"]["summary"]["HIGH"] == 1
+
+    summary = lines[-1]
+    assert summary["type"] == "summary"
+    assert summary["documents"] == 2
+    assert summary["category_counts"] == {"Prohibited Term": 1}
+    assert summary["min_score"] == 80
+
+
+def test_review_batch_from_server_zip(tmp_path):
+    archive = tmp_path / "portfolio.zip"
+    with zipfile.ZipFile(archive, "w") as zf:
+        zf.writestr("a/SOW-1.md", "# SOW 1\n\nwork for hire applies.")
+        zf.writestr("SOW-2.docx", _docx_bytes("Standard terms."))
+        zf.writestr("notes.csv", "ignored")
+
+    with patch.object(config, "review_batch_root", str(tmp_path)):
+        response = client.post("/api/v1/sow/review/batch", json={"source_path": "portfolio.zip"})
+
+    lines = _ndjson(response)
+    assert sorted(line["id"] for line in lines[:-1]) == ["SOW-2.docx", "a/SOW-1.md"]
+    assert lines[-1]["status_counts"] == {"PASS": 1, "WARNING": 1}
+
+
+def test_review_batch_rejects_paths_outside_root(tmp_path):
+    with patch.object(config, "review_batch_root", str(tmp_path)):
+        response = client.post("/api/v1/sow/review/batch", json={"source_path": "../"})
+
+    assert response.status_code == 400
+
+
+def test_review_with_document_id_returns_diff():
+    payload = {"sow_text": "# SOW\n\n## Terms\n\nperpetual license", "document_id": "api-doc"}
+    first = client.post("/api/v1/sow/review", json=payload).json()
+
+    payload["sow_text"] = "# SOW\n\n## Terms\n\nsubscription license"
+    second = client.post("/api/v1/sow/review", json=payload).json()
+
+    assert len(first["diff"]["added"]) == 1
+    assert second["status"] == "PASS"
+    assert len(second["diff"]["resolved"]) == 1
+    assert second["diff"]["blocks_reviewed"] == 1
+
+
+def _sse(response):
+    events = []
+    for block in response.text.strip().split("\n\n"):
+        fields = dict(line.split(": ", 1) for line in block.splitlines())
+        events.append((fields["event"], json.loads(fields["data"])))
+    return events
+
+
+def test_sow_job_returns_quick_draft_then_refined_sow():
+    from langchain_core.messages import AIMessage
+
+    mock_llm = MagicMock()
+    mock_llm.invoke.side_effect = [
+        AIMessage(content="# Quick draft"),
+        AIMessage(content="Critique: add milestones"),
+        AIMessage(content="# Refined SOW"),
+    ]
+    context = {"client": {"name": "Acme"}, "requirements": "6-month timeline"}
+    payload = {"client_id": "CLIENT-001", "product": "Product X", "quality_mode": "production"}
+
+    with (
+        patch.object(config, "warmup_enabled", False),
+        patch("src.api.jobs.assemble_generation_context", return_value=context),
+        patch("src.agent.tools.content._get_llm", return_value=mock_llm),
+        TestClient(app) as c,
+    ):
+        started = c.post("/api/v1/sow/create/jobs", json=payload)
+        events = _sse(c.get(started.json()["events_url"]))
+        status = c.get(started.json()["status_url"]).json()
+
+    assert started.status_code == 202
+    names = [name for name, _ in events]
+    assert names.index("draft") < names.index("final")
+    assert events[names.index("draft")][1]["sow_text"] == "# Quick draft"
+    assert status["status"] == "done"
+    assert status["draft"] == "# Quick draft"
+    assert status["sow_text"] == "# Refined SOW"
+    # The quick draft is reused: critique and revision only, no second draft call
+    assert mock_llm.invoke.call_count == 3
+    assert "6-month timeline" in mock_llm.invoke.call_args_list[0][0][0][-1].content
+
+
+def test_sow_job_that_fails_to_start_releases_its_generation_slot():
+    controller = AdmissionController(
+        {"generation": LaneLimits(1, 1, 0, 0.1), "interactive": LaneLimits(4, 4, 4, 0.1)}
+    )
+    payload = {"client_id": "CLIENT-001", "product": "Product X"}
+
+    with (
+        patch("src.api.routes.sow_routes.admission_controller", controller),
+        patch("src.api.jobs.start_generation_job", side_effect=RuntimeError("no loop")),
+        TestClient(app, raise_server_exceptions=False) as c,
+    ):
+        response = c.post("/api/v1/sow/create/jobs", json=payload)
+
+    assert response.status_code == 500
+    assert controller.lane("generation").snapshot()["active"] == 0
+
+
+def test_sow_job_unknown_id_returns_404():
+    assert client.get("/api/v1/sow/jobs/missing").status_code == 404
+
+
+def test_sow_session_follow_up_edit_revises_one_section():
+    from langchain_core.messages import AIMessage
+
+    from src.agent.core.checkpoint import SqliteCheckpointSaver
+    from src.agent.core.sessions import SOWSessions
+
+    sessions = SOWSessions(SqliteCheckpointSaver())
+    app.dependency_overrides[get_sow_sessions] = lambda: sessions
+    mock_llm = MagicMock()
+    mock_llm.invoke.return_value = AIMessage(content="Delivery in three months.")
+    sow = "# SOW\n\n## Scope\n\nGateway.\n\n## Timeline\n\nTwelve months.\n"
+
+    try:
+        created = client.post("/api/v1/sow/sessions", json={"sow_text": sow, "session_id": "s1"})
+        with patch("src.agent.tools.content._get_llm", return_value=mock_llm):
+            edited = client.post(
+                "/api/v1/sow/sessions/s1/edits", json={"instruction": "Shorten the timeline"}
+            )
+            unmatched = client.post(
+                "/api/v1/sow/sessions/s1/edits", json={"instruction": "Add a warranty"}
+            )
+        missing = client.get("/api/v1/sow/sessions/unknown")
+    finally:
+        del app.dependency_overrides[get_sow_sessions]
+
+    assert created.status_code == 201
+    assert created.json()["sections"] == ["SOW", "Scope", "Timeline"]
+    data = edited.json()
+    assert data["section"] == "Timeline"
+    assert (
+        data["sow_text"]
+        == "# SOW\n\n## Scope\n\nGateway.\n\n## Timeline\n\nDelivery in three months.\n"
+    )
+    assert data["edits"] == [{"instruction": "Shorten the timeline", "section": "Timeline"}]
+    assert mock_llm.invoke.call_count == 1
+    assert unmatched.status_code == 422
+    assert missing.status_code == 404
+
+
+def test_sow_session_edit_errors_are_not_reported_as_missing_sessions():
+    from src.agent.core.checkpoint import SqliteCheckpointSaver
+    from src.agent.core.sessions import SOWSessions
+
+    sessions = SOWSessions(SqliteCheckpointSaver())
+    sessions.start("s1", "# SOW\n\n## Timeline\n\nTwelve months.\n")
+    app.dependency_overrides[get_sow_sessions] = lambda: sessions
+    edit = {"instruction": "Shorten the timeline"}
+
+    try:
+        missing = client.post("/api/v1/sow/sessions/unknown/edits", json=edit)
+        with patch("src.agent.tools.content._get_llm", side_effect=KeyError("max_tokens")):
+            broken = client.post("/api/v1/sow/sessions/s1/edits", json=edit)
+    finally:
+        del app.dependency_overrides[get_sow_sessions]
+
+    assert missing.status_code == 404
+    assert broken.status_code == 500
@@ -30,10 +30,10 @@ def test_rag_pipeline_e2e(temp_chroma_db, tmp_path):
     mock_embedding_instance.embed_documents.return_value = [[0.1] * 1536]
     mock_embedding_instance.embed_query.return_value = [0.1] * 1536
 
-    # We need to patch BedrockEmbeddings class in both modules where it is imported/used
+    # We need to patch the embeddings factory in both modules where it is imported/used
     with (
-        patch("src.rag.indexer.BedrockEmbeddings", return_value=mock_embedding_instance),
-        patch("src.rag.retriever.BedrockEmbeddings", return_value=mock_embedding_instance),
+        patch("src.rag.indexer.get_embeddings", return_value=mock_embedding_instance),
+        patch("src.rag.retriever.get_embeddings", return_value=mock_embedding_instance),
     ):
 
         # 1. Setup Indexer
@@ -56,3 +56,40 @@ def test_rag_pipeline_e2e(temp_chroma_db, tmp_path):
         assert len(results) > 0
         assert "Section content here" in results[0]["content"]
         assert results[0]["metadata"]["source"] == "test"
+
+
+def test_generation_context_includes_historical_sows(temp_chroma_db):
+    from pathlib import Path
+
+    from src.api.jobs import assemble_generation_context
+
+    history_dir = Path(__file__).parents[2] / "data" / "historical_sows"
+    with patch.object(config, "embedding_backend", "local"):
+        indexer = DocumentIndexer()
+        for sow_file in sorted(history_dir.glob("*.md")):
+            # Same metadata as scripts/index_documents.py
+            parts = sow_file.stem.split("-")
+            indexer.index_markdown_file(
+                sow_file,
+                metadata={"doc_type": "historical_sow", "client_id": parts[3], "product": parts[4]},
+            )
+
+        context = assemble_generation_context("client-001", "Cuspac Real-Time Payments (NPP)")
+
+    assert context["historical_sows"]
+    assert any("payments" in sow["source"] for sow in context["historical_sows"])
+
+
+def test_reindexing_a_shorter_file_removes_its_old_chunks(temp_chroma_db, tmp_path):
+    doc_path = tmp_path / "sow.md"
+    doc_path.write_text("\n\n".join(f"## Section {i}\n\nOld text {i}." for i in range(5)))
+
+    with patch.object(config, "embedding_backend", "local"):
+        indexer = DocumentIndexer(collection_name="reindex_test")
+        indexer.index_markdown_file(doc_path)
+        assert indexer.collection.count() == 5
+
+        doc_path.write_text("## Section 0\n\nNew text.")
+        indexer.index_markdown_file(doc_path)
+
+    assert indexer.collection.get()["documents"] == ["New text."]
@@ -0,0 +1,151 @@
+import asyncio
+
+import pytest
+from fastapi import HTTPException, Request
+from starlette.authentication import SimpleUser
+
+from src.agent.config import config
+from src.api.admission import AdmissionController, AdmissionLane, LaneLimits, tenant_of
+
+
+def _lane(max_concurrent=2, max_per_tenant=1, max_queue=4, queue_timeout=1.0):
+    return AdmissionLane(
+        "generation", LaneLimits(max_concurrent, max_per_tenant, max_queue, queue_timeout)
+    )
+
+
+async def test_per_tenant_limit_does_not_block_other_tenants():
+    lane = _lane(max_concurrent=2, max_per_tenant=1)
+    await lane.acquire("acme")
+
+    second_acme = asyncio.create_task(lane.acquire("acme"))
+    await asyncio.sleep(0)
+    await asyncio.wait_for(lane.acquire("globex"), timeout=0.5)
+
+    assert not second_acme.done()
+    assert lane.snapshot()["active"] == 2
+
+    lane.release("acme")
+    await asyncio.wait_for(second_acme, timeout=0.5)
+    assert lane.snapshot()["queued"] == 0
+
+
+async def test_waiters_are_admitted_in_order_when_slots_free():
+    lane = _lane(max_concurrent=1, max_per_tenant=5)
+    await lane.acquire("a")
+    order = []
+
+    async def request(name):
+        async with lane.slot("a"):
+            order.append(name)
+
+    tasks = [asyncio.create_task(request(n)) for n in ("first", "second", "third")]
+    await asyncio.sleep(0)
+    lane.release("a")
+    await asyncio.gather(*tasks)
+
+    assert order == ["first", "second", "third"]
+    assert lane.active == 0
+
+
+async def test_full_queue_is_rejected_with_retry_after():
+    lane = _lane(max_concurrent=1, max_queue=1)
+    await lane.acquire("a")
+    queued = asyncio.create_task(lane.acquire("b"))
+    await asyncio.sleep(0)
+
+    with pytest.raises(HTTPException) as excinfo:
+        await lane.acquire("c")
+
+    assert excinfo.value.status_code == 429
+    assert int(excinfo.value.headers["Retry-After"]) >= 1
+    assert lane.rejected == 1
+    queued.cancel()
+
+
+async def test_queue_deadline_rejects_and_frees_the_queue_entry():
+    lane = _lane(max_concurrent=1, queue_timeout=0.05)
+    await lane.acquire("a")
+
+    with pytest.raises(HTTPException) as excinfo:
+        await lane.acquire("b")
+
+    assert excinfo.value.status_code == 429
+    assert lane.snapshot()["queued"] == 0
+
+    lane.release("a")
+    await asyncio.wait_for(lane.acquire("b"), timeout=0.5)
+
+
+async def test_cancelled_waiter_leaves_the_queue():
+    lane = _lane(max_concurrent=1)
+    await lane.acquire("a")
+    waiter = asyncio.create_task(lane.acquire("b"))
+    await asyncio.sleep(0)
+
+    waiter.cancel()
+    await asyncio.gather(waiter, return_exceptions=True)
+    lane.release("a")
+
+    assert lane.active == 0
+    assert lane.snapshot()["queued"] == 0
+
+
+async def test_retry_after_follows_observed_service_time():
+    lane = _lane(max_concurrent=1, queue_timeout=30)
+    assert lane.retry_after() == 30
+
+    await lane.acquire("a")
+    lane.release("a", service_time=4.0)
+
+    assert lane.retry_after() == 4
+
+
+async def test_lanes_are_independent():
+    controller = AdmissionController(
+        {
+            "generation": LaneLimits(1, 1, 0, 0.1),
+            "interactive": LaneLimits(4, 4, 4, 0.1),
+        }
+    )
+    await controller.lane("generation").acquire("a")
+
+    with pytest.raises(HTTPException):
+        await controller.lane("generation").acquire("b")
+    await asyncio.wait_for(controller.lane("interactive").acquire("b"), timeout=0.5)
+
+    snapshot = controller.snapshot()
+    assert snapshot["generation"]["rejected"] == 1
+    assert snapshot["interactive"]["active"] == 1
+
+
+def _request(headers=None, user=None):
+    scope = {
+        "type": "http",
+        "headers": [(k.lower().encode(), v.encode()) for k, v in (headers or {}).items()],
+        "client": ("203.0.113.7", 5000),
+    }
+    if user is not None:
+        scope["user"] = user
+    return Request(scope)
+
+
+def test_tenant_header_is_ignored_unless_trusted(monkeypatch):
+    monkeypatch.setattr(config, "trust_tenant_header", False)
+
+    assert tenant_of(_request({"X-Tenant-ID": "someone-else"})) == "203.0.113.7"
+
+
+def test_tenant_header_is_used_behind_a_trusted_proxy(monkeypatch):
+    monkeypatch.setattr(config, "trust_tenant_header", True)
+
+    assert tenant_of(_request({"X-Tenant-ID": " acme "})) == "acme"
+    assert tenant_of(_request({"X-Tenant-ID": " "})) == "203.0.113.7"
+
+
+def test_authenticated_user_is_the_tenant(monkeypatch):
+    monkeypatch.setattr(config, "trust_tenant_header", True)
+
+    request = _request({"X-Tenant-ID": "globex"}, user=SimpleUser("alice"))
+
+    assert tenant_of(request) == "alice"
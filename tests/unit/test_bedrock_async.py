@@ -0,0 +1,157 @@
+import asyncio
+import time
+from unittest.mock import patch
+
+import pytest
+from botocore.credentials import Credentials
+
+from scripts.bedrock_stub import BedrockStub
+from src.agent.config import config
+from src.agent.tools.content import generate_section, generate_sow_draft_with_reflection
+from src.agent.utils.bedrock_async import AsyncBedrockClient, BedrockError
+from src.agent.utils.rate_limit import BedrockRateLimiter
+from src.rag.embeddings import BedrockEmbeddings
+
+
+@pytest.fixture
+def stub():
+    with BedrockStub() as server:
+        yield server
+
+
+@pytest.fixture
+def limiter():
+    return BedrockRateLimiter(rate=0, max_concurrency=64, max_retries=2, backoff_base=0.001)
+
+
+@pytest.fixture
+def client(stub, limiter):
+    return AsyncBedrockClient(
+        region="us-east-1",
+        endpoint_url=stub.url,
+        credentials=Credentials("AKID", "SECRET"),
+        limiter=limiter,
+    )
+
+
+async def test_invoke_model_is_signed_and_parsed(stub, client):
+    body = await client.invoke_model("amazon.titan-embed-text-v2:0", {"inputText": "NPP gateway"})
+
+    assert body["embedding"] == stub.embedding("NPP gateway")
+    assert stub.requests[0]["model_id"] == "amazon.titan-embed-text-v2:0"
+    await client.aclose()
+
+
+async def test_generate_sends_system_prompt_and_turns(stub, client):
+    from langchain_core.messages import HumanMessage, SystemMessage
+
+    text = await client.generate(
+        [SystemMessage(content="Be brief."), HumanMessage(content="Summarise the SOW")],
+        model_id="test-model",
+        temperature=0.1,
+    )
+
+    assert text == "[stub test-model] Summarise the SOW"
+    request = stub.requests[0]
+    assert request["action"] == "converse"
+    assert request["body"]["system"] == [{"text": "Be brief."}]
+    assert request["body"]["inferenceConfig"]["temperature"] == 0.1
+    await client.aclose()
+
+
+async def test_error_response_raises(stub, limiter):
+    client = AsyncBedrockClient(
+        region="us-east-1",
+        endpoint_url=f"{stub.url}/wrong",
+        credentials=Credentials("AKID", "SECRET"),
+        limiter=limiter,
+    )
+
+    with pytest.raises(BedrockError) as excinfo:
+        await client.invoke_model("model", {"inputText": "x"})
+
+    assert excinfo.value.status_code == 404
+    assert excinfo.value.error_type == "ResourceNotFound"
+    await client.aclose()
+
+
+async def test_throttled_requests_are_retried(stub, client, limiter):
+    stub.throttle_requests = 2
+
+    body = await client.invoke_model("model", {"inputText": "x"})
+
+    assert body["embedding"] == stub.embedding("x")
+    assert limiter.snapshot()["throttles"] == 2
+    await client.aclose()
+
+
+async def test_generations_overlap_on_one_event_loop(stub, client):
+    from langchain_core.messages import HumanMessage
+
+    stub.latency = 0.2
+    start = time.perf_counter()
+    replies = await asyncio.gather(
+        *(client.generate([HumanMessage(content=f"request {i}")]) for i in range(40))
+    )
+    elapsed = time.perf_counter() - start
+
+    assert len(replies) == 40
+    assert stub.max_in_flight >= 20
+    assert elapsed < 40 * 0.2 / 4
+    await client.aclose()
+
+
+async def test_bedrock_embeddings_async_preserves_order(stub, client):
+    with (
+        patch("src.agent.config.Config.bedrock_runtime"),
+        patch("src.agent.utils.bedrock_async._async_bedrock", client),
+    ):
+        embeddings = BedrockEmbeddings(model_id="amazon.titan-embed-text-v2:0")
+        vectors = await embeddings.aembed_documents(["alpha", "beta", "gamma"])
+        query = await embeddings.aembed_query("beta")
+
+    assert vectors == [stub.embedding(t) for t in ["alpha", "beta", "gamma"]]
+    assert query == vectors[1]
+    await client.aclose()
+
+
+async def test_content_tools_use_async_transport(stub, client):
+    with (
+        patch("src.agent.utils.bedrock_async._async_bedrock", client),
+        patch("src.agent.tools.content._get_llm") as get_llm,
+    ):
+        section = await generate_section.ainvoke(
+            {"section_name": "Scope", "context": {"client": "Acme"}}
+        )
+        reflected = await generate_sow_draft_with_reflection.ainvoke(
+            {"context": {"client": {"name": "Acme"}}}
+        )
+
+    get_llm.assert_not_called()
+    assert section.startswith("[stub ")
+    assert '"Scope"' in section
+    assert reflected.startswith("[stub ")
+    assert [r["action"] for r in stub.requests] == ["converse"] * 4
+    await client.aclose()
+
+
+async def test_draft_prompt_prefix_is_read_from_prompt_cache(stub, client):
+    from src.agent.model_router import RouteStats
+    from src.agent.tools.content import generate_sow_draft
+
+    stats = RouteStats()
+    with (
+        patch.object(config, "bedrock_model_id", "apac.amazon.nova-pro-v1:0"),
+        patch("src.agent.utils.bedrock_async._async_bedrock", client),
+        patch("src.agent.model_router.route_stats", stats),
+    ):
+        await generate_sow_draft.ainvoke({"context": {"client": {"name": "Acme"}}})
+        await generate_sow_draft.ainvoke({"context": {"client": {"name": "Globex"}}})
+
+    system = stub.requests[0]["body"]["system"]
+    assert "TEMPLATE STRUCTURE" in system[0]["text"]
+    assert system[-1] == {"cachePoint": {"type": "default"}}
+    assert "Acme" in stub.requests[0]["body"]["messages"][0]["content"][0]["text"]
+    (route,) = stats.snapshot()
+    assert route["cache_write_tokens"] == route["cache_read_tokens"] > 0
+    await client.aclose()
@@ -0,0 +1,124 @@
+from typing import Annotated, TypedDict
+
+import pytest
+from langgraph.graph import END, StateGraph
+
+from src.agent.core.checkpoint import SqliteCheckpointSaver
+
+
+class State(TypedDict):
+    steps: Annotated[list[str], lambda a, b: a + b]
+
+
+def _graph(saver, fail_second: bool):
+    def first(state):
+        return {"steps": ["first"]}
+
+    def second(state):
+        if fail_second:
+            raise TimeoutError("read timeout")
+        return {"steps": ["second"]}
+
+    workflow = StateGraph(State)
+    workflow.add_node("first", first)
+    workflow.add_node("second", second)
+    workflow.set_entry_point("first")
+    workflow.add_edge("first", "second")
+    workflow.add_edge("second", END)
+    return workflow.compile(checkpointer=saver)
+
+
+def test_run_resumes_from_database_after_restart(tmp_path):
+    path = tmp_path / "checkpoints.db"
+    run = {"configurable": {"thread_id": "run-1"}}
+
+    with pytest.raises(TimeoutError):
+        _graph(SqliteCheckpointSaver(path), fail_second=True).invoke({"steps": []}, run)
+
+    # A new process opening the same file picks up where the run stopped
+    graph = _graph(SqliteCheckpointSaver(path), fail_second=False)
+    assert graph.get_state(run).next == ("second",)
+    assert graph.invoke(None, run) == {"steps": ["first", "second"]}
+
+
+def test_list_and_delete_thread():
+    saver = SqliteCheckpointSaver()
+    graph = _graph(saver, fail_second=False)
+    graph.invoke({"steps": []}, {"configurable": {"thread_id": "a"}})
+    graph.invoke({"steps": []}, {"configurable": {"thread_id": "b"}})
+
+    history = list(saver.list({"configurable": {"thread_id": "a"}}))
+    assert [c.metadata["step"] for c in history] == [2, 1, 0, -1]
+    assert len(list(saver.list(None, limit=3))) == 3
+
+    saver.delete_thread("a")
+
+    assert saver.get_tuple({"configurable": {"thread_id": "a"}}) is None
+    assert saver.get_tuple({"configurable": {"thread_id": "b"}}) is not None
+
+
+def test_threads_past_the_ttl_are_deleted(tmp_path):
+    path = tmp_path / "checkpoints.db"
+    saver = SqliteCheckpointSaver(path)
+    graph = _graph(saver, fail_second=True)
+    for thread_id in ("stale", "fresh"):
+        with pytest.raises(TimeoutError):
+            graph.invoke({"steps": []}, {"configurable": {"thread_id": thread_id}})
+    with saver._conn:
+        saver._conn.execute("UPDATE checkpoints SET created_at = 0 WHERE thread_id = 'stale'")
+
+    # Opening the database with a TTL deletes the abandoned run only
+    saver = SqliteCheckpointSaver(path, ttl_seconds=3600)
+
+    assert saver.get_tuple({"configurable": {"thread_id": "stale"}}) is None
+    assert saver.get_tuple({"configurable": {"thread_id": "fresh"}}) is not None
+    assert (
+        saver._conn.execute("SELECT COUNT(*) FROM writes WHERE thread_id = 'stale'").fetchone()[0]
+        == 0
+    )
+
+
+def test_database_without_created_at_is_migrated(tmp_path):
+    path = tmp_path / "checkpoints.db"
+    saver = SqliteCheckpointSaver(path)
+    _graph(saver, fail_second=False).invoke({"steps": []}, {"configurable": {"thread_id": "a"}})
+    with saver._conn:
+        saver._conn.execute("ALTER TABLE checkpoints DROP COLUMN created_at")
+    saver.close()
+
+    saver = SqliteCheckpointSaver(path, ttl_seconds=3600)
+
+    assert saver.get_tuple({"configurable": {"thread_id": "a"}}) is not None
+    assert saver.delete_expired(max_age_seconds=0) == 1
+
+
+def test_get_tuple_reads_one_row_of_a_long_thread():
+    saver = SqliteCheckpointSaver()
+    graph = _graph(saver, fail_second=False)
+    run = {"configurable": {"thread_id": "session"}}
+    for _ in range(20):
+        graph.invoke({"steps": []}, run)
+    statements = []
+    saver._conn.set_trace_callback(statements.append)
+
+    latest = saver.get_tuple(run)
+    saver._conn.set_trace_callback(None)
+
+    assert latest.metadata["step"] == max(c.metadata["step"] for c in saver.list(run))
+    selects = [s for s in statements if s.startswith("SELECT thread_id")]
+    assert len(selects) == 1 and selects[0].endswith("LIMIT 1")
+
+
+def test_list_with_filter_and_limit():
+    saver = SqliteCheckpointSaver()
+    graph = _graph(saver, fail_second=False)
+    run = {"configurable": {"thread_id": "a"}}
+    for _ in range(10):
+        graph.invoke({"steps": []}, run)
+
+    loops = list(saver.list(run, filter={"source": "loop"}, limit=20))
+    inputs = list(saver.list(run, filter={"source": "input"}, limit=3))
+
+    assert len(loops) == 20
+    assert len(inputs) == 3
+    assert all(c.metadata["source"] == "input" for c in inputs)
@@ -0,0 +1,114 @@
+import pytest
+
+from src.rag.chunker import MarkdownChunker, count_tokens
+
+SAMPLE_SOW = """# Statement of Work
+
+Intro paragraph.
+
+## 1. Scope
+
+### In Scope
+- Gateway provisioning
+- ISO 20022 message flows
+
+## 2. Pricing
+
+| Item | Cost |
+|------|------|
+| Implementation | $250,000 |
+| Support | $100,000 |
+"""
+
+
+def test_count_tokens():
+    assert count_tokens("Total: $450,000 AUD") == 6
+
+
+def test_heading_path_metadata():
+    chunks = MarkdownChunker(max_tokens=200).chunk(SAMPLE_SOW)
+
+    assert [c.heading_path_text for c in chunks] == [
+        "Statement of Work",
+        "Statement of Work > 1. Scope > In Scope",
+        "Statement of Work > 2. Pricing",
+    ]
+    assert chunks[1].section == "In Scope"
+    assert chunks[2].text.startswith("| Item | Cost |")
+
+
+def test_large_table_split_between_rows_with_header():
+    rows = "\n".join(f"| Item {i} | ${i},000 |" for i in range(60))
+    content = f"## Pricing\n\n| Item | Cost |\n|------|------|\n{rows}\n"
+
+    chunks = MarkdownChunker(max_tokens=120).chunk(content)
+
+    assert len(chunks) > 1
+    for chunk in chunks:
+        lines = chunk.text.splitlines()
+        assert lines[:2] == ["| Item | Cost |", "|------|------|"]
+        assert all(line.startswith("|") and line.endswith("|") for line in lines)
+        assert chunk.token_count <= 120
+
+
+def test_list_items_kept_whole():
+    items = "\n".join(f"- Deliverable {i} with a short description" for i in range(40))
+    chunks = MarkdownChunker(max_tokens=50).chunk(f"## Deliverables\n\n{items}\n")
+
+    assert len(chunks) > 1
+    for chunk in chunks:
+        assert all(line.startswith("- Deliverable") for line in chunk.text.splitlines())
+
+
+def test_code_block_not_split_at_blank_lines():
+    content = "## Config\n\n```yaml\nkey: value\n\nother: value\n```\n"
+    chunks = MarkdownChunker(max_tokens=100).chunk(content)
+
+    assert len(chunks) == 1
+    assert chunks[0].text == "```yaml\nkey: value\n\nother: value\n```"
+
+
+def test_oversized_paragraph_is_split():
+    paragraph = " ".join(f"Sentence number {i} describes the scope." for i in range(100))
+    chunks = MarkdownChunker(max_tokens=60).chunk(f"## Scope\n\n{paragraph}\n")
+
+    assert len(chunks) > 1
+    assert all(chunk.token_count <= 60 for chunk in chunks)
+
+
+def test_overlap_repeats_trailing_content():
+    paragraphs = "\n\n".join(f"Paragraph {i} text." for i in range(6))
+    chunks = MarkdownChunker(max_tokens=12, overlap_tokens=4).chunk(f"## A\n\n{paragraphs}\n")
+
+    assert len(chunks) > 1
+    assert chunks[1].text.startswith(chunks[0].text.split("\n\n")[-1])
+
+
+def test_overlap_within_an_oversized_paragraph():
+    paragraph = " ".join(
+        f"Sentence {i} sets out the gateway scope, milestones and acceptance criteria."
+        for i in range(120)
+    )
+    chunks = MarkdownChunker(max_tokens=400, overlap_tokens=40).chunk(f"## Scope\n\n{paragraph}\n")
+
+    assert count_tokens(paragraph) > 1500
+    assert len(chunks) > 3
+    for previous, chunk in zip(chunks, chunks[1:], strict=False):
+        assert chunk.token_count <= 400
+        first_sentence = chunk.text.split(". ")[0] + "."
+        assert first_sentence in previous.text
+
+
+def test_overlap_within_a_sentence_split_on_words():
+    words = " ".join(f"word{i}" for i in range(300))
+    chunks = MarkdownChunker(max_tokens=100, overlap_tokens=10).chunk(words)
+
+    assert len(chunks) > 2
+    for previous, chunk in zip(chunks, chunks[1:], strict=False):
+        assert chunk.token_count <= 100
+        assert previous.text.split()[-10:] == chunk.text.split()[:10]
+
+
+def test_overlap_must_be_smaller_than_budget():
+    with pytest.raises(ValueError):
+        MarkdownChunker(max_tokens=10, overlap_tokens=10)
@@ -0,0 +1,118 @@
+import json
+from unittest.mock import patch
+
+import pytest
+
+from src.agent.tools import compliance_rules
+from src.agent.tools.compliance import check_prohibited_terms
+from src.agent.tools.compliance_rules import ComplianceRules, load_compliance_rules
+
+RULES = {
+    "compliance_tiers": {
+        "HIGH": {"sla": "99.99%", "data_residency": "Onshore only"},
+        "LOW": {"sla": "99.5%", "data_residency": "Any region"},
+    },
+    "mandatory_clauses": [
+        {
+            "name": "Service Level Agreement",
+            "text": "Vendor guarantees {sla}.",
+            "required_for": ["ALL"],
+        },
+        {
+            "name": "Data Protection",
+            "text": "Data stays {data_residency}.",
+            "required_for": ["ALL"],
+        },
+        {"name": "Termination", "text": "30 days {notice}.", "required_for": ["HIGH"]},
+    ],
+    "prohibited_terms": ["unlimited liability"],
+    "product_requirements": {
+        "Payments Gateway": {
+            "aliases": ["Gateway"],
+            "sla_requirements": {"uptime": "99.999%", "max_response_time": "15 minutes"},
+            "mandatory_clauses": [{"name": "Scheme Rules", "required_for": ["ALL"]}],
+            "prohibited_terms": ["instant settlement guaranteed"],
+        }
+    },
+}
+
+
+@pytest.fixture
+def rules():
+    return ComplianceRules(RULES)
+
+
+def test_tier_bundle_renders_clause_texts(rules):
+    bundle = rules.bundle("HIGH")
+
+    assert dict(bundle.sla_requirements) == {"uptime": "99.99%"}
+    assert [c["text"] for c in bundle.mandatory_clauses] == [
+        "Vendor guarantees 99.99%.",
+        "Data stays Onshore only.",
+        "30 days {notice}.",  # unknown placeholders are left alone
+    ]
+    assert len(rules.bundle("LOW").mandatory_clauses) == 2
+
+
+def test_product_bundle_adds_product_requirements(rules):
+    bundle = rules.bundle("LOW", product="gateway")
+
+    assert bundle.product == "Payments Gateway"
+    assert dict(bundle.sla_requirements) == {"uptime": "99.999%", "max_response_time": "15 minutes"}
+    assert bundle.mandatory_clauses[0]["text"] == "Vendor guarantees 99.999%."
+    assert bundle.mandatory_clauses[-1]["name"] == "Scheme Rules"
+    assert bundle.prohibited_terms == ("unlimited liability", "instant settlement guaranteed")
+
+
+def test_bundles_are_precomputed_and_immutable(rules):
+    bundle = rules.bundle("HIGH", "Payments Gateway")
+
+    assert rules.bundle("HIGH", "Gateway") is bundle
+    with pytest.raises(TypeError):
+        bundle.mandatory_clauses[0]["text"] = "changed"
+
+    response = bundle.to_dict()
+    response["mandatory_clauses"][0]["text"] = "changed"
+    assert bundle.mandatory_clauses[0]["text"] == "Vendor guarantees 99.999%."
+
+
+def test_unknown_tier_and_product_fall_back(rules):
+    bundle = rules.bundle("PLATINUM", "Unknown Product")
+
+    assert bundle.product is None
+    assert dict(bundle.sla_requirements) == {}
+    assert [c["name"] for c in bundle.mandatory_clauses] == [
+        "Service Level Agreement",
+        "Data Protection",
+    ]
+
+
+def test_rules_reload_when_file_changes(tmp_path):
+    rules_file = tmp_path / "compliance_rules.json"
+    rules_file.write_text(json.dumps(RULES))
+
+    with patch.object(compliance_rules, "RULES_FILE", rules_file):
+        first = load_compliance_rules()
+        assert load_compliance_rules() is first
+
+        rules_file.write_text(json.dumps({**RULES, "prohibited_terms": ["work for hire"]}))
+        reloaded = load_compliance_rules()
+
+    assert reloaded is not first
+    assert reloaded.bundle().prohibited_terms == ("work for hire",)
+
+
+def test_check_prohibited_terms_uses_product_terms(tmp_path):
+    rules_file = tmp_path / "compliance_rules.json"
+    rules_file.write_text(json.dumps(RULES))
+    sow_text = "Instant settlement guaranteed, with Unlimited Liability."
+
+    with patch.object(compliance_rules, "RULES_FILE", rules_file):
+        generic = check_prohibited_terms.invoke({"sow_text": sow_text})
+        product = check_prohibited_terms.invoke({"sow_text": sow_text, "product": "Gateway"})
+
+    assert [f["term"] for f in generic["findings"]] == ["unlimited liability"]
+    assert [f["term"] for f in product["findings"]] == [
+        "instant settlement guaranteed",
+        "unlimited liability",
+    ]
@@ -4,6 +4,7 @@ from unittest.mock import mock_open, patch
 import pytest
 
 from src.agent.tools.compliance import (
+    ClauseDetector,
     check_mandatory_clauses_v2,
     check_prohibited_terms,
     check_sla_requirements,
@@ -36,6 +37,58 @@ def test_check_mandatory_clauses_fail():
     assert "Liability" in result["missing_clauses"]
 
 
+SECTIONED_SOW = """# Statement of Work
+
+## Service Levels
+
+The Vendor guarantees 99.9% availability under this service-level agreement.
+
+## Data Protecton
+
+Customer data is stored in Australia.
+
+## Terminating for Convenience
+
+Either party may end this SOW with 30 days notice.
+"""
+
+
+def test_check_mandatory_clauses_reports_sections():
+    requirements = ["Service Level Agreement", "Data Protection", "Termination for Convenience"]
+
+    result = check_mandatory_clauses_v2.invoke(
+        {"sow_text": SECTIONED_SOW, "requirements": requirements}
+    )
+
+    assert result["status"] == "PASS"
+    assert result["clause_locations"] == {
+        "Service Level Agreement": "Service Levels",
+        "Data Protection": "Data Protecton",
+        "Termination for Convenience": "Terminating for Convenience",
+    }
+
+
+def test_check_mandatory_clauses_reports_closest_section_for_missing():
+    result = check_mandatory_clauses_v2.invoke(
+        {"sow_text": SECTIONED_SOW, "requirements": ["Limitation of Liability for Data"]}
+    )
+
+    assert result["missing_clauses"] == ["Limitation of Liability for Data"]
+    assert result["closest_sections"] == {"Limitation of Liability for Data": "Data Protecton"}
+
+
+def test_clause_detector_thresholds():
+    text = "## Fees\n\nPayment is due within thirty days.\n"
+
+    lenient = ClauseDetector(text, token_threshold=0.5)
+    assert lenient.is_match(lenient.match("Payment Schedule"))
+    strict = ClauseDetector(text, token_threshold=1.0)
+    assert not strict.is_match(strict.match("Payment Schedule"))
+    # "#" lines inside code fences are not headings
+    fenced = ClauseDetector("```\n# Payment Schedule\n```")
+    assert fenced.match("Payment Schedule").section == "Preamble"
+
+
 def test_check_prohibited_terms_pass(mock_compliance_rules):
     sow_text = "We promise reasonable efforts."
 
@@ -75,3 +128,19 @@ def test_check_sla_requirements_pass(mock_compliance_rules):
         )
         assert result["status"] == "PASS"
         assert len(result["findings"]) == 0
+
+
+def test_check_sla_requirements_flags_weaker_commitments(mock_compliance_rules):
+    sow_text = "## SLA\n\n- Uptime: 99.5%\n- Response time within 4 hours"
+
+    with (
+        patch("builtins.open", mock_open(read_data=json.dumps(mock_compliance_rules))),
+        patch("pathlib.Path.exists", return_value=True),
+    ):
+        result = check_sla_requirements.invoke(
+            {"sow_text": sow_text, "product": "Test", "client_tier": "HIGH"}
+        )
+
+    assert result["status"] == "WARNING"
+    assert [f["location"] for f in result["findings"]] == ["Line 4", "Line 3"]
+    assert [c["metric"] for c in result["commitments"]] == ["availability", "response_time"]
@@ -0,0 +1,152 @@
+from unittest.mock import patch
+
+import pytest
+from docx import Document
+from pypdf import PdfWriter
+from pypdf.generic import DecodedStreamObject, DictionaryObject, NameObject
+
+from src.agent.utils import doc_handler
+from src.agent.utils.doc_handler import extract_pdf_pages, iter_pdf_pages, parse_document
+
+
+def _write_pdf(path, n_pages):
+    writer = PdfWriter()
+    font = writer._add_object(
+        DictionaryObject(
+            {
+                NameObject("/Type"): NameObject("/Font"),
+                NameObject("/Subtype"): NameObject("/Type1"),
+                NameObject("/BaseFont"): NameObject("/Helvetica"),
+            }
+        )
+    )
+    for i in range(n_pages):
+        page = writer.add_blank_page(612, 792)
+        page[NameObject("/Resources")] = DictionaryObject(
+            {NameObject("/Font"): DictionaryObject({NameObject("/F1"): font})}
+        )
+        stream = DecodedStreamObject()
+        stream.set_data(f"BT /F1 12 Tf 72 720 Td (Page {i} text) Tj ET".encode())
+        page[NameObject("/Contents")] = writer._add_object(stream)
+    writer.write(str(path))
+    return path
+
+
+@pytest.fixture(autouse=True)
+def clear_page_cache():
+    doc_handler.pdf_page_cache.clear()
+    yield
+    doc_handler.pdf_page_cache.clear()
+
+
+def test_parse_pdf_joins_pages(tmp_path):
+    pdf = _write_pdf(tmp_path / "sow.pdf", 3)
+
+    assert parse_document(pdf) == "Page 0 text\n\nPage 1 text\n\nPage 2 text"
+
+
+def test_page_range(tmp_path):
+    pdf = _write_pdf(tmp_path / "sow.pdf", 10)
+
+    assert extract_pdf_pages(pdf, start=3, end=5) == ["Page 3 text", "Page 4 text"]
+    assert extract_pdf_pages(pdf, start=8, end=50) == ["Page 8 text", "Page 9 text"]
+    with pytest.raises(ValueError):
+        extract_pdf_pages(pdf, start=11)
+
+
+def test_parallel_extraction_streams_pages_in_order(tmp_path):
+    pdf = _write_pdf(tmp_path / "appendix.pdf", 40)
+
+    with patch.object(doc_handler.config, "pdf_parallel_min_pages", 10):
+        pages = list(iter_pdf_pages(pdf, workers=2))
+
+    assert [n for n, _ in pages] == list(range(40))
+    assert all(text == f"Page {n} text" for n, text in pages)
+
+
+def test_parallel_extraction_reuses_one_pool(tmp_path):
+    pdfs = [_write_pdf(tmp_path / f"appendix-{i}.pdf", 20) for i in range(2)]
+
+    with patch.object(doc_handler.config, "pdf_parallel_min_pages", 10):
+        for pdf in pdfs:
+            extract_pdf_pages(pdf, workers=2)
+
+    assert list(doc_handler._page_pools) == [2]
+
+
+def test_worker_processes_extract_serially(tmp_path):
+    pdf = _write_pdf(tmp_path / "appendix.pdf", 20)
+
+    with (
+        patch.object(doc_handler.config, "pdf_parallel_min_pages", 10),
+        patch.object(doc_handler, "_pool_worker", True),
+        patch.object(doc_handler, "_page_pool") as page_pool,
+    ):
+        assert extract_pdf_pages(pdf, workers=2) == [f"Page {i} text" for i in range(20)]
+
+    page_pool.assert_not_called()
+
+
+def test_pool_initializer_marks_workers():
+    pool = doc_handler._page_pool(1)
+    try:
+        assert pool.submit(doc_handler.in_pool_worker).result() is True
+    finally:
+        doc_handler._page_pools.pop(1).shutdown()
+
+    assert doc_handler.in_pool_worker() is False
+
+
+def test_pages_are_cached_by_file_hash(tmp_path):
+    pdf = _write_pdf(tmp_path / "sow.pdf", 4)
+    extract_pdf_pages(pdf)
+
+    # A copy with identical content is served from the cache
+    copy = tmp_path / "copy.pdf"
+    copy.write_bytes(pdf.read_bytes())
+    with patch.object(doc_handler.PdfReader, "pages") as pages:
+        pages.__len__.return_value = 4
+        assert extract_pdf_pages(copy) == [f"Page {i} text" for i in range(4)]
+        pages.__getitem__.assert_not_called()
+
+    assert doc_handler.pdf_page_cache.hits == 4
+
+
+def _write_docx(path):
+    doc = Document()
+    doc.add_heading("Statement of Work", level=1)
+    doc.add_paragraph("Intro paragraph.")
+    doc.add_heading("Deliverables", level=2)
+    doc.add_paragraph("Gateway provisioning", style="List Bullet")
+    doc.add_paragraph("ISO 20022 message flows", style="List Bullet")
+    doc.add_paragraph("Design", style="List Number")
+    doc.add_paragraph("Build", style="List Number")
+    doc.add_heading("Service Levels", level=2)
+    table = doc.add_table(rows=2, cols=2)
+    table.cell(0, 0).text, table.cell(0, 1).text = "Metric", "Target"
+    table.cell(1, 0).text, table.cell(1, 1).text = "Uptime", "99.9%"
+    doc.add_paragraph("Closing paragraph.")
+    doc.save(str(path))
+    return path
+
+
+def test_parse_docx_blocks_in_document_order(tmp_path):
+    blocks = doc_handler.parse_docx_blocks(_write_docx(tmp_path / "sow.docx"))
+
+    assert [(b.kind, b.level) for b in blocks[:3]] == [
+        ("heading", 1),
+        ("paragraph", 0),
+        ("heading", 2),
+    ]
+    assert [b.marker for b in blocks if b.kind == "list_item"] == ["-", "-", "1.", "2."]
+    table = next(b for b in blocks if b.kind == "table")
+    assert table.rows == [["Metric", "Target"], ["Uptime", "99.9%"]]
+    assert blocks[-1].text == "Closing paragraph."
+
+
+def test_parse_docx_renders_markdown(tmp_path):
+    text = parse_document(_write_docx(tmp_path / "sow.docx"))
+
+    assert text.startswith("# Statement of Work\n\nIntro paragraph.\n\n## Deliverables")
+    assert "- Gateway provisioning\n- ISO 20022 message flows\n1. Design\n2. Build" in text
+    assert "| Metric | Target |\n| --- | --- |\n| Uptime | 99.9% |\n\nClosing paragraph." in text
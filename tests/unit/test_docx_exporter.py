@@ -0,0 +1,90 @@
+import io
+
+from docx import Document
+
+from src.agent.utils.doc_handler import parse_docx_blocks
+from src.agent.utils.docx_exporter import (
+    export_batch,
+    export_to_bytes,
+    parse_inline,
+    parse_markdown_blocks,
+)
+
+SAMPLE_SOW = """# Statement of Work
+
+Total fee is **$450,000** *excluding GST*.
+
+## Deliverables
+
+- Gateway provisioning
+- ISO 20022 message flows
+  - pacs.008 credit transfers
+
+1. Design
+2. Build
+
+| Metric | Target |
+|--------|--------|
+| Uptime | **99.9%** |
+
+## Milestones
+
+1. Kickoff
+2. Go-live
+"""
+
+
+def test_parse_markdown_blocks():
+    blocks = parse_markdown_blocks(SAMPLE_SOW)
+
+    assert [b.kind for b in blocks[:3]] == ["heading", "paragraph", "heading"]
+    items = [(b.level, b.marker, b.text) for b in blocks if b.kind == "list_item"][:3]
+    assert items == [
+        (0, "-", "Gateway provisioning"),
+        (0, "-", "ISO 20022 message flows"),
+        (1, "-", "pacs.008 credit transfers"),
+    ]
+    table = next(b for b in blocks if b.kind == "table")
+    assert table.rows == [["Metric", "Target"], ["Uptime", "**99.9%**"]]
+
+
+def test_parse_inline_runs():
+    assert parse_inline("Fee **$450,000** *ex GST* for `api_v2` and snake_case") == [
+        ("Fee ", False, False),
+        ("$450,000", True, False),
+        (" ", False, False),
+        ("ex GST", False, True),
+        (" for ", False, False),
+        ("api_v2", False, False),
+        (" and snake_case", False, False),
+    ]
+
+
+def test_export_to_bytes_keeps_formatting(tmp_path):
+    data = export_to_bytes(SAMPLE_SOW)
+    doc = Document(io.BytesIO(data))
+
+    fee = doc.paragraphs[1]
+    assert [(r.text, r.bold, r.italic) for r in fee.runs] == [
+        ("Total fee is ", None, None),
+        ("$450,000", True, None),
+        (" ", None, None),
+        ("excluding GST", None, True),
+        (".", None, None),
+    ]
+    assert doc.tables[0].cell(1, 1).text == "99.9%"
+
+    # Round trip through the DOCX parser: both numbered lists restart at 1
+    path = tmp_path / "sow.docx"
+    path.write_bytes(data)
+    markers = [b.marker for b in parse_docx_blocks(path) if b.kind == "list_item"]
+    assert markers == ["-", "-", "-", "1.", "2.", "1.", "2."]
+
+
+def test_export_batch(tmp_path):
+    documents = {f"SOW-{i}": f"# SOW {i}\n\nBody {i}." for i in range(3)}
+
+    paths = export_batch(documents, tmp_path / "out", workers=2)
+
+    assert sorted(paths) == ["SOW-0", "SOW-1", "SOW-2"]
+    assert Document(str(paths["SOW-2"])).paragraphs[0].text == "SOW 2"
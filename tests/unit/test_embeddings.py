@@ -0,0 +1,52 @@
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+from src.rag.embeddings import BedrockEmbeddings, LocalEmbeddings, get_embeddings
+
+
+def test_local_embeddings_shape_and_norm():
+    embeddings = LocalEmbeddings(dimensions=256)
+
+    vectors = embeddings.embed_documents(["Real-time payments SOW", "Fraud detection pricing"])
+
+    assert len(vectors) == 2
+    assert all(len(v) == 256 for v in vectors)
+    assert np.allclose(np.linalg.norm(np.asarray(vectors), axis=1), 1.0)
+
+
+def test_local_embeddings_deterministic():
+    embeddings = LocalEmbeddings(dimensions=256)
+
+    assert embeddings.embed_query("NPP gateway") == embeddings.embed_query("NPP gateway")
+    assert embeddings.embed_documents(["NPP gateway"])[0] == embeddings.embed_query("NPP gateway")
+
+
+def test_local_embeddings_similarity_ranking():
+    embeddings = LocalEmbeddings(dimensions=512)
+    docs = embeddings.embed_documents(
+        [
+            "Pricing: total professional services fee and payment schedule",
+            "Timeline: phase 1 design, phase 2 build and integration testing",
+        ]
+    )
+    query = embeddings.embed_query("payment schedule and pricing")
+
+    scores = np.asarray(docs) @ np.asarray(query)
+    assert scores[0] > scores[1]
+
+
+def test_local_embeddings_empty_input():
+    assert LocalEmbeddings(dimensions=64).embed_documents([]) == []
+    assert LocalEmbeddings(dimensions=64).embed_query("") == [0.0] * 64
+
+
+def test_get_embeddings_selects_backend():
+    assert isinstance(get_embeddings("local"), LocalEmbeddings)
+
+    with patch("src.agent.config.Config.bedrock_runtime"):
+        assert isinstance(get_embeddings("bedrock"), BedrockEmbeddings)
+
+    with pytest.raises(ValueError):
+        get_embeddings("unknown")
@@ -0,0 +1,97 @@
+import asyncio
+from unittest.mock import MagicMock, patch
+
+from langchain_core.messages import AIMessage
+
+from src.api.jobs import GenerationJob, JobStore, format_sse, run_generation_job
+
+
+async def _collect(job, after=0):
+    return [event async for event in job.follow(after=after)]
+
+
+async def test_follow_waits_for_events_and_replays_after_last_id():
+    job = GenerationJob(id="j1", client_id="C", product="P", quality_mode="production")
+    follower = asyncio.create_task(_collect(job))
+
+    await job.publish("draft", {"sow_text": "quick"})
+    await asyncio.sleep(0)
+    job.status = "done"
+    await job.publish("final", {"sow_text": "refined"})
+
+    assert [e["event"] for e in await follower] == ["draft", "final"]
+    assert [e["id"] for e in await _collect(job, after=1)] == [2]
+
+
+async def test_quick_mode_job_skips_refinement():
+    job = GenerationJob(id="j2", client_id="C", product="P", quality_mode="quick")
+    finished = []
+
+    with (
+        patch("src.api.jobs.assemble_generation_context", return_value={}),
+        patch("src.api.jobs._quick_draft", return_value="# Draft"),
+        patch("src.api.jobs._refine") as refine,
+    ):
+        await run_generation_job(job, on_finish=lambda: finished.append(True))
+
+    refine.assert_not_called()
+    assert job.status == "done"
+    assert job.sow_text == "# Draft"
+    assert finished == [True]
+
+
+async def test_failed_job_publishes_error_and_releases():
+    job = GenerationJob(id="j3", client_id="C", product="P", quality_mode="production")
+    finished = []
+
+    with patch("src.api.jobs.assemble_generation_context", side_effect=LookupError("no client")):
+        await run_generation_job(job, on_finish=lambda: finished.append(True))
+
+    assert job.status == "failed"
+    assert job.events[-1] == {
+        "id": len(job.events),
+        "event": "error",
+        "data": {"error": "no client", "draft_available": False},
+    }
+    assert finished == [True]
+
+
+async def test_truncated_quick_draft_is_not_published_or_refined():
+    job = GenerationJob(id="j4", client_id="C", product="P", quality_mode="production")
+    mock_llm = MagicMock()
+    mock_llm.invoke.return_value = AIMessage(
+        content="# SOW\n\n## 1. Scope\n\nThe gateway will",
+        response_metadata={"stopReason": "max_tokens"},
+    )
+
+    with (
+        patch("src.api.jobs.assemble_generation_context", return_value={}),
+        patch("src.agent.tools.content._get_llm", return_value=mock_llm),
+        patch("src.api.jobs._refine") as refine,
+    ):
+        await run_generation_job(job)
+
+    refine.assert_not_called()
+    assert job.status == "failed"
+    assert "cut off" in job.error
+    assert job.draft is None
+    assert "draft" not in [e["event"] for e in job.events]
+
+
+def test_store_evicts_only_expired_finished_jobs():
+    store = JobStore(ttl_seconds=60)
+    done = store.create("C", "P", "quick")
+    running = store.create("C", "P", "quick")
+    done.status = "done"
+    done.created_at -= 120
+    running.created_at -= 120
+
+    store.create("C", "P", "quick")
+
+    assert store.get(done.id) is None
+    assert store.get(running.id) is running
+
+
+def test_format_sse():
+    event = {"id": 3, "event": "draft", "data": {"sow_text": "a\nb"}}
+    assert format_sse(event) == 'id: 3\nevent: draft\ndata: {"sow_text": "a\\nb"}\n\n'
@@ -0,0 +1,52 @@
+import subprocess
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+
+# Loaded on first use only, never at API startup. Eager agent/RAG imports used
+# to put src.api.main over 3 seconds; what it imports is checked rather than
+# wall-clock time, which varies with the machine and its load.
+LAZY_MODULES = (
+    "langgraph",
+    "langchain_aws",
+    "langchain_core",
+    "boto3",
+    "chromadb",
+    "pypdf",
+    "docx",
+)
+
+
+def _import_times(module: str) -> dict[str, int]:
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=PROJECT_ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.removeprefix("import time:").split("|")
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+def test_api_import_skips_heavy_dependencies():
+    times = _import_times("src.api.main")
+
+    assert "src.api.main" in times
+    assert not [name for name in times if name.split(".")[0] in LAZY_MODULES]
+
+
+def test_lazy_exports_resolve():
+    from src.agent import SOWAgent
+    from src.agent.tools import ALL_TOOLS
+    from src.agent.utils import parse_document
+
+    assert SOWAgent.__name__ == "SOWAgent"
+    assert len(ALL_TOOLS) == 16
+    assert callable(parse_document)
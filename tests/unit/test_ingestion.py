@@ -0,0 +1,130 @@
+import threading
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.rag.chunker import MarkdownChunker
+from src.rag.indexer import chunk_id_prefix
+from src.rag.ingestion import IngestionPipeline, iter_source_files
+
+
+@pytest.fixture
+def corpus(tmp_path):
+    docs = tmp_path / "docs"
+    docs.mkdir()
+    for i in range(5):
+        (docs / f"SOW-{i}.md").write_text(
+            f"# SOW {i}\n\n## Scope\n\nScope text {i}.\n\n## Pricing\n\nPricing text {i}.\n"
+        )
+    (docs / "notes.txt").write_text("ignored")
+    return docs
+
+
+@pytest.fixture
+def indexer():
+    mock = MagicMock()
+    mock.chunker = MarkdownChunker(max_tokens=50)
+    return mock
+
+
+def _metadata(path):
+    return {"doc_type": "historical_sow"}
+
+
+def test_iter_source_files_filters_suffixes(corpus):
+    files = list(iter_source_files([corpus, corpus / "missing"]))
+
+    assert [f.name for f in files] == [f"SOW-{i}.md" for i in range(5)]
+
+
+def test_pipeline_indexes_all_files_in_batches(corpus, indexer):
+    pipeline = IngestionPipeline(indexer, workers=2, batch_size=4)
+    progress = MagicMock()
+
+    stats = pipeline.run([(corpus, _metadata)], progress=progress)
+
+    assert stats.files_indexed == 5
+    assert stats.chunks_indexed == 10
+    assert stats.files_failed == 0
+    assert progress.called
+
+    upserted = [call.args for call in indexer.upsert_chunks.call_args_list]
+    assert all(len(ids) <= 4 for ids, _, _ in upserted)
+    ids = [chunk_id for ids, _, _ in upserted for chunk_id in ids]
+    assert sorted(ids) == sorted(
+        f"{chunk_id_prefix(corpus / f'SOW-{i}.md')}_{j}" for i in range(5) for j in range(2)
+    )
+
+    metadata = upserted[0][2][0]
+    assert metadata["doc_type"] == "historical_sow"
+    assert metadata["source_format"] == "md"
+
+
+def test_files_sharing_a_stem_get_distinct_chunk_ids(tmp_path, indexer):
+    docs = tmp_path / "docs"
+    for sub in ("a", "b"):
+        (docs / sub).mkdir(parents=True)
+        (docs / sub / "sow.md").write_text(f"# SOW {sub}\n\nScope for {sub}.\n")
+    (docs / "sow.md").write_text("# SOW root\n\nScope for root.\n")
+
+    stats = IngestionPipeline(indexer, workers=2).run([(docs, _metadata)])
+
+    ids = [i for call in indexer.upsert_chunks.call_args_list for i in call.args[0]]
+    assert stats.chunks_indexed == 3
+    assert len(set(ids)) == 3
+    assert all(i.startswith("sow_") for i in ids)
+
+
+def test_pipeline_resumes_from_checkpoint(corpus, indexer, tmp_path):
+    checkpoint = tmp_path / "checkpoint.json"
+    IngestionPipeline(indexer, workers=2, checkpoint_path=checkpoint).run([(corpus, _metadata)])
+
+    # New file plus a modified file are the only ones re-ingested
+    (corpus / "SOW-5.md").write_text("# SOW 5\n\nNew.\n")
+    (corpus / "SOW-0.md").write_text("# SOW 0\n\nChanged content, now longer.\n")
+    indexer.reset_mock()
+
+    stats = IngestionPipeline(indexer, workers=2, checkpoint_path=checkpoint).run(
+        [(corpus, _metadata)]
+    )
+
+    assert stats.files_skipped == 4
+    assert stats.files_indexed == 2
+    deleted = [p for call in indexer.delete_sources.call_args_list for p in call.args[0]]
+    assert sorted(deleted) == [str(corpus / "SOW-0.md"), str(corpus / "SOW-5.md")]
+
+
+def test_failed_upsert_is_not_checkpointed(corpus, indexer, tmp_path):
+    indexer.upsert_chunks.side_effect = RuntimeError("throttled")
+    pipeline = IngestionPipeline(indexer, workers=1, checkpoint_path=tmp_path / "cp.json")
+
+    stats = pipeline.run([(corpus, _metadata)])
+
+    assert stats.files_indexed == 0
+    assert stats.files_failed == 5
+    assert not any(pipeline.checkpoint.is_done(p) for p in iter_source_files([corpus]))
+
+
+def test_writer_error_is_raised_instead_of_blocking(tmp_path, indexer):
+    docs = tmp_path / "docs"
+    docs.mkdir()
+    for i in range(20):
+        (docs / f"SOW-{i}.md").write_text(f"# SOW {i}\n\nScope text {i}.\n")
+    progress = MagicMock(side_effect=RuntimeError("progress sink closed"))
+    pipeline = IngestionPipeline(indexer, workers=2, batch_size=1, queue_size=1)
+    outcome = {}
+
+    def run():
+        try:
+            pipeline.run([(docs, _metadata)], progress=progress)
+        except RuntimeError as e:
+            outcome["error"] = e
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    thread.join(timeout=30)
+
+    assert not thread.is_alive()
+    assert str(outcome["error"]) == "progress sink closed"
+    assert progress.call_count == 1
+    assert indexer.upsert_chunks.call_count < 20
@@ -0,0 +1,275 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+from langchain_core.messages import AIMessage
+
+from src.agent.config import config
+from src.agent.model_router import (
+    CACHE_POINT,
+    ModelRouter,
+    RouteCall,
+    RouteStats,
+    load_model_router,
+    resolve_model,
+    route_stats,
+    track,
+)
+from src.agent.tools.content import generate_sow_draft_with_reflection
+
+ROUTES = """
+default_profile: big
+profiles:
+  big:
+    model_id: big-model
+    max_tokens: 4000
+    input_cost_per_1k: 0.001
+    output_cost_per_1k: 0.002
+  small:
+    model_id: small-model
+    max_tokens: 500
+    temperature: 0.1
+routes:
+  draft:
+    default: big
+    quick: small
+  critique: small
+"""
+
+
+@pytest.fixture
+def routes_file(tmp_path):
+    path = tmp_path / "routes.yaml"
+    path.write_text(ROUTES)
+    with patch.object(config, "model_routes_file", str(path)):
+        yield path
+
+
+def test_bundled_routes_send_quick_and_auxiliary_tasks_to_the_fast_profile():
+    router = load_model_router()
+
+    assert resolve_model("draft", "production").model_id == config.bedrock_model_id
+    assert resolve_model("draft", "quick").name == "fast"
+    assert resolve_model("critique", "production").name == "fast"
+    assert resolve_model("revision", "production").max_tokens == config.max_tokens
+    assert resolve_model("unknown-task").name == router.default_profile
+
+
+def test_fast_profile_model_comes_from_the_environment(monkeypatch):
+    import yaml
+
+    from src.agent.model_router import ROUTES_FILE
+
+    routes = yaml.safe_load(ROUTES_FILE.read_text())
+    monkeypatch.delenv("FAST_MODEL_ID", raising=False)
+    fast = ModelRouter(routes).profiles["fast"]
+
+    assert fast.model_id == config.bedrock_model_id
+    assert fast.max_tokens == config.max_tokens
+
+    monkeypatch.setenv("FAST_MODEL_ID", "us.amazon.nova-lite-v1:0")
+    assert ModelRouter(routes).profiles["fast"].model_id == "us.amazon.nova-lite-v1:0"
+
+
+def test_routes_from_yaml(routes_file):
+    assert resolve_model("draft").model_id == "big-model"
+    assert resolve_model("draft", "quick").max_tokens == 500
+    assert resolve_model("critique", "production").temperature == 0.1
+    assert resolve_model("summary").name == "big"
+
+
+def test_routes_file_is_reloaded_when_changed(routes_file):
+    assert resolve_model("critique").name == "small"
+
+    routes_file.write_text(ROUTES.replace("critique: small", "critique: big"))
+
+    assert resolve_model("critique").name == "big"
+
+
+def test_unknown_profile_is_rejected():
+    with pytest.raises(ValueError, match="unknown model profile"):
+        ModelRouter({"profiles": {"a": {}}, "routes": {"draft": {"quick": "missing"}}})
+
+
+def test_track_records_latency_tokens_and_cost(routes_file):
+    stats = RouteStats()
+    profile = resolve_model("draft")
+
+    with patch("src.agent.model_router.route_stats", stats):
+        with track("draft", "production", profile) as call:
+            call.usage(
+                AIMessage(
+                    content="x",
+                    usage_metadata={
+                        "input_tokens": 1000,
+                        "output_tokens": 500,
+                        "total_tokens": 1500,
+                    },
+                )
+            )
+        with pytest.raises(RuntimeError), track("draft", "production", profile):
+            raise RuntimeError("boom")
+
+    (route,) = stats.snapshot()
+    assert route["model_id"] == "big-model"
+    assert route["calls"] == 2
+    assert route["errors"] == 1
+    assert route["input_tokens"] == 1000
+    assert route["cost_usd"] == pytest.approx(0.002)
+    assert route["latency_p50_ms"] is not None
+
+
+def test_reflection_steps_use_their_routed_models(routes_file):
+    mock_llm = MagicMock()
+    mock_llm.invoke.return_value = AIMessage(content="text")
+
+    with (
+        patch("src.agent.tools.content.ChatBedrock", return_value=mock_llm) as chat,
+        patch("src.agent.config.Config.bedrock_runtime"),
+    ):
+        generate_sow_draft_with_reflection.invoke({"context": {}})
+
+    models = [c.kwargs["model"] for c in chat.call_args_list]
+    assert models == ["big-model", "small-model", "big-model"]
+    tasks = {(r["task"], r["model_id"]) for r in route_stats.snapshot()}
+    assert ("critique", "small-model") in tasks
+
+
+def test_planner_model_follows_quality_mode(routes_file):
+    from src.agent.core.planner import SOWAgent
+
+    mock_llm = MagicMock()
+    mock_llm.bind_tools.return_value.invoke.return_value = AIMessage(content="done")
+
+    with (
+        patch("src.agent.config.Config.bedrock_runtime"),
+        patch("src.agent.core.planner.ChatBedrock", return_value=mock_llm) as chat,
+        patch("src.agent.core.planner.get_system_prompt", return_value="SysPrompt"),
+    ):
+        routes_file.write_text(ROUTES + "  planner:\n    default: big\n    quick: small\n")
+        agent = SOWAgent()
+        assert agent.run("Draft a SOW", quality_mode="quick") == "done"
+        agent.run("Draft another", quality_mode="quick")
+
+    models = [c.kwargs["model"] for c in chat.call_args_list]
+    assert models == ["big-model", "small-model"]
+
+
+def test_tools_called_by_the_agent_follow_its_quality_mode(routes_file):
+    from src.agent.core.planner import SOWAgent
+
+    call = {"name": "generate_section", "args": {"section_name": "Scope", "context": {}}, "id": "1"}
+    planner_llm = MagicMock()
+    planner_llm.bind_tools.return_value.invoke.side_effect = [
+        AIMessage(content="", tool_calls=[call]),
+        AIMessage(content="done"),
+    ]
+    section_llm = MagicMock()
+    section_llm.invoke.return_value = AIMessage(content="## Scope")
+
+    with (
+        patch("src.agent.config.Config.bedrock_runtime"),
+        patch("src.agent.core.planner.ChatBedrock", return_value=planner_llm),
+        patch("src.agent.tools.content.ChatBedrock", return_value=section_llm) as chat,
+        patch("src.agent.core.planner.get_system_prompt", return_value="SysPrompt"),
+    ):
+        routes_file.write_text(ROUTES + "  section:\n    default: big\n    quick: small\n")
+        assert SOWAgent().run("Write the scope", quality_mode="quick") == "done"
+
+    assert chat.call_args.kwargs["model"] == "small-model"
+
+
+def test_cache_tokens_are_metered_apart_from_input(routes_file):
+    stats = RouteStats()
+    profile = resolve_model("draft")
+
+    with patch("src.agent.model_router.route_stats", stats):
+        with track("draft", None, profile) as call:
+            call.usage(
+                AIMessage(
+                    content="x",
+                    usage_metadata={
+                        "input_tokens": 1500,
+                        "output_tokens": 100,
+                        "total_tokens": 1600,
+                        "input_token_details": {"cache_read": 1000, "cache_creation": 0},
+                    },
+                )
+            )
+        with track("draft", None, profile) as call:
+            call.usage(
+                {"usage": {"inputTokens": 500, "outputTokens": 100, "cacheWriteInputTokens": 1000}}
+            )
+
+    (route,) = stats.snapshot()
+    assert route["input_tokens"] == 1000
+    assert route["cache_read_tokens"] == 1000
+    assert route["cache_write_tokens"] == 1000
+    # Cached tokens are priced as input unless the profile sets cache prices
+    assert route["cost_usd"] == pytest.approx((3000 * 0.001 + 200 * 0.002) / 1000)
+
+
+def test_prompt_cache_checkpoints_only_for_supporting_models():
+    from langchain_core.messages import HumanMessage, SystemMessage
+
+    from src.agent.model_router import ModelProfile, apply_prompt_cache
+
+    messages = [
+        SystemMessage(content=[{"type": "text", "text": "Static"}, CACHE_POINT]),
+        HumanMessage(content="Dynamic"),
+    ]
+    router = ModelRouter(
+        {
+            "profiles": {
+                "nova": {"model_id": "apac.amazon.nova-pro-v1:0"},
+                "sonnet": {"model_id": "anthropic.claude-3-5-sonnet-20241022-v2:0"},
+            }
+        }
+    )
+
+    assert apply_prompt_cache(messages, router.profiles["nova"]) == messages
+    assert apply_prompt_cache(messages, router.profiles["sonnet"])[0].content == "Static"
+    with patch.object(config, "prompt_cache_enabled", False):
+        assert apply_prompt_cache(messages, router.profiles["nova"])[0].content == "Static"
+        # Nova models are only served through Converse, caching or not
+        assert router.profiles["nova"].uses_converse_api
+    assert not router.profiles["sonnet"].uses_converse_api
+    assert ModelProfile("p", "m", 1, 0.0).cost(0, 0, cache_read_tokens=1000) == 0.0
+
+
+def test_planner_sends_cached_system_prompt_on_every_turn():
+    from langchain_core.messages import SystemMessage
+
+    from src.agent.core.planner import SOWAgent
+
+    mock_llm = MagicMock()
+    mock_llm.bind_tools.return_value.invoke.side_effect = [
+        AIMessage(
+            content="",
+            tool_calls=[{"name": "search_crm", "args": {"client_name": "Acme"}, "id": "c1"}],
+        ),
+        AIMessage(content="done"),
+    ]
+
+    with (
+        patch("src.agent.config.Config.bedrock_runtime"),
+        patch.object(config, "bedrock_model_id", "apac.amazon.nova-pro-v1:0"),
+        patch("src.agent.core.planner.ChatBedrock", return_value=mock_llm),
+        patch("src.agent.core.planner.get_system_prompt", return_value="SysPrompt"),
+    ):
+        SOWAgent().run("Find Acme")
+
+    for call in mock_llm.bind_tools.return_value.invoke.call_args_list:
+        system = call[0][0][0]
+        assert isinstance(system, SystemMessage)
+        assert system.content == [{"type": "text", "text": "SysPrompt"}, CACHE_POINT]
+
+
+def test_route_call_notes_replies_cut_off_at_max_tokens():
+    call = RouteCall()
+    call.usage({"usage": {"outputTokens": 10}, "stopReason": "max_tokens"})
+    assert call.truncated
+
+    call.usage(AIMessage(content="x", response_metadata={"stop_reason": "end_turn"}))
+    assert not call.truncated
+    call.usage(AIMessage(content="x", response_metadata={"stopReason": "max_tokens"}))
+    assert call.truncated
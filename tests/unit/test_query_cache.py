@@ -0,0 +1,118 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.rag.cache import QueryCache, normalize_query
+from src.rag.retriever import DocumentRetriever
+
+
+@pytest.fixture
+def mock_chroma_results():
+    return {
+        "documents": [["Past SOW pricing section"]],
+        "metadatas": [[{"file_name": "sow1.md"}]],
+        "distances": [[0.25]],
+    }
+
+
+def test_normalize_query():
+    assert normalize_query("  Pricing   for ACME? ") == "pricing for acme"
+
+
+def test_cache_hit_and_stats():
+    cache = QueryCache(max_size=4, ttl_seconds=60)
+    key = cache.make_key("docs", "Pricing", {"client_id": "C1"}, 5)
+
+    assert cache.get(key) is None
+    cache.put(key, ["result"], compute_seconds=0.2)
+
+    assert cache.get(cache.make_key("docs", "pricing ", {"client_id": "C1"}, 5)) == ["result"]
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["hit_rate"] == 0.5
+    assert stats["latency_saved_seconds"] == 0.2
+
+
+def test_cache_lru_eviction():
+    cache = QueryCache(max_size=2, ttl_seconds=60)
+    keys = [cache.make_key("docs", q, None, 5) for q in ("a", "b", "c")]
+
+    cache.put(keys[0], 1)
+    cache.put(keys[1], 2)
+    cache.get(keys[0])
+    cache.put(keys[2], 3)
+
+    assert cache.get(keys[1]) is None
+    assert cache.get(keys[0]) == 1
+    assert cache.stats()["evictions"] == 1
+
+
+def test_cache_ttl_expiry():
+    cache = QueryCache(max_size=2, ttl_seconds=10)
+    key = cache.make_key("docs", "a", None, 5)
+
+    with patch("src.rag.cache.time.monotonic", side_effect=[100.0, 200.0]):
+        cache.put(key, 1)
+        assert cache.get(key) is None
+
+    assert cache.stats()["expirations"] == 1
+
+
+def test_cache_invalidation_bumps_version():
+    cache = QueryCache(max_size=4, ttl_seconds=60)
+    stale_key = cache.make_key("docs", "a", None, 5)
+    cache.put(stale_key, 1)
+
+    cache.invalidate("docs")
+
+    assert cache.get(cache.make_key("docs", "a", None, 5)) is None
+    # Results computed before the write must not be stored afterwards
+    cache.put(stale_key, 1)
+    assert cache.stats()["size"] == 0
+
+
+def test_retriever_uses_cache(mock_chroma_results):
+    mock_collection = MagicMock()
+    mock_collection.query.return_value = mock_chroma_results
+    mock_chroma = MagicMock()
+    mock_chroma.get_or_create_collection.return_value = mock_collection
+    mock_embeddings = MagicMock()
+    mock_embeddings.embed_query.return_value = [0.1, 0.2]
+
+    with (
+        patch("src.agent.config.Config.chroma_client", new=mock_chroma),
+        patch("src.rag.retriever.get_embeddings", return_value=mock_embeddings),
+    ):
+        retriever = DocumentRetriever(cache=QueryCache(max_size=8, ttl_seconds=60))
+        first = retriever.search("pricing", filters={"client_id": "C1"})
+        second = retriever.search("Pricing", filters={"client_id": "C1"})
+
+    assert first == second
+    assert mock_collection.query.call_count == 1
+    assert mock_embeddings.embed_query.call_count == 1
+    assert retriever.cache.stats()["hits"] == 1
+
+
+def test_retriever_search_many_batches_queries(mock_chroma_results):
+    mock_collection = MagicMock()
+    mock_collection.query.return_value = {
+        key: value * 2 for key, value in mock_chroma_results.items()
+    }
+    mock_chroma = MagicMock()
+    mock_chroma.get_or_create_collection.return_value = mock_collection
+    mock_embeddings = MagicMock()
+    mock_embeddings.embed_documents.return_value = [[0.1, 0.2], [0.3, 0.4]]
+
+    with (
+        patch("src.agent.config.Config.chroma_client", new=mock_chroma),
+        patch("src.rag.retriever.get_embeddings", return_value=mock_embeddings),
+    ):
+        retriever = DocumentRetriever(cache=QueryCache(max_size=8, ttl_seconds=60))
+        results = retriever.search_many(["scope", "pricing", "scope"], n_results=3)
+
+    assert len(results) == 3
+    assert results[0] == results[2]
+    mock_embeddings.embed_documents.assert_called_once_with(["scope", "pricing"])
+    assert mock_collection.query.call_count == 1
+    assert mock_collection.query.call_args[1]["query_embeddings"] == [[0.1, 0.2], [0.3, 0.4]]
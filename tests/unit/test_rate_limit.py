@@ -0,0 +1,229 @@
+import asyncio
+import io
+import json
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+from botocore.exceptions import ClientError, ReadTimeoutError
+
+from src.agent.utils.bedrock_async import BedrockError
+from src.agent.utils.rate_limit import (
+    AdaptiveConcurrency,
+    BedrockRateLimiter,
+    ThrottledBedrockClient,
+    TokenBucket,
+    is_throttling_error,
+    is_transient_error,
+)
+from src.rag.embeddings import BedrockEmbeddings
+
+
+def _throttle():
+    return ClientError(
+        {"Error": {"Code": "ThrottlingException", "Message": "Rate exceeded"}}, "InvokeModel"
+    )
+
+
+class FakeBedrockClient:
+    """invoke_model that throttles on a schedule of call numbers, or above a concurrency quota."""
+
+    def __init__(self, throttle_calls=(), quota=None, latency=0.0):
+        self.throttle_calls = set(throttle_calls)
+        self.quota = quota
+        self.latency = latency
+        self.calls = 0
+        self.in_flight = 0
+        self._lock = threading.Lock()
+
+    def invoke_model(self, **kwargs):
+        with self._lock:
+            call = self.calls
+            self.calls += 1
+            self.in_flight += 1
+            over_quota = self.quota is not None and self.in_flight > self.quota
+        try:
+            time.sleep(self.latency)
+            if call in self.throttle_calls or over_quota:
+                raise _throttle()
+            return {"body": io.BytesIO(json.dumps({"embedding": [float(call)]}).encode())}
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+
+def _limiter(**kwargs):
+    defaults = {"rate": 0, "burst": 10, "max_concurrency": 8, "max_retries": 3}
+    return BedrockRateLimiter(backoff_base=0.001, **{**defaults, **kwargs})
+
+
+def test_token_bucket_allows_burst_then_paces():
+    now = [0.0]
+    bucket = TokenBucket(rate=2, capacity=2, clock=lambda: now[0])
+
+    assert [bucket.reserve(), bucket.reserve()] == [0.0, 0.0]
+    assert bucket.reserve() == pytest.approx(0.5)
+    assert bucket.reserve() == pytest.approx(1.0)
+
+    now[0] = 5.0
+    assert bucket.reserve() == 0.0
+
+
+def test_aimd_halves_once_per_epoch_and_grows_back():
+    concurrency = AdaptiveConcurrency(initial=8, minimum=1, maximum=8)
+    epoch = concurrency.acquire()
+    concurrency.release()
+
+    concurrency.on_throttle(epoch)
+    concurrency.on_throttle(epoch)  # same burst: ignored
+    assert concurrency.limit == 4
+
+    for _ in range(4):
+        concurrency.on_success()
+    assert 4.9 < concurrency.limit < 5.1
+
+
+def test_throttled_calls_are_retried_and_counted():
+    limiter = _limiter()
+    client = ThrottledBedrockClient(FakeBedrockClient(throttle_calls={0, 1}), limiter)
+
+    response = client.invoke_model(modelId="m", body="{}")
+
+    assert json.loads(response["body"].read())["embedding"] == [2.0]
+    metrics = limiter.snapshot()
+    assert metrics["throttles"] == 2
+    assert metrics["retries"] == 2
+    assert metrics["throttle_rate"] == pytest.approx(2 / 3, abs=1e-3)
+    assert metrics["concurrency_limit"] < 8
+
+
+def test_retries_are_bounded():
+    limiter = _limiter(max_retries=2)
+    client = ThrottledBedrockClient(FakeBedrockClient(throttle_calls=range(10)), limiter)
+
+    with pytest.raises(ClientError):
+        client.invoke_model(modelId="m", body="{}")
+
+    assert limiter.snapshot()["failures"] == 1
+    assert client._client.calls == 3
+
+
+def test_other_errors_are_not_retried():
+    class Broken:
+        calls = 0
+
+        def invoke_model(self, **kwargs):
+            self.calls += 1
+            raise ClientError({"Error": {"Code": "ValidationException"}}, "InvokeModel")
+
+    broken = Broken()
+    with pytest.raises(ClientError):
+        ThrottledBedrockClient(broken, _limiter()).invoke_model(modelId="m")
+
+    assert broken.calls == 1
+
+
+def test_transient_errors_are_retried_without_lowering_the_limit():
+    class Flaky:
+        calls = 0
+
+        def invoke_model(self, **kwargs):
+            self.calls += 1
+            if self.calls == 1:
+                raise ReadTimeoutError(endpoint_url="https://bedrock")
+            if self.calls == 2:
+                raise ClientError(
+                    {"Error": {"Code": "InternalServerException"}, "ResponseMetadata": {}},
+                    "InvokeModel",
+                )
+            return {"ok": True}
+
+    limiter = _limiter()
+    flaky = Flaky()
+
+    assert ThrottledBedrockClient(flaky, limiter).invoke_model(modelId="m") == {"ok": True}
+    assert flaky.calls == 3
+    metrics = limiter.snapshot()
+    assert metrics["retries"] == 2
+    assert metrics["throttles"] == 0
+    assert metrics["concurrency_limit"] == 8
+
+
+def test_concurrency_converges_below_the_service_quota():
+    limiter = _limiter(max_concurrency=12, max_retries=20)
+    fake = FakeBedrockClient(quota=3, latency=0.01)
+    client = ThrottledBedrockClient(fake, limiter)
+    errors = []
+
+    def worker():
+        for _ in range(5):
+            try:
+                client.invoke_model(modelId="m", body="{}")
+            except ClientError as e:
+                errors.append(e)
+
+    threads = [threading.Thread(target=worker) for _ in range(12)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    metrics = limiter.snapshot()
+    assert errors == []
+    assert metrics["throttles"] > 0
+    assert metrics["concurrency_limit"] < 12
+    assert metrics["in_flight"] == 0
+
+
+def test_embeddings_go_through_the_limiter():
+    limiter = _limiter()
+    client = ThrottledBedrockClient(FakeBedrockClient(throttle_calls={0}), limiter)
+
+    with patch("src.agent.config.Config.bedrock_runtime", client):
+        vector = BedrockEmbeddings(model_id="m").embed_query("hello")
+
+    assert vector == [1.0]
+    assert limiter.snapshot()["throttles"] == 1
+
+
+async def test_async_calls_share_the_concurrency_limit():
+    limiter = _limiter(max_concurrency=2)
+    active = 0
+    peak = 0
+    attempts = 0
+
+    async def call():
+        nonlocal active, peak, attempts
+        attempts += 1
+        if attempts == 3:
+            raise BedrockError(429, "ThrottlingException", "slow down")
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.01)
+        active -= 1
+        return "ok"
+
+    results = await asyncio.gather(*(limiter.acall(call) for _ in range(10)))
+
+    assert results == ["ok"] * 10
+    assert peak <= 2
+    assert limiter.snapshot()["throttles"] == 1
+    assert limiter.concurrency.in_flight == 0
+
+
+def test_is_throttling_error():
+    assert is_throttling_error(_throttle())
+    assert is_throttling_error(BedrockError(429, "BedrockError", "x"))
+    assert is_throttling_error(ValueError("Error raised by bedrock service: ThrottlingException"))
+    assert not is_throttling_error(ValueError("bad input"))
+
+
+def test_is_transient_error():
+    assert is_transient_error(ReadTimeoutError(endpoint_url="https://bedrock"))
+    assert is_transient_error(BedrockError(503, "BedrockError", "x"))
+    assert is_transient_error(
+        ClientError({"ResponseMetadata": {"HTTPStatusCode": 500}}, "Converse")
+    )
+    assert not is_transient_error(BedrockError(400, "ValidationException", "x"))
+    assert not is_transient_error(ValueError("bad input"))
@@ -0,0 +1,79 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.rag.reranker import CrossEncoderReranker, mmr_select, rerank
+from src.rag.retriever import DocumentRetriever
+
+
+@pytest.fixture
+def candidates():
+    return [
+        {"content": "Pricing v1", "metadata": {}, "score": 0.10},
+        {"content": "Pricing v2", "metadata": {}, "score": 0.11},
+        {"content": "Timeline", "metadata": {}, "score": 0.40},
+    ]
+
+
+def test_mmr_prefers_diverse_candidates():
+    query = [1.0, 0.0]
+    # Two near-duplicates closest to the query and one different chunk
+    embeddings = [[1.0, 0.05], [1.0, 0.06], [0.8, -0.6]]
+
+    assert mmr_select(query, embeddings, k=2, lambda_mult=0.5) == [0, 2]
+    assert mmr_select(query, embeddings, k=2, lambda_mult=1.0) == [0, 1]
+
+
+def test_mmr_handles_small_inputs():
+    assert mmr_select([1.0], [], k=3) == []
+    assert mmr_select([1.0, 0.0], [[1.0, 0.0]], k=3) == [0]
+
+
+def test_rerank_mmr(candidates):
+    embeddings = [[1.0, 0.05], [1.0, 0.06], [0.8, -0.6]]
+
+    result = rerank("mmr", "pricing", [1.0, 0.0], candidates, embeddings, k=2)
+
+    assert [r["content"] for r in result] == ["Pricing v1", "Timeline"]
+
+
+def test_rerank_unknown_strategy(candidates):
+    with pytest.raises(ValueError):
+        rerank("bogus", "q", [1.0], candidates, None, k=2)
+
+
+def test_cross_encoder_reranker(candidates):
+    mock_model = MagicMock()
+    mock_model.predict.return_value = [0.2, 0.1, 0.9]
+
+    with patch("src.rag.reranker._load_cross_encoder", return_value=mock_model):
+        result = CrossEncoderReranker("test-model").rerank("timeline", candidates, k=2)
+
+    assert [r["content"] for r in result] == ["Timeline", "Pricing v1"]
+    assert result[0]["rerank_score"] == 0.9
+
+
+def test_retriever_overfetches_and_reranks():
+    mock_collection = MagicMock()
+    mock_collection.query.return_value = {
+        "documents": [["Pricing v1", "Pricing v2", "Timeline"]],
+        "metadatas": [[{}, {}, {}]],
+        "distances": [[0.10, 0.11, 0.40]],
+        "embeddings": [[[1.0, 0.05], [1.0, 0.06], [0.8, -0.6]]],
+    }
+    mock_chroma = MagicMock()
+    mock_chroma.get_or_create_collection.return_value = mock_collection
+    mock_embeddings = MagicMock()
+    mock_embeddings.embed_query.return_value = [1.0, 0.0]
+
+    with (
+        patch("src.agent.config.Config.chroma_client", new=mock_chroma),
+        patch("src.rag.retriever.get_embeddings", return_value=mock_embeddings),
+    ):
+        retriever = DocumentRetriever(cache=None)
+        results = retriever.search("pricing", n_results=2, rerank="mmr", fetch_k=10)
+
+    query_kwargs = mock_collection.query.call_args[1]
+    assert query_kwargs["n_results"] == 10
+    assert "embeddings" in query_kwargs["include"]
+    assert [r["content"] for r in results] == ["Pricing v1", "Timeline"]
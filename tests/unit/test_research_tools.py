@@ -79,12 +79,14 @@ def test_search_opportunities_found(mock_opportunities_data):
 
 def test_search_historical_sows():
     mock_retriever_instance = MagicMock()
-    mock_retriever_instance.search.return_value = [
-        {
-            "content": "Past SOW content",
-            "metadata": {"file_name": "sow1.md", "client_id": "C1", "product": "P1"},
-            "score": 0.9,
-        }
+    mock_retriever_instance.search_many.return_value = [
+        [
+            {
+                "content": "Past SOW content",
+                "metadata": {"file_name": "sow1.md", "client_id": "C1", "product": "P1"},
+                "score": 0.9,
+            }
+        ]
     ]
 
     with patch("src.agent.tools.research.DocumentRetriever", return_value=mock_retriever_instance):
@@ -92,8 +94,30 @@ def test_search_historical_sows():
 
         assert len(result) == 1
         assert result[0]["content"] == "Past SOW content"
-        mock_retriever_instance.search.assert_called_once()
-        assert mock_retriever_instance.search.call_args[1]["filters"]["client_id"] == "C1"
+        mock_retriever_instance.search_many.assert_called_once()
+        assert mock_retriever_instance.search_many.call_args[1]["filters"]["client_id"] == "C1"
+
+
+def test_search_historical_sows_multi_query_dedup():
+    shared = {
+        "content": "Pricing and timeline",
+        "metadata": {"file_name": "sow1.md", "client_id": "C1", "product": "P1"},
+    }
+    mock_retriever_instance = MagicMock()
+    mock_retriever_instance.search_many.return_value = [
+        [{**shared, "score": 0.6}],
+        [{**shared, "score": 0.3}, {**shared, "content": "Risks", "score": 0.8}],
+    ]
+
+    with patch("src.agent.tools.research.DocumentRetriever", return_value=mock_retriever_instance):
+        result = search_historical_sows.invoke(
+            {"query": "pricing", "client_id": "C1", "additional_queries": ["timeline"]}
+        )
+
+        assert mock_retriever_instance.search_many.call_args[0][0] == ["pricing", "timeline"]
+        assert len(result) == 2
+        assert result[0]["relevance_score"] == 0.3
+        assert result[0]["query"] == "timeline"
 
 
 def test_search_product_kb_mock_file():
@@ -153,3 +177,24 @@ def test_search_compliance_kb(mock_compliance_data):
         assert result["sla_requirements"] == {"uptime": "99.99%"}
         assert len(result["mandatory_clauses"]) == 1
         assert result["mandatory_clauses"][0]["name"] == "Data Privacy"
+
+
+def test_search_compliance_kb_includes_product_requirements(product_compliance_rules):
+    result = search_compliance_kb.invoke({"client_tier": "HIGH", "product": "Real-Time Payments"})
+
+    assert result["product"] == "Payments Gateway"
+    assert result["sla_requirements"] == {"uptime": "99.999%"}
+    sla_clause = next(c for c in result["mandatory_clauses"] if c["id"] == "clause-001")
+    assert sla_clause["text"] == "Vendor guarantees 99.999% availability during business hours."
+    assert "Scheme Rules" in [c["name"] for c in result["mandatory_clauses"]]
+
+
+def test_shipped_rules_define_no_product_requirements():
+    result = search_compliance_kb.invoke({"client_tier": "HIGH", "product": "Real-Time Payments"})
+
+    assert result["sla_requirements"] == {"uptime": "99.99%"}
+    assert [c["id"] for c in result["mandatory_clauses"]] == [
+        "clause-001",
+        "clause-002",
+        "clause-003",
+    ]
@@ -0,0 +1,150 @@
+import zipfile
+from unittest.mock import patch
+
+import pytest
+
+from src.api import review
+from src.api.review import (
+    IncrementalReviewer,
+    collect_batch_sources,
+    diff_issues,
+    split_review_blocks,
+)
+from src.api.schemas import ComplianceIssue
+
+SOW = """Preamble text.
+
+# Statement of Work
+
+## 1. Scope
+
+Gateway provisioning.
+
+```
+# not a heading
+```
+
+## 2. Liability
+
+The vendor accepts unlimited liability.
+"""
+
+
+def _issue(description, category="Prohibited Term"):
+    return ComplianceIssue(severity="HIGH", category=category, description=description)
+
+
+def test_split_review_blocks():
+    blocks = split_review_blocks(SOW)
+
+    assert [b.title for b in blocks] == [
+        "Preamble",
+        "Statement of Work",
+        "1. Scope",
+        "2. Liability",
+    ]
+    assert "# not a heading" in blocks[2].text
+    assert len({b.digest for b in blocks}) == 4
+
+
+def test_diff_issues_counts_repeats():
+    previous = [_issue("a"), _issue("b"), _issue("b")]
+    current = [_issue("b"), _issue("c")]
+
+    added, resolved = diff_issues(previous, current)
+
+    assert [i.description for i in added] == ["c"]
+    assert sorted(i.description for i in resolved) == ["a", "b"]
+
+
+@pytest.fixture
+def reviewer():
+    return IncrementalReviewer()
+
+
+def test_incremental_review_only_reevaluates_changed_blocks(reviewer):
+    with patch.object(
+        review, "_prohibited_term_issues", wraps=review._prohibited_term_issues
+    ) as check:
+        first = reviewer.review("doc-1", SOW)
+        assert check.call_count == 4
+
+        edited = SOW.replace("Gateway provisioning.", "Gateway provisioning and testing.")
+        second = reviewer.review("doc-1", edited)
+        assert check.call_count == 5
+
+    assert first.diff.blocks_reviewed == 4
+    assert second.diff.blocks_reviewed == 1
+    assert second.diff.added == [] and second.diff.resolved == []
+    assert second.compliance_score == first.compliance_score == 80
+    assert second.issues[0].location.startswith("2. Liability | Near:")
+
+
+def test_incremental_review_reports_resolved_issues(reviewer):
+    reviewer.review("doc-2", SOW)
+    fixed = reviewer.review("doc-2", SOW.replace("unlimited liability", "capped liability"))
+
+    assert fixed.status == "PASS"
+    assert [i.description for i in fixed.diff.resolved] == [
+        "Found prohibited term: 'unlimited liability'"
+    ]
+    assert fixed.diff.blocks_reviewed == 1
+
+
+def test_page_review_matches_full_review():
+    pages = [
+        "# Statement of Work\n\nGateway provisioning.",
+        "The vendor accepts unlimited liability.",
+    ]
+
+    paged, text = review.review_sow_pages(iter(pages))
+    full = review.review_sow_text(text)
+
+    assert text == "\n\n".join(pages)
+    assert paged.compliance_score == full.compliance_score
+    assert [i.description for i in paged.issues] == [i.description for i in full.issues]
+    assert paged.issues[0].location.startswith("Page 2 | ")
+
+
+def test_review_applies_product_requirements(product_compliance_rules):
+    sow = SOW.replace("unlimited liability", "instant settlement guaranteed")
+
+    with_product = review.review_sow_text(sow, product="Gateway", client_tier="HIGH")
+    without = review.review_sow_text(sow, product="Other", client_tier="HIGH")
+
+    descriptions = [i.description for i in with_product.issues]
+    assert any("instant settlement guaranteed" in d for d in descriptions)
+    assert any("Scheme Rules" in d for d in descriptions)
+    assert with_product.compliance_score < without.compliance_score
+
+
+def test_incremental_review_matches_full_review(reviewer):
+    full = review.review_sow_text(SOW)
+    incremental = reviewer.review("doc-3", SOW)
+
+    assert incremental.compliance_score == full.compliance_score
+    assert [i.description for i in incremental.issues] == [i.description for i in full.issues]
+
+
+@pytest.fixture
+def portfolio(tmp_path):
+    archive = tmp_path / "portfolio.zip"
+    with zipfile.ZipFile(archive, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+        for i in range(3):
+            zf.writestr(f"SOW-{i}.md", "# SOW\n\n" + "x" * 10_000)
+    extract_dir = tmp_path / "extract"
+    extract_dir.mkdir()
+    return tmp_path, extract_dir
+
+
+def test_batch_zip_limits_count_extracted_bytes(portfolio):
+    root, extract_dir = portfolio
+
+    assert len(collect_batch_sources("portfolio.zip", root, extract_dir)) == 3
+
+    with pytest.raises(ValueError, match="size limit"):
+        collect_batch_sources("portfolio.zip", root, extract_dir, max_member_bytes=5_000)
+    with pytest.raises(ValueError, match="extraction size limit"):
+        collect_batch_sources("portfolio.zip", root, extract_dir, max_total_bytes=25_000)
+    with pytest.raises(ValueError, match="more than 2"):
+        collect_batch_sources("portfolio.zip", root, extract_dir, max_members=2)
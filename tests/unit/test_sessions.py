@@ -0,0 +1,131 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock, patch
+
+import pytest
+from langchain_core.messages import AIMessage
+
+from src.agent.core.checkpoint import SqliteCheckpointSaver
+from src.agent.core.sessions import (
+    SectionNotFoundError,
+    SessionNotFoundError,
+    SOWSessions,
+    find_section,
+    replace_section,
+)
+
+SOW = """# Statement of Work
+
+## Scope
+
+Deploy the payments gateway.
+
+## Timeline and Milestones
+
+### Phase 1
+
+Discovery over six weeks.
+
+### Phase 2
+
+Build over nine months.
+
+## Pricing
+
+Fixed fee of $1.2M.
+"""
+
+
+def test_find_section_from_instruction():
+    assert find_section(SOW, "Shorten the timeline section").title == "Timeline and Milestones"
+    assert find_section(SOW, "Lower the price").title == "Pricing"
+    assert find_section(SOW, "Make phase 2 three months").title == "Phase 2"
+    assert find_section(SOW, "anything", title="scope").title == "Scope"
+
+    with pytest.raises(LookupError):
+        find_section(SOW, "Add a warranty clause")
+
+
+def test_replace_section_keeps_heading_and_neighbours():
+    section = find_section(SOW, "timeline")
+
+    edited = replace_section(SOW, section, "Delivery in four months.")
+
+    assert "## Timeline and Milestones\n\nDelivery in four months.\n\n## Pricing" in edited
+    assert "Phase 1" not in edited
+    assert edited.startswith("# Statement of Work\n\n## Scope\n\nDeploy the payments gateway.")
+    assert edited.endswith("Fixed fee of $1.2M.\n")
+
+
+def test_edit_revises_only_the_section_and_persists(tmp_path):
+    path = tmp_path / "checkpoints.db"
+    mock_llm = MagicMock()
+    mock_llm.invoke.return_value = AIMessage(content="## Pricing\n\nFixed fee of $0.9M.")
+
+    with patch("src.agent.tools.content._get_llm", return_value=mock_llm):
+        sessions = SOWSessions(SqliteCheckpointSaver(path))
+        sessions.start("s1", SOW, client_id="CLIENT-001")
+        state = sessions.edit("s1", "Lower the price by 25%")
+
+    mock_llm.invoke.assert_called_once()
+    prompt = mock_llm.invoke.call_args[0][0][-1].content
+    assert "Fixed fee of $1.2M." in prompt
+    assert "Deploy the payments gateway" not in prompt
+    assert "Fixed fee of $0.9M." in state["sow_text"]
+    assert "Deploy the payments gateway." in state["sow_text"]
+
+    # A new process sees the edited document and its history
+    reopened = SOWSessions(SqliteCheckpointSaver(path)).get("s1")
+    assert reopened["sow_text"] == state["sow_text"]
+    assert reopened["edits"] == [{"instruction": "Lower the price by 25%", "section": "Pricing"}]
+    assert reopened["client_id"] == "CLIENT-001"
+
+
+def test_edit_unknown_session_or_section():
+    sessions = SOWSessions(SqliteCheckpointSaver())
+    sessions.start("s1", SOW)
+
+    with pytest.raises(SessionNotFoundError):
+        sessions.edit("missing", "Shorten the timeline")
+    with pytest.raises(SectionNotFoundError):
+        sessions.edit("s1", "Add a warranty clause")
+
+    sessions.delete("s1")
+    assert sessions.get("s1") is None
+
+
+def test_edit_revises_the_resolved_section_when_titles_repeat():
+    sow = "# SOW\n\n## Notes\n\nKickoff in May.\n\n## Pricing\n\nFixed fee.\n\n## Notes\n\nNet 30 invoices.\n"
+    mock_llm = MagicMock()
+    mock_llm.invoke.return_value = AIMessage(content="Net 45 invoices.")
+
+    with patch("src.agent.tools.content._get_llm", return_value=mock_llm):
+        sessions = SOWSessions(SqliteCheckpointSaver())
+        sessions.start("s1", sow)
+        state = sessions.edit("s1", "Change invoices to net 45")
+
+    assert "Net 30 invoices." in mock_llm.invoke.call_args[0][0][-1].content
+    assert "## Notes\n\nKickoff in May." in state["sow_text"]
+    assert state["sow_text"].endswith("## Notes\n\nNet 45 invoices.\n")
+
+
+def test_concurrent_edits_of_a_session_are_not_lost():
+    def revise(messages):
+        time.sleep(0.05)  # both edits would read the same document without the lock
+        section = messages[-1].content.split("CURRENT CONTENT:\n")[1].split("\n")[0]
+        return AIMessage(content=f"{section}\n\nRevised.")
+
+    mock_llm = MagicMock()
+    mock_llm.invoke.side_effect = revise
+
+    with patch("src.agent.tools.content._get_llm", return_value=mock_llm):
+        sessions = SOWSessions(SqliteCheckpointSaver())
+        sessions.start("s1", SOW)
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            list(pool.map(lambda text: sessions.edit("s1", text), ["Lower the price", "Scope"]))
+
+    state = sessions.get("s1")
+    assert len(state["edits"]) == 2
+    assert sessions._locks == {}  # no lock kept once the edits are done
+    assert "## Pricing\n\nRevised." in state["sow_text"]
+    assert "## Scope\n\nRevised." in state["sow_text"]
@@ -0,0 +1,85 @@
+import pytest
+
+from src.agent.tools.sla_validator import (
+    compile_sla_validator,
+    extract_commitments,
+    parse_quantity,
+    tier_sla_requirements,
+)
+
+SOW = """# Statement of Work
+
+## Service Level Agreement
+- 95% uptime
+- Response time < 200ms for 95% of transactions
+- Critical incidents acknowledged within four (4) hours and resolved in 2 business days
+
+## Availability
+- 99.95% measured monthly
+
+## Pricing
+Total project cost: $250,000 plus AUD 1.5m in licences.
+"""
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("99.9%", ("percentage", 99.9)),
+        ("1 hour", ("duration", 60)),
+        ("twenty-four hours", ("duration", 1440)),
+        ("500 ms", ("duration", 500 / 60000)),
+        ("$5,000", ("currency", 5000)),
+        ("USD 2.5m", ("currency", 2_500_000)),
+        ("best effort", None),
+    ],
+)
+def test_parse_quantity_normalizes_units(text, expected):
+    assert parse_quantity(text) == expected
+
+
+def test_commitments_are_tagged_with_metrics():
+    commitments = [(c.text, c.metric, c.line) for c in extract_commitments(SOW).commitments]
+
+    assert commitments == [
+        ("95%", "availability", 4),
+        ("200ms", "response_time", 5),
+        ("95%", "response_time", 5),
+        ("four (4) hours", "response_time", 6),
+        ("2 business days", "resolution_time", 6),
+        # No keyword on the line: the section heading decides
+        ("99.95%", "availability", 9),
+        ("$250,000", None, 12),
+        ("AUD 1.5m", None, 12),
+    ]
+
+
+def test_validator_flags_weaker_and_missing_commitments():
+    validator = compile_sla_validator(
+        {"uptime": "99.9%", "max_response_time": "1 hour", "max_resolution_time": "1 day"}
+    )
+
+    findings = validator.validate(extract_commitments(SOW))
+
+    assert [(f["severity"], f["location"]) for f in findings] == [
+        ("MEDIUM", "Line 6"),  # resolved in 2 days > 1 day
+        ("MEDIUM", "Line 6"),  # acknowledged in 4 hours > 1 hour
+        ("HIGH", "Line 4"),  # 95% < 99.9%; 99.95% on line 9 passes
+    ]
+    assert "'95%' is weaker than required '99.9%'" in findings[2]["issue"]
+
+    missing = compile_sla_validator({"min_service_credit": "10%"}).validate(
+        extract_commitments(SOW)
+    )
+    assert missing[0]["issue"] == "Missing service credit SLA: '10%'"
+
+
+def test_validators_are_compiled_once_per_requirements():
+    assert compile_sla_validator({"uptime": "99.9%"}) is compile_sla_validator({"uptime": "99.9%"})
+
+
+def test_tier_requirements_fall_back_to_compliance_tiers():
+    rules = {"compliance_tiers": {"HIGH": {"sla": "99.99%"}}}
+
+    assert tier_sla_requirements(rules, "HIGH") == {"uptime": "99.99%"}
+    assert tier_sla_requirements(rules, "LOW") == {}
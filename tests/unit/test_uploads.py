@@ -0,0 +1,90 @@
+import pytest
+from fastapi import HTTPException
+from starlette.requests import Request
+
+from src.api.uploads import receive_upload
+
+BOUNDARY = "sow-boundary"
+
+
+def _body(content, filename="sow.pdf", product="Payment Gateway Pro"):
+    return (
+        (
+            f"--{BOUNDARY}\r\n"
+            'Content-Disposition: form-data; name="product"\r\n\r\n'
+            f"{product}\r\n"
+            f"--{BOUNDARY}\r\n"
+            f'Content-Disposition: form-data; name="file"; filename="{filename}"\r\n'
+            "Content-Type: application/pdf\r\n\r\n"
+        ).encode()
+        + content
+        + f"\r\n--{BOUNDARY}--\r\n".encode()
+    )
+
+
+def _request(body, chunk_size=1024, content_length=False):
+    """Request whose body arrives in chunks, without Content-Length unless asked."""
+    headers = [(b"content-type", f"multipart/form-data; boundary={BOUNDARY}".encode())]
+    if content_length:
+        headers.append((b"content-length", str(len(body)).encode()))
+    chunks = [body[i : i + chunk_size] for i in range(0, len(body), chunk_size)]
+    received = []
+
+    async def receive():
+        chunk = chunks[len(received)]
+        received.append(chunk)
+        return {"type": "http.request", "body": chunk, "more_body": len(received) < len(chunks)}
+
+    request = Request({"type": "http", "method": "POST", "headers": headers}, receive)
+    return request, received
+
+
+@pytest.fixture
+def tmp_uploads(tmp_path, monkeypatch):
+    monkeypatch.setattr("tempfile.tempdir", str(tmp_path))
+    return tmp_path
+
+
+async def test_file_part_is_written_once_to_a_temp_file(tmp_uploads):
+    content = b"%PDF-1.4 " + b"x" * 5000
+    request, _ = _request(_body(content))
+
+    upload = await receive_upload(request, "file", (".pdf",), max_bytes=10_000)
+
+    assert upload.filename == "sow.pdf"
+    assert upload.path.read_bytes() == content
+    assert upload.size == len(content)
+    assert upload.fields == {"product": "Payment Gateway Pro"}
+
+
+async def test_oversized_upload_is_rejected_while_streaming(tmp_uploads):
+    body = _body(b"x" * 500_000)
+    request, received = _request(body, chunk_size=4096)
+
+    with pytest.raises(HTTPException) as error:
+        await receive_upload(request, "file", (".pdf",), max_bytes=10_000)
+
+    assert error.value.status_code == 413
+    # Stopped reading shortly after the limit, and the partial file is gone
+    assert sum(len(chunk) for chunk in received) < 20_000
+    assert list(tmp_uploads.iterdir()) == []
+
+
+async def test_declared_content_length_is_refused_before_reading(tmp_uploads):
+    request, received = _request(_body(b"x" * 500_000), content_length=True)
+
+    with pytest.raises(HTTPException) as error:
+        await receive_upload(request, "file", (".pdf",), max_bytes=10_000)
+
+    assert error.value.status_code == 413
+    assert received == []
+
+
+async def test_unsupported_file_type(tmp_uploads):
+    request, _ = _request(_body(b"plain text", filename="sow.txt"))
+
+    with pytest.raises(HTTPException) as error:
+        await receive_upload(request, "file", (".pdf", ".docx"), max_bytes=10_000)
+
+    assert error.value.status_code == 415
+    assert list(tmp_uploads.iterdir()) == []
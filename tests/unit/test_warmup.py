@@ -0,0 +1,40 @@
+from src.api.warmup import FirstRequestMetrics, WarmupState
+
+
+def _fail():
+    raise RuntimeError("chroma unavailable")
+
+
+async def test_warmup_runs_steps_in_order():
+    calls = []
+    state = WarmupState([("a", lambda: calls.append("a")), ("b", lambda: calls.append("b"))])
+    assert state.status == "pending"
+
+    await state.run()
+
+    assert calls == ["a", "b"]
+    assert state.ready
+    snapshot = state.snapshot()
+    assert [step["status"] for step in snapshot["steps"]] == ["done", "done"]
+    assert snapshot["duration_ms"] >= 0
+
+
+async def test_failed_step_is_reported_and_later_steps_still_run():
+    calls = []
+    state = WarmupState([("vector_store", _fail), ("agent", lambda: calls.append("agent"))])
+
+    await state.run()
+
+    assert state.status == "failed"
+    assert not state.ready
+    assert calls == ["agent"]
+    assert state.snapshot()["steps"][0]["error"] == "chroma unavailable"
+
+
+def test_first_request_metrics_keep_only_the_first_request():
+    metrics = FirstRequestMetrics()
+
+    metrics.record("/api/v1/sow/review", 850.0, warm=False)
+    metrics.record("/api/v1/sow/review", 12.0, warm=True)
+
+    assert metrics.snapshot() == {"/api/v1/sow/review": {"latency_ms": 850.0, "warm": False}}